@@ -0,0 +1,36 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from litex.build import tools
+
+# Platform Designer (Qsys) System ------------------------------------------------------------------
+
+def add_qsys_system(platform, name, tcl, pin_assignments=None):
+    """Generate a Platform Designer system with the Quartus build.
+
+    <name>.tcl (qsys-script) is written to the build directory, the system is generated to <name>/
+    before synthesis and added to the project (QIP_FILE). pin_assignments (ex the UniPHY/HPS
+    <...>_pin_assignments.tcl, relative to <name>/synthesis/submodules/) is applied with quartus_sta
+    after synthesis to set the I/O assignments of memory interfaces.
+    """
+    toolchain    = platform.toolchain
+    build_script = toolchain.build_script
+    def _build_script():
+        tools.write_to_file(f"{name}.tcl", tcl)
+        script_file = build_script()
+        script      = open(script_file).read()
+        build_name  = toolchain._build_name
+        script = script.replace(f"{toolchain._synth_tool} ",
+            f"qsys-script --script={name}.tcl\n"
+            f"qsys-generate {name}.qsys --synthesis=VERILOG --output-directory={name}\n"
+            f"{toolchain._synth_tool} ", 1)
+        if pin_assignments is not None:
+            script = script.replace("quartus_fit ",
+                f"quartus_sta -t {name}/synthesis/submodules/{pin_assignments} {build_name}\n"
+                "quartus_fit ", 1)
+        tools.write_to_file(script_file, script, force_unix=True)
+        return script_file
+    toolchain.build_script = _build_script
+    toolchain.additional_qsf_commands.append(f"set_global_assignment -name QIP_FILE {name}/synthesis/{name}.qip")
@@ -0,0 +1,129 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import copy
+
+# Xilinx SPI Flash Configuration Profile -----------------------------------------------------------
+
+# Valid BITSTREAM.CONFIG.CONFIGRATE values (MHz).
+_configrates = {
+    "7series"    : [3, 6, 9, 12, 16, 22, 26, 33, 40, 50, 66],
+    "ultrascale" : [3.1, 6.3, 12.5, 25.0, 31.9, 42.5, 51.0, 63.8, 85.0, 127.5, 150.0],
+}
+# UltraScale+ CCLK is derived from the same internal oscillator/dividers as UltraScale.
+_configrates["ultrascale+"] = _configrates["ultrascale"]
+
+class XilinxConfigProfile:
+    """SPI Flash configuration profile of a Xilinx 7-Series/UltraScale(+) board.
+
+    Groups the bitstream configuration settings (SPI bus width, CCLK rate, compression, fallback
+    and multiboot) and the matching write_cfgmem parameters so that each platform describes its
+    configuration flash once and targets can switch to the fastest settings with --fast-boot.
+
+    with_cfgmem: generate the SPI Flash .bin image(s) with write_cfgmem after the bitstream (disable
+    for boards programmed through other flows).
+    """
+    def __init__(self, flash_size,
+        family           = "7series",
+        spi_buswidth     = 1,
+        configrate       = None,
+        extmasterclk_en  = None,
+        compress         = False,
+        fallback         = False,
+        multiboot        = False,
+        next_config_addr = 0x00400000,
+        timer_cfg        = 0x0001fbd0,
+        spi_32bit_addr   = None,
+        spi_fall_edge    = False,
+        with_cfgmem      = True,
+        # Fastest settings supported by the board/flash (used by fast_boot()).
+        max_spi_buswidth    = None,
+        max_configrate      = None,
+        max_extmasterclk_en = None):
+        assert family in _configrates.keys()
+        assert spi_buswidth in [1, 2, 4, 8]
+        self.flash_size          = flash_size # In MBytes.
+        self.family              = family
+        self.spi_buswidth        = spi_buswidth
+        self.configrate          = configrate
+        self.extmasterclk_en     = extmasterclk_en
+        self.compress            = compress
+        self.fallback            = fallback
+        self.multiboot           = multiboot
+        self.next_config_addr    = next_config_addr
+        self.timer_cfg           = timer_cfg
+        self.spi_32bit_addr      = spi_32bit_addr
+        self.spi_fall_edge       = spi_fall_edge
+        self.with_cfgmem         = with_cfgmem
+        self.max_spi_buswidth    = spi_buswidth if max_spi_buswidth is None else max_spi_buswidth
+        self.max_configrate      = configrate   if max_configrate   is None else max_configrate
+        self.max_extmasterclk_en = max_extmasterclk_en
+        if configrate is not None:
+            assert configrate in _configrates[family]
+        if self.max_configrate is not None:
+            assert self.max_configrate in _configrates[family]
+
+    def fast_boot(self):
+        """Return a copy of the profile using the fastest settings supported by the board."""
+        profile = copy.copy(self)
+        profile.spi_buswidth = self.max_spi_buswidth
+        profile.configrate   = self.max_configrate
+        profile.compress     = True
+        if self.max_extmasterclk_en is not None:
+            profile.extmasterclk_en = self.max_extmasterclk_en
+        return profile
+
+    def get_bitstream_commands(self):
+        def prop(name, value):
+            return f"set_property {name} {value} [current_design]"
+        commands = [prop("BITSTREAM.CONFIG.SPI_BUSWIDTH", self.spi_buswidth)]
+        if self.configrate is not None:
+            commands.append(prop("BITSTREAM.CONFIG.CONFIGRATE", self.configrate))
+        if self.extmasterclk_en is not None:
+            commands.append(prop("BITSTREAM.CONFIG.EXTMASTERCCLK_EN", self.extmasterclk_en))
+        if self.compress:
+            commands.append(prop("BITSTREAM.GENERAL.COMPRESS", "TRUE"))
+        if self.fallback:
+            commands.append(prop("BITSTREAM.CONFIG.CONFIGFALLBACK", "Enable"))
+        if self.spi_32bit_addr is not None:
+            commands.append(prop("BITSTREAM.CONFIG.SPI_32BIT_ADDR", "YES" if self.spi_32bit_addr else "NO"))
+        if self.spi_fall_edge:
+            commands.append(prop("BITSTREAM.CONFIG.SPI_FALL_EDGE", "YES"))
+        return commands
+
+    def get_cfgmem_command(self, bitstream, binary):
+        return " ".join([
+            "write_cfgmem -force -format bin",
+            f"-interface spix{self.spi_buswidth}",
+            f"-size {self.flash_size}",
+            f"-loadbit \"up 0x0 {bitstream}\"",
+            f"-file {binary}",
+        ])
+
+    def get_additional_commands(self):
+        if not self.with_cfgmem:
+            return []
+        # Non-Multiboot SPI-Flash bitstream generation.
+        commands = [self.get_cfgmem_command("{build_name}.bit", "{build_name}.bin")]
+        if self.multiboot:
+            commands += [
+                # Multiboot SPI-Flash Operational bitstream generation.
+                f"set_property BITSTREAM.CONFIG.TIMER_CFG 0x{self.timer_cfg:08x} [current_design]",
+                "set_property BITSTREAM.CONFIG.CONFIGFALLBACK Enable [current_design]",
+                "write_bitstream -force {build_name}_operational.bit ",
+                self.get_cfgmem_command("{build_name}_operational.bit", "{build_name}_operational.bin"),
+
+                # Multiboot SPI-Flash Fallback bitstream generation.
+                f"set_property BITSTREAM.CONFIG.NEXT_CONFIG_ADDR 0x{self.next_config_addr:08x} [current_design]",
+                "write_bitstream -force {build_name}_fallback.bit ",
+                self.get_cfgmem_command("{build_name}_fallback.bit", "{build_name}_fallback.bin"),
+            ]
+        return commands
+
+    def apply(self, platform):
+        """Set the platform's Vivado bitstream/write_cfgmem commands from the profile."""
+        platform.config_profile = self
+        platform.toolchain.bitstream_commands  = self.get_bitstream_commands()
+        platform.toolchain.additional_commands = self.get_additional_commands()
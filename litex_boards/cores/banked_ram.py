@@ -0,0 +1,150 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+from migen.genlib.roundrobin import *
+
+from litex.gen import LiteXModule, Reduce
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import wishbone
+
+kB = 1024
+
+# Banked RAM ---------------------------------------------------------------------------------------
+
+class BankedRAM(LiteXModule):
+    """On-chip RAM banks shared by several Wishbone ports with per-bank arbitration.
+
+    banks are memories exposing a word-addressed Wishbone bus (ex NXLRAM/Up5kSPRAM), of bank_size
+    bytes and same data width. Banks are either linear (a bank per bank_size region: masters working
+    in different regions never conflict) or interleaved (consecutive words in consecutive banks:
+    streaming masters spread their accesses over all the banks).
+
+    Ports (CPU, DMAs...) are added with add_port and are taken modulo the RAM size, so they can be
+    driven with SoC addresses when the RAM region is aligned on its size. Each bank has its own
+    round-robin arbiter: ports accessing different banks are served in parallel, a bank is
+    re-arbitrated after each access. Accesses and conflict cycles (port waiting on a bank granted to
+    another port) are counted per port.
+    """
+    def __init__(self, banks, bank_size, interleaved=False, with_csr=True):
+        assert len(banks) in [1, 2, 4, 8]
+        self.banks       = banks
+        self.bank_size   = bank_size
+        self.size        = bank_size*len(banks)
+        self.interleaved = interleaved
+        self.with_csr    = with_csr
+        self.data_width  = len(banks[0].bus.dat_w)
+        self.ports       = []
+        self.counters    = []
+        for n, bank in enumerate(banks):
+            setattr(self, f"bank{n}", bank)
+
+        if with_csr:
+            self.clear = CSR()
+
+    def add_port(self, name):
+        """Add a port, returns its Wishbone interface (data width of the banks)."""
+        port = wishbone.Interface(data_width=self.data_width, address_width=32, addressing="word")
+        self.ports.append(port)
+        if self.with_csr:
+            accesses  = CSRStatus(32, name=f"{name}_accesses",  description="Accesses (acks).")
+            conflicts = CSRStatus(32, name=f"{name}_conflicts", description="Cycles waiting on a bank accessed by another port.")
+            setattr(self, f"{name}_accesses",  accesses)
+            setattr(self, f"{name}_conflicts", conflicts)
+            self.counters.append((accesses, conflicts))
+        return port
+
+    def _decode(self, adr):
+        # Returns the bank and the bank address of a port address.
+        bank_bits = log2_int(len(self.banks))
+        word_bits = log2_int(self.bank_size//(self.data_width//8))
+        if bank_bits == 0:
+            return None, adr[:word_bits]
+        if self.interleaved:
+            return adr[:bank_bits], adr[bank_bits:bank_bits + word_bits]
+        else:
+            return adr[word_bits:word_bits + bank_bits], adr[:word_bits]
+
+    def do_finalize(self):
+        assert len(self.ports) >= 1
+        nports    = len(self.ports)
+        waits     = [[] for _ in range(nports)]
+        for n, bank in enumerate(self.banks):
+            # Requests.
+            requests = []
+            adrs     = []
+            for port in self.ports:
+                bank_sel, bank_adr = self._decode(port.adr)
+                request = Signal()
+                self.comb += request.eq(port.cyc & port.stb)
+                if bank_sel is not None:
+                    self.comb += If(bank_sel != n, request.eq(0))
+                requests.append(request)
+                adrs.append(bank_adr)
+
+            # Arbitration (re-arbitrate when the granted port is idle or on ack).
+            rr = RoundRobin(nports, SP_CE)
+            self.submodules += rr
+            busy = Signal()
+            self.comb += [
+                busy.eq(Array(requests)[rr.grant]),
+                rr.request.eq(Cat(*requests)),
+                rr.ce.eq(~busy | bank.bus.ack),
+            ]
+
+            # Bank access.
+            cases = {}
+            for p, port in enumerate(self.ports):
+                cases[p] = [
+                    bank.bus.adr.eq(adrs[p]),
+                    bank.bus.dat_w.eq(port.dat_w),
+                    bank.bus.sel.eq(port.sel),
+                    bank.bus.we.eq(port.we),
+                    bank.bus.cyc.eq(requests[p]),
+                    bank.bus.stb.eq(requests[p]),
+                ]
+            self.comb += Case(rr.grant, cases)
+
+            # Responses.
+            for p, port in enumerate(self.ports):
+                granted = Signal()
+                self.comb += [
+                    granted.eq(requests[p] & (rr.grant == p)),
+                    If(granted,
+                        port.ack.eq(bank.bus.ack),
+                        port.dat_r.eq(bank.bus.dat_r),
+                    )
+                ]
+                waits[p].append(requests[p] & (rr.grant != p) & busy)
+
+        # Counters.
+        if self.with_csr:
+            for p, (accesses, conflicts) in enumerate(self.counters):
+                for csr, inc in [(accesses, self.ports[p].ack), (conflicts, Reduce("OR", waits[p]))]:
+                    self.sync += [
+                        If(self.clear.re,
+                            csr.status.eq(0)
+                        ).Else(
+                            csr.status.eq(csr.status + inc)
+                        )
+                    ]
+
+# Lattice RAM Banks --------------------------------------------------------------------------------
+
+def lattice_ram_banks(primitive, size, mode="single"):
+    """Banks of Lattice large RAMs (NXLRAM/Up5kSPRAM) for a size and mode, returns (banks, bank_size).
+
+    - single     : one 32-bit bank (one port at a time).
+    - linear     : two 32-bit banks, one per half of the RAM.
+    - interleaved: two 32-bit banks, word interleaved.
+    - wide       : one 64-bit bank (twice the bandwidth per access for 64-bit ports).
+    """
+    assert mode in ["single", "linear", "interleaved", "wide"]
+    if mode == "single":
+        return [primitive(32, size)], size
+    if mode == "wide":
+        return [primitive(64, size)], size
+    return [primitive(32, size//2) for _ in range(2)], size//2
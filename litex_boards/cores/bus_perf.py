@@ -0,0 +1,240 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from functools import reduce
+from operator import add
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect import axi
+
+# Bus Performance Counters -------------------------------------------------------------------------
+
+class BusPerfCounters(LiteXModule):
+    """Transactions/Bytes/Wait/Stall counters and latency histogram of a bus, fed with probes.
+
+    - transaction: transactions (requests) accepted in the cycle.
+    - nbytes     : bytes transferred in the cycle.
+    - wait       : the initiator is waiting (request/data not accepted: target bound).
+    - stall      : the target is waiting (response not accepted/initiator idle: initiator bound).
+    - start/end  : request issued/response received for the latency measurement (one measured request
+                   at a time, others are not sampled). start is a level (request pending) on non-pipelined
+                   buses, a pulse per request on pipelined ones (measured only when nothing is in flight).
+
+    Counters are latched in the CSRs on snapshot and reset on clear.
+    """
+    def __init__(self, snapshot, clear, counter_width=32, nbuckets=8, with_latency=True, pipelined=False):
+        self.transaction = Signal(2) # Up to 2 per cycle (AXI AW + AR).
+        self.nbytes      = Signal(16)
+        self.wait        = Signal()
+        self.stall       = Signal()
+        self.start       = Signal()
+        self.end         = Signal()
+
+        self.transactions = CSRStatus(counter_width, description="Transactions.")
+        self.bytes        = CSRStatus(counter_width, description="Bytes.")
+        self.wait_cycles  = CSRStatus(counter_width, description="Cycles waiting on the target.")
+        self.stall_cycles = CSRStatus(counter_width, description="Cycles waiting on the initiator.")
+        if with_latency:
+            for i in range(nbuckets):
+                low  = 1 if i == 0 else 2**i
+                high = f"{2**(i + 1) - 1}" if i != (nbuckets - 1) else ""
+                setattr(self, f"latency{i}", CSRStatus(counter_width, name=f"latency{i}",
+                    description=f"Sampled requests with a {low}-{high} cycles latency."))
+
+        # # #
+
+        # Counters.
+        counters = [
+            (self.transactions, self.transaction),
+            (self.bytes,        self.nbytes),
+            (self.wait_cycles,  self.wait),
+            (self.stall_cycles, self.stall),
+        ]
+
+        # Latency.
+        if with_latency:
+            busy    = Signal()
+            latency = Signal(nbuckets)
+            count   = Signal(nbuckets)
+            first   = Signal()
+            done    = Signal()
+            pending = Signal(8)
+            if pipelined:
+                self.sync += pending.eq(pending + self.start - self.end)
+            self.comb += [
+                first.eq(self.start & ~busy & (pending == 0)),
+                done.eq(self.end & (busy if pipelined else (busy | first))),
+                If(~busy,
+                    count.eq(1)
+                ).Elif(latency != (2**nbuckets - 1),
+                    count.eq(latency + 1)
+                ).Else(
+                    count.eq(latency)
+                )
+            ]
+            self.sync += [
+                If(done,
+                    busy.eq(0)
+                ).Elif(first,
+                    busy.eq(1),
+                    latency.eq(1)
+                ).Elif(busy,
+                    latency.eq(count)
+                )
+            ]
+            for i in range(nbuckets):
+                low  = 1 if i == 0 else 2**i
+                high = 2**(i + 1) - 1 if i != (nbuckets - 1) else 2**nbuckets - 1
+                counters.append((getattr(self, f"latency{i}"), done & (count >= low) & (count <= high)))
+
+        for csr, inc in counters:
+            counter = Signal(counter_width)
+            self.sync += [
+                If(clear,
+                    counter.eq(0)
+                ).Else(
+                    counter.eq(counter + inc)
+                ),
+                If(snapshot,
+                    csr.status.eq(counter)
+                )
+            ]
+
+# Probes -------------------------------------------------------------------------------------------
+
+def _handshake(endpoint):
+    return endpoint.valid & endpoint.ready
+
+def _popcount(signal):
+    return reduce(add, [signal[i] for i in range(len(signal))])
+
+def wishbone_probes(counters, bus):
+    """Wishbone (Classic/Incrementing burst): a transaction per acked access."""
+    access = bus.cyc & bus.stb
+    return [
+        counters.transaction.eq(access & bus.ack),
+        counters.nbytes.eq(Mux(access & bus.ack, Mux(bus.we, _popcount(bus.sel), bus.data_width//8), 0)),
+        counters.wait.eq(access & ~bus.ack),
+        counters.stall.eq(bus.cyc & ~bus.stb),
+        counters.start.eq(access),
+        counters.end.eq(access & bus.ack),
+    ]
+
+def axi_probes(counters, bus):
+    """AXI/AXI-Lite: a transaction per AW/AR handshake, latency from AR to the last R beat."""
+    r_last = getattr(bus.r, "last", 1)
+    return [
+        counters.transaction.eq(_handshake(bus.aw) + _handshake(bus.ar)),
+        counters.nbytes.eq((_handshake(bus.w) + _handshake(bus.r))*(bus.data_width//8)),
+        counters.wait.eq((bus.aw.valid & ~bus.aw.ready) | (bus.w.valid & ~bus.w.ready) | (bus.ar.valid & ~bus.ar.ready)),
+        counters.stall.eq((bus.r.valid & ~bus.r.ready) | (bus.b.valid & ~bus.b.ready)),
+        counters.start.eq(_handshake(bus.ar)),
+        counters.end.eq(_handshake(bus.r) & r_last),
+    ]
+
+def dram_port_probes(counters, port):
+    """LiteDRAM Native Port: a transaction per command, latency from read command to read data."""
+    return [
+        counters.transaction.eq(_handshake(port.cmd)),
+        counters.nbytes.eq((_handshake(port.wdata) + _handshake(port.rdata))*(port.data_width//8)),
+        counters.wait.eq((port.cmd.valid & ~port.cmd.ready) | (port.wdata.valid & ~port.wdata.ready)),
+        counters.stall.eq(port.rdata.valid & ~port.rdata.ready),
+        counters.start.eq(_handshake(port.cmd) & ~port.cmd.we),
+        counters.end.eq(_handshake(port.rdata)),
+    ]
+
+def stream_probes(counters, endpoint):
+    """Stream (ex DMA): a transaction per packet, no latency."""
+    return [
+        counters.transaction.eq(_handshake(endpoint) & endpoint.last),
+        counters.nbytes.eq(_handshake(endpoint)*(len(endpoint.data)//8)),
+        counters.wait.eq(endpoint.valid & ~endpoint.ready),
+        counters.stall.eq(~endpoint.valid & endpoint.ready),
+    ]
+
+# Bus Performance Monitor --------------------------------------------------------------------------
+
+class BusPerf(LiteXModule):
+    """Non-intrusive performance monitors (observe the bus signals only) with common snapshot/clear.
+
+    cycles gives the elapsed sys cycles between clear and snapshot, to compute throughputs/ratios.
+    """
+    def __init__(self, counter_width=32):
+        self.counter_width = counter_width
+        self.monitors      = []
+
+        self.snapshot = CSR()
+        self.clear    = CSR()
+        self.cycles   = CSRStatus(counter_width, description="Cycles elapsed between clear and snapshot.")
+
+        # # #
+
+        cycles = Signal(counter_width)
+        self.sync += [
+            If(self.clear.re,
+                cycles.eq(0)
+            ).Else(
+                cycles.eq(cycles + 1)
+            ),
+            If(self.snapshot.re,
+                self.cycles.status.eq(cycles)
+            )
+        ]
+
+    def add_monitor(self, name, interface):
+        if isinstance(interface, wishbone.Interface):
+            probes, with_latency, pipelined = wishbone_probes, True, False
+        elif isinstance(interface, (axi.AXIInterface, axi.AXILiteInterface)):
+            probes, with_latency, pipelined = axi_probes, True, True
+        elif isinstance(interface, stream.Endpoint):
+            probes, with_latency, pipelined = stream_probes, False, False
+        elif hasattr(interface, "cmd") and hasattr(interface, "rdata"):
+            probes, with_latency, pipelined = dram_port_probes, True, True
+        else:
+            raise ValueError(f"Unsupported interface for {name} monitor.")
+        counters = BusPerfCounters(self.snapshot.re, self.clear.re, self.counter_width,
+            with_latency = with_latency,
+            pipelined    = pipelined,
+        )
+        self.add_module(name=name, module=counters)
+        self.comb += probes(counters, interface)
+        self.monitors.append(name)
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _dram_port_owner(soc, port):
+    # Modules using LiteDRAM ports keep them as port (Wishbone/AXI bridges, DMAs) or dma.port (Video).
+    for name, module in soc._submodules:
+        if port in [getattr(module, "port", None), getattr(getattr(module, "dma", None), "port", None)]:
+            return name
+    return None
+
+def add_bus_perf(soc, name="bus_perf", counter_width=32):
+    """Monitor the SoC Bus masters/slaves, LiteDRAM ports (after L2) and PCIe DMAs.
+
+    To be called once all the bus masters/slaves have been added (before the build).
+    """
+    bus_perf = BusPerf(counter_width)
+    for master_name, master in soc.bus.masters.items():
+        bus_perf.add_monitor(f"master_{master_name}", master)
+    for slave_name, slave in soc.bus.slaves.items():
+        bus_perf.add_monitor(f"slave_{slave_name}", slave)
+    if hasattr(soc, "sdram"):
+        for i, port in enumerate(soc.sdram.crossbar.masters):
+            if port.clock_domain != "sys":
+                continue
+            owner = _dram_port_owner(soc, port)
+            bus_perf.add_monitor(f"sdram_{owner or f'port{i}'}", port)
+    for dma_name, dma in soc._submodules:
+        if dma_name.startswith("pcie_dma"):
+            bus_perf.add_monitor(f"{dma_name}_writer", dma.sink)
+            bus_perf.add_monitor(f"{dma_name}_reader", dma.source)
+    soc.add_module(name=name, module=bus_perf)
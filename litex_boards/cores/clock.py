@@ -0,0 +1,276 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from types import SimpleNamespace
+
+from migen import *
+from migen.genlib.cdc import MultiReg, PulseSynchronizer
+from migen.genlib.resetsync import AsyncResetSynchronizer
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+
+# Xilinx Clock Reconfiguration ---------------------------------------------------------------------
+
+class XilinxClockReconfig(LiteXModule):
+    """Runtime frequency reconfiguration of a Xilinx PLL/MMCM (S7PLL, S7MMCM, USMMCM...) through its DRP.
+
+    Must be created after pll.register_clkin (and after pll.reset is driven) and before the
+    pll.create_clkout calls. The DRP is driven from the PLL input clock ("clk_reconfig" domain), never
+    from a clock generated by the PLL itself.
+
+    A reconfiguration applies a table of DRP read-modify-write entries (written = (read & mask) | data)
+    loaded through CSRs. During the sequence, cd (sys) is switched (glitch-free BUFGMUX_CTRL) to the PLL
+    input clock and is kept out of reset, so the SoC (CPU/Bridges) keeps running while the PLL is held in
+    reset, reprogrammed and relocks. cd is switched back once the PLL is locked; when it does not lock
+    before the timeout, error is set and cd stays on the input clock (reprogram a valid configuration
+    to recover). The other PLL outputs are held in reset until lock, as at power-up.
+
+    CSRConstants describe the PLL and its outputs for the host (litex_boards/tools/clk_sweep.py):
+    outputs in fixed keep their nominal frequency (dividers recomputed by the host, ex Ethernet PHY or
+    IDELAYCTRL reference clocks), the other ones are scaled with cd (ratios kept).
+    """
+    def __init__(self, pll, cd="sys", fixed=[], nentries=32, lock_timeout=2**20):
+        assert pll.clkin_freq is not None
+        self.pll      = pll
+        self._cd      = cd
+        self._fixed   = fixed
+        self._clkouts = {}
+
+        self.start       = CSR()
+        self.read        = CSR()
+        self.count       = CSRStorage(bits_for(nentries), description="Number of DRP entries to apply.")
+        self.entry_index = CSRStorage(bits_for(nentries - 1))
+        self.entry_adr   = CSRStorage(7)
+        self.entry_mask  = CSRStorage(16, description="DRP bits to keep.")
+        self.entry_data  = CSRStorage(16, description="DRP bits to set.")
+        self.entry_write = CSR()
+        self.read_adr    = CSRStorage(7)
+        self.read_data   = CSRStatus(16)
+        self.status      = CSRStatus(fields=[
+            CSRField("busy",     size=1, description="Reconfiguration/Read ongoing."),
+            CSRField("error",    size=1, description="PLL did not lock after the last reconfiguration."),
+            CSRField("locked",   size=1, description="PLL locked."),
+            CSRField("fallback", size=1, description=f"{cd} running from the PLL input clock."),
+        ])
+        self.sys_freq    = CSRStatus(32, description="Measured sys clock frequency (Hz, 10ms window).")
+
+        self.clkin_freq = CSRConstant(int(pll.clkin_freq))
+        self.vco_min    = CSRConstant(int(pll.vco_freq_range[0]))
+        self.vco_max    = CSRConstant(int(pll.vco_freq_range[1]))
+        self.pfd_min    = CSRConstant(int(pll.clkin_freq_range[0]))
+        self.mult_min   = CSRConstant(int(pll.clkfbout_mult_frange[0]))
+        self.mult_max   = CSRConstant(int(pll.clkfbout_mult_frange[1] - 1))
+        self.div_max    = CSRConstant(int(pll.divclk_divide_range[1] - 1))
+        self.primitive  = CSRConstant({"S7PLL": 1, "S7MMCM": 2}.get(type(pll).__name__, 0)) # LOCK/FILTER tables.
+
+        # # #
+
+        # Clocking (DRP/Sequencer on the PLL input clock).
+        self.cd_clk_reconfig = ClockDomain(reset_less=True)
+        self.specials += Instance("BUFG", i_I=pll.clkin, o_O=self.cd_clk_reconfig.clk)
+        self.fallback = fallback = Signal()
+
+        # PLL Reset (User reset or Sequencer).
+        drp_reset = Signal()
+        reset     = pll.reset
+        pll.reset = Signal()
+        self.comb += pll.reset.eq(reset | drp_reset)
+
+        # PLL Outputs (Recorded for the host, cd with fallback to the input clock).
+        create_clkout = pll.create_clkout
+        def _create_clkout(_cd, freq, phase=0, **kwargs):
+            n = pll.nclkouts
+            self._clkouts[n] = _cd.name
+            setattr(self, f"clkout{n}_freq",  CSRConstant(int(freq), name=f"clkout{n}_freq"))
+            setattr(self, f"clkout{n}_fixed", CSRConstant(int(_cd.name in fixed), name=f"clkout{n}_fixed"))
+            if _cd.name != cd:
+                return create_clkout(_cd, freq, phase, **kwargs)
+            self.sys_clkout = CSRConstant(n)
+            clkout = Signal()
+            create_clkout(SimpleNamespace(name=_cd.name, clk=clkout), freq, phase, buf=None, with_reset=False)
+            self.specials += [
+                Instance("BUFGMUX_CTRL",
+                    i_I0 = clkout,
+                    i_I1 = ClockSignal("clk_reconfig"),
+                    i_S  = fallback,
+                    o_O  = _cd.clk,
+                ),
+                AsyncResetSynchronizer(_cd, ~pll.locked & ~fallback),
+            ]
+        pll.create_clkout = _create_clkout
+
+        # DRP.
+        den   = Signal()
+        dwe   = Signal()
+        daddr = Signal(7)
+        di    = Signal(16)
+        do    = Signal(16)
+        drdy  = Signal()
+        pll.params.update(
+            i_DCLK  = ClockSignal("clk_reconfig"),
+            i_DEN   = den,
+            i_DWE   = dwe,
+            i_DADDR = daddr,
+            i_DI    = di,
+            o_DO    = do,
+            o_DRDY  = drdy,
+        )
+
+        # Entries (Written from sys, static during the sequence).
+        adrs  = Array(Signal(7)  for _ in range(nentries))
+        masks = Array(Signal(16) for _ in range(nentries))
+        datas = Array(Signal(16) for _ in range(nentries))
+        self.sync += If(self.entry_write.re,
+            adrs[self.entry_index.storage].eq(self.entry_adr.storage),
+            masks[self.entry_index.storage].eq(self.entry_mask.storage),
+            datas[self.entry_index.storage].eq(self.entry_data.storage),
+        )
+
+        # Control/Status (sys <-> clk_reconfig).
+        self.start_ps = start_ps = PulseSynchronizer("sys", "clk_reconfig")
+        self.read_ps  = read_ps  = PulseSynchronizer("sys", "clk_reconfig")
+        self.done_ps  = done_ps  = PulseSynchronizer("clk_reconfig", "sys")
+        busy   = Signal()
+        error  = Signal()
+        locked = Signal()
+        self.specials += MultiReg(pll.locked, locked, "clk_reconfig")
+        self.comb += [
+            start_ps.i.eq(self.start.re & ~busy),
+            read_ps.i.eq(self.read.re & ~busy),
+        ]
+        self.sync += [
+            If(self.start.re | self.read.re,
+                busy.eq(1)
+            ).Elif(done_ps.o,
+                busy.eq(0)
+            )
+        ]
+        self.specials += [
+            MultiReg(error,    self.status.fields.error),
+            MultiReg(locked,   self.status.fields.locked),
+            MultiReg(fallback, self.status.fields.fallback),
+        ]
+        self.comb += self.status.fields.busy.eq(busy)
+
+        # Sequencer.
+        index = Signal(bits_for(nentries))
+        value = Signal(16)
+        timer = Signal(max=lock_timeout + 1)
+        self.fsm = fsm = ClockDomainsRenamer("clk_reconfig")(FSM(reset_state="IDLE"))
+        fsm.act("IDLE",
+            If(start_ps.o,
+                NextValue(index, 0),
+                NextValue(error, 0),
+                NextValue(fallback, 1),
+                NextValue(timer, 64),
+                NextState("SWITCH")
+            ).Elif(read_ps.o,
+                NextState("READ")
+            )
+        )
+        fsm.act("READ",
+            den.eq(1),
+            daddr.eq(self.read_adr.storage),
+            NextState("READ-WAIT")
+        )
+        fsm.act("READ-WAIT",
+            If(drdy,
+                NextValue(self.read_data.status, do),
+                done_ps.i.eq(1),
+                NextState("IDLE")
+            )
+        )
+        # Let cd switch to the input clock before resetting the PLL.
+        fsm.act("SWITCH",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                NextValue(drp_reset, 1),
+                If(self.count.storage == 0,
+                    NextState("RELEASE")
+                ).Else(
+                    NextState("RMW-READ")
+                )
+            )
+        )
+        fsm.act("RMW-READ",
+            den.eq(1),
+            daddr.eq(adrs[index]),
+            NextState("RMW-READ-WAIT")
+        )
+        fsm.act("RMW-READ-WAIT",
+            If(drdy,
+                NextValue(value, (do & masks[index]) | datas[index]),
+                NextState("RMW-WRITE")
+            )
+        )
+        fsm.act("RMW-WRITE",
+            den.eq(1),
+            dwe.eq(1),
+            daddr.eq(adrs[index]),
+            di.eq(value),
+            NextState("RMW-WRITE-WAIT")
+        )
+        fsm.act("RMW-WRITE-WAIT",
+            If(drdy,
+                NextValue(index, index + 1),
+                If(index == (self.count.storage - 1),
+                    NextState("RELEASE")
+                ).Else(
+                    NextState("RMW-READ")
+                )
+            )
+        )
+        fsm.act("RELEASE",
+            NextValue(drp_reset, 0),
+            NextValue(timer, lock_timeout),
+            NextState("LOCK")
+        )
+        fsm.act("LOCK",
+            NextValue(timer, timer - 1),
+            If(locked,
+                NextValue(timer, 1024),
+                NextState("SWITCH-BACK")
+            ).Elif(timer == 0,
+                NextValue(error, 1),
+                done_ps.i.eq(1),
+                NextState("IDLE")
+            )
+        )
+        # Let the PLL outputs settle before switching cd back.
+        fsm.act("SWITCH-BACK",
+            NextValue(timer, timer - 1),
+            If(~locked,
+                NextValue(timer, lock_timeout),
+                NextState("LOCK")
+            ).Elif(timer == 0,
+                NextValue(fallback, 0),
+                done_ps.i.eq(1),
+                NextState("IDLE")
+            )
+        )
+
+        # Sys Clk Frequency Meter (sys cycles during 10ms of the input clock).
+        window  = Signal(max=int(pll.clkin_freq//100))
+        tick    = Signal()
+        counter = Signal(32)
+        self.sync.clk_reconfig += [
+            tick.eq(window == 0),
+            If(window == 0,
+                window.eq(int(pll.clkin_freq//100) - 1)
+            ).Else(
+                window.eq(window - 1)
+            )
+        ]
+        self.tick_ps = tick_ps = PulseSynchronizer("clk_reconfig", "sys")
+        self.comb += tick_ps.i.eq(tick)
+        self.sync += [
+            counter.eq(counter + 1),
+            If(tick_ps.o,
+                self.sys_freq.status.eq(counter*100),
+                counter.eq(0),
+            )
+        ]
@@ -0,0 +1,236 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from types import SimpleNamespace
+
+from migen import *
+from migen.genlib.cdc import PulseSynchronizer, BusSynchronizer
+
+from litex.gen import LiteXModule
+
+from litex.build.generic_platform import Subsignal
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.interconnect.packet import Arbiter
+
+from liteeth.common import eth_phy_description
+from liteeth.mac.gap import LiteEthMACGap
+
+# IOs ----------------------------------------------------------------------------------------------
+
+def rgmii_datapath_io(platform, number, name="eth"):
+    """RGMII data path (without reset/MDIO) of an Ethernet PHY sharing them with another PHY."""
+    for resource in platform.constraint_manager.available:
+        if resource[:2] == (name, number):
+            shared = ["rst_n", "mdio", "mdc"]
+            items  = [item for item in resource[2:] if not (isinstance(item, Subsignal) and item.name in shared)]
+            return [(f"{name}_datapath", number, *items)]
+    raise ValueError(f"No {name}:{number} resource.")
+
+# Ethernet Port Stats ------------------------------------------------------------------------------
+
+class EthernetPortStats(LiteXModule):
+    """Frames/bytes counters of an Ethernet PHY (bytes on the wire, preamble and CRC included)."""
+    def __init__(self, phy, cd="eth"):
+        self.rx_frames = CSRStatus(32, description="Received frames.")
+        self.rx_bytes  = CSRStatus(32, description="Received bytes.")
+        self.tx_frames = CSRStatus(32, description="Transmitted frames.")
+        self.tx_bytes  = CSRStatus(32, description="Transmitted bytes.")
+
+        # # #
+
+        for direction, endpoint in [("rx", phy.source), ("tx", phy.sink)]:
+            domain = f"{cd}_{direction}"
+            frames = Signal(32)
+            nbytes = Signal(32)
+            sync   = getattr(self.sync, domain)
+            sync += If(endpoint.valid & endpoint.ready,
+                nbytes.eq(nbytes + len(endpoint.data)//8),
+                If(endpoint.last,
+                    frames.eq(frames + 1)
+                )
+            )
+            for name, counter in [("frames", frames), ("bytes", nbytes)]:
+                bsync = BusSynchronizer(32, domain, "sys")
+                self.submodules += bsync
+                self.comb += [
+                    bsync.i.eq(counter),
+                    getattr(self, f"{direction}_{name}").status.eq(bsync.o),
+                ]
+
+# Ethernet Cut-Through FIFO ------------------------------------------------------------------------
+
+class EthernetCutThroughFIFO(LiteXModule):
+    """Forwards PHY frames (preamble/CRC included) from a PHY RX domain to a PHY TX domain.
+
+    A frame is forwarded as soon as threshold bytes of it are buffered (or as soon as it is complete
+    when shorter), covering the PHY clocks ppm difference, or buffered entirely when the TX port is
+    busy. Frames overflowing the FIFO are truncated (terminated with error) and counted as drops.
+    """
+    def __init__(self, cd_from, cd_to, depth=2048, threshold=32):
+        self.sink   = sink   = stream.Endpoint(eth_phy_description(8)) # cd_from, no backpressure.
+        self.source = source = stream.Endpoint(eth_phy_description(8)) # cd_to.
+        self.drop   = Signal() # cd_from, end of a dropped/truncated frame.
+        self.frame  = Signal() # cd_to, end of a forwarded frame.
+
+        # # #
+
+        self.fifo = fifo = ClockDomainsRenamer({"write": cd_from, "read": cd_to})(
+            stream.AsyncFIFO(eth_phy_description(8), depth, buffered=True))
+
+        # Write side: one credit per frame, given at threshold bytes or at the end of the frame.
+        count    = Signal(max=threshold + 1)
+        started  = Signal()
+        credited = Signal()
+        credit   = Signal()
+        write    = Signal()
+        self.comb += [
+            sink.ready.eq(1),
+            write.eq(fifo.sink.valid & fifo.sink.ready),
+            credit.eq(write & ~credited & ((count == (threshold - 1)) | fifo.sink.last)),
+        ]
+        sync_from = getattr(self.sync, cd_from)
+        sync_from += [
+            If(write,
+                started.eq(1),
+                If(count != threshold,
+                    count.eq(count + 1)
+                ),
+                If(credit,
+                    credited.eq(1)
+                ),
+                If(fifo.sink.last,
+                    count.eq(0),
+                    started.eq(0),
+                    credited.eq(0),
+                )
+            )
+        ]
+
+        in_frame = Signal()
+        sync_from += If(sink.valid, in_frame.eq(~sink.last))
+
+        self.wfsm = wfsm = ClockDomainsRenamer(cd_from)(FSM(reset_state="COPY"))
+        wfsm.act("COPY",
+            sink.connect(fifo.sink, omit={"ready"}),
+            If(sink.valid & ~fifo.sink.ready,
+                self.drop.eq(sink.last),
+                If(started,
+                    NextState("TERMINATE")
+                ).Elif(~sink.last,
+                    NextState("DROP")
+                )
+            )
+        )
+        wfsm.act("TERMINATE",
+            fifo.sink.valid.eq(1),
+            fifo.sink.last.eq(1),
+            fifo.sink.error.eq(1),
+            self.drop.eq(sink.valid & sink.last),
+            If(fifo.sink.ready,
+                # Resume on the next frame.
+                If(Mux(sink.valid, sink.last, ~in_frame),
+                    NextState("COPY")
+                ).Else(
+                    NextState("DROP")
+                )
+            )
+        )
+        wfsm.act("DROP",
+            self.drop.eq(sink.valid & sink.last),
+            If(sink.valid & sink.last,
+                NextState("COPY")
+            )
+        )
+
+        # Read side.
+        self.credit_ps = credit_ps = PulseSynchronizer(cd_from, cd_to)
+        self.comb += credit_ps.i.eq(credit)
+        credits = Signal(max=depth)
+        take    = Signal()
+        sync_to = getattr(self.sync, cd_to)
+        sync_to += credits.eq(credits + credit_ps.o - take)
+
+        self.rfsm = rfsm = ClockDomainsRenamer(cd_to)(FSM(reset_state="IDLE"))
+        rfsm.act("IDLE",
+            If(credits != 0,
+                take.eq(1),
+                NextState("COPY")
+            )
+        )
+        rfsm.act("COPY",
+            fifo.source.connect(source),
+            If(source.valid & source.ready & source.last,
+                self.frame.eq(1),
+                NextState("IDLE")
+            )
+        )
+
+# Ethernet Forwarder -------------------------------------------------------------------------------
+
+class EthernetForwarder(LiteXModule):
+    """Cut-through forwarding between two Ethernet PHYs (Daisy-chain), with a local port.
+
+    phy0 (upstream) RX is forwarded to phy1 TX and to the local port; phy1 (downstream) RX is
+    forwarded to phy0 TX, merged with the local port frames at frame boundaries. Forwarding is done
+    entirely in hardware.
+
+    The local port is a PHY interface (in phy0 "eth_rx"/"eth_tx" clock domains) for LiteEth
+    MACs/cores, that can be used as a regular PHY.
+    """
+    dw                      = 8
+    integrated_ifg_inserter = True
+    def __init__(self, phy0, phy1, cd0="eth", cd1="eth1", depth=2048, threshold=32):
+        # Clock domains of phy0 for timing constraints (phy0 CRG not added as a submodule).
+        self.crg         = SimpleNamespace(cd_eth_rx=phy0.crg.cd_eth_rx, cd_eth_tx=phy0.crg.cd_eth_tx)
+        self.rx_clk_freq = phy0.rx_clk_freq
+        self.tx_clk_freq = phy0.tx_clk_freq
+        self.sink        = sink   = stream.Endpoint(eth_phy_description(8)) # Local TX.
+        self.source      = source = stream.Endpoint(eth_phy_description(8)) # Local RX.
+
+        self.downstream_frames = CSRStatus(32, description="Frames forwarded downstream (phy0 -> phy1).")
+        self.downstream_drops  = CSRStatus(32, description="Frames dropped downstream (overflow).")
+        self.upstream_frames   = CSRStatus(32, description="Frames forwarded upstream (phy1 -> phy0).")
+        self.upstream_drops    = CSRStatus(32, description="Frames dropped upstream (overflow).")
+
+        # # #
+
+        # Downstream: phy0 RX -> Local RX + phy1 TX.
+        self.downstream = downstream = EthernetCutThroughFIFO(f"{cd0}_rx", f"{cd1}_tx", depth, threshold)
+        self.downstream_gap = downstream_gap = ClockDomainsRenamer(f"{cd1}_tx")(LiteEthMACGap(8))
+        self.comb += [
+            phy0.source.ready.eq(1),
+            phy0.source.connect(source,          omit={"ready"}),
+            phy0.source.connect(downstream.sink, omit={"ready"}),
+            downstream.source.connect(downstream_gap.sink),
+            downstream_gap.source.connect(phy1.sink),
+        ]
+
+        # Upstream: phy1 RX + Local TX -> phy0 TX.
+        self.upstream = upstream = EthernetCutThroughFIFO(f"{cd1}_rx", f"{cd0}_tx", depth, threshold)
+        self.upstream_gap = upstream_gap = ClockDomainsRenamer(f"{cd0}_tx")(LiteEthMACGap(8))
+        self.arbiter = ClockDomainsRenamer(f"{cd0}_tx")(Arbiter([upstream.source, sink], upstream_gap.sink))
+        self.comb += [
+            phy1.source.connect(upstream.sink),
+            upstream_gap.source.connect(phy0.sink),
+        ]
+
+        # Counters.
+        for name, domain, pulse in [
+            ("downstream_frames", f"{cd1}_tx", downstream.frame),
+            ("downstream_drops",  f"{cd0}_rx", downstream.drop),
+            ("upstream_frames",   f"{cd0}_tx", upstream.frame),
+            ("upstream_drops",    f"{cd1}_rx", upstream.drop),
+        ]:
+            counter = Signal(32)
+            sync    = getattr(self.sync, domain)
+            sync += If(pulse, counter.eq(counter + 1))
+            bsync = BusSynchronizer(32, domain, "sys")
+            self.submodules += bsync
+            self.comb += [
+                bsync.i.eq(counter),
+                getattr(self, name).status.eq(bsync.o),
+            ]
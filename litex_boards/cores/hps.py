@@ -0,0 +1,338 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.build import tools
+
+from litex.soc.interconnect import axi
+from litex.soc.interconnect import wishbone
+
+from litex_boards.build.altera_qsys import add_qsys_system
+
+# Cyclone V HPS Configurations ---------------------------------------------------------------------
+
+# 1GB HPS DDR3 (2x MT41K256M16, 32-bit) @ 400MHz on the Terasic Cyclone V SoC boards.
+_ddr3_1gb_x32 = {
+    "MEM_VENDOR"            : "Micron",
+    "MEM_FORMAT"            : "DISCRETE",
+    "MEM_CLK_FREQ"          : "400.0",
+    "REF_CLK_FREQ"          : "25.0",
+    "MEM_DQ_WIDTH"          : "32",
+    "MEM_ROW_ADDR_WIDTH"    : "15",
+    "MEM_COL_ADDR_WIDTH"    : "10",
+    "MEM_BANKADDR_WIDTH"    : "3",
+    "MEM_TCL"               : "7",
+    "MEM_WTCL"              : "7",
+    "MEM_DRV_STR"           : "RZQ/6",
+    "MEM_RTT_NOM"           : "RZQ/6",
+    "MEM_RTT_WR"            : "Dynamic ODT off",
+    "MEM_TINIT_US"          : "500",
+    "MEM_TMRD_CK"           : "4",
+    "MEM_TRAS_NS"           : "35.0",
+    "MEM_TRCD_NS"           : "13.75",
+    "MEM_TRP_NS"            : "13.75",
+    "MEM_TREFI_US"          : "7.8",
+    "MEM_TRFC_NS"           : "260.0",
+    "MEM_TWR_NS"            : "15.0",
+    "MEM_TWTR"              : "4",
+    "MEM_TFAW_NS"           : "30.0",
+    "MEM_TRRD_NS"           : "7.5",
+    "MEM_TRTP_NS"           : "7.5",
+}
+
+# HPS peripherals on the HPS dedicated I/Os (Ethernet, SDCard, UART console, USB OTG).
+_peripherals = {
+    "EMAC1_PinMuxing" : "HPS I/O Set 0",
+    "EMAC1_Mode"      : "RGMII",
+    "SDIO_PinMuxing"  : "HPS I/O Set 0",
+    "SDIO_Mode"       : "4-bit Data",
+    "UART0_PinMuxing" : "HPS I/O Set 0",
+    "UART0_Mode"      : "No Flow Control",
+    "USB1_PinMuxing"  : "HPS I/O Set 0",
+    "USB1_Mode"       : "SDR",
+}
+
+_hps_io = {
+    "emac1" : ["TX_CLK", "TXD0", "TXD1", "TXD2", "TXD3", "RXD0", "RXD1", "RXD2", "RXD3", "MDIO", "MDC",
+               "RX_CTL", "TX_CTL", "RX_CLK"],
+    "sdio"  : ["CMD", "D0", "D1", "D2", "D3", "CLK"],
+    "uart0" : ["RX", "TX"],
+    "usb1"  : ["D0", "D1", "D2", "D3", "D4", "D5", "D6", "D7", "CLK", "STP", "DIR", "NXT"],
+}
+
+_configs = {
+    "5CSEBA6U23I7"     : {"memory" : _ddr3_1gb_x32, "peripherals" : _peripherals}, # DE10-Nano.
+    "5CSEMA5F31C6"     : {"memory" : _ddr3_1gb_x32, "peripherals" : _peripherals}, # DE1-SoC.
+    "5CSXFC6D6F31C8ES" : {"memory" : _ddr3_1gb_x32, "peripherals" : _peripherals}, # SoCKit (Rev B/C).
+    "5CSXFC6D6F31C8"   : {"memory" : _ddr3_1gb_x32, "peripherals" : _peripherals}, # SoCKit (Rev D).
+}
+
+# HPS bridges windows (HPS physical addresses).
+H2F_BASE   = 0xc000_0000
+H2F_SIZE   = 0x3c00_0000
+LWH2F_BASE = 0xff20_0000
+LWH2F_SIZE = 0x0020_0000
+
+_width_codes = {0: 0, 32: 1, 64: 2, 128: 3}
+
+# Cyclone V HPS ------------------------------------------------------------------------------------
+
+class CycloneVHPS(LiteXModule):
+    """Cyclone V HPS (ARM Cortex-A9 Hard Processor System) with its FPGA bridges and F2SDRAM ports.
+
+    The HPS is generated by Platform Designer at build time (qsys-script/qsys-generate are added to
+    the Quartus build script) from a description of the bridges/ports requested here and of the board
+    HPS DDR3/peripherals (selected from the device). HPS DDR3 and HPS I/Os are dedicated pins: they
+    are added as top-level ports without location constraints and their I/O settings are applied by the
+    generated hps_sdram_p0_pin_assignments.tcl after synthesis.
+
+    - add_h2f_master    : HPS -> FPGA bridge (AXI3 master, 1GB window at 0xc0000000 on the HPS).
+    - add_lwh2f_master  : HPS -> FPGA lightweight bridge (AXI3 master, 2MB window at 0xff200000).
+    - add_f2sdram_port  : FPGA -> HPS SDRAM port (AXI3 slave, HPS physical addresses), usable as a
+                          LiteDRAMAXIPort by LiteX DMAs.
+
+    All the interfaces are clocked by clock_domain. The F2SDRAM ports must be released from reset
+    by the HPS software (U-Boot "bridge enable") before being used.
+    """
+    def __init__(self, platform, clock_domain="sys"):
+        assert platform.device in _configs.keys()
+        self.platform      = platform
+        self.clock_domain  = clock_domain
+        self.config        = _configs[platform.device]
+        self.h2f_width     = 0
+        self.h2f_base      = None
+        self.lwh2f         = False
+        self.lwh2f_base    = None
+        self.f2sdram_ports = []
+        self.h2f_rst_n     = Signal()
+
+        # # #
+
+        self.hps_params = dict(o_h2f_reset_reset_n=self.h2f_rst_n)
+
+        # HPS DDR3 / HPS I/Os (Dedicated pins).
+        memory    = self.config["memory"]
+        dq_width  = int(memory["MEM_DQ_WIDTH"])
+        self.ios  = ios = []
+        for name, width, direction in [
+            ("mem_a",       int(memory["MEM_ROW_ADDR_WIDTH"]), "o"),
+            ("mem_ba",      int(memory["MEM_BANKADDR_WIDTH"]), "o"),
+            ("mem_ck",      1,            "o"),
+            ("mem_ck_n",    1,            "o"),
+            ("mem_cke",     1,            "o"),
+            ("mem_cs_n",    1,            "o"),
+            ("mem_ras_n",   1,            "o"),
+            ("mem_cas_n",   1,            "o"),
+            ("mem_we_n",    1,            "o"),
+            ("mem_reset_n", 1,            "o"),
+            ("mem_dq",      dq_width,     "io"),
+            ("mem_dqs",     dq_width//8,  "io"),
+            ("mem_dqs_n",   dq_width//8,  "io"),
+            ("mem_odt",     1,            "o"),
+            ("mem_dm",      dq_width//8,  "o"),
+            ("oct_rzqin",   1,            "i"),
+            ]:
+            s = Signal(width, name=f"hps_memory_{name}")
+            self.hps_params[f"{direction}_memory_{name}"] = s
+            ios.append(s)
+        for peripheral, pins in _hps_io.items():
+            for pin in pins:
+                s = Signal(name=f"hps_io_{peripheral}_{pin.lower()}")
+                self.hps_params[f"io_hps_io_hps_io_{peripheral}_inst_{pin}"] = s
+                ios.append(s)
+
+    # Bridges/Ports --------------------------------------------------------------------------------
+
+    def _add_axi(self, name, axi_if, master, address_width):
+        # HPS AXI3 ports exported as <name>_<signal>, master: HPS is the initiator.
+        o, i = ("o", "i") if master else ("i", "o")
+        for channel, direction in [("aw", o), ("w", o), ("b", i), ("ar", o), ("r", i)]:
+            ep = getattr(axi_if, channel)
+            ready = {"o": "i", "i": "o"}[direction]
+            self.hps_params[f"{direction}_{name}_{channel}valid"] = ep.valid
+            self.hps_params[f"{ready}_{name}_{channel}ready"]     = ep.ready
+            for field in {
+                "aw" : ["id", "addr", "len", "size", "burst", "lock", "cache", "prot"],
+                "ar" : ["id", "addr", "len", "size", "burst", "lock", "cache", "prot"],
+                "w"  : ["id", "data", "strb", "last"],
+                "b"  : ["id", "resp"],
+                "r"  : ["id", "data", "resp", "last"],
+            }[channel]:
+                signal = getattr(ep, field)
+                if field == "addr":
+                    signal = signal[:address_width]
+                self.hps_params[f"{direction}_{name}_{channel}{field}"] = signal
+        self.hps_params[f"i_{name}_clock_clk"] = ClockSignal(self.clock_domain)
+
+    def add_h2f_master(self, data_width=64, base=0x4000_0000):
+        """HPS -> FPGA bridge, the 1GB window is mapped at base on the returned AXI interface."""
+        assert self.h2f_width == 0
+        assert data_width in [32, 64, 128]
+        assert base % 2**30 == 0
+        self.h2f_width = data_width
+        self.h2f_base  = base
+        axi_if = axi.AXIInterface(data_width=data_width, address_width=32, id_width=12, version="axi3",
+            clock_domain=self.clock_domain)
+        self._add_axi("h2f_axi", axi_if, master=True, address_width=30)
+        for ch in [axi_if.aw, axi_if.ar]:
+            self.comb += ch.addr[30:].eq(base >> 30)
+        return axi_if
+
+    def add_lwh2f_master(self, base=0xf000_0000):
+        """HPS -> FPGA lightweight bridge, the 2MB window is mapped at base on the returned AXI interface."""
+        assert not self.lwh2f
+        assert base % 2**21 == 0
+        self.lwh2f      = True
+        self.lwh2f_base = base
+        axi_if = axi.AXIInterface(data_width=32, address_width=32, id_width=12, version="axi3",
+            clock_domain=self.clock_domain)
+        self._add_axi("h2f_lw_axi", axi_if, master=True, address_width=21)
+        for ch in [axi_if.aw, axi_if.ar]:
+            self.comb += ch.addr[21:].eq(base >> 21)
+        return axi_if
+
+    def add_f2sdram_port(self, data_width=128):
+        """FPGA -> HPS SDRAM port (HPS physical byte addresses)."""
+        from litedram.frontend.axi import LiteDRAMAXIPort
+        assert data_width in [32, 64, 128, 256]
+        n = len(self.f2sdram_ports)
+        port = LiteDRAMAXIPort(data_width=data_width, address_width=32, id_width=8, version="axi3",
+            clock_domain=self.clock_domain)
+        self._add_axi(f"f2h_sdram{n}_data", port, master=False, address_width=32)
+        self.f2sdram_ports.append(port)
+        return port
+
+    # Platform Designer ----------------------------------------------------------------------------
+
+    def get_qsys_tcl(self):
+        tcl = []
+        tcl.append("package require -exact qsys 16.1")
+        tcl.append("create_system hps")
+        tcl.append("set_project_property DEVICE_FAMILY {Cyclone V}")
+        tcl.append(f"set_project_property DEVICE {{{self.platform.device}}}")
+        tcl.append("add_instance hps_0 altera_hps")
+        params = {
+            "MPU_EVENTS_Enable" : "false",
+            "S2F_Width"         : str(_width_codes[self.h2f_width]),
+            "F2S_Width"         : "0",
+            "LWH2F_Enable"      : "true" if self.lwh2f else "false",
+            "F2SDRAM_Type"      : " ".join("AXI-3" for _ in self.f2sdram_ports),
+            "F2SDRAM_Width"     : " ".join(str(p.data_width) for p in self.f2sdram_ports),
+        }
+        params.update(self.config["peripherals"])
+        params.update(self.config["memory"])
+        for k, v in params.items():
+            tcl.append(f"set_instance_parameter_value hps_0 {{{k}}} {{{v}}}")
+
+        # Exported interfaces.
+        exports = [
+            ("memory",    "conduit", "end",    "memory"),
+            ("hps_io",    "conduit", "end",    "hps_io"),
+            ("h2f_reset", "reset",   "source", "h2f_reset"),
+        ]
+        if self.h2f_width:
+            exports += [
+                ("h2f_axi_clock",  "clock", "sink",  "h2f_axi_clock"),
+                ("h2f_axi",        "axi",   "start", "h2f_axi_master"),
+            ]
+        if self.lwh2f:
+            exports += [
+                ("h2f_lw_axi_clock", "clock", "sink",  "h2f_lw_axi_clock"),
+                ("h2f_lw_axi",       "axi",   "start", "h2f_lw_axi_master"),
+            ]
+        for n in range(len(self.f2sdram_ports)):
+            exports += [
+                (f"f2h_sdram{n}_data_clock", "clock", "sink", f"f2h_sdram{n}_clock"),
+                (f"f2h_sdram{n}_data",       "axi",   "end",  f"f2h_sdram{n}_data"),
+            ]
+        for name, kind, direction, interface in exports:
+            tcl.append(f"add_interface {name} {kind} {direction}")
+            tcl.append(f"set_interface_property {name} EXPORT_OF hps_0.{interface}")
+        tcl.append("save_system hps.qsys")
+        return "\n".join(tcl) + "\n"
+
+    def get_linux_header(self):
+        h = []
+        h.append("#ifndef __GENERATED_HPS_H")
+        h.append("#define __GENERATED_HPS_H")
+        h.append("")
+        h.append("/* HPS -> FPGA bridges (HPS physical addresses, /dev/mem or UIO mappings). */")
+        if self.h2f_width:
+            h.append(f"#define HPS_H2F_BASE    0x{H2F_BASE:08x}L /* LiteX bus 0x{self.h2f_base:08x}. */")
+            h.append(f"#define HPS_H2F_SIZE    0x{H2F_SIZE:08x}L")
+            h.append(f"#define HPS_LITEX_BUS_PHYS(addr) (HPS_H2F_BASE + ((addr) - 0x{self.h2f_base:08x}L))")
+        if self.lwh2f:
+            h.append(f"#define HPS_LWH2F_BASE  0x{LWH2F_BASE:08x}L /* LiteX bus 0x{self.lwh2f_base:08x}. */")
+            h.append(f"#define HPS_LWH2F_SIZE  0x{LWH2F_SIZE:08x}L")
+            h.append(f"#define HPS_LITEX_CSR_PHYS(addr) (HPS_LWH2F_BASE + ((addr) - 0x{self.lwh2f_base:08x}L))")
+        h.append("")
+        h.append("/* FPGA -> HPS SDRAM ports (HPS physical addresses, buffers to reserve from Linux). */")
+        h.append(f"#define HPS_F2SDRAM_PORTS {len(self.f2sdram_ports)}")
+        for n, port in enumerate(self.f2sdram_ports):
+            h.append(f"#define HPS_F2SDRAM{n}_DATA_WIDTH {port.data_width}")
+        h.append("")
+        h.append("#endif")
+        return "\n".join(h) + "\n"
+
+    # Finalize -------------------------------------------------------------------------------------
+
+    def do_finalize(self):
+        platform = self.platform
+        self.specials += Instance("hps", **self.hps_params)
+
+        # HPS dedicated pins: top-level ports without location constraints.
+        cm     = platform.constraint_manager
+        get_io = cm.get_io_signals
+        cm.get_io_signals = lambda: get_io() | set(self.ios)
+
+        # Generate HPS with Platform Designer before synthesis, apply HPS DDR3 I/O settings after.
+        add_qsys_system(platform, "hps", self.get_qsys_tcl(),
+            pin_assignments = "hps_sdram_p0_pin_assignments.tcl")
+
+        # Linux header (With the other generated headers).
+        if platform.output_dir is not None:
+            path = os.path.join(platform.output_dir, "software", "include", "generated")
+            os.makedirs(path, exist_ok=True)
+            tools.write_to_file(os.path.join(path, "hps.h"), self.get_linux_header())
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def add_hps(soc, name="hps", h2f_width=64, f2sdram_ports=1, f2sdram_width=128, with_f2sdram_bist=True):
+    """Add the Cyclone V HPS to a SoC.
+
+    H2F/LWH2F bridges are added as Bus masters (main_ram/CSRs windows) and F2SDRAM ports
+    (soc.<name>.f2sdram_ports) are available to LiteX DMAs, the first one with a BIST used as
+    bandwidth test (litex_boards/tools/hps_bench.py).
+    """
+    hps = CycloneVHPS(soc.platform)
+    soc.add_module(name=name, module=hps)
+
+    # H2F -> main_ram window (or first 1GB when no main_ram).
+    h2f_base = soc.mem_map.get("main_ram", 0)
+    h2f      = hps.add_h2f_master(data_width=h2f_width, base=h2f_base)
+    h2f_wb   = wishbone.Interface(data_width=h2f_width, adr_width=32 - log2_int(h2f_width//8))
+    soc.submodules += axi.AXI2Wishbone(axi=h2f, wishbone=h2f_wb)
+    soc.bus.add_master(name=f"{name}_h2f", master=h2f_wb)
+
+    # LWH2F -> CSRs window.
+    lwh2f    = hps.add_lwh2f_master(base=soc.mem_map["csr"])
+    lwh2f_wb = wishbone.Interface(data_width=32)
+    soc.submodules += axi.AXI2Wishbone(axi=lwh2f, wishbone=lwh2f_wb)
+    soc.bus.add_master(name=f"{name}_lwh2f", master=lwh2f_wb)
+
+    # F2SDRAM.
+    for i in range(f2sdram_ports):
+        hps.add_f2sdram_port(data_width=f2sdram_width)
+    if with_f2sdram_bist and f2sdram_ports:
+        from litedram.frontend.bist import LiteDRAMBISTGenerator, LiteDRAMBISTChecker
+        soc.add_module(name=f"{name}_f2sdram_generator", module=LiteDRAMBISTGenerator(hps.f2sdram_ports[0]))
+        soc.add_module(name=f"{name}_f2sdram_checker",   module=LiteDRAMBISTChecker(hps.f2sdram_ports[0]))
+
+    return hps
@@ -0,0 +1,604 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.build.generic_platform import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+# HUB75 LED-panel output.
+#
+# Frames are stored in SDRAM in scan order (one 32-bit 0x00BBGGRR word per pixel):
+#
+#   for row in range(rows):          # Scan rows (panel height/2).
+#       for x in range(width):       # Columns (panels width * chained panels).
+#           for chain in range(nchains):
+#               pixel(chain, x, row)           # Upper half.
+#               pixel(chain, x, row + rows)    # Lower half.
+#
+# so that each scan row is a single linear SDRAM read. Rows are gamma-corrected while loaded into
+# a double-buffered line buffer and displayed with Binary-Coded-Modulation: bit-plane b is shifted
+# out to all the chains in parallel and displayed for bcm_base << b cycles, the next bit-plane being
+# shifted during the display of the current one.
+
+# IOs ----------------------------------------------------------------------------------------------
+
+def hub75_connector_io(connectors, iostandard="LVCMOS33"):
+    """HUB75 control/chains IOs from Colorlight receiver cards connectors.
+
+    Connectors pinout: R0 G0 B0 - R1 G1 B1 E A B C D CLK STB OE -, control signals are shared by all
+    the connectors and taken from the first one.
+    """
+    control = connectors[0]
+    io = [
+        ("hub75_control", 0,
+            # bank select (a, b, c, d, e)
+            Subsignal("bank", Pins(" ".join(f"{control}:{n}" for n in [8, 9, 10, 11, 7]))),
+            Subsignal("oe",   Pins(f"{control}:14")),
+            Subsignal("stb",  Pins(f"{control}:13")),
+            Subsignal("clk",  Pins(f"{control}:12")),
+            IOStandard(iostandard),
+        ),
+    ]
+    for i, connector in enumerate(connectors):
+        io.append(("hub75_chain", i,
+            Subsignal("r", Pins(f"{connector}:0 {connector}:4")),
+            Subsignal("g", Pins(f"{connector}:1 {connector}:5")),
+            Subsignal("b", Pins(f"{connector}:2 {connector}:6")),
+            IOStandard(iostandard),
+        ))
+    return io
+
+def hub75_pmod_io(control, chains, iostandard="LVCMOS33"):
+    """HUB75 control/chains IOs on PMODs (Dual-PMOD HUB75 adapters).
+
+    Control PMOD: A B C D CLK STB OE E, Chain PMODs: R0 G0 B0 - R1 G1 B1 -.
+    """
+    io = [
+        ("hub75_control", 0,
+            # bank select (a, b, c, d, e)
+            Subsignal("bank", Pins(f"{control}:0 {control}:1 {control}:2 {control}:3 {control}:7")),
+            Subsignal("oe",   Pins(f"{control}:6")),
+            Subsignal("stb",  Pins(f"{control}:5")),
+            Subsignal("clk",  Pins(f"{control}:4")),
+            IOStandard(iostandard),
+        ),
+    ]
+    for i, pmod in enumerate(chains):
+        io.append(("hub75_chain", i,
+            Subsignal("r", Pins(f"{pmod}:0 {pmod}:4")),
+            Subsignal("g", Pins(f"{pmod}:1 {pmod}:5")),
+            Subsignal("b", Pins(f"{pmod}:2 {pmod}:6")),
+            IOStandard(iostandard),
+        ))
+    return io
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def hub75_gamma_table(gamma, depth):
+    """8-bit to depth-bit gamma correction table."""
+    return [int(round(((i/255)**gamma)*(2**depth - 1))) for i in range(256)]
+
+def hub75_bcm_base(sys_clk_freq, refresh_rate, rows, width, depth, clk_div=1, blank=4):
+    """Largest BCM LSB display time (in sys_clk cycles) reaching refresh_rate.
+
+    The display time of a bit-plane is at least the shift time of the next one, so the refresh rate
+    is bounded by rows*depth*shift time whatever bcm_base.
+    """
+    row_cycles = sys_clk_freq/(refresh_rate*rows)
+    shift      = 2*clk_div*width + blank + clk_div + 2
+    # With the k LSB bit-planes displayed for the shift time (bcm_base << k >= shift > bcm_base <<
+    # (k - 1)), a row takes k*shift + bcm_base*(2**depth - 2**k) cycles: take the largest bcm_base
+    # in the range of the smallest k.
+    for k in range(depth + 1):
+        bcm_min = -(-shift >> k) if k < depth else 1
+        bcm_max = 2**16 - 1 if k == 0 else min(2**16 - 1, -(-shift >> (k - 1)) - 1)
+        if k < depth:
+            bcm_max = min(bcm_max, int((row_cycles - k*shift)//(2**depth - 2**k)))
+        elif depth*shift > row_cycles:
+            break
+        if bcm_max >= bcm_min:
+            return bcm_max
+    return 1
+
+# HUB75 Scanner ------------------------------------------------------------------------------------
+
+class HUB75Scanner(LiteXModule):
+    """Scans HUB75 chains in parallel from a double-buffered, gamma-corrected line buffer.
+
+    Rows are requested on request (row) and pixels received on sink (width*2*nchains words per row,
+    in scan order). A row not loaded when the previous one has been displayed is an underrun: the
+    panels stay blanked until it is loaded.
+    """
+    def __init__(self, control_pads, chain_pads, max_width=256, depth=8, gamma=2.2,
+        width    = 128,
+        rows     = 16,
+        bcm_base = 16,
+        clk_div  = 1,
+        blank    = 4):
+        nchains   = len(chain_pads)
+        npixels   = 2*nchains
+        bank_bits = len(control_pads.bank)
+        assert rows <= 2**bank_bits
+        assert width <= max_width
+
+        self.request = request = stream.Endpoint([("row", bank_bits)])
+        self.sink    = sink    = stream.Endpoint([("data", 32)])
+
+        self.enable         = CSRStorage(reset=1, description="Panels output enable.")
+        self.width          = CSRStorage(bits_for(max_width), reset=width, description="Columns per chain.")
+        self.rows           = CSRStorage(bank_bits + 1, reset=rows, description="Scan rows (panel height/2).")
+        self.bit_depth      = CSRStorage(bits_for(depth), reset=depth, description=f"Displayed bit-planes (MSBs, max {depth}).")
+        self.bcm_base       = CSRStorage(16, reset=bcm_base, description="LSB bit-plane display time (in sys_clk cycles).")
+        self.clk_div        = CSRStorage(8, reset=clk_div, description="Panels clock half period (in sys_clk cycles, >= 1).")
+        self.blank          = CSRStorage(8, reset=blank, description="Blanking time before latch/row change (in sys_clk cycles).")
+        self.underruns      = CSRStatus(32, description="Row underruns.")
+        self.refreshes      = CSRStatus(32, description="Refreshes (full scans).")
+        self.refresh_period = CSRStatus(32, description="Refresh period (in sys_clk cycles).")
+
+        # # #
+
+        # Line Buffer (2 rows, one word per column: nchains * 2 halfs * RGB * depth bits).
+        xbits = bits_for(max_width - 1)
+        mem = Memory(npixels*3*depth, 2*2**xbits)
+        wrport = mem.get_port(write_capable=True)
+        rdport = mem.get_port()
+        self.specials += mem, wrport, rdport
+        full      = Signal(2)
+        full_set  = Signal(2)
+        full_clr  = Signal(2)
+        self.sync += full.eq((full | full_set) & ~full_clr)
+
+        # Loader -----------------------------------------------------------------------------------
+
+        # Gamma correction.
+        gamma_mem   = Memory(depth, 256, init=hub75_gamma_table(gamma, depth))
+        gamma_ports = [gamma_mem.get_port() for _ in range(3)]
+        self.specials += gamma_mem, *gamma_ports
+        for i, port in enumerate(gamma_ports):
+            self.comb += port.adr.eq(sink.data[8*i:8*(i+1)])
+
+        ld_buf = Signal()
+        ld_row = Signal(bank_bits)
+        ld_x   = Signal(bits_for(max_width))
+        ld_k   = Signal(bits_for(npixels))
+
+        # Pixels pipeline (Gamma LUT latency), columns written on their last pixel.
+        p_valid  = Signal()
+        p_last   = Signal()
+        p_x      = Signal(xbits)
+        column   = Signal(npixels*3*depth)
+        rgb      = Cat(*[port.dat_r for port in gamma_ports])
+        self.comb += [
+            wrport.adr.eq(Cat(p_x, ld_buf)),
+            wrport.dat_w.eq(Cat(column[3*depth:], rgb)),
+        ]
+        self.sync += If(p_valid,
+            column.eq(Cat(column[3*depth:], rgb))
+        )
+        self.comb += wrport.we.eq(p_valid & p_last)
+
+        self.loader = loader = FSM(reset_state="IDLE")
+        loader.act("IDLE",
+            If(~full[0] & ~ld_buf | ~full[1] & ld_buf,
+                request.valid.eq(1),
+                request.row.eq(ld_row),
+                If(request.ready,
+                    NextValue(ld_x, 0),
+                    NextValue(ld_k, 0),
+                    NextState("LOAD")
+                )
+            )
+        )
+        loader.act("LOAD",
+            sink.ready.eq(1),
+            If(sink.valid,
+                NextValue(p_valid, 1),
+                NextValue(p_last,  ld_k == (npixels - 1)),
+                NextValue(p_x,     ld_x),
+                NextValue(ld_k,    ld_k + 1),
+                If(ld_k == (npixels - 1),
+                    NextValue(ld_k, 0),
+                    NextValue(ld_x, ld_x + 1),
+                    If(ld_x == (self.width.storage - 1),
+                        NextState("DONE")
+                    )
+                )
+            ).Else(
+                NextValue(p_valid, 0)
+            )
+        )
+        loader.act("DONE",
+            NextValue(p_valid, 0),
+            full_set.eq(Mux(ld_buf, 0b10, 0b01)),
+            NextValue(ld_buf, ~ld_buf),
+            NextValue(ld_row, ld_row + 1),
+            If(ld_row == (self.rows.storage - 1),
+                NextValue(ld_row, 0)
+            ),
+            NextState("IDLE")
+        )
+
+        # Display ----------------------------------------------------------------------------------
+
+        disp_buf    = Signal()
+        disp_row    = Signal(bank_bits)
+        addr        = Signal(bank_bits)
+        plane       = Signal(bits_for(depth))
+        first_plane = Signal(bits_for(depth))
+        x           = Signal(bits_for(max_width))
+        timer       = Signal(8)
+        started     = Signal()
+        waiting     = Signal()
+        load        = Signal()
+        clk         = Signal()
+        stb         = Signal()
+        r           = [Signal(2) for _ in range(nchains)]
+        g           = [Signal(2) for _ in range(nchains)]
+        b           = [Signal(2) for _ in range(nchains)]
+        self.comb += [
+            first_plane.eq(depth - self.bit_depth.storage),
+            rdport.adr.eq(Cat(x[:xbits], disp_buf)),
+        ]
+
+        # Bit-plane extraction from the line buffer.
+        def field(n, color):
+            return rdport.dat_r[(3*n + color)*depth:(3*n + color + 1)*depth] >> plane
+        for n in range(nchains):
+            self.sync += If(load,
+                r[n].eq(Cat(field(2*n + 0, 0)[0], field(2*n + 1, 0)[0])),
+                g[n].eq(Cat(field(2*n + 0, 1)[0], field(2*n + 1, 1)[0])),
+                b[n].eq(Cat(field(2*n + 0, 2)[0], field(2*n + 1, 2)[0])),
+            )
+        self.sync += If(load, x.eq(x + 1))
+
+        # BCM Output Enable timer.
+        oe_timer = Signal(16 + depth)
+        oe_start = Signal()
+        self.sync += [
+            If(oe_start,
+                oe_timer.eq(self.bcm_base.storage << (plane - first_plane))
+            ).Elif(oe_timer != 0,
+                oe_timer.eq(oe_timer - 1)
+            )
+        ]
+
+        # Refresh rate.
+        period  = Signal(32)
+        refresh = Signal()
+        self.sync += [
+            period.eq(period + 1),
+            If(refresh,
+                period.eq(1),
+                self.refreshes.status.eq(self.refreshes.status + 1),
+                self.refresh_period.status.eq(period),
+            )
+        ]
+
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(Mux(disp_buf, full[1], full[0]),
+                NextValue(waiting, 0),
+                NextValue(plane, first_plane),
+                NextValue(x, 0),
+                NextState("PREFETCH")
+            ).Elif(started & ~waiting,
+                NextValue(waiting, 1),
+                NextValue(self.underruns.status, self.underruns.status + 1)
+            )
+        )
+        fsm.act("PREFETCH",
+            NextState("LOAD")
+        )
+        fsm.act("LOAD",
+            load.eq(1),
+            NextValue(timer, self.clk_div.storage - 1),
+            NextState("SETUP")
+        )
+        fsm.act("SETUP",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                NextValue(timer, self.clk_div.storage - 1),
+                NextState("CLOCK")
+            )
+        )
+        fsm.act("CLOCK",
+            clk.eq(1),
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                If(x == self.width.storage,
+                    NextState("WAIT")
+                ).Else(
+                    load.eq(1),
+                    NextValue(timer, self.clk_div.storage - 1),
+                    NextState("SETUP")
+                )
+            )
+        )
+        fsm.act("WAIT",
+            NextValue(timer, self.blank.storage),
+            If(oe_timer == 0,
+                NextState("BLANK")
+            )
+        )
+        fsm.act("BLANK",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                NextValue(timer, self.clk_div.storage),
+                NextValue(addr, disp_row),
+                NextState("LATCH")
+            )
+        )
+        fsm.act("LATCH",
+            stb.eq(1),
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                oe_start.eq(1),
+                NextValue(x, 0),
+                NextValue(plane, plane + 1),
+                NextState("PREFETCH"),
+                If(plane == (depth - 1),
+                    NextValue(started, 1),
+                    full_clr.eq(Mux(disp_buf, 0b10, 0b01)),
+                    NextValue(disp_buf, ~disp_buf),
+                    NextValue(disp_row, disp_row + 1),
+                    If(disp_row == (self.rows.storage - 1),
+                        refresh.eq(1),
+                        NextValue(disp_row, 0)
+                    ),
+                    NextState("IDLE")
+                )
+            )
+        )
+
+        # Pads.
+        self.sync += [
+            control_pads.bank.eq(addr),
+            control_pads.clk.eq(clk),
+            control_pads.stb.eq(stb),
+            control_pads.oe.eq(~((oe_timer != 0) & self.enable.storage)), # Active low.
+        ]
+        for n, pads in enumerate(chain_pads):
+            self.sync += [
+                pads.r.eq(r[n]),
+                pads.g.eq(g[n]),
+                pads.b.eq(b[n]),
+            ]
+
+# HUB75 Frame Reader -------------------------------------------------------------------------------
+
+class HUB75FrameReader(LiteXModule):
+    """Reads the requested rows from the front framebuffer in SDRAM (LiteDRAM native port).
+
+    The framebuffers are swapped (on swap or swap_request) on the next refresh, to avoid tearing.
+    """
+    def __init__(self, port, row_bits, base0=0, base1=0):
+        from litedram.frontend.dma import LiteDRAMDMAReader
+
+        self.request      = request = stream.Endpoint([("row", row_bits)])
+        self.source       = source  = stream.Endpoint([("data", port.data_width)])
+        self.row_words    = Signal(32)
+        self.swap_request = Signal()
+        self.back_base    = Signal(port.address_width)
+
+        self.base0 = CSRStorage(32, reset=base0, description="Framebuffer 0 base (byte offset in SDRAM).")
+        self.base1 = CSRStorage(32, reset=base1, description="Framebuffer 1 base (byte offset in SDRAM).")
+        self.front = CSRStatus(description="Displayed Framebuffer.")
+        self.swap  = CSR()
+        self.swaps = CSRStatus(32, description="Framebuffer swaps.")
+
+        # # #
+
+        shift = log2_int(port.data_width//8)
+        base0 = self.base0.storage[shift:]
+        base1 = self.base1.storage[shift:]
+        front = self.front.status
+
+        # Swap.
+        swap_pending = Signal()
+        swap         = Signal()
+        self.sync += [
+            If(self.swap.re | self.swap_request,
+                swap_pending.eq(1)
+            ),
+            If(swap,
+                swap_pending.eq(0),
+                front.eq(~front),
+                self.swaps.status.eq(self.swaps.status + 1),
+            )
+        ]
+        self.comb += self.back_base.eq(Mux(front, base0, base1))
+
+        # DMA.
+        self.dma = dma = LiteDRAMDMAReader(port, fifo_depth=32, fifo_buffered=True)
+        self.comb += dma.source.connect(source)
+
+        row_base = Signal(port.address_width)
+        offset   = Signal(32)
+        self.comb += dma.sink.address.eq(row_base + offset)
+
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            request.ready.eq(1),
+            If(request.valid,
+                NextValue(offset, 0),
+                NextValue(row_base, row_base + self.row_words),
+                If(request.row == 0,
+                    swap.eq(swap_pending),
+                    NextValue(row_base, Mux(front ^ swap_pending, base1, base0))
+                ),
+                NextState("READ")
+            )
+        )
+        fsm.act("READ",
+            dma.sink.valid.eq(1),
+            If(dma.sink.ready,
+                NextValue(offset, offset + 1),
+                If(offset == (self.row_words - 1),
+                    NextState("IDLE")
+                )
+            )
+        )
+
+# HUB75 UDP Receiver -------------------------------------------------------------------------------
+
+class HUB75UDPReceiver(LiteXModule):
+    """Writes frames received over UDP to the back framebuffer in SDRAM (LiteDRAM native port).
+
+    Packets: 32-bit offset (in pixels), 32-bit flags (bit 0: swap framebuffers after this packet)
+    then pixels (0x00BBGGRR, little-endian). Pixels outside the framebuffer are dropped.
+    """
+    def __init__(self, port):
+        from litedram.frontend.dma import LiteDRAMDMAWriter
+        from liteeth.common import eth_udp_user_description
+
+        self.sink         = sink = stream.Endpoint(eth_udp_user_description(32))
+        self.back_base    = Signal(port.address_width)
+        self.frame_words  = Signal(32)
+        self.swap_request = Signal()
+
+        self.packets = CSRStatus(32, description="Received packets.")
+        self.frames  = CSRStatus(32, description="Received frames.")
+        self.drops   = CSRStatus(32, description="Dropped pixels (outside of the framebuffer).")
+
+        # # #
+
+        offset = Signal(32)
+        flags  = Signal(32)
+
+        self.dma = dma = LiteDRAMDMAWriter(port, fifo_depth=32, fifo_buffered=True)
+        self.comb += [
+            dma.sink.address.eq(self.back_base + offset),
+            dma.sink.data.eq(sink.data),
+        ]
+
+        eof  = Signal()
+        swap = Signal()
+        self.comb += self.swap_request.eq(eof & swap)
+        self.sync += If(eof,
+            self.packets.status.eq(self.packets.status + 1),
+            If(self.swap_request,
+                self.frames.status.eq(self.frames.status + 1)
+            )
+        )
+
+        self.fsm = fsm = FSM(reset_state="OFFSET")
+        fsm.act("OFFSET",
+            sink.ready.eq(1),
+            If(sink.valid & ~sink.last,
+                NextValue(offset, sink.data),
+                NextState("FLAGS")
+            )
+        )
+        fsm.act("FLAGS",
+            sink.ready.eq(1),
+            If(sink.valid,
+                NextValue(flags, sink.data),
+                If(sink.last,
+                    eof.eq(1),
+                    swap.eq(sink.data[0]),
+                    NextState("OFFSET")
+                ).Else(
+                    NextState("DATA")
+                )
+            )
+        )
+        fsm.act("DATA",
+            If(offset < self.frame_words,
+                dma.sink.valid.eq(sink.valid),
+                sink.ready.eq(dma.sink.ready)
+            ).Else(
+                sink.ready.eq(1),
+                If(sink.valid,
+                    NextValue(self.drops.status, self.drops.status + 1)
+                )
+            ),
+            If(sink.valid & sink.ready,
+                NextValue(offset, offset + 1),
+                If(sink.last,
+                    eof.eq(1),
+                    swap.eq(flags[0]),
+                    NextState("OFFSET")
+                )
+            )
+        )
+
+# HUB75 --------------------------------------------------------------------------------------------
+
+def add_hub75(soc, name="hub75", control_pads=None, chain_pads=[], ethphy=None, ip_address="192.168.1.50", udp_port=6000,
+    width        = 128,
+    rows         = 16,
+    depth        = 8,
+    gamma        = 2.2,
+    refresh_rate = 400,
+    clk_div      = 1):
+    """Add a HUB75 LED-panel output to a SoC: UDP -> SDRAM framebuffers -> Scanner -> Panels.
+
+    Frames are received over UDP on the Etherbone UDP/IP core when present, else on a dedicated
+    UDP/IP core created on ethphy. The framebuffers are placed at the top of the SDRAM and removed
+    from main_ram (still decoded, so shared with the CPU: writes from the CPU should flush the L2
+    cache).
+    """
+    from liteeth.core import LiteEthUDPIPCore
+
+    nchains     = len(chain_pads)
+    frame_bytes = 4*rows*width*2*nchains
+    main_ram    = soc.bus.regions["main_ram"]
+    sdram_size  = main_ram.size
+    bcm_base    = hub75_bcm_base(soc.sys_clk_freq, refresh_rate, rows, width, depth, clk_div)
+
+    # Framebuffers (reserved at the top of main_ram).
+    assert 2*frame_bytes < sdram_size
+    main_ram.size = sdram_size - 2*frame_bytes
+
+    # Scanner.
+    scanner = HUB75Scanner(control_pads, chain_pads, max_width=max(256, width), depth=depth, gamma=gamma,
+        width    = width,
+        rows     = rows,
+        bcm_base = bcm_base,
+        clk_div  = clk_div,
+    )
+    soc.add_module(name=name, module=scanner)
+
+    # Frame Reader.
+    reader = HUB75FrameReader(soc.sdram.crossbar.get_port(mode="read", data_width=32),
+        row_bits = len(control_pads.bank),
+        base0    = sdram_size - 2*frame_bytes,
+        base1    = sdram_size - 1*frame_bytes,
+    )
+    soc.add_module(name=f"{name}_reader", module=reader)
+
+    # UDP Receiver.
+    if hasattr(soc, "ethcore_etherbone"):
+        ethcore = soc.ethcore_etherbone
+        assert ethcore.udp.crossbar.dw == 32, "Etherbone data_width must be 32."
+    else:
+        ethcore = LiteEthUDPIPCore(ethphy,
+            mac_address       = 0x10e2d5000002,
+            ip_address        = ip_address,
+            clk_freq          = soc.sys_clk_freq,
+            dw                = 32,
+            with_sys_datapath = True,
+        )
+        soc.add_module(name=f"{name}_ethcore", module=ethcore)
+    receiver = HUB75UDPReceiver(soc.sdram.crossbar.get_port(mode="write", data_width=32))
+    soc.add_module(name=f"{name}_receiver", module=receiver)
+    udp = ethcore.udp.crossbar.get_port(udp_port, dw=32)
+
+    soc.comb += [
+        udp.source.connect(receiver.sink),
+        scanner.request.connect(reader.request),
+        reader.source.connect(scanner.sink),
+        reader.row_words.eq(scanner.width.storage*(2*nchains)),
+        receiver.frame_words.eq(scanner.rows.storage*scanner.width.storage*(2*nchains)),
+        receiver.back_base.eq(reader.back_base),
+        reader.swap_request.eq(receiver.swap_request),
+    ]
+    soc.add_constant(f"{name.upper()}_CHAINS",   nchains)
+    soc.add_constant(f"{name.upper()}_UDP_PORT", udp_port)
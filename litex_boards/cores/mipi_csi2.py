@@ -0,0 +1,705 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+from migen.genlib.cdc import MultiReg, PulseSynchronizer
+from migen.genlib.resetsync import AsyncResetSynchronizer
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect.csr_eventmanager import *
+from litex.soc.interconnect import stream
+from litex.soc.interconnect import wishbone
+from litex.soc.cores.dma import WishboneDMAWriter
+
+# Constants ----------------------------------------------------------------------------------------
+
+CSI2_DT_FS       = 0x00 # Frame Start.
+CSI2_DT_FE       = 0x01 # Frame End.
+CSI2_DT_LS       = 0x02 # Line Start.
+CSI2_DT_LE       = 0x03 # Line End.
+CSI2_DT_YUV422_8 = 0x1e
+CSI2_DT_RAW8     = 0x2a
+CSI2_DT_RAW10    = 0x2b
+CSI2_DT_RAW12    = 0x2c
+
+csi2_data_types = {
+    "yuv422" : CSI2_DT_YUV422_8,
+    "raw8"   : CSI2_DT_RAW8,
+    "raw10"  : CSI2_DT_RAW10,
+    "raw12"  : CSI2_DT_RAW12,
+}
+
+SOT_SYNC = 0xb8 # D-PHY HS Start-of-Transmission sync byte (00011101 sent LSB first).
+
+# Packet header ECC: parity bits covering each of the 24 header bits (syndrome of a single bit error).
+CSI2_ECC_COLUMNS = [
+    0x07, 0x0b, 0x0d, 0x0e, 0x13, 0x15, 0x16, 0x19, 0x1a, 0x1c, 0x23, 0x25,
+    0x26, 0x29, 0x2a, 0x2c, 0x31, 0x32, 0x34, 0x38, 0x1f, 0x2f, 0x37, 0x3b,
+]
+
+CSI2_CRC_POLY = 0x8408 # Payload CRC-16 (x^16 + x^12 + x^5 + 1, LSB first, seed 0xffff).
+
+# Payload words: 32-bit CSI-2 payload (bytes in reception order, LSB first), sof on the first word of
+# a frame, first/last on the first/last word of a line.
+csi2_payload_layout = [("data", 32), ("sof", 1)]
+
+# CrossLink-NX D-PHY RX ----------------------------------------------------------------------------
+
+class NXDPHYRX(LiteXModule):
+    """Soft D-PHY HS receiver for CrossLink-NX.
+
+    The HS clock lane drives an edge clock; each data lane is deserialized 1:8 with an IDDRX4 and
+    the ECLKDIV'ed clock (bit rate / 8) is exposed as the cd_byte clock domain. Outputs one raw
+    (unaligned) byte per lane per cycle in self.lanes, and the LP state of the lanes in self.stop
+    (Dn LP receiver: high in LP-11/LP-01, low in LP-00/HS), synchronized to cd_byte.
+    """
+    def __init__(self, pads, nlanes=4, cd_byte="mipi_byte"):
+        self.rst   = Signal()
+        self.lanes = [Signal(8) for _ in range(nlanes)]
+        self.stop  = [Signal() for _ in range(nlanes)]
+
+        # # #
+
+        # Clocking.
+        eclk = Signal()
+        self.cd_byte = cd = ClockDomain(cd_byte)
+        self.specials += Instance("ECLKSYNC",
+            i_ECLKIN  = pads.clkp,
+            i_STOP    = 0,
+            o_ECLKOUT = eclk,
+        )
+        self.specials += Instance("ECLKDIV",
+            p_ECLK_DIV = "4",
+            i_ECLKIN   = eclk,
+            i_DIVRST   = self.rst,
+            i_SLIP     = 0,
+            o_DIVOUT   = cd.clk,
+        )
+        self.specials += AsyncResetSynchronizer(cd, self.rst)
+
+        # Data Lanes.
+        for n in range(nlanes):
+            q = Signal(8)
+            self.specials += Instance("IDDRX4",
+                i_D       = pads.dp[n],
+                i_ECLK    = eclk,
+                i_SCLK    = cd.clk,
+                i_RST     = self.rst,
+                i_ALIGNWD = 0,
+                **{f"o_Q{i}": q[i] for i in range(8)}
+            )
+            self.comb += self.lanes[n].eq(q)
+            self.specials += MultiReg(pads.dn[n], self.stop[n], odomain=cd_byte)
+
+# D-PHY Lane Aligner -------------------------------------------------------------------------------
+
+class DPHYLaneAligner(LiteXModule):
+    """Finds the HS sync byte in a raw lane and outputs the following bytes aligned.
+
+    The bit offset is locked on the sync byte and kept until reset (end of packet). With stop (lane
+    LP state), the sync byte is only searched after a LP-11 -> HS entry and the lane is unlocked on
+    the return to LP-11, so that LP/HS-trail garbage can't be taken for a sync byte.
+    """
+    def __init__(self, data, stop=None):
+        self.reset  = Signal()
+        self.source = source = stream.Endpoint([("data", 8)])
+
+        # # #
+
+        data_d = Signal(8)
+        window = Signal(16)
+        offset = Signal(3)
+        locked = Signal()
+        self.sync += data_d.eq(data)
+        self.comb += window.eq(Cat(data_d, data))
+
+        found  = Signal()
+        found_offset = Signal(3)
+        for i in reversed(range(8)):
+            self.comb += If(window[i:i+8] == SOT_SYNC,
+                found.eq(1),
+                found_offset.eq(i),
+            )
+
+        hunt = Signal()
+        if stop is None:
+            self.comb += hunt.eq(1)
+        else:
+            # Hunt once the window only has HS bytes.
+            armed  = Signal()
+            stop_d = Signal()
+            self.sync += [
+                stop_d.eq(stop),
+                If(stop,
+                    armed.eq(1)
+                ).Elif(locked,
+                    armed.eq(0)
+                )
+            ]
+            self.comb += hunt.eq(armed & ~stop & ~stop_d)
+
+        self.sync += [
+            If(self.reset | (stop if stop is not None else 0),
+                locked.eq(0),
+            ).Elif(~locked & found & hunt,
+                locked.eq(1),
+                offset.eq(found_offset),
+            )
+        ]
+        cases = {i: source.data.eq(window[i:i+8]) for i in range(8)}
+        self.comb += [
+            source.valid.eq(locked & ~self.reset),
+            Case(offset, cases),
+        ]
+
+# D-PHY Lane Merger --------------------------------------------------------------------------------
+
+class DPHYLaneMerger(LiteXModule):
+    """Deskews aligned lanes (locked on different cycles) and merges them in a single stream.
+
+    Lanes can't be stalled: overflow pulses when a byte is lost on a full deskew FIFO (lanes skew
+    larger than depth or stalled source) and the lanes then have to be resynchronized.
+    """
+    def __init__(self, lanes, depth=8):
+        nlanes = len(lanes)
+        self.reset    = Signal()
+        self.overflow = Signal()
+        self.source   = source = stream.Endpoint([("data", 8*nlanes)])
+
+        # # #
+
+        fifos = []
+        for n, lane in enumerate(lanes):
+            fifo = ResetInserter()(stream.SyncFIFO([("data", 8)], depth))
+            self.comb += fifo.reset.eq(self.reset)
+            self.comb += lane.connect(fifo.sink)
+            self.submodules += fifo
+            fifos.append(fifo)
+        self.sync += self.overflow.eq(reduce(or_, [lane.valid & ~fifo.sink.ready for lane, fifo in zip(lanes, fifos)]))
+
+        self.comb += source.valid.eq(reduce(and_, [fifo.source.valid for fifo in fifos]))
+        for n, fifo in enumerate(fifos):
+            self.comb += [
+                source.data[8*n:8*(n+1)].eq(fifo.source.data),
+                fifo.source.ready.eq(source.valid & source.ready),
+            ]
+
+# CSI-2 Depacketizer -------------------------------------------------------------------------------
+
+class CSI2Depacketizer(LiteXModule):
+    """Extracts the payload of the long packets of a given data type.
+
+    Short packets are used for the Frame Start markers; the end of each packet resets the lanes so
+    that they hunt for the next sync byte. Payload word count must be a multiple of 4 bytes (true
+    for common resolutions). Single bit header errors are corrected by the ECC, other header errors
+    drop the packet (ecc_error); payload CRC errors are reported (crc_error), the payload being
+    already forwarded.
+    """
+    def __init__(self, data_type):
+        self.sink      = sink   = stream.Endpoint([("data", 32)])
+        self.source    = source = stream.Endpoint(csi2_payload_layout)
+        self.reset     = Signal()
+        self.stop      = Signal()
+        self.ecc_error = Signal()
+        self.crc_error = Signal()
+
+        # # #
+
+        # Header ECC.
+        header   = Signal(24)
+        syndrome = Signal(6)
+        ecc_ok   = Signal()
+        parity   = [reduce(xor, [sink.data[d] for d in range(24) if (CSI2_ECC_COLUMNS[d] >> p) & 1])
+            for p in range(6)]
+        self.comb += [
+            syndrome.eq(Cat(*parity) ^ sink.data[24:30]),
+            header.eq(sink.data[0:24]),
+            ecc_ok.eq((syndrome == 0) | (syndrome & (syndrome - 1) == 0)), # No error or ECC bit error.
+            Case(syndrome, {c: [
+                header.eq(sink.data[0:24] ^ (1 << d)),
+                ecc_ok.eq(1),
+            ] for d, c in enumerate(CSI2_ECC_COLUMNS)}),
+        ]
+
+        # Payload CRC (4 bytes per word).
+        crc      = Signal(16)
+        crc_next = crc
+        for i in range(32):
+            crc_bit = Signal(16)
+            self.comb += crc_bit.eq((crc_next >> 1) ^ Mux(sink.data[i] ^ crc_next[0], CSI2_CRC_POLY, 0))
+            crc_next = crc_bit
+
+        dt    = Signal(6)
+        wc    = Signal(16)
+        count = Signal(14)
+        first = Signal()
+        sof   = Signal()
+        self.comb += [
+            dt.eq(header[0:6]),
+            wc.eq(header[8:24]),
+        ]
+
+        self.fsm = fsm = FSM(reset_state="HEADER")
+        fsm.act("HEADER",
+            sink.ready.eq(1),
+            If(sink.valid,
+                If(~ecc_ok,
+                    self.ecc_error.eq(1),
+                    NextState("END")
+                ).Elif(dt < 0x10,
+                    # Short Packet.
+                    If(dt == CSI2_DT_FS,
+                        NextValue(sof, 1)
+                    ),
+                    NextState("END")
+                ).Elif(dt == data_type,
+                    NextValue(count, wc[2:]),
+                    NextValue(first, 1),
+                    NextValue(crc, 0xffff),
+                    NextState("PAYLOAD")
+                ).Else(
+                    NextState("END")
+                )
+            )
+        )
+        fsm.act("PAYLOAD",
+            sink.connect(source, keep={"valid", "ready", "data"}),
+            source.sof.eq(sof & first),
+            source.first.eq(first),
+            source.last.eq(count == 1),
+            If(source.valid & source.ready,
+                NextValue(first, 0),
+                NextValue(sof, 0),
+                NextValue(crc, crc_next),
+                NextValue(count, count - 1),
+                If(count == 1,
+                    NextState("CRC")
+                )
+            ),
+            # Lanes back to LP-11 before the end of the packet.
+            If(self.stop,
+                NextState("END")
+            )
+        )
+        fsm.act("CRC",
+            sink.ready.eq(1),
+            If(sink.valid,
+                self.crc_error.eq(sink.data[0:16] != crc),
+                NextState("END")
+            ),
+            If(self.stop,
+                NextState("END")
+            )
+        )
+        fsm.act("END",
+            # Drop trailer and re-hunt sync on the lanes.
+            self.reset.eq(1),
+            NextState("HEADER")
+        )
+
+# CSI-2 RX -----------------------------------------------------------------------------------------
+
+class CSI2RX(LiteXModule):
+    """D-PHY lanes -> CSI-2 payload stream, in the PHY's byte clock domain.
+
+    stop: LP state of the lanes (optional, see DPHYLaneAligner). Header ECC, payload CRC errors and
+    lane merger overflows (lanes resynchronized, current packet dropped) are counted in the sys
+    clock domain.
+    """
+    def __init__(self, lanes, data_type, cd_byte="mipi_byte", stop=None):
+        nlanes = len(lanes)
+        assert nlanes in [1, 2, 4]
+        self.source = source = stream.Endpoint(csi2_payload_layout)
+
+        self.ecc_errors = CSRStatus(32, description="Dropped packets (uncorrectable header errors).")
+        self.crc_errors = CSRStatus(32, description="Payload CRC errors.")
+        self.overflows  = CSRStatus(32, description="Lane merger overflows (lanes resynchronized).")
+
+        # # #
+
+        depacketizer = CSI2Depacketizer(data_type)
+        aligners     = [DPHYLaneAligner(lane, None if stop is None else stop[n]) for n, lane in enumerate(lanes)]
+        merger       = DPHYLaneMerger([aligner.source for aligner in aligners])
+        converter    = ResetInserter()(stream.Converter(8*nlanes, 32))
+        # Lanes back to LP-11 or merger overflow: end current packet and re-hunt sync on the lanes.
+        self.comb += depacketizer.stop.eq(merger.overflow | (reduce(and_, stop) if stop is not None else 0))
+        for aligner in aligners:
+            self.comb += aligner.reset.eq(depacketizer.reset | merger.overflow)
+        self.comb += [
+            merger.reset.eq(depacketizer.reset | depacketizer.stop),
+            converter.reset.eq(depacketizer.reset | depacketizer.stop),
+            merger.source.connect(converter.sink),
+            converter.source.connect(depacketizer.sink, omit={"valid_token_count"}),
+            depacketizer.source.connect(source),
+        ]
+        self.submodules += ClockDomainsRenamer(cd_byte)(depacketizer)
+        self.submodules += ClockDomainsRenamer(cd_byte)(merger)
+        self.submodules += ClockDomainsRenamer(cd_byte)(converter)
+        for aligner in aligners:
+            self.submodules += ClockDomainsRenamer(cd_byte)(aligner)
+
+        # Errors.
+        for csr, error in [
+            (self.ecc_errors, depacketizer.ecc_error),
+            (self.crc_errors, depacketizer.crc_error),
+            (self.overflows,  merger.overflow)]:
+            ps = PulseSynchronizer(cd_byte, "sys")
+            self.submodules += ps
+            self.comb += ps.i.eq(error)
+            self.sync += If(ps.o, csr.status.eq(csr.status + 1))
+
+# CSI-2 Unpacker -----------------------------------------------------------------------------------
+
+class CSI2Unpacker(LiteXModule):
+    """Unpacks RAW10/RAW12 payloads to 16-bit pixels (2 pixels per 32-bit word).
+
+    RAW8 and YUV422 payloads are already byte-aligned and passed through. Lines must be a multiple
+    of 16 (RAW10) / 8 (RAW12) pixels.
+    """
+    def __init__(self, data_type):
+        self.sink   = sink   = stream.Endpoint(csi2_payload_layout)
+        self.source = source = stream.Endpoint(csi2_payload_layout)
+
+        # # #
+
+        if data_type not in [CSI2_DT_RAW10, CSI2_DT_RAW12]:
+            self.comb += sink.connect(source)
+            return
+
+        # RAW10: 5 bytes/4 pixels, RAW12: 3 bytes/2 pixels.
+        pixel_bits, group_bytes, group_pixels = {
+            CSI2_DT_RAW10 : (10, 5, 4),
+            CSI2_DT_RAW12 : (12, 3, 2),
+        }[data_type]
+        lsb_bits  = pixel_bits - 8
+        in_words  = group_bytes    # 4 groups: word aligned.
+        out_words = 2*group_pixels # 4*group_pixels 16-bit pixels.
+
+        # Words are carried with their sof bit (33-bit chunks) through the Converters.
+        self.up   = up   = stream.Converter(33, 33*in_words)
+        self.down = down = stream.Converter(33*out_words, 33)
+        self.comb += [
+            up.sink.valid.eq(sink.valid),
+            up.sink.data.eq(Cat(sink.data, sink.sof)),
+            up.sink.first.eq(sink.first),
+            up.sink.last.eq(sink.last),
+            sink.ready.eq(up.sink.ready),
+        ]
+
+        data   = Cat(*[up.source.data[33*i:33*i+32] for i in range(in_words)])
+        pixels = []
+        for g in range(len(data)//(8*group_bytes)):
+            group = data[8*group_bytes*g:8*group_bytes*(g+1)]
+            lsbs  = group[8*group_pixels:8*group_pixels+8]
+            for p in range(group_pixels):
+                msb = group[8*p:8*(p+1)]
+                lsb = lsbs[lsb_bits*p:lsb_bits*(p+1)]
+                pixels.append(Cat(lsb, msb, Replicate(0, 16 - pixel_bits)))
+        chunks = []
+        for w in range(out_words):
+            sof = up.source.data[32] if w == 0 else 0
+            chunks.append(Cat(pixels[2*w], pixels[2*w+1], sof))
+        self.comb += [
+            down.sink.valid.eq(up.source.valid),
+            down.sink.data.eq(Cat(*chunks)),
+            down.sink.first.eq(up.source.first),
+            down.sink.last.eq(up.source.last),
+            up.source.ready.eq(down.sink.ready),
+
+            source.valid.eq(down.source.valid),
+            source.data.eq(down.source.data[0:32]),
+            source.sof.eq(down.source.data[32]),
+            source.first.eq(down.source.first),
+            source.last.eq(down.source.last),
+            down.source.ready.eq(source.ready),
+        ]
+
+# CSI-2 Frame DMA ----------------------------------------------------------------------------------
+
+class CSI2FrameDMA(LiteXModule):
+    """Writes frames to memory through a ring of frame buffer descriptors.
+
+    Software pushes free frame buffers by writing their base address to buffer_base; each frame
+    (starting on a sof word, ending after height lines) is written to the next free buffer and its
+    descriptor (base, length in bytes) is pushed to the done ring, read through done_base/
+    done_length and released with done_ack. Frames arriving without a free buffer are dropped.
+
+    Writes are limited to buffer_size bytes: the rest of a larger frame is discarded and the frame
+    is flagged as truncated (done_truncated). No frame is captured while height or buffer_size are
+    0 (invalid configuration, frames counted as dropped).
+    """
+    def __init__(self, bus, nbuffers=4):
+        self.sink = sink = stream.Endpoint(csi2_payload_layout)
+
+        self.enable         = CSRStorage(description="Frame capture enable.")
+        self.height         = CSRStorage(16, description="Frame height (in lines, 0: invalid).")
+        self.buffer_size    = CSRStorage(32, description="Frame buffers size (in bytes, 0: invalid).")
+        self.buffer_base    = CSRStorage(32, description="Free frame buffer base (writing pushes it to the free ring).")
+        self.buffer_level   = CSRStatus(bits_for(nbuffers), description="Free ring level.")
+        self.done_valid     = CSRStatus(description="Done ring has a descriptor.")
+        self.done_base      = CSRStatus(32, description="Done descriptor frame buffer base.")
+        self.done_length    = CSRStatus(32, description="Done descriptor frame length (in bytes).")
+        self.done_truncated = CSRStatus(description="Done descriptor frame truncated (larger than buffer_size).")
+        self.done_ack       = CSR()
+        self.frames         = CSRStatus(32, description="Captured frames.")
+        self.drops          = CSRStatus(32, description="Dropped frames (no free buffer or invalid configuration).")
+        self.truncations    = CSRStatus(32, description="Truncated frames (larger than buffer_size).")
+        self.frame_period   = CSRStatus(32, description="Frame period (in sys_clk cycles).")
+
+        self.ev = EventManager()
+        self.ev.done = EventSourcePulse(description="Frame written to memory.")
+        self.ev.finalize()
+
+        # # #
+
+        # Free/Done rings.
+        self.free = free = stream.SyncFIFO([("base", 32)], nbuffers, buffered=True)
+        self.done = done = stream.SyncFIFO([("base", 32), ("length", 32), ("truncated", 1)], nbuffers, buffered=True)
+        self.comb += [
+            free.sink.valid.eq(self.buffer_base.re),
+            free.sink.base.eq(self.buffer_base.storage),
+            self.buffer_level.status.eq(free.level),
+            self.done_valid.status.eq(done.source.valid),
+            self.done_base.status.eq(done.source.base),
+            self.done_length.status.eq(done.source.length),
+            self.done_truncated.status.eq(done.source.truncated),
+            done.source.ready.eq(self.done_ack.re),
+        ]
+
+        # Frame rate.
+        period = Signal(32)
+        sof    = Signal()
+        self.comb += sof.eq(sink.valid & sink.ready & sink.sof)
+        self.sync += [
+            period.eq(period + 1),
+            If(sof,
+                period.eq(1),
+                self.frame_period.status.eq(period),
+            )
+        ]
+
+        # DMA (Payload words are already LSB first: no byte reordering).
+        self.dma = dma = WishboneDMAWriter(bus, endianness="big", with_csr=False)
+        base      = Signal(32)
+        offset    = Signal(32)
+        lines     = Signal(16)
+        valid     = Signal()
+        full      = Signal()
+        truncated = Signal()
+        self.comb += [
+            valid.eq((self.height.storage != 0) & (self.buffer_size.storage[2:] != 0)),
+            full.eq(offset >= self.buffer_size.storage[2:]),
+            dma.sink.address.eq(base[2:] + offset),
+            dma.sink.data.eq(sink.data),
+        ]
+
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            sink.ready.eq(1),
+            If(sink.valid & sink.first & sink.sof & self.enable.storage,
+                sink.ready.eq(0),
+                If(free.source.valid & valid,
+                    free.source.ready.eq(1),
+                    NextValue(base, free.source.base),
+                    NextValue(offset, 0),
+                    NextValue(lines, 0),
+                    NextValue(truncated, 0),
+                    NextState("WRITE")
+                ).Else(
+                    sink.ready.eq(1),
+                    NextValue(self.drops.status, self.drops.status + 1)
+                )
+            )
+        )
+        fsm.act("WRITE",
+            If(sink.valid & sink.sof & ((offset != 0) | truncated),
+                # New frame before the end of the current one: close it.
+                NextState("DONE")
+            ).Else(
+                # Discard words past the end of the buffer.
+                dma.sink.valid.eq(sink.valid & ~full),
+                sink.ready.eq(dma.sink.ready | full),
+                If(sink.valid & sink.ready,
+                    If(full,
+                        NextValue(truncated, 1)
+                    ).Else(
+                        NextValue(offset, offset + 1)
+                    ),
+                    If(sink.last,
+                        NextValue(lines, lines + 1),
+                        If(lines == (self.height.storage - 1),
+                            NextState("DONE")
+                        )
+                    )
+                )
+            )
+        )
+        fsm.act("DONE",
+            done.sink.valid.eq(1),
+            done.sink.base.eq(base),
+            done.sink.length.eq(4*offset),
+            done.sink.truncated.eq(truncated),
+            If(done.sink.ready,
+                self.ev.done.trigger.eq(1),
+                NextValue(self.frames.status, self.frames.status + 1),
+                If(truncated,
+                    NextValue(self.truncations.status, self.truncations.status + 1)
+                ),
+                NextState("IDLE")
+            )
+        )
+
+# Trion MIPI RX ------------------------------------------------------------------------------------
+
+class TrionMIPIRX(LiteXModule):
+    """Trion hard MIPI CSI-2 RX.
+
+    The hard block does the D-PHY/CSI-2 decoding and outputs pixels (pixels_per_clk pixels of up to
+    16 bits in DATA, configured for 2 pixels per clock) in the cd_pixel clock domain (PIXEL_CLK,
+    from a PLL output). Its pixel stream is converted to the payload stream (2 pixels per word) with
+    sof on VSYNC and line markers on HSYNC. The block is configured through the Interface Designer.
+    """
+    def __init__(self, platform, name="mipi_rx", location="MIPI_RX0", nlanes=4, pixel_bits=10,
+        pixels_per_clk = 2,
+        cd_pixel       = "mipi_pixel",
+        properties     = {}):
+        from litex.build.efinix import InterfaceWriterBlock
+        self.source = source = stream.Endpoint(csi2_payload_layout)
+
+        # # #
+
+        # Interface Designer Block.
+        ios = {
+            "VALID" : 1,
+            "HSYNC" : 4,
+            "VSYNC" : 4,
+            "CNT"   : 4,
+            "DATA"  : 64,
+            "TYPE"  : 6,
+            "VC"    : 2,
+            "ERROR" : 18,
+        }
+        pads = {k: platform.add_iface_io(f"{name}_{k.lower()}", n) for k, n in ios.items()}
+        ctrl = {
+            "DPHY_RSTN" : 1,
+            "RSTN"      : 1,
+            "LANES"     : 2,
+            "VC_ENA"    : 4,
+            "CLEAR"     : 1,
+        }
+        ctrl = {k: platform.add_iface_io(f"{name}_{k.lower()}", n) for k, n in ctrl.items()}
+        self.comb += [
+            ctrl["DPHY_RSTN"].eq(~ResetSignal(cd_pixel)),
+            ctrl["RSTN"].eq(~ResetSignal(cd_pixel)),
+            ctrl["LANES"].eq(nlanes - 1),
+            ctrl["VC_ENA"].eq(0b0001),
+            ctrl["CLEAR"].eq(0),
+        ]
+
+        class _MIPIRXBlock(InterfaceWriterBlock):
+            def generate(self):
+                block_type = "MIPI_RX"
+                cmd = []
+                cmd.append(f'design.create_block("{name}", "{block_type}")')
+                for k, v in properties.items():
+                    cmd.append(f'design.set_property("{name}", "{k}", "{v}", "{block_type}")')
+                for k, pad in list(pads.items()) + list(ctrl.items()):
+                    cmd.append(f'design.set_property("{name}", "{k}_PIN", "{pad.name}", "{block_type}")')
+                cmd.append(f'design.set_property("{name}", "PIXEL_CLK_PIN", "{platform.clks[cd_pixel]}", "{block_type}")')
+                cmd.append(f'design.assign_resource("{name}", "{location}", "{block_type}")')
+                return "\n".join(cmd) + "\n\n"
+        platform.toolchain.ifacewriter.blocks.append(_MIPIRXBlock())
+
+        # Pixels -> Payload words.
+        assert pixels_per_clk == 2 # 2 16-bit pixels per 32-bit word.
+        valid   = pads["VALID"][0]
+        vsync   = pads["VSYNC"][0]
+        hsync   = pads["HSYNC"][0]
+        pixels  = Cat(*[Cat(pads["DATA"][16*i:16*i+pixel_bits], Replicate(0, 16 - pixel_bits)) for i in range(2)])
+        vsync_d = Signal()
+        sof     = Signal()
+        first   = Signal()
+        data_d  = Signal(32)
+        valid_d = Signal()
+        sof_d   = Signal()
+        first_d = Signal()
+        sync    = getattr(self.sync, cd_pixel)
+        sync += [
+            vsync_d.eq(vsync),
+            If(vsync & ~vsync_d, sof.eq(1)),
+            If(valid,
+                data_d.eq(pixels),
+                valid_d.eq(1),
+                sof_d.eq(sof),
+                first_d.eq(first),
+                sof.eq(0),
+                first.eq(0),
+            ).Elif(~hsync,
+                valid_d.eq(0),
+                first.eq(1),
+            )
+        ]
+
+        # Words are delayed by one cycle to mark the last word of the line on HSYNC deassertion. The
+        # hard block can't be backpressured, lines are absorbed by the CDC.
+        self.comb += [
+            source.valid.eq(valid_d & (valid | ~hsync)),
+            source.data.eq(data_d),
+            source.sof.eq(sof_d),
+            source.first.eq(first_d),
+            source.last.eq(~hsync),
+        ]
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_mipi_csi2_capture(soc, name="mipi", phy=None, data_type="raw10", cd_phy="mipi_byte", nbuffers=4, cdc_depth=2048, port=None):
+    """Add a MIPI CSI-2 capture pipeline to a SoC: PHY -> CSI-2 RX -> CDC -> Unpacker -> Frame DMA.
+
+    phy is either a soft D-PHY (exposing lanes, CSI-2 decoded here) or a hard CSI-2 RX (exposing a
+    payload source). The Frame DMA is a SoC bus master, or is connected to port when specified (ex
+    a dedicated BankedRAM port, frame buffers then have to be in this RAM).
+    """
+    data_type = csi2_data_types[data_type]
+    soc.add_module(name=f"{name}_phy", module=phy)
+
+    # CSI-2 RX (Soft D-PHY only, hard CSI-2 RXs already output unpacked pixels).
+    soft = hasattr(phy, "lanes")
+    if soft:
+        rx = CSI2RX(phy.lanes, data_type, cd_byte=cd_phy, stop=getattr(phy, "stop", None))
+        soc.add_module(name=f"{name}_rx", module=rx)
+        source = rx.source
+    else:
+        source = phy.source
+
+    # CDC.
+    cdc = stream.ClockDomainCrossing(csi2_payload_layout, cd_from=cd_phy, cd_to="sys", depth=cdc_depth)
+    soc.add_module(name=f"{name}_cdc", module=cdc)
+
+    # Unpacker.
+    unpacker = CSI2Unpacker(data_type if soft else None)
+    soc.add_module(name=f"{name}_unpacker", module=unpacker)
+
+    # Frame DMA.
+    bus = wishbone.Interface(
+        data_width    = 32,
+        address_width = soc.bus.address_width,
+        addressing    = "word",
+    )
+    dma = CSI2FrameDMA(bus, nbuffers=nbuffers)
+    soc.add_module(name=f"{name}_dma", module=dma)
+    if port is None:
+        soc.bus.add_master(name=f"{name}_dma", master=bus)
+    else:
+        soc.add_module(name=f"{name}_dma_converter", module=wishbone.Converter(bus, port))
+    if soc.irq.enabled:
+        soc.irq.add(f"{name}_dma", use_loc_if_exists=True)
+
+    soc.comb += [
+        source.connect(cdc.sink),
+        cdc.source.connect(unpacker.sink),
+        unpacker.source.connect(dma.sink),
+    ]
@@ -0,0 +1,743 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import math
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.cores.icap import ICAP_DUMMY, ICAP_SYNC, ICAP_NOOP, ICAP_WRITE, ICAP_READ
+from litex.soc.cores.icap import ICAPRegisters, ICAPCMDs
+from litex.soc.cores.spi import SPIMaster
+from litex.soc.cores.gpio import GPIOOut
+
+# ICAP Streamer ------------------------------------------------------------------------------------
+
+class ICAPStreamer(LiteXModule):
+    """ICAP with a streaming write path (Bitstream from DMA).
+
+    Provides the ICAP register interface of LiteX's ICAP (CSRs/reload compatible with the LitePCIe
+    driver) and a 32-bit sink: words are written to the ICAPE2 at ICAP clock rate
+    (sys_clk/clk_divider). Register accesses and stream words are arbitrated by a single sequencer in
+    the ICAP clock domain: stream words are only accepted between register accesses and a register
+    access only starts once the stream is drained, so neither can be interleaved with the other.
+    Words are in bitstream (.bin) order: the bit reordering expected by the ICAPE2 is done here.
+    """
+    def __init__(self, clk_divider=2, fifo_depth=512, primitive="ICAPE2", with_csr=True, simulation=False):
+        self.write      = Signal()
+        self.read       = Signal()
+        self.done       = Signal()
+        self.addr       = Signal(5)
+        self.write_data = Signal(32)
+        self.read_data  = Signal(32)
+        self.sink       = stream.Endpoint([("data", 32)])
+
+        # ICAP interface (ICAP clock domain).
+        self.csib  = csib  = Signal(reset=1)
+        self.rdwrb = rdwrb = Signal()
+        self.i     = i     = Signal(32)
+        self.o     = o     = Signal(32)
+
+        # # #
+
+        # Parameters check.
+        assert primitive in ["ICAPE2", "ICAPE3"]
+        assert clk_divider > 1
+        assert math.log2(clk_divider).is_integer()
+        self.clk_divider = clk_divider
+
+        # Create slow ICAP Clk (provided by the simulator in simulation).
+        self.cd_icap = ClockDomain()
+        if not simulation:
+            icap_clk_counter = Signal(int(math.log2(clk_divider)))
+            self.sync += icap_clk_counter.eq(icap_clk_counter + 1)
+            self.sync += self.cd_icap.clk.eq(icap_clk_counter[-1])
+
+        # FIFO (sys_clk to icap_clk).
+        self.fifo = fifo = ClockDomainsRenamer({"write": "sys", "read": "icap"})(
+            stream.AsyncFIFO([("data", 32)], fifo_depth))
+        self.comb += self.sink.connect(fifo.sink)
+
+        # Register commands (sys_clk to icap_clk, addr/write_data are static during a command).
+        write = Signal()
+        read  = Signal()
+        done  = Signal()
+        done_sync = Signal()
+        self.specials += [
+            MultiReg(self.write, write, odomain="icap"),
+            MultiReg(self.read,  read,  odomain="icap"),
+            MultiReg(done, done_sync),
+        ]
+        self.comb += self.done.eq(done_sync & (self.write | self.read))
+
+        # ICAP Sequencer.
+        count = Signal(4)
+        self.fsm = fsm = ClockDomainsRenamer("icap")(FSM(reset_state="WAIT"))
+        fsm.act("WAIT",
+            # Set ICAP in IDLE state.
+            csib.eq(1),
+            rdwrb.eq(0),
+            i.eq(ICAP_DUMMY),
+            # Stream words or wait User Command.
+            If(fifo.source.valid,
+                NextState("STREAM")
+            ).Elif(write | read,
+                NextValue(count, 0),
+                NextState("SYNC")
+            )
+        )
+        fsm.act("STREAM",
+            fifo.source.ready.eq(1),
+            csib.eq(~fifo.source.valid),
+            rdwrb.eq(0),
+            i.eq(fifo.source.data),
+            If(~fifo.source.valid,
+                NextState("WAIT")
+            )
+        )
+        fsm.act("SYNC",
+            csib.eq(0),
+            rdwrb.eq(0),
+            Case(count, {
+                0 : i.eq(ICAP_NOOP), # No Op.
+                1 : i.eq(ICAP_SYNC), # Sync Word.
+                2 : i.eq(ICAP_NOOP), # No Op.
+                3 : i.eq(ICAP_NOOP), # No Op.
+            }),
+            NextValue(count, count + 1),
+            If(count == (4-1),
+                NextValue(count, 0),
+                If(write,
+                    NextState("WRITE")
+                ).Else(
+                    NextState("READ")
+                )
+            )
+        )
+        fsm.act("WRITE",
+            csib.eq(0),
+            rdwrb.eq(0),
+            Case(count, {
+                0 : i.eq(ICAP_WRITE | (self.addr << 13) | 1), # Set Register.
+                1 : i.eq(self.write_data),                    # Set Register Data.
+                2 : i.eq(ICAP_NOOP),                          # No Op.
+                3 : i.eq(ICAP_NOOP),                          # No Op.
+            }),
+            NextValue(count, count + 1),
+            If(count == (4-1),
+                NextValue(count, 0),
+                NextState("DESYNC")
+            )
+        )
+        fsm.act("READ",
+            csib.eq(0),
+            rdwrb.eq(0),
+            Case(count, {
+                0 : i.eq(ICAP_READ | (self.addr << 13) | 1),    # Set Register.
+                1 : i.eq(ICAP_NOOP),                            # No Op.
+                2 : i.eq(ICAP_NOOP),                            # No Op.
+                3 : [csib.eq(1), rdwrb.eq(1), i.eq(ICAP_NOOP)], # Idle + No Op.
+                4 : [csib.eq(0), rdwrb.eq(1), i.eq(ICAP_NOOP)], # No Op.
+                5 : [csib.eq(0), rdwrb.eq(1), i.eq(ICAP_NOOP)], # No Op.
+                6 : [csib.eq(0), rdwrb.eq(1), i.eq(ICAP_NOOP)], # No Op.
+                7 : [csib.eq(0), rdwrb.eq(1), i.eq(ICAP_NOOP)], # No Op.
+            }),
+            NextValue(count, count + 1),
+            If(count == (8-1),
+                NextValue(self.read_data, o),
+                NextValue(count, 0),
+                NextState("DESYNC")
+            )
+        )
+        fsm.act("DESYNC",
+            csib.eq(0),
+            rdwrb.eq(0),
+            Case(count, {
+                0 : i.eq(ICAP_WRITE | (ICAPRegisters.CMD << 13) | 1), # Write to CMD Register.
+                1 : i.eq(ICAPCMDs.DESYNC),                            # DESYNC CMD.
+                2 : i.eq(ICAP_NOOP),                                  # No Op.
+                3 : i.eq(ICAP_NOOP),                                  # No Op.
+            }),
+            NextValue(count, count + 1),
+            If(count == (4-1),
+                NextValue(count, 0),
+                NextState("DONE")
+            )
+        )
+        fsm.act("DONE",
+            # Set ICAP in IDLE state until User Command is released.
+            csib.eq(1),
+            rdwrb.eq(0),
+            i.eq(ICAP_DUMMY),
+            done.eq(1),
+            If(~(write | read),
+                NextState("WAIT")
+            )
+        )
+
+        # ICAP Instance.
+        if not simulation:
+            o_icap = Signal(32)
+            self.comb += o.eq(Cat(*[o_icap[8*n:8*(n+1)][::-1] for n in range(4)]))
+            self.params = dict()
+            if primitive == "ICAPE2":
+                self.params.update(p_ICAP_WIDTH="X32")
+            self.params.update(
+                i_CLK   = ClockSignal("icap"),
+                i_CSIB  = csib,
+                i_RDWRB = rdwrb,
+                i_I     = Cat(*[i[8*n:8*(n+1)][::-1] for n in range(4)]),
+                o_O     = o_icap,
+            )
+            self.specials += Instance(primitive, **self.params)
+
+        # CSR.
+        if with_csr:
+            self.add_csr()
+
+    def add_csr(self):
+        self._addr  = CSRStorage(5,  reset_less=True, description="ICAP Address.")
+        self._data  = CSRStorage(32, reset_less=True, description="ICAP Write/Read Data.", write_from_dev=True)
+        self._write = CSRStorage(description="ICAP Control.\n\n Write ``1`` send a write to the ICAP.")
+        self._done  = CSRStatus(description="ICAP Status.\n\n Command done when read as ``1``.")
+        self._read  = CSRStorage(description="ICAP Control.\n\n Read ``1`` send a read from the ICAP.")
+
+        self.comb += [
+            self.addr.eq(self._addr.storage),
+            self.write_data.eq(self._data.storage),
+            self.write.eq(self._write.storage),
+            self._done.status.eq(self.done),
+            self.read.eq(self._read.storage),
+            If(self.done,
+                self._data.we.eq(1),
+                self._data.dat_w.eq(self.read_data)
+            )
+        ]
+
+    def add_reload(self):
+        self.reload = Signal() # Set to 1 to reload FPGA from logic.
+
+        self.reload_fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(self.reload,
+                NextState("RELOAD")
+            )
+        )
+        fsm.act("RELOAD",
+            self.addr.eq(ICAPRegisters.CMD),
+            self.write.eq(1),
+            self.write_data.eq(ICAPCMDs.IPROG),
+        )
+
+    def add_timing_constraints(self, platform, sys_clk_freq, sys_clk):
+        platform.add_period_constraint(self.cd_icap.clk, self.clk_divider*1e9/sys_clk_freq)
+        platform.add_false_path_constraints(self.cd_icap.clk, sys_clk)
+
+# QSPI Flash PHY -----------------------------------------------------------------------------------
+
+class QSPIFlashPHY(LiteXModule):
+    """Byte-oriented SPI/QSPI Flash PHY (Mode 0, MSB first).
+
+    Each sink byte is transferred in 1-bit mode (DQ0 out, DQ1 in, WP#/HOLD# high) or in 4-bit mode
+    (driven when oe is set, else tri-stated). Bytes with capture set are returned on source. The
+    clock is sys_clk/(2*div); inputs are sampled at the end of the high phase to absorb the clock
+    and IO delays.
+    """
+    def __init__(self, div=1):
+        assert div >= 1
+        self.sink   = sink   = stream.Endpoint([("data", 8), ("width", 3), ("oe", 1), ("capture", 1)])
+        self.source = source = stream.Endpoint([("data", 8)])
+        self.idle   = Signal()
+
+        self.clk   = Signal()
+        self.dq_o  = Signal(4)
+        self.dq_oe = Signal(4)
+        self.dq_i  = Signal(4)
+
+        # # #
+
+        shift_o = Signal(8)
+        shift_i = Signal(8)
+        quad    = Signal()
+        oe      = Signal()
+        capture = Signal()
+        count   = Signal(4)
+        timer   = Signal(max=div + 1)
+
+        # Outputs.
+        self.comb += [
+            If(quad,
+                self.dq_o.eq(shift_o[4:]),
+                self.dq_oe.eq(Replicate(oe, 4)),
+            ).Else(
+                self.dq_o.eq(Cat(shift_o[7], 0, 1, 1)),
+                self.dq_oe.eq(0b1101),
+            )
+        ]
+
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            self.idle.eq(1),
+            If(sink.valid,
+                NextValue(shift_o, sink.data),
+                NextValue(quad,    sink.width == 4),
+                NextValue(oe,      sink.oe),
+                NextValue(capture, sink.capture),
+                NextValue(count,   Mux(sink.width == 4, 2, 8)),
+                NextValue(timer,   div - 1),
+                NextState("LOW")
+            )
+        )
+        fsm.act("LOW",
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                NextValue(timer, div - 1),
+                NextState("HIGH")
+            )
+        )
+        fsm.act("HIGH",
+            self.clk.eq(1),
+            NextValue(timer, timer - 1),
+            If(timer == 0,
+                NextValue(timer, div - 1),
+                NextValue(count, count - 1),
+                If(quad,
+                    NextValue(shift_i, Cat(self.dq_i, shift_i[:4])),
+                    NextValue(shift_o, shift_o << 4),
+                ).Else(
+                    NextValue(shift_i, Cat(self.dq_i[1], shift_i[:7])),
+                    NextValue(shift_o, shift_o << 1),
+                ),
+                If(count == 1,
+                    sink.ready.eq(1),
+                    If(capture,
+                        NextState("OUTPUT")
+                    ).Else(
+                        NextState("IDLE")
+                    )
+                ).Else(
+                    NextState("LOW")
+                )
+            )
+        )
+        fsm.act("OUTPUT",
+            source.valid.eq(1),
+            source.data.eq(shift_i),
+            If(source.ready,
+                NextState("IDLE")
+            )
+        )
+
+# QSPI Flash Programmer ----------------------------------------------------------------------------
+
+SPIFLASH_WREN  = 0x06
+SPIFLASH_RDSR  = 0x05
+SPIFLASH_RDCR  = 0x35 # Read Configuration Register (CR1).
+SPIFLASH_WRR   = 0x01 # Write Registers (SR1, CR1).
+SPIFLASH_QUAD  = 0x02 # CR1 Quad Enable bit (Quad commands are ignored while cleared).
+SPIFLASH_4SE   = 0xdc # Sector Erase (4-byte address).
+SPIFLASH_4QPP  = 0x34 # Quad Page Program (4-byte address).
+SPIFLASH_4QOR  = 0x6c # Quad Output Read (4-byte address, 8 dummy cycles).
+
+class QSPIFlashProgrammer(LiteXModule):
+    """Autonomous QSPI Flash programmer fed by a 32-bit stream.
+
+    Once enabled (address loaded on enable write), the incoming stream is collected in a page buffer
+    and each full page is erased (on sector boundaries, optional), programmed with Quad Page Program
+    and verified on-chip with Quad Output Read (optional) before the next page is accepted. The host
+    only has to stream the (page padded) image and check the pages/errors CSRs at the end.
+
+    Quad commands require the Flash Quad Enable bit (CR1.QUAD on S25FL, cleared on parts as shipped):
+    when quad_enable is set, CR1 is read on enable and QUAD is set with WRR (SR1 rewritten with its
+    current value) before the first page.
+    """
+    def __init__(self, phy, page_size=256, sector_size=65536, cs_high_cycles=8):
+        assert page_size % 4 == 0
+        self.sink = sink = stream.Endpoint([("data", 32)])
+        self.cs_n = Signal(reset=1)
+
+        self.enable        = CSRStorage(description="Enable programming (Address loaded on write).")
+        self.address       = CSRStorage(32, description="Start address (sector aligned when erase is enabled).")
+        self.erase         = CSRStorage(reset=1, description="Erase sectors before programming.")
+        self.verify        = CSRStorage(reset=1, description="Verify pages after programming.")
+        self.quad_enable   = CSRStorage(reset=1, description="Set the Flash Quad Enable bit (CR1.QUAD) on enable.")
+        self.pages         = CSRStatus(32, description="Programmed pages count.")
+        self.errors        = CSRStatus(32, description="Verify errors (mismatching bytes) count.")
+        self.error_address = CSRStatus(32, description="First mismatching byte address.")
+        self.busy          = CSRStatus(description="Page being erased/programmed/verified.")
+
+        # # #
+
+        page_words = page_size//4
+        address    = Signal(32)
+
+        # Page buffer.
+        mem = Memory(32, page_words)
+        wr_port = mem.get_port(write_capable=True)
+        rd_port = mem.get_port(async_read=True)
+        self.specials += mem, wr_port, rd_port
+        wr_ptr = Signal(max=page_words)
+        byte   = Signal(max=page_size)
+        data   = Signal(8)
+        self.comb += [
+            rd_port.adr.eq(byte[2:]),
+            data.eq(rd_port.dat_r >> (8*byte[:2])),
+        ]
+
+        # Command sequencer helpers.
+        index   = Signal(8)
+        timer   = Signal(max=cs_high_cycles + 1)
+        pending = Signal()
+        def command(name, cmd, next_state, with_address=True, last=True, data=[]):
+            seq = [cmd]
+            if with_address:
+                seq += [address[24:32], address[16:24], address[8:16], address[0:8]]
+            seq = Array(seq + data)
+            fsm.act(name,
+                self.cs_n.eq(0),
+                phy.sink.valid.eq(1),
+                phy.sink.width.eq(1),
+                phy.sink.data.eq(seq[index]),
+                If(phy.sink.ready,
+                    NextValue(index, index + 1),
+                    If(index == (len(seq) - 1),
+                        NextValue(index, 0),
+                        NextState(f"{name}-END" if last else next_state)
+                    )
+                )
+            )
+            if last:
+                end(f"{name}-END", next_state)
+        def end(name, next_state):
+            fsm.act(name,
+                self.cs_n.eq(phy.idle),
+                If(phy.idle,
+                    NextValue(timer, timer + 1),
+                    If(timer == (cs_high_cycles - 1),
+                        NextValue(timer, 0),
+                        NextState(next_state)
+                    )
+                )
+            )
+        def read_register(name, cmd, register, next_state):
+            command(name, cmd, f"{name}-DATA", with_address=False, last=False)
+            fsm.act(f"{name}-DATA",
+                self.cs_n.eq(0),
+                phy.sink.valid.eq(~pending),
+                phy.sink.width.eq(1),
+                phy.sink.capture.eq(1),
+                phy.source.ready.eq(1),
+                If(phy.sink.ready,
+                    NextValue(pending, 1)
+                ),
+                If(phy.source.valid,
+                    NextValue(pending, 0),
+                    NextValue(register, phy.source.data),
+                    NextState(f"{name}-END")
+                )
+            )
+            end(f"{name}-END", next_state)
+        def wait_wip(name, next_state):
+            command(name, SPIFLASH_RDSR, f"{name}-STATUS", with_address=False, last=False)
+            fsm.act(f"{name}-STATUS",
+                self.cs_n.eq(0),
+                phy.sink.valid.eq(~pending),
+                phy.sink.width.eq(1),
+                phy.sink.capture.eq(1),
+                phy.source.ready.eq(1),
+                If(phy.sink.ready,
+                    NextValue(pending, 1)
+                ),
+                If(phy.source.valid,
+                    NextValue(pending, 0),
+                    If(phy.source.data[0],
+                        NextState(f"{name}-RETRY")
+                    ).Else(
+                        NextState(f"{name}-END")
+                    )
+                )
+            )
+            end(f"{name}-RETRY", name)
+            end(f"{name}-END",   next_state)
+
+        next_page = Signal()
+        mismatch  = Signal()
+        self.fsm = fsm = ResetInserter()(FSM(reset_state="QE"))
+        self.comb += fsm.reset.eq(self.enable.re)
+
+        # Quad Enable.
+        sr1 = Signal(8)
+        cr1 = Signal(8)
+        fsm.act("QE",
+            If(self.enable.storage & self.quad_enable.storage,
+                NextState("QE-RDSR")
+            ).Else(
+                NextState("FILL")
+            )
+        )
+        read_register("QE-RDSR", SPIFLASH_RDSR, sr1, "QE-RDCR")
+        read_register("QE-RDCR", SPIFLASH_RDCR, cr1, "QE-CHECK")
+        fsm.act("QE-CHECK",
+            If(cr1 & SPIFLASH_QUAD,
+                NextState("FILL")
+            ).Else(
+                NextState("QE-WREN")
+            )
+        )
+        command("QE-WREN", SPIFLASH_WREN, "QE-WRR", with_address=False)
+        command("QE-WRR",  SPIFLASH_WRR,  "QE-WAIT", with_address=False, data=[sr1, cr1 | SPIFLASH_QUAD])
+        wait_wip("QE-WAIT", "FILL")
+
+        # Collect page.
+        fsm.act("FILL",
+            sink.ready.eq(self.enable.storage),
+            wr_port.adr.eq(wr_ptr),
+            wr_port.dat_w.eq(sink.data),
+            If(sink.valid & sink.ready,
+                wr_port.we.eq(1),
+                NextValue(wr_ptr, wr_ptr + 1),
+                If(wr_ptr == (page_words - 1),
+                    NextValue(wr_ptr, 0),
+                    If(self.erase.storage & (address[:log2_int(sector_size)] == 0),
+                        NextState("ERASE-WREN")
+                    ).Else(
+                        NextState("PROGRAM-WREN")
+                    )
+                )
+            )
+        )
+        self.sync += [
+            If(self.enable.re,
+                address.eq(self.address.storage),
+                self.pages.status.eq(0),
+                self.errors.status.eq(0),
+            ).Else(
+                If(next_page,
+                    address.eq(address + page_size),
+                    self.pages.status.eq(self.pages.status + 1),
+                ),
+                If(mismatch,
+                    If(self.errors.status == 0,
+                        self.error_address.status.eq(address + byte)
+                    ),
+                    self.errors.status.eq(self.errors.status + 1)
+                )
+            )
+        ]
+        self.comb += self.busy.status.eq(~fsm.ongoing("FILL"))
+
+        # Erase.
+        command("ERASE-WREN", SPIFLASH_WREN, "ERASE",      with_address=False)
+        command("ERASE",      SPIFLASH_4SE,  "ERASE-WAIT")
+        wait_wip("ERASE-WAIT", "PROGRAM-WREN")
+
+        # Program.
+        command("PROGRAM-WREN", SPIFLASH_WREN, "PROGRAM",   with_address=False)
+        command("PROGRAM",      SPIFLASH_4QPP, "PROGRAM-DATA", last=False)
+        fsm.act("PROGRAM-DATA",
+            self.cs_n.eq(0),
+            phy.sink.valid.eq(1),
+            phy.sink.width.eq(4),
+            phy.sink.oe.eq(1),
+            phy.sink.data.eq(data),
+            If(phy.sink.ready,
+                NextValue(byte, byte + 1),
+                If(byte == (page_size - 1),
+                    NextValue(byte, 0),
+                    NextState("PROGRAM-END")
+                )
+            )
+        )
+        end("PROGRAM-END", "PROGRAM-WAIT")
+        wait_wip("PROGRAM-WAIT", "VERIFY")
+
+        # Verify.
+        fsm.act("VERIFY",
+            If(self.verify.storage,
+                NextState("VERIFY-CMD")
+            ).Else(
+                NextState("NEXT")
+            )
+        )
+        command("VERIFY-CMD", SPIFLASH_4QOR, "VERIFY-DUMMY", last=False)
+        fsm.act("VERIFY-DUMMY", # 8 dummy cycles.
+            self.cs_n.eq(0),
+            phy.sink.valid.eq(1),
+            phy.sink.width.eq(4),
+            If(phy.sink.ready,
+                NextValue(index, index + 1),
+                If(index == (4 - 1),
+                    NextValue(index, 0),
+                    NextState("VERIFY-DATA")
+                )
+            )
+        )
+        fsm.act("VERIFY-DATA",
+            self.cs_n.eq(0),
+            phy.sink.valid.eq(~pending),
+            phy.sink.width.eq(4),
+            phy.sink.capture.eq(1),
+            phy.source.ready.eq(1),
+            If(phy.sink.ready,
+                NextValue(pending, 1)
+            ),
+            If(phy.source.valid,
+                NextValue(pending, 0),
+                mismatch.eq(phy.source.data != data),
+                NextValue(byte, byte + 1),
+                If(byte == (page_size - 1),
+                    NextValue(byte, 0),
+                    NextState("VERIFY-END")
+                )
+            )
+        )
+        end("VERIFY-END", "NEXT")
+
+        # Next page.
+        fsm.act("NEXT",
+            next_page.eq(1),
+            NextState("FILL")
+        )
+
+# QSPI Flash ---------------------------------------------------------------------------------------
+
+class S7QSPIFlash(LiteXModule):
+    """Xilinx 7-Series QSPI Flash with legacy SPIMaster and QSPI programmer.
+
+    The SPIMaster (and the cs_n signal, to drive from a GPIOOut) keep the CSR interface used by the
+    LitePCIe driver/utilities for identification, status and small accesses; the pads are switched to
+    the programmer while it is enabled.
+    """
+    def __init__(self, pads, cs_n_pads, sys_clk_freq, spi_clk_freq=25e6, qspi_clk_freq=50e6, **kwargs):
+        self.cs_n = Signal()
+
+        # # #
+
+        # Legacy SPI Master.
+        self.spi = spi = SPIMaster(None, 40, sys_clk_freq, spi_clk_freq)
+
+        # QSPI PHY / Programmer.
+        div = max(int(math.ceil(sys_clk_freq/(2*qspi_clk_freq))), 1)
+        self.phy        = phy        = QSPIFlashPHY(div=div)
+        self.programmer = programmer = QSPIFlashProgrammer(phy, **kwargs)
+
+        # Pads Mux.
+        clk   = Signal()
+        dq_o  = Signal(4)
+        dq_oe = Signal(4)
+        dq_i  = Signal(4)
+        self.comb += [
+            If(programmer.enable.storage,
+                clk.eq(phy.clk),
+                dq_o.eq(phy.dq_o),
+                dq_oe.eq(phy.dq_oe),
+                cs_n_pads.eq(programmer.cs_n),
+            ).Else(
+                clk.eq(spi.pads.clk),
+                dq_o.eq(Cat(spi.pads.mosi, 0, 1, 1)),
+                dq_oe.eq(0b1101),
+                cs_n_pads.eq(self.cs_n),
+            ),
+            phy.dq_i.eq(dq_i),
+            spi.pads.miso.eq(dq_i[1]),
+        ]
+
+        # IOs.
+        for n, name in enumerate(["mosi", "miso", "wp", "hold"]):
+            t = TSTriple()
+            self.specials += t.get_tristate(getattr(pads, name))
+            self.comb += [
+                t.o.eq(dq_o[n]),
+                t.oe.eq(dq_oe[n]),
+                dq_i[n].eq(t.i),
+            ]
+        self.specials += Instance("STARTUPE2",
+            i_CLK       = 0,
+            i_GSR       = 0,
+            i_GTS       = 0,
+            i_KEYCLEARB = 0,
+            i_PACK      = 0,
+            i_USRCCLKO  = clk,
+            i_USRCCLKTS = 0,
+            i_USRDONEO  = 1,
+            i_USRDONETS = 1,
+        )
+
+# PCIe Reconfiguration Router ----------------------------------------------------------------------
+
+RECONFIG_SEL_ICAP  = 0
+RECONFIG_SEL_FLASH = 1
+
+class PCIeReconfigRouter(LiteXModule):
+    """Routes a DMA stream to the ICAP or to the Flash programmer.
+
+    Only length words are forwarded after start, the rest of the stream is dropped: the LitePCIe
+    DMA reader loops over its buffers, so stale buffers must not reach the ICAP/Flash.
+    """
+    def __init__(self, icap_sink, flash_sink):
+        self.sink = sink = stream.Endpoint([("data", 32)])
+
+        self.sel    = CSRStorage(description="Destination (0: ICAP, 1: Flash).")
+        self.length = CSRStorage(32, description="Number of 32-bit words to forward.")
+        self.start  = CSR()
+        self.count  = CSRStatus(32, description="Forwarded words count.")
+
+        # # #
+
+        self.sync += [
+            If(self.start.re,
+                self.count.status.eq(0)
+            ).Elif(sink.valid & sink.ready & (self.count.status < self.length.storage),
+                self.count.status.eq(self.count.status + 1)
+            )
+        ]
+        self.comb += [
+            If(self.count.status < self.length.storage,
+                Case(self.sel.storage, {
+                    RECONFIG_SEL_ICAP  : sink.connect(icap_sink),
+                    RECONFIG_SEL_FLASH : sink.connect(flash_sink),
+                })
+            ).Else(
+                sink.ready.eq(1)
+            )
+        ]
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_pcie_reconfig(soc, dma_channel, flash_pads, flash_cs_n_pads, icap_clk_divider=2, qspi_clk_freq=50e6):
+    """Add DMA-fed ICAP and QSPI Flash programmer to a PCIe SoC (replaces ICAP/Flash/Flash CS_N).
+
+    The icap, flash and flash_cs_n modules keep the CSR names used by the LitePCIe driver; the
+    reconfig router selects the destination of the reader stream of PCIe DMA dma_channel, exported
+    as RECONFIG_DMA_CHANNEL for the host tool (/dev/litepcie<RECONFIG_DMA_CHANNEL>).
+    """
+    platform = soc.platform
+    dma      = getattr(soc, f"pcie_dma{dma_channel}")
+    soc.add_constant("RECONFIG_DMA_CHANNEL", dma_channel)
+
+    # ICAP.
+    icap = ICAPStreamer(clk_divider=icap_clk_divider)
+    icap.add_reload()
+    icap.add_timing_constraints(platform, soc.sys_clk_freq, soc.crg.cd_sys.clk)
+    soc.add_module(name="icap", module=icap)
+
+    # Flash.
+    flash = S7QSPIFlash(flash_pads, flash_cs_n_pads, soc.sys_clk_freq, 25e6, qspi_clk_freq)
+    soc.add_module(name="flash",      module=flash)
+    soc.add_module(name="flash_cs_n", module=GPIOOut(flash.cs_n))
+
+    # DMA -> ICAP/Flash.
+    conv   = stream.Converter(len(dma.source.data), 32)
+    router = PCIeReconfigRouter(icap.sink, flash.programmer.sink)
+    soc.add_module(name="reconfig_conv", module=conv)
+    soc.add_module(name="reconfig",      module=router)
+    soc.comb += [
+        dma.source.connect(conv.sink),
+        conv.source.connect(router.sink),
+    ]
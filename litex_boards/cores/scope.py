@@ -0,0 +1,290 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+from litescope.core import core_layout, _Mux, _Trigger, _SubSampler, LiteScopeAnalyzer
+
+# LiteScope DMA Storage ----------------------------------------------------------------------------
+
+class _DMAStorage(LiteXModule):
+    """Analyzer storage in external memory (ring buffer) or streamed to a DMA (ex PCIe to host memory).
+
+    Samples are padded to sample_width bits (power of 2) and packed in DMA words. In memory mode, the
+    ring buffer (length samples at base) keeps the last offset samples before the trigger and the
+    samples following it (length - offset, less up to a DMA word to end on a word boundary); in
+    stream mode, all the samples since enable are streamed until length - offset samples following
+    the trigger have been sent, padded to align bytes.
+
+    count/trigger/end give the written samples, the trigger sample and the sample following the last
+    one (ring indexes in memory mode, stream indexes in stream mode). Samples that could not be
+    written (DMA bandwidth lower than the sample rate) set overflow.
+    """
+    def __init__(self, data_width, dma, base=0, cdc_depth=512, align=8192):
+        self.sink = sink = stream.Endpoint(core_layout(data_width))
+
+        self.sample_width = sample_width = max(8, 2**bits_for(data_width - 1))
+
+        self.enable   = CSRStorage()
+        self.done     = CSRStatus()
+        self.base     = CSRStorage(64, reset=base, description="Ring buffer base (byte address).")
+        self.length   = CSRStorage(32, description="Samples to capture (ring buffer size).")
+        self.offset   = CSRStorage(32, description="Samples to keep before the trigger.")
+        self.count    = CSRStatus(32,  description="Written samples.")
+        self.trigger  = CSRStatus(32,  description="Trigger sample index.")
+        self.end      = CSRStatus(32,  description="Index following the last sample.")
+        self.overflow = CSRStatus(description="Samples lost (DMA bandwidth lower than the sample rate).")
+
+        # # #
+
+        # DMA (Memory: LiteDRAM Native/AXI port, Stream: Endpoint).
+        self.memory = memory = not isinstance(dma, stream.Endpoint)
+        if memory:
+            from litedram.frontend.dma import LiteDRAMDMAWriter
+            from litedram.frontend.axi import LiteDRAMAXIPort
+            self.writer = writer = LiteDRAMDMAWriter(dma, fifo_depth=32, fifo_buffered=True)
+            dma_width   = dma.data_width
+            byte_addr   = isinstance(dma, LiteDRAMAXIPort)
+            if byte_addr:
+                # Single beat bursts (len=0).
+                self.comb += [
+                    dma.aw.burst.eq(0b01), # INCR.
+                    dma.w.last.eq(1),
+                ]
+        else:
+            dma_width = len(dma.data)
+
+        # Control (sys) and re-synchronization (scope).
+        start     = Signal()
+        enable_sd = Signal()
+        self.sync += enable_sd.eq(self.enable.storage)
+        self.comb += start.eq(self.enable.storage & ~enable_sd)
+        enable   = Signal()
+        enable_d = Signal()
+        self.specials += MultiReg(self.enable.storage, enable, "scope")
+        self.sync.scope += enable_d.eq(enable)
+
+        # Clock Domain Crossing (scope -> sys), samples are never back-pressured (overflow).
+        self.cdc = cdc = ClockDomainsRenamer({"write": "scope", "read": "sys"})(
+            stream.AsyncFIFO([("data", sample_width), ("hit", 1)], cdc_depth, buffered=True))
+        overflow = Signal()
+        self.comb += [
+            sink.ready.eq(1),
+            cdc.sink.valid.eq(sink.valid & enable),
+            cdc.sink.data.eq(sink.data),
+            cdc.sink.hit.eq(sink.hit),
+        ]
+        self.sync.scope += [
+            If(enable & ~enable_d,
+                overflow.eq(0)
+            ).Elif(cdc.sink.valid & ~cdc.sink.ready,
+                overflow.eq(1)
+            )
+        ]
+        self.specials += MultiReg(overflow, self.overflow.status)
+
+        # Packing (samples -> DMA words).
+        self.dma_width = dma_width
+        self.converter = converter = ResetInserter()(stream.Converter(sample_width, dma_width))
+        self.comb += converter.reset.eq(start)
+
+        # Pointers.
+        ratio  = max(dma_width//sample_width, 1) # Samples per word.
+        length = self.length.storage
+        count  = Signal(32)
+        index  = Signal(32)
+        post   = Signal(32)
+        index_next = Signal(32)
+        self.comb += [
+            self.count.status.eq(count),
+            index_next.eq(index + 1),
+        ]
+        if memory:
+            self.comb += If(index == (length - 1), index_next.eq(0))
+
+        # FSM.
+        accept = Signal()
+        self.comb += accept.eq(cdc.source.valid & converter.sink.ready)
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            self.done.status.eq(1),
+            cdc.source.ready.eq(1),
+            If(start,
+                NextValue(count, 0),
+                NextValue(index, 0),
+                NextState("PRE")
+            )
+        )
+        fsm.act("PRE",
+            cdc.source.connect(converter.sink, omit={"hit"}),
+            If(accept,
+                NextValue(count, count + 1),
+                NextValue(index, index_next),
+                If(cdc.source.hit,
+                    NextValue(self.trigger.status, index),
+                    NextValue(post, length - self.offset.storage - (ratio if memory else 1)),
+                    NextState("POST")
+                )
+            ),
+            If(~self.enable.storage,
+                NextState("IDLE")
+            )
+        )
+        aligned = (index[:log2_int(ratio)] == 0) if ratio > 1 else 1
+        fsm.act("POST",
+            If((post == 0) & aligned,
+                NextValue(self.end.status, index),
+                NextState("FLUSH")
+            ).Else(
+                cdc.source.connect(converter.sink, omit={"hit"}),
+                If(accept,
+                    NextValue(count, count + 1),
+                    NextValue(index, index_next),
+                    If(post != 0,
+                        NextValue(post, post - 1)
+                    )
+                )
+            ),
+            If(~self.enable.storage,
+                NextState("IDLE")
+            )
+        )
+        # Wait for the last words to be written.
+        flush_done = Signal()
+        if memory:
+            self.comb += flush_done.eq(~converter.source.valid & ~writer.fifo.source.valid)
+        else:
+            self.comb += flush_done.eq(~converter.source.valid)
+        fsm.act("FLUSH",
+            cdc.source.ready.eq(1),
+            If(flush_done,
+                NextState("PAD" if not memory else "IDLE")
+            )
+        )
+
+        # DMA Write (Memory: Ring buffer at base, Stream: Data + Padding to align).
+        if memory:
+            word  = Signal(32)
+            words = Signal(32)
+            shift = log2_int(dma_width//8)
+            if ratio > 1:
+                self.comb += words.eq(length >> log2_int(ratio))
+            else:
+                self.comb += words.eq(length << log2_int(sample_width//dma_width))
+            self.comb += [
+                converter.source.connect(writer.sink, omit={"address"}),
+                writer.sink.address.eq((self.base.storage >> (0 if byte_addr else shift)) +
+                    (word << (shift if byte_addr else 0))),
+            ]
+            self.sync += [
+                If(start,
+                    word.eq(0)
+                ).Elif(writer.sink.valid & writer.sink.ready,
+                    word.eq(word + 1),
+                    If(word == (words - 1),
+                        word.eq(0)
+                    )
+                )
+            ]
+        else:
+            pad = Signal(max=max(align*8//dma_width, 2))
+            self.sync += [
+                If(start,
+                    pad.eq(0)
+                ).Elif(dma.valid & dma.ready,
+                    pad.eq(pad + 1)
+                )
+            ]
+            self.comb += If(fsm.ongoing("PAD"),
+                dma.valid.eq(pad != 0),
+                dma.data.eq(0),
+            ).Else(
+                converter.source.connect(dma)
+            )
+            fsm.act("PAD",
+                cdc.source.ready.eq(1),
+                If(pad == 0,
+                    NextState("IDLE")
+                )
+            )
+
+# LiteScope DMA Analyzer ---------------------------------------------------------------------------
+
+class LiteScopeDMAAnalyzer(LiteScopeAnalyzer):
+    """LiteScope Analyzer with deep captures in external memory or streamed to the host.
+
+    Same Mux/Trigger/SubSampler (and CSRs/analyzer.csv) as LiteScopeAnalyzer, with the BRAM storage
+    replaced by _DMAStorage: dma is a LiteDRAM Native/AXI port (ex from the LiteDRAM crossbar or
+    connected to a HBM AXI channel), depth samples at base, or a stream Endpoint (ex LitePCIe DMA
+    writer sink, to host memory). bus_base is the address of base on the main bus, from which the
+    host reads the captures (litex_boards/tools/litescope_dma.py).
+    """
+    def __init__(self, groups, depth, dma,
+        base          = 0,
+        bus_base      = None,
+        samplerate    = 1e12,
+        clock_domain  = "sys",
+        trigger_depth = 16,
+        register      = False,
+        cdc_depth     = 512,
+        csr_csv       = "analyzer.csv",
+    ):
+        self.groups     = groups = self.format_groups(groups)
+        self.depth      = depth
+        self.samplerate = int(samplerate)
+        self.bus_base   = base if bus_base is None else bus_base
+
+        self.data_width = data_width = max([sum([len(s) for s in g]) for g in groups.values()])
+
+        self.csr_csv = csr_csv
+
+        # # #
+
+        # Create scope clock domain.
+        self.cd_scope = ClockDomain()
+        self.comb += self.cd_scope.clk.eq(ClockSignal(clock_domain))
+
+        # Mux.
+        self.mux = _Mux(data_width, len(groups))
+        sd = getattr(self.sync, clock_domain)
+        for i, signals in groups.items():
+            s = Cat(signals)
+            if register:
+                s_d = Signal(len(s))
+                sd += s_d.eq(s)
+                s = s_d
+            self.comb += [
+                self.mux.sinks[i].valid.eq(1),
+                self.mux.sinks[i].data.eq(s)
+            ]
+
+        # Frontend.
+        self.trigger    = _Trigger(data_width, depth=trigger_depth)
+        self.subsampler = _SubSampler(data_width)
+
+        # Storage.
+        self.storage = _DMAStorage(data_width, dma, base=base, cdc_depth=cdc_depth)
+
+        # Pipeline: Mux -> Trigger -> Subsampler -> Storage.
+        self.pipeline = stream.Pipeline(
+            self.mux,
+            self.trigger,
+            self.subsampler,
+            self.storage,
+        )
+
+    def export_csv(self, vns, filename):
+        LiteScopeAnalyzer.export_csv(self, vns, filename)
+        with open(filename, "a") as f:
+            f.write(f"config,None,sample_width,{self.storage.sample_width}\n")
+            f.write(f"config,None,dma_width,{self.storage.dma_width}\n")
+            f.write(f"config,None,stream,{int(not self.storage.memory)}\n")
+            f.write(f"config,None,bus_base,{self.bus_base}\n")
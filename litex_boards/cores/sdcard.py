@@ -0,0 +1,30 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import math
+
+# SDCard -------------------------------------------------------------------------------------------
+
+def get_sdcard_clk_freq(sys_clk_freq, clk_freq):
+    """Return the effective SDCard clock frequency generated by the LiteSDCard PHY clocker.
+
+    The clocker divides sys_clk by a power of 2 between 2 and 256. The divider is rounded up so that
+    the effective frequency never exceeds clk_freq.
+    """
+    divider = math.ceil(sys_clk_freq/clk_freq)
+    divider = 2**(max(divider, 1) - 1).bit_length()
+    divider = min(max(divider, 2), 256)
+    return sys_clk_freq/divider
+
+def add_sdcard_dma(soc, name="sdcard", sdcard_name="sdcard", mode="read+write", clk_freq=25e6):
+    """Add a 4-bit SDCard with Block2Mem/Mem2Block DMAs running at the highest supported clock.
+
+    The BIOS/Linux drivers already use multi-block (CMD18/CMD25) DMA transfers with LiteSDCard;
+    clk_freq should be set to the highest frequency the board's SDCard wiring supports (up to 50MHz
+    with High-Speed cards, the BIOS switches the card to SDR25 during initialization).
+    """
+    assert clk_freq <= 50e6
+    soc.add_sdcard(name=name, sdcard_name=sdcard_name, mode=mode)
+    soc.add_constant("SDCARD_CLK_FREQ", int(get_sdcard_clk_freq(soc.sys_clk_freq, clk_freq)))
@@ -0,0 +1,324 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import re
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+# Constants ----------------------------------------------------------------------------------------
+
+NS_PER_SEC = int(1e9)
+
+TIMESTAMP_CHANNEL_PPS_IN  = 0
+TIMESTAMP_CHANNEL_PPS_OUT = 1
+TIMESTAMP_CHANNEL_SOFT    = 2
+TIMESTAMP_CHANNEL_NULL    = 0xff # Padding events.
+
+# Event: 128-bit, little-endian in host memory:
+# - [  0:  8] : Channel.
+# - [  8: 32] : Sequence number (Global, detects lost events).
+# - [ 32: 80] : Seconds.
+# - [ 80:112] : Nanoseconds.
+# - [112:128] : Fractional nanoseconds (1/65536 ns).
+timestamp_event_layout = [
+    ("channel",   8),
+    ("seq",      24),
+    ("sec",      48),
+    ("ns",       32),
+    ("frac",     16),
+]
+
+# Time of Day --------------------------------------------------------------------------------------
+
+class TimeOfDay(LiteXModule):
+    """PTP Hardware Clock style Time-of-Day counter.
+
+    Seconds (48-bit) + Nanoseconds (32-bit) + Fractional Nanoseconds (32-bit), incremented every
+    sys_clk cycle by a 32.32 fixed-point ns increment. The CSRs map to the PHC operations:
+    - settime  : time_set_sec/time_set_ns then time_set.
+    - gettime  : time_latch then time_sec/time_ns/time_frac.
+    - adjfine  : increment (ns per cycle, 32.32 fixed-point).
+    - adjtime  : offset (signed ns, |offset| < 1s, applied atomically on write).
+    The PPS output is asserted for pps_width cycles on each second rollover.
+    """
+    def __init__(self, sys_clk_freq):
+        self.sec  = Signal(48)
+        self.ns   = Signal(32)
+        self.frac = Signal(32)
+        self.pps  = Signal()
+
+        increment = int(round(1e9/sys_clk_freq*2**32))
+        self.increment    = CSRStorage(64, reset=increment,       description="Nanoseconds per cycle (32.32 fixed-point).")
+        self.offset       = CSRStorage(32,                        description="Signed nanoseconds offset, applied on write.")
+        self.time_set_sec = CSRStorage(48,                        description="Seconds to set.")
+        self.time_set_ns  = CSRStorage(32,                        description="Nanoseconds to set.")
+        self.time_set     = CSR()
+        self.time_latch   = CSR()
+        self.time_sec     = CSRStatus(48,                         description="Latched Seconds.")
+        self.time_ns      = CSRStatus(32,                         description="Latched Nanoseconds.")
+        self.time_frac    = CSRStatus(32,                         description="Latched Fractional Nanoseconds.")
+        self.pps_width    = CSRStorage(32, reset=int(sys_clk_freq/10), description="PPS Output width (in cycles).")
+
+        # # #
+
+        # Counter.
+        ns_frac      = Signal(64)
+        offset       = Signal((32, True))
+        ns_frac_next = Signal((66, True))
+        rollover     = Signal()
+        self.comb += [
+            offset.eq(self.offset.storage),
+            ns_frac_next.eq(ns_frac + self.increment.storage),
+            If(self.offset.re,
+                ns_frac_next.eq(ns_frac + self.increment.storage + (offset << 32))
+            ),
+            self.ns.eq(ns_frac[32:]),
+            self.frac.eq(ns_frac[:32]),
+        ]
+        self.sync += [
+            rollover.eq(0),
+            If(self.time_set.re,
+                self.sec.eq(self.time_set_sec.storage),
+                ns_frac.eq(self.time_set_ns.storage << 32)
+            ).Elif(ns_frac_next >= (NS_PER_SEC << 32),
+                self.sec.eq(self.sec + 1),
+                ns_frac.eq(ns_frac_next - (NS_PER_SEC << 32)),
+                rollover.eq(1)
+            ).Elif(ns_frac_next < 0,
+                self.sec.eq(self.sec - 1),
+                ns_frac.eq(ns_frac_next + (NS_PER_SEC << 32))
+            ).Else(
+                ns_frac.eq(ns_frac_next)
+            )
+        ]
+
+        # Latch.
+        self.sync += If(self.time_latch.re,
+            self.time_sec.status.eq(self.sec),
+            self.time_ns.status.eq(self.ns),
+            self.time_frac.status.eq(self.frac),
+        )
+
+        # PPS Output.
+        pps_count = Signal(32)
+        self.sync += [
+            If(rollover,
+                pps_count.eq(self.pps_width.storage)
+            ).Elif(pps_count != 0,
+                pps_count.eq(pps_count - 1)
+            )
+        ]
+        self.comb += self.pps.eq(pps_count != 0)
+
+# Timestamp Capture --------------------------------------------------------------------------------
+
+class TimestampCapture(LiteXModule):
+    """Timestamps rising edges of asynchronous inputs against the Time-of-Day counter.
+
+    Inputs are resynchronized (2 stages) before edge detection: events are timestamped with a fixed
+    2 sys_clk cycles delay that software can compensate (TIMESTAMP_CAPTURE_DELAY_CYCLES). Events are
+    pushed to a FIFO; overflow counts events lost when the FIFO is full.
+    """
+    def __init__(self, tod, inputs, fifo_depth=1024):
+        self.source = stream.Endpoint(timestamp_event_layout)
+
+        self.enable    = CSRStorage(len(inputs), reset=2**len(inputs)-1, description="Channels enable.")
+        self.trigger   = CSR()
+        self.count     = CSRStatus(32, description="Captured events count.")
+        self.overflow  = CSRStatus(32, description="Lost events count (FIFO full).")
+        self.level     = CSRStatus(16, description="Event FIFO level.")
+
+        # # #
+
+        # Edge detection.
+        edges = Signal(len(inputs))
+        for n, i in enumerate(inputs):
+            if i is None: # Software trigger.
+                self.comb += edges[n].eq(self.trigger.re)
+                continue
+            i_sync = Signal()
+            i_d    = Signal()
+            self.specials += MultiReg(i, i_sync)
+            self.sync += i_d.eq(i_sync)
+            self.comb += edges[n].eq(i_sync & ~i_d)
+
+        # Pending events (Inputs need 2 cycles between rising edges, so at most one per channel).
+        pending = Signal(len(inputs))
+        ts      = Array(Signal(96) for _ in inputs)
+        for n in range(len(inputs)):
+            self.sync += If(edges[n] & self.enable.storage[n],
+                ts[n].eq(Cat(tod.sec, tod.ns, tod.frac[16:]))
+            )
+
+        # Arbitration (Fixed priority, one event per cycle) and FIFO.
+        self.fifo = fifo = stream.SyncFIFO(timestamp_event_layout, fifo_depth, buffered=True)
+        seq   = Signal(24)
+        grant = Signal(max=max(len(inputs), 2))
+        self.comb += [
+            If(pending != 0,
+                fifo.sink.valid.eq(1),
+                fifo.sink.channel.eq(grant),
+                fifo.sink.seq.eq(seq),
+                Cat(fifo.sink.sec, fifo.sink.ns, fifo.sink.frac).eq(ts[grant]),
+            ),
+            self.level.status.eq(fifo.level),
+        ]
+        for n in reversed(range(len(inputs))):
+            self.comb += If(pending[n], grant.eq(n))
+        clear = Signal(len(inputs))
+        self.comb += If(pending != 0, clear.eq(1 << grant))
+        self.sync += [
+            pending.eq((pending & ~clear) | (edges & self.enable.storage)),
+            If(pending != 0,
+                seq.eq(seq + 1),
+                If(fifo.sink.ready,
+                    self.count.status.eq(self.count.status + 1)
+                ).Else(
+                    self.overflow.status.eq(self.overflow.status + 1)
+                )
+            )
+        ]
+        self.comb += fifo.source.connect(self.source)
+
+# Timestamp Block Packetizer -----------------------------------------------------------------------
+
+class TimestampBlockPacketizer(LiteXModule):
+    """Packs events in fixed-size blocks matching the host DMA buffers (Interrupt moderation).
+
+    LitePCIe DMA writers raise (at most) one MSI per buffer: a block is only emitted when count
+    events are pending or when timeout cycles have elapsed since the first pending event, and is
+    padded with null events (channel 0xff) once the event FIFO is empty. This bounds the interrupt
+    rate while keeping the capture-to-host latency under timeout.
+    """
+    def __init__(self, block_events, timeout=1000):
+        self.sink   = sink   = stream.Endpoint(timestamp_event_layout)
+        self.source = source = stream.Endpoint([("data", 128)])
+        self.level  = level  = Signal(16) # Event FIFO level.
+
+        self.count   = CSRStorage(16, reset=block_events, description="Emit a block when count events are pending.")
+        self.timeout = CSRStorage(32, reset=timeout,      description="Emit a block timeout cycles after the first pending event.")
+        self.blocks  = CSRStatus(32, description="Emitted blocks count.")
+
+        # # #
+
+        timer = Signal(32)
+        index = Signal(max=block_events)
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(sink.valid & ((level >= self.count.storage) | (timer >= self.timeout.storage)),
+                NextState("BLOCK")
+            )
+        )
+        self.sync += [
+            If(fsm.ongoing("IDLE") & sink.valid,
+                timer.eq(timer + 1)
+            ).Else(
+                timer.eq(0)
+            )
+        ]
+        fsm.act("BLOCK",
+            source.valid.eq(1),
+            source.last.eq(index == (block_events - 1)),
+            If(sink.valid,
+                sink.ready.eq(source.ready),
+                source.data.eq(sink.payload.raw_bits()),
+            ).Else(
+                source.data.eq(TIMESTAMP_CHANNEL_NULL),
+            ),
+            If(source.ready,
+                NextValue(index, index + 1),
+                If(source.last,
+                    NextValue(index, 0),
+                    NextValue(self.blocks.status, self.blocks.status + 1),
+                    NextState("IDLE")
+                )
+            )
+        )
+
+# Timestamping -------------------------------------------------------------------------------------
+
+class Timestamping(LiteXModule):
+    """Time-of-Day counter, PPS In/Out and event capture, streamed as blocks of 128-bit events."""
+    def __init__(self, sys_clk_freq, pps_in=None, pps_out=None, inputs=None, block_size=256, fifo_depth=1024, timeout=10e-6):
+        assert block_size % 16 == 0
+        self.source = stream.Endpoint([("data", 128)])
+
+        # # #
+
+        if pps_in is None:
+            pps_in = Signal()
+        if inputs is None:
+            inputs = []
+
+        # Time of Day.
+        self.tod = tod = TimeOfDay(sys_clk_freq)
+        if pps_out is not None:
+            self.comb += pps_out.eq(tod.pps)
+
+        # Capture (PPS In, PPS Out loopback, Software trigger, Extra inputs).
+        self.capture = TimestampCapture(tod, [pps_in, tod.pps, None] + inputs, fifo_depth=fifo_depth)
+
+        # Packetizer.
+        self.packetizer = TimestampBlockPacketizer(
+            block_events = block_size//16,
+            timeout      = int(timeout*sys_clk_freq),
+        )
+        self.comb += [
+            self.capture.source.connect(self.packetizer.sink),
+            self.packetizer.level.eq(self.capture.fifo.level),
+            self.packetizer.source.connect(self.source),
+        ]
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_pcie_timestamping(soc, name="timestamping", dma=None, pads=None, inputs=None, block_size=256, timeout=10e-6):
+    """Add Timestamping to a PCIe SoC, events are streamed to the host through dma's writer.
+
+    pads (optional) provide PPS In (i) and PPS Out (o), the PPS In channel is idle without them. For
+    the lowest latency, the host driver's DMA_BUFFER_SIZE should match block_size and
+    DMA_BUFFER_PER_IRQ be 1 (see set_litepcie_dma_buffering).
+    """
+    pps_in  = getattr(pads, "i", None)
+    pps_out = getattr(pads, "o", None)
+    timestamping = Timestamping(soc.sys_clk_freq,
+        pps_in     = pps_in,
+        pps_out    = pps_out,
+        inputs     = inputs,
+        block_size = block_size,
+        timeout    = timeout,
+    )
+    soc.add_module(name=name, module=timestamping)
+
+    # Events -> DMA.
+    conv = stream.Converter(128, len(dma.sink.data))
+    soc.add_module(name=f"{name}_conv", module=conv)
+    soc.comb += [
+        timestamping.source.connect(conv.sink),
+        conv.source.connect(dma.sink),
+    ]
+    soc.add_constant(f"{name.upper()}_BLOCK_SIZE", block_size)
+    soc.add_constant(f"{name.upper()}_CAPTURE_DELAY_CYCLES", 2)
+
+# LitePCIe Driver ----------------------------------------------------------------------------------
+
+def set_litepcie_dma_buffering(driver_dir, buffer_size, buffer_per_irq=1):
+    """Patch the generated LitePCIe kernel driver DMA buffering configuration.
+
+    Opt-in: the configuration is global to the driver, so it also applies to the other DMA channels
+    (ex PCIe reconfiguration streams, that must then use the same buffer size).
+    """
+    filename = f"{driver_dir}/kernel/config.h"
+    with open(filename) as f:
+        config = f.read()
+    config = re.sub(r"(#define DMA_BUFFER_SIZE\s+)\d+",    rf"\g<1>{buffer_size}",    config)
+    config = re.sub(r"(#define DMA_BUFFER_PER_IRQ\s+)\d+", rf"\g<1>{buffer_per_irq}", config)
+    with open(filename, "w") as f:
+        f.write(config)
@@ -0,0 +1,294 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import math
+
+from migen import *
+from migen.fhdl.simplify import FullMemoryWE
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.avalon import AvalonMMInterface
+
+from litex_boards.build.altera_qsys import add_qsys_system
+
+# MAX 10 DDR3 Configurations -----------------------------------------------------------------------
+
+# 512MB DDR3 (MT41K256M16, 16-bit) @ 300MHz (Half-Rate).
+_ddr3_512mb_x16 = {
+    "MEM_VENDOR"            : "Micron",
+    "MEM_FORMAT"            : "DISCRETE",
+    "MEM_CLK_FREQ"          : "300.0",
+    "REF_CLK_FREQ"          : "50.0",
+    "RATE"                  : "Half",
+    "MEM_DQ_WIDTH"          : "16",
+    "MEM_ROW_ADDR_WIDTH"    : "15",
+    "MEM_COL_ADDR_WIDTH"    : "10",
+    "MEM_BANKADDR_WIDTH"    : "3",
+    "MEM_TCL"               : "5",
+    "MEM_WTCL"              : "5",
+    "MEM_DRV_STR"           : "RZQ/6",
+    "MEM_RTT_NOM"           : "RZQ/6",
+    "MEM_RTT_WR"            : "Dynamic ODT off",
+    "MEM_TINIT_US"          : "500",
+    "MEM_TMRD_CK"           : "4",
+    "MEM_TRAS_NS"           : "35.0",
+    "MEM_TRCD_NS"           : "13.75",
+    "MEM_TRP_NS"            : "13.75",
+    "MEM_TREFI_US"          : "7.8",
+    "MEM_TRFC_NS"           : "260.0",
+    "MEM_TWR_NS"            : "15.0",
+    "MEM_TWTR"              : "4",
+    "MEM_TFAW_NS"           : "35.0",
+    "MEM_TRRD_NS"           : "7.5",
+    "MEM_TRTP_NS"           : "7.5",
+}
+
+_configs = {
+    "10M50DAF484C6GES" : {"memory" : _ddr3_512mb_x16, "speedgrade" : "6"}, # DECA.
+}
+
+# MAX 10 DDR3 --------------------------------------------------------------------------------------
+
+class Max10DDR3(LiteXModule):
+    """MAX 10 DDR3 memory (UniPHY soft controller/PHY) with a Wishbone slave.
+
+    Intel does not provide the MAX 10 DDR3 I/O primitives needed by a LiteDRAM PHY, so the controller
+    and PHY are the UniPHY ones, generated by Platform Designer at build time (see
+    litex_boards.build.altera_qsys) from the board memory configuration (selected from the device).
+    The controller Avalon-MM interface (afi_clk) is crossed to clock_domain in the generated system
+    and exposed as a Wishbone slave (bus, single accesses of the controller width, byte addresses
+    truncated to the memory size), the L2 cache of the SoC providing the bursts.
+
+    The PLL reference clock (ref_clk) must come from a clock pin able to reach the memory PLL, it can be
+    shared with the CRG. Calibration status is available in the status CSR.
+    """
+    def __init__(self, platform, pads, ref_clk, clock_domain="sys"):
+        assert platform.device in _configs.keys()
+        self.platform     = platform
+        self.clock_domain = clock_domain
+        self.config       = config = _configs[platform.device]
+        memory            = config["memory"]
+
+        dq_width          = int(memory["MEM_DQ_WIDTH"])
+        self.data_width   = data_width = {"Half": 4, "Quarter": 8}[memory["RATE"]]*dq_width
+        self.size         = (dq_width//8)*2**(
+            int(memory["MEM_ROW_ADDR_WIDTH"]) +
+            int(memory["MEM_COL_ADDR_WIDTH"]) +
+            int(memory["MEM_BANKADDR_WIDTH"]))
+        self.bus          = bus = wishbone.Interface(data_width=data_width, address_width=32, addressing="word")
+        self.status       = CSRStatus(fields=[
+            CSRField("init_done",   size=1, description="Controller initialized."),
+            CSRField("cal_success", size=1, description="Calibration successful."),
+            CSRField("cal_fail",    size=1, description="Calibration failed."),
+        ])
+
+        # # #
+
+        init_done   = Signal()
+        cal_success = Signal()
+        cal_fail    = Signal()
+        self.comb += [
+            self.status.fields.init_done.eq(init_done),
+            self.status.fields.cal_success.eq(cal_success),
+            self.status.fields.cal_fail.eq(cal_fail),
+        ]
+
+        # Wishbone -> Avalon-MM (Byte addresses).
+        self.avl = avl = AvalonMMInterface(data_width=data_width, adr_width=log2_int(self.size))
+        self.comb += [
+            avl.address.eq(bus.adr << log2_int(data_width//8)),
+            avl.writedata.eq(bus.dat_w),
+            avl.byteenable.eq(bus.sel),
+            avl.burstcount.eq(1),
+            bus.dat_r.eq(avl.readdata),
+        ]
+        self.fsm = fsm = ClockDomainsRenamer(clock_domain)(FSM(reset_state="IDLE"))
+        fsm.act("IDLE",
+            If(bus.cyc & bus.stb,
+                If(bus.we,
+                    NextState("WRITE")
+                ).Else(
+                    NextState("READ")
+                )
+            )
+        )
+        fsm.act("WRITE",
+            avl.write.eq(1),
+            If(~avl.waitrequest,
+                bus.ack.eq(1),
+                NextState("IDLE")
+            )
+        )
+        fsm.act("READ",
+            avl.read.eq(1),
+            If(~avl.waitrequest,
+                NextState("READ-DATA")
+            )
+        )
+        fsm.act("READ-DATA",
+            If(avl.readdatavalid,
+                bus.ack.eq(1),
+                NextState("IDLE")
+            )
+        )
+
+        # UniPHY.
+        self.ddr3_params = dict(
+            # Clk / Rst.
+            i_pll_ref_clk_clk      = ref_clk,
+            i_global_reset_reset_n = ~ResetSignal(clock_domain),
+            i_soft_reset_reset_n   = ~ResetSignal(clock_domain),
+
+            # Memory.
+            o_memory_mem_a         = pads.a,
+            o_memory_mem_ba        = pads.ba,
+            o_memory_mem_ck        = pads.clk_p,
+            o_memory_mem_ck_n      = pads.clk_n,
+            o_memory_mem_cke       = pads.cke,
+            o_memory_mem_cs_n      = pads.cs_n,
+            o_memory_mem_dm        = pads.dm,
+            o_memory_mem_ras_n     = pads.ras_n,
+            o_memory_mem_cas_n     = pads.cas_n,
+            o_memory_mem_we_n      = pads.we_n,
+            o_memory_mem_reset_n   = pads.reset_n,
+            io_memory_mem_dq       = pads.dq,
+            io_memory_mem_dqs      = pads.dqs_p,
+            io_memory_mem_dqs_n    = pads.dqs_n,
+            o_memory_mem_odt       = pads.odt,
+
+            # Status.
+            o_status_local_init_done   = init_done,
+            o_status_local_cal_success = cal_success,
+            o_status_local_cal_fail    = cal_fail,
+
+            # Avalon-MM (clock_domain).
+            i_avl_clk_clk          = ClockSignal(clock_domain),
+            i_avl_reset_reset_n    = ~ResetSignal(clock_domain),
+            i_avl_address          = avl.address,
+            i_avl_writedata        = avl.writedata,
+            o_avl_readdata         = avl.readdata,
+            o_avl_readdatavalid    = avl.readdatavalid,
+            i_avl_byteenable       = avl.byteenable,
+            i_avl_read             = avl.read,
+            i_avl_write            = avl.write,
+            o_avl_waitrequest      = avl.waitrequest,
+            i_avl_burstcount       = avl.burstcount[:1],
+            i_avl_debugaccess      = 0,
+        )
+
+        # OCT calibration resistor: board RZQ pin when described, else placed by the Fitter.
+        self.rzq_pin = not hasattr(pads, "rzq")
+        self.rzq     = Signal(name="ddram_rzq") if self.rzq_pin else pads.rzq
+        self.ddr3_params["i_oct_rzqin"] = self.rzq
+
+    # Platform Designer ----------------------------------------------------------------------------
+
+    def get_qsys_tcl(self):
+        memory     = self.config["memory"]
+        adr_width  = log2_int(self.size)
+        tcl = []
+        tcl.append("package require -exact qsys 16.1")
+        tcl.append("create_system ddr3")
+        tcl.append("set_project_property DEVICE_FAMILY {MAX 10}")
+        tcl.append(f"set_project_property DEVICE {{{self.platform.device}}}")
+
+        # Controller/PHY.
+        tcl.append("add_instance mem_if altera_mem_if_ddr3_emif")
+        params = {
+            "SPEED_GRADE"    : self.config["speedgrade"],
+            "AVL_MAX_SIZE"   : "1",
+        }
+        params.update(memory)
+        for k, v in params.items():
+            tcl.append(f"set_instance_parameter_value mem_if {{{k}}} {{{v}}}")
+
+        # Clock Crossing (afi_clk -> Avalon-MM clock).
+        tcl.append("add_instance cdc altera_avalon_mm_clock_crossing_bridge")
+        for k, v in {
+            "DATA_WIDTH"          : str(self.data_width),
+            "SYMBOL_WIDTH"        : "8",
+            "ADDRESS_WIDTH"       : str(adr_width),
+            "ADDRESS_UNITS"       : "SYMBOLS",
+            "MAX_BURST_SIZE"      : "1",
+            "COMMAND_FIFO_DEPTH"  : "16",
+            "RESPONSE_FIFO_DEPTH" : "32",
+            "MASTER_SYNC_DEPTH"   : "2",
+            "SLAVE_SYNC_DEPTH"    : "2",
+            }.items():
+            tcl.append(f"set_instance_parameter_value cdc {{{k}}} {{{v}}}")
+        tcl.append("add_connection mem_if.afi_clk cdc.m0_clk")
+        tcl.append("add_connection mem_if.afi_reset cdc.m0_reset")
+        tcl.append("add_connection cdc.m0 mem_if.avl")
+        tcl.append("set_connection_parameter_value cdc.m0/mem_if.avl baseAddress {0x0}")
+
+        # Exported interfaces.
+        for name, kind, direction, interface in [
+            ("pll_ref_clk",  "clock",   "sink",  "mem_if.pll_ref_clk"),
+            ("global_reset", "reset",   "sink",  "mem_if.global_reset"),
+            ("soft_reset",   "reset",   "sink",  "mem_if.soft_reset"),
+            ("memory",       "conduit", "end",   "mem_if.memory"),
+            ("oct",          "conduit", "end",   "mem_if.oct"),
+            ("status",       "conduit", "end",   "mem_if.status"),
+            ("avl_clk",      "clock",   "sink",  "cdc.s0_clk"),
+            ("avl_reset",    "reset",   "sink",  "cdc.s0_reset"),
+            ("avl",          "avalon",  "slave", "cdc.s0"),
+            ]:
+            tcl.append(f"add_interface {name} {kind} {direction}")
+            tcl.append(f"set_interface_property {name} EXPORT_OF {interface}")
+        tcl.append("save_system ddr3.qsys")
+        return "\n".join(tcl) + "\n"
+
+    # Finalize -------------------------------------------------------------------------------------
+
+    def do_finalize(self):
+        platform = self.platform
+        self.specials += Instance("ddr3", **self.ddr3_params)
+
+        # OCT RZQ pin (when not described by the platform): top-level port without location.
+        if self.rzq_pin:
+            cm     = platform.constraint_manager
+            get_io = cm.get_io_signals
+            cm.get_io_signals = lambda: get_io() | {self.rzq}
+
+        # Generate the controller with Platform Designer before synthesis, apply I/O settings after.
+        add_qsys_system(platform, "ddr3", self.get_qsys_tcl(),
+            pin_assignments = "ddr3_mem_if_p0_pin_assignments.tcl")
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def add_max10_ddr3(soc, ref_clk, name="ddr3", l2_cache_size=8192):
+    """Add the MAX 10 DDR3 memory as main_ram of a SoC (with optional L2 cache).
+
+    The BIOS runs its memtest/memspeed (bandwidth) self-tests on main_ram at boot, the controller
+    calibration status is available in the <name>_status CSR.
+    """
+    from litex.soc.integration.soc import SoCRegion
+
+    ddr3 = Max10DDR3(soc.platform, soc.platform.request("ddram"), ref_clk=ref_clk)
+    soc.add_module(name=name, module=ddr3)
+
+    # Wishbone Slave.
+    wb_ddr3 = wishbone.Interface(data_width=soc.bus.data_width, address_width=32, addressing="word")
+    soc.bus.add_slave(name="main_ram", slave=wb_ddr3, region=SoCRegion(
+        origin = soc.mem_map.get("main_ram", None),
+        size   = ddr3.size))
+
+    # L2 Cache.
+    if l2_cache_size != 0:
+        l2_cache_size = max(l2_cache_size, int(2*ddr3.data_width/8)) # Use minimal size if lower.
+        l2_cache_size = 2**int(math.log2(l2_cache_size))             # Round to nearest power of 2.
+        l2_cache = wishbone.Cache(
+            cachesize = l2_cache_size//4,
+            master    = wb_ddr3,
+            slave     = ddr3.bus)
+        soc.l2_cache = FullMemoryWE()(l2_cache)
+        soc.add_config("L2_SIZE", l2_cache_size)
+    else:
+        soc.submodules += wishbone.Converter(wb_ddr3, ddr3.bus)
+
+    return ddr3
@@ -0,0 +1,165 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.interconnect import wishbone
+from litex.soc.cores.uart import UART, Stream2Wishbone
+from litex.soc.cores.dma import WishboneDMAReader, WishboneDMAWriter
+
+# USB-ACM PHY --------------------------------------------------------------------------------------
+
+class USBACMPHY(LiteXModule):
+    """ValentyUSB CDC-ACM PHY with deep TX/RX FIFOs.
+
+    Exposes 8-bit sink/source streams in the sys clock domain. The default usb_acm UART only has
+    4-entry FIFOs between the sys and usb_12 domains, which limits throughput far below Full-Speed
+    USB; here the clock domain crossings are deep enough to buffer several USB packets.
+    """
+    def __init__(self, pads, fifo_depth=512):
+        import valentyusb.usbcore.io as usbio
+        from valentyusb.usbcore.cpu.cdc_eptri import CDCUsbPHY
+
+        self.sink   = stream.Endpoint([("data", 8)])
+        self.source = stream.Endpoint([("data", 8)])
+
+        # # #
+
+        # USB Core.
+        usb_iobuf = usbio.IoBuf(pads.d_p, pads.d_n, pads.pullup)
+        self.usb  = usb = ClockDomainsRenamer("usb_12")(CDCUsbPHY(usb_iobuf, debug=False))
+
+        # TX: sys -> usb_12.
+        self.tx_cdc = tx_cdc = stream.ClockDomainCrossing([("data", 8)],
+            cd_from = "sys",
+            cd_to   = "usb_12",
+            depth   = fifo_depth,
+        )
+        self.comb += self.sink.connect(tx_cdc.sink)
+        self.comb += tx_cdc.source.connect(usb.sink)
+
+        # RX: usb_12 -> sys.
+        self.rx_cdc = rx_cdc = stream.ClockDomainCrossing([("data", 8)],
+            cd_from = "usb_12",
+            cd_to   = "sys",
+            depth   = fifo_depth,
+        )
+        self.comb += usb.source.connect(rx_cdc.sink)
+        self.comb += rx_cdc.source.connect(self.source)
+
+# USB-ACM Streamer ---------------------------------------------------------------------------------
+
+USB_ACM_MODE_CONSOLE = 0
+USB_ACM_MODE_DMA     = 1
+USB_ACM_MODE_BRIDGE  = 2
+
+class USBACMStreamer(LiteXModule):
+    """Routes the USB-ACM PHY to the console UART, to DMAs or to a Wishbone bridge.
+
+    - Console : Regular CSR UART (with deep FIFOs).
+    - DMA     : Memory -> USB (data logging) and USB -> Memory (data loading) without CPU
+                involvement, 32-bit bus accesses batched into the USB stream.
+    - Bridge  : Host-driven Wishbone bridge (UARTBone protocol), used by the bulk reader to dump
+                memory with 255-word bursts.
+    """
+    def __init__(self, phy, clk_freq,
+        uart              = None,
+        dma_bus           = None,
+        bridge            = False,
+        bus_address_width = 32,
+        default_mode      = USB_ACM_MODE_CONSOLE):
+        self.mode = CSRStorage(2, reset=default_mode, description="USB-ACM Mode (0: Console, 1: DMA, 2: Bridge).")
+
+        # # #
+
+        # RX/TX Routing.
+        tx_cases = {}
+        rx_cases = {}
+        def add_port(mode, sink, source):
+            if source is not None:
+                tx_cases[mode] = source.connect(phy.sink)
+            if sink is not None:
+                rx_cases[mode] = phy.source.connect(sink)
+
+        # Console.
+        if uart is not None:
+            add_port(USB_ACM_MODE_CONSOLE, uart.sink, uart.source)
+
+        # DMA.
+        if dma_bus is not None:
+            # Memory -> USB.
+            self.dma_reader = dma_reader = WishboneDMAReader(dma_bus[0], with_csr=True)
+            self.dma_reader_conv = dma_reader_conv = stream.Converter(32, 8)
+            self.comb += dma_reader.source.connect(dma_reader_conv.sink)
+            # USB -> Memory.
+            self.dma_writer = dma_writer = WishboneDMAWriter(dma_bus[1], with_csr=True)
+            self.dma_writer_conv = dma_writer_conv = stream.Converter(8, 32)
+            self.comb += dma_writer_conv.source.connect(dma_writer.sink)
+            add_port(USB_ACM_MODE_DMA, dma_writer_conv.sink, dma_reader_conv.source)
+
+        # Bridge.
+        if bridge:
+            self.bridge = Stream2Wishbone(clk_freq=clk_freq, address_width=bus_address_width)
+            add_port(USB_ACM_MODE_BRIDGE, self.bridge.sink, self.bridge.source)
+
+        self.comb += Case(self.mode.storage, tx_cases)
+        self.comb += Case(self.mode.storage, rx_cases)
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_usb_acm_fifo(soc, name="uart", pads=None, fifo_depth=512, with_dma=True, with_bridge=True, default_mode="console"):
+    """Add a USB-ACM UART with deep FIFOs, DMAs and Wishbone bridge to a SoC.
+
+    Replaces the SoC's usb_acm UART (build the SoC with with_uart=False): the console stays
+    compatible with the BIOS/litex_term, and the DMA/bridge modes are selected through the
+    <name>_streamer_mode CSR.
+    """
+    assert default_mode in ["console", "dma", "bridge"]
+    default_mode = {
+        "console" : USB_ACM_MODE_CONSOLE,
+        "dma"     : USB_ACM_MODE_DMA,
+        "bridge"  : USB_ACM_MODE_BRIDGE,
+    }[default_mode]
+
+    # PHY.
+    if pads is None:
+        pads = soc.platform.request("usb")
+    phy = USBACMPHY(pads, fifo_depth=fifo_depth)
+    soc.add_module(name=f"{name}_phy", module=phy)
+
+    # Console UART.
+    uart = UART(tx_fifo_depth=fifo_depth, rx_fifo_depth=fifo_depth)
+    soc.add_module(name=name, module=uart)
+    if soc.irq.enabled:
+        soc.irq.add(name, use_loc_if_exists=True)
+    else:
+        soc.add_constant("UART_POLLING")
+
+    # DMA Buses.
+    dma_bus = None
+    if with_dma:
+        dma_bus = [wishbone.Interface(
+            data_width    = 32,
+            address_width = soc.bus.address_width,
+            addressing    = "word") for _ in range(2)]
+
+    # Streamer.
+    streamer = USBACMStreamer(phy, soc.sys_clk_freq,
+        uart              = uart,
+        dma_bus           = dma_bus,
+        bridge            = with_bridge,
+        bus_address_width = soc.bus.address_width,
+        default_mode      = default_mode,
+    )
+    soc.add_module(name=f"{name}_streamer", module=streamer)
+    if with_dma:
+        soc.bus.add_master(name=f"{name}_dma_reader", master=dma_bus[0])
+        soc.bus.add_master(name=f"{name}_dma_writer", master=dma_bus[1])
+    if with_bridge:
+        soc.bus.add_master(name=f"{name}_bridge", master=streamer.bridge.wishbone)
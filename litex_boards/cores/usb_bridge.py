@@ -0,0 +1,232 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.interconnect.packet import Arbiter
+
+# Frame Format -------------------------------------------------------------------------------------
+
+# Each packet is sent to the USB FIFO as a frame of 32-bit words (little-endian on the host):
+# - Header    : [31:24] magic (0xa5), [23:20] channel, [16] drops before this packet, [15:0] length.
+# - Timestamp : sys_clk cycles at the first beat of the packet.
+# - Payload   : length 32-bit words (beats of the channel data width, LSB first).
+FRAME_MAGIC = 0xa5
+
+# Packet Framer ------------------------------------------------------------------------------------
+
+class _PacketFramer(LiteXModule):
+    """Store and forward a packet stream and frame it for the USB FIFO.
+
+    Packets are buffered until complete (so that the frame length is known) and longer packets are
+    split in max_words segments. Droppable channels (taps on links that can't be stalled) drop the
+    whole packet when the buffer can't store a max_words segment, others are back-pressured.
+    """
+    def __init__(self, data_width, channel, timestamp, max_words=512, depth=1024, droppable=True):
+        assert data_width % 32 == 0
+        ratio     = data_width//32
+        max_beats = max_words//ratio
+        assert max_beats <= depth
+        self.sink   = sink   = stream.Endpoint([("data", data_width)])
+        self.source = source = stream.Endpoint([("data", 32)])
+        self.enable = Signal()
+        self.clear  = Signal()
+
+        self.packets = CSRStatus(32, description="Forwarded packets/segments.")
+        self.drops   = CSRStatus(32, description="Dropped packets (Buffer full).")
+
+        # # #
+
+        # Buffers.
+        self.data_fifo = data_fifo = stream.SyncFIFO([("data", data_width)], depth, buffered=True)
+        self.desc_fifo = desc_fifo = stream.SyncFIFO([("length", 16), ("timestamp", 32), ("dropped", 1)], 16)
+
+        # Ingress.
+        first     = Signal(reset=1)
+        dropping  = Signal()
+        dropped   = Signal()
+        beats     = Signal(16)
+        start     = Signal(32)
+        space     = Signal()
+        discard   = Signal()
+        forward   = Signal()
+        last_beat = Signal()
+        self.comb += [
+            space.eq((data_fifo.level <= (depth - max_beats)) & desc_fifo.sink.ready),
+            If(first,
+                discard.eq(~self.enable | (~space if droppable else 0))
+            ).Else(
+                discard.eq(dropping)
+            ),
+            sink.ready.eq(1 if droppable else (discard | ~first | space)),
+            forward.eq(sink.valid & sink.ready & ~discard),
+            last_beat.eq(sink.last | (~discard & (beats == (max_beats - 1)))),
+            data_fifo.sink.valid.eq(forward),
+            data_fifo.sink.data.eq(sink.data),
+            desc_fifo.sink.valid.eq(forward & last_beat),
+            desc_fifo.sink.length.eq((beats + 1)*ratio),
+            desc_fifo.sink.timestamp.eq(Mux(first, timestamp, start)),
+            desc_fifo.sink.dropped.eq(dropped),
+        ]
+        self.sync += [
+            If(sink.valid & sink.ready,
+                first.eq(last_beat),
+                If(first,
+                    dropping.eq(discard),
+                    start.eq(timestamp),
+                    If(discard & self.enable,
+                        self.drops.status.eq(self.drops.status + 1),
+                        dropped.eq(1)
+                    )
+                ),
+                If(forward,
+                    beats.eq(beats + 1),
+                    If(last_beat,
+                        beats.eq(0),
+                        dropped.eq(0),
+                        self.packets.status.eq(self.packets.status + 1)
+                    )
+                )
+            ),
+            If(self.clear,
+                self.packets.status.eq(0),
+                self.drops.status.eq(0)
+            )
+        ]
+
+        # Egress.
+        self.converter = converter = stream.Converter(data_width, 32)
+        self.comb += data_fifo.source.connect(converter.sink)
+        remaining = Signal(16)
+        desc      = desc_fifo.source
+        self.fsm = fsm = FSM(reset_state="HEADER")
+        fsm.act("HEADER",
+            source.valid.eq(desc.valid),
+            source.data.eq(Cat(desc.length, desc.dropped, Constant(0, 3), Constant(channel, 4), Constant(FRAME_MAGIC, 8))),
+            If(source.valid & source.ready,
+                NextState("TIMESTAMP")
+            )
+        )
+        fsm.act("TIMESTAMP",
+            source.valid.eq(1),
+            source.data.eq(desc.timestamp),
+            If(source.ready,
+                NextValue(remaining, desc.length - 1),
+                NextState("PAYLOAD")
+            )
+        )
+        fsm.act("PAYLOAD",
+            converter.source.connect(source, omit={"last"}),
+            source.last.eq(remaining == 0),
+            If(source.valid & source.ready,
+                NextValue(remaining, remaining - 1),
+                If(remaining == 0,
+                    desc.ready.eq(1),
+                    NextState("HEADER")
+                )
+            )
+        )
+
+# USB Bridge ---------------------------------------------------------------------------------------
+
+class USBBridge(LiteXModule):
+    """Packet streams (PCIe TLPs, DMA...) to a USB FIFO (ex FT601 through FT245PHYSynchronous).
+
+    Channels (add_channel/add_tap) are framed (see Frame Format) and arbitrated per packet into a
+    deep FIFO. The FIFO is released to source in batches of batch words (large USB transfers) or,
+    when less data is available, after timeout sys_clk cycles (latency bound). Counters: words sent,
+    FIFO level watermark, per channel forwarded/dropped packets.
+    """
+    def __init__(self, fifo_depth=8192, batch=1024, timeout=100000):
+        assert batch <= fifo_depth
+        self.fifo_depth = fifo_depth
+        self.source     = stream.Endpoint([("data", 32)])
+        self.timestamp  = Signal(32)
+        self.channels   = []
+
+        self.control = CSRStorage(fields=[
+            CSRField("enable", size=8, reset=0xff, description="Channels enable."),
+            CSRField("clear",  size=1, pulse=True, description="Clear counters."),
+        ])
+        self.batch     = CSRStorage(16, reset=batch,   description="USB batch size (words, <= FIFO depth).")
+        self.timeout   = CSRStorage(32, reset=timeout, description="Partial batch flush timeout (cycles).")
+        self.words     = CSRStatus(32, description="Words sent to the USB FIFO.")
+        self.level_max = CSRStatus(32, description="FIFO level watermark (words).")
+
+        # # #
+
+        self.sync += self.timestamp.eq(self.timestamp + 1)
+
+    def add_channel(self, data_width, max_words=512, depth=1024, droppable=False):
+        """Add a packet channel, returns its sink (data, last)."""
+        n = len(self.channels)
+        assert n < 8
+        framer = _PacketFramer(data_width, n, self.timestamp,
+            max_words = max_words,
+            depth     = depth,
+            droppable = droppable)
+        self.comb += [
+            framer.enable.eq(self.control.fields.enable[n]),
+            framer.clear.eq(self.control.fields.clear),
+        ]
+        setattr(self, f"ch{n}", framer)
+        self.channels.append(framer)
+        return framer.sink
+
+    def add_tap(self, endpoint, data="data", max_words=512, depth=1024):
+        """Monitor endpoint transfers (without affecting them) on a droppable channel."""
+        sink = self.add_channel(len(getattr(endpoint, data)), max_words=max_words, depth=depth, droppable=True)
+        self.comb += [
+            sink.valid.eq(endpoint.valid & endpoint.ready),
+            sink.last.eq(endpoint.last),
+            sink.data.eq(getattr(endpoint, data)),
+        ]
+        return sink
+
+    def do_finalize(self):
+        # Packet Arbitration -> FIFO.
+        self.fifo = fifo = stream.SyncFIFO([("data", 32)], self.fifo_depth, buffered=True)
+        self.arbiter = Arbiter([framer.source for framer in self.channels], fifo.sink)
+        self.sync += [
+            If(fifo.level > self.level_max.status,
+                self.level_max.status.eq(fifo.level)
+            ),
+            If(self.control.fields.clear,
+                self.level_max.status.eq(0)
+            )
+        ]
+
+        # Batching.
+        credit = Signal(16)
+        timer  = Signal(32)
+        self.comb += [
+            self.source.valid.eq(fifo.source.valid & (credit != 0)),
+            self.source.data.eq(fifo.source.data),
+            fifo.source.ready.eq(self.source.ready & (credit != 0)),
+        ]
+        self.sync += [
+            If(credit == 0,
+                timer.eq(timer + (fifo.level != 0)),
+                If(fifo.level >= self.batch.storage,
+                    credit.eq(self.batch.storage),
+                    timer.eq(0)
+                ).Elif((fifo.level != 0) & (timer >= self.timeout.storage),
+                    credit.eq(fifo.level),
+                    timer.eq(0)
+                )
+            ).Elif(self.source.valid & self.source.ready,
+                credit.eq(credit - 1)
+            ),
+            If(self.source.valid & self.source.ready,
+                self.words.status.eq(self.words.status + 1)
+            ),
+            If(self.control.fields.clear,
+                self.words.status.eq(0)
+            )
+        ]
@@ -13,6 +13,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.build.xilinx_config import XilinxConfigProfile
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -108,18 +110,17 @@ class Platform(Xilinx7SeriesPlatform):
         Xilinx7SeriesPlatform.__init__(self, device, _io, toolchain=toolchain)
         self.add_platform_command("set_property INTERNAL_VREF 0.675 [get_iobanks 15]")
 
-        self.toolchain.bitstream_commands = [
-            "set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]",
-            "set_property BITSTREAM.CONFIG.CONFIGRATE 33 [current_design]",
-            "set_property CONFIG_VOLTAGE 3.3 [current_design]",
-            "set_property CFGBVS VCCO [current_design]",
-            "set_property BITSTREAM.CONFIG.SPI_32BIT_ADDR NO [current_design]",
-            "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 1 [current_design]",
-            "set_property BITSTREAM.CONFIG.SPI_FALL_EDGE YES [current_design]",
-        ]
-        self.toolchain.additional_commands = \
-            ["write_cfgmem -force -format bin -interface spix1 -size 4 "
-             "-loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"]
+        self.add_platform_command("set_property CONFIG_VOLTAGE 3.3 [current_design]")
+        self.add_platform_command("set_property CFGBVS VCCO [current_design]")
+
+        XilinxConfigProfile(flash_size=4,
+            spi_buswidth   = 1,
+            configrate     = 33,
+            compress       = True,
+            spi_32bit_addr = False,
+            spi_fall_edge  = True,
+            max_configrate = 50,
+        ).apply(self)
 
     def create_programmer(self):
         return OpenOCD("openocd_xc7_ft2232.cfg", "bscan_spi_xc7a35t.bit")
@@ -9,6 +9,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.build.xilinx_config import XilinxConfigProfile
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -344,11 +346,10 @@ class Platform(Xilinx7SeriesPlatform):
             "a7-100": "xc7a100tcsg324-1"
         }[variant]
         Xilinx7SeriesPlatform.__init__(self, device, _io, _connectors, toolchain=toolchain)
-        self.toolchain.bitstream_commands = \
-            ["set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]"]
-        self.toolchain.additional_commands = \
-            ["write_cfgmem -force -format bin -interface spix4 -size 16 "
-             "-loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"]
+        XilinxConfigProfile(flash_size=16,
+            spi_buswidth   = 4,
+            max_configrate = 50,
+        ).apply(self)
         self.add_platform_command("set_property INTERNAL_VREF 0.675 [get_iobanks 34]")
 
     def create_programmer(self):
@@ -8,6 +8,8 @@
 from litex.build.generic_platform import Pins, Subsignal, IOStandard, Misc
 from litex.build.xilinx import Xilinx7SeriesPlatform, VivadoProgrammer
 
+from litex_boards.build.xilinx_config import XilinxConfigProfile
+
 # IOs -----------------------------------------------------------------------------------------------
 
 _io = [
@@ -226,6 +228,20 @@ class Platform(Xilinx7SeriesPlatform):
 
     def __init__(self, toolchain="vivado"):
         Xilinx7SeriesPlatform.__init__(self, "xcu280-fsvh2892-2L-e-es1", _io, _connectors, toolchain=toolchain)
+        # MT25QU01G (1.8V, 166MHz STR) in SPIx4, CCLK from the internal oscillator (127.5MHz max for
+        # --fast-boot). No write_cfgmem .bin image: the card's Flash is programmed with its own flow.
+        XilinxConfigProfile(flash_size=128,
+            family          = "ultrascale+",
+            spi_buswidth    = 4,
+            configrate      = 85.0,
+            extmasterclk_en = "disable",
+            compress        = True,
+            fallback        = True,
+            spi_32bit_addr  = True,
+            spi_fall_edge   = True,
+            with_cfgmem     = False,
+            max_configrate  = 127.5,
+        ).apply(self)
 
     def create_programmer(self):
         return VivadoProgrammer()
@@ -237,8 +253,6 @@ class Platform(Xilinx7SeriesPlatform):
 
         # For passively cooled boards, overheating is a significant risk if airflow isn't sufficient
         self.add_platform_command("set_property BITSTREAM.CONFIG.OVERTEMPSHUTDOWN ENABLE [current_design]")
-        # Reduce programming time
-        self.add_platform_command("set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]")
         # DDR4 memory channel C0 Internal Vref
         self.add_platform_command("set_property INTERNAL_VREF 0.84 [get_iobanks 64]")
         self.add_platform_command("set_property INTERNAL_VREF 0.84 [get_iobanks 65]")
@@ -250,14 +264,8 @@ class Platform(Xilinx7SeriesPlatform):
 
         # Other suggested configurations
         self.add_platform_command("set_property CONFIG_VOLTAGE 1.8 [current_design]")
-        self.add_platform_command("set_property BITSTREAM.CONFIG.CONFIGFALLBACK Enable [current_design]")
         self.add_platform_command("set_property CONFIG_MODE SPIx4 [current_design]")
-        self.add_platform_command("set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]")
-        self.add_platform_command("set_property BITSTREAM.CONFIG.CONFIGRATE 85.0 [current_design]")
-        self.add_platform_command("set_property BITSTREAM.CONFIG.EXTMASTERCCLK_EN disable [current_design]")
-        self.add_platform_command("set_property BITSTREAM.CONFIG.SPI_FALL_EDGE YES [current_design]")
         self.add_platform_command("set_property BITSTREAM.CONFIG.UNUSEDPIN Pullup [current_design]")
-        self.add_platform_command("set_property BITSTREAM.CONFIG.SPI_32BIT_ADDR Yes [current_design]")
 
         # For HBM2 IP in Vivado 2019.2 (https://www.xilinx.com/support/answers/72607.html)
         self.add_platform_command("connect_debug_port dbg_hub/clk [get_nets apb_clk]")
\ No newline at end of file
@@ -41,6 +41,33 @@ _io = [
         IOStandard("LVCMOS25")
     ),
 
+    # DDR3 SDRAM (MT41J64M16LA-187E)
+    ("ddram_clock", 0,
+        Subsignal("p", Pins("K4")),
+        Subsignal("n", Pins("K3")),
+        IOStandard("DIFF_SSTL15_II"), Misc("IN_TERM=NONE")
+    ),
+    ("ddram", 0,
+        Subsignal("a", Pins(
+            "K2 K1 K5 M6 H3 M3 L4 K6",
+            "G3 G1 J4 E1 F1"),
+            IOStandard("SSTL15_II")),
+        Subsignal("ba",      Pins("J3 J1 H1"), IOStandard("SSTL15_II")),
+        Subsignal("ras_n",   Pins("M5"), IOStandard("SSTL15_II")),
+        Subsignal("cas_n",   Pins("M4"), IOStandard("SSTL15_II")),
+        Subsignal("we_n",    Pins("H2"), IOStandard("SSTL15_II")),
+        Subsignal("dm",      Pins("N4 P3"), IOStandard("SSTL15_II")),
+        Subsignal("dq", Pins(
+            "R3 R1 P2 P1 L3 L1 M2 M1",
+            "T2 T1 U3 U1 W3 W1 Y3 Y1"),
+            IOStandard("SSTL15_II")),
+        Subsignal("dqs",     Pins("N3 V2"), IOStandard("DIFF_SSTL15_II")),
+        Subsignal("dqs_n",   Pins("N1 V1"), IOStandard("DIFF_SSTL15_II")),
+        Subsignal("cke",     Pins("F2"), IOStandard("SSTL15_II")),
+        Subsignal("odt",     Pins("L6"), IOStandard("SSTL15_II")),
+        Subsignal("reset_n", Pins("E3"), IOStandard("LVCMOS15")),
+    ),
+
     # GMII Ethernet
     ("eth_clocks", 0,
         # Subsignal("tx", Pins("L20")),  # Comment to force GMII 1G only mode
@@ -0,0 +1,15 @@
+// This file is part of LiteX-Boards.
+//
+// SPDX-License-Identifier: BSD-2-Clause
+
+#ifndef __BENCH_H
+#define __BENCH_H
+
+#include <stdint.h>
+
+/* Cycles (sys_clk) counter: 64-bit with timer0 uptime (--timer-uptime), 32-bit otherwise. */
+void bench_timer_init(void);
+uint64_t bench_cycles(void);
+uint64_t bench_elapsed(uint64_t start, uint64_t end);
+
+#endif /* __BENCH_H */
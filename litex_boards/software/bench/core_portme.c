@@ -0,0 +1,71 @@
+// This file is part of LiteX-Boards.
+//
+// SPDX-License-Identifier: BSD-2-Clause
+
+// CoreMark port (timing from bench_cycles, sys_clk cycles).
+
+#include <stdio.h>
+#include <stdint.h>
+
+#include "coremark.h"
+#include "bench.h"
+
+#if VALIDATION_RUN
+volatile ee_s32 seed1_volatile = 0x3415;
+volatile ee_s32 seed2_volatile = 0x3415;
+volatile ee_s32 seed3_volatile = 0x66;
+#endif
+#if PERFORMANCE_RUN
+volatile ee_s32 seed1_volatile = 0x0;
+volatile ee_s32 seed2_volatile = 0x0;
+volatile ee_s32 seed3_volatile = 0x66;
+#endif
+#if PROFILE_RUN
+volatile ee_s32 seed1_volatile = 0x8;
+volatile ee_s32 seed2_volatile = 0x8;
+volatile ee_s32 seed3_volatile = 0x8;
+#endif
+volatile ee_s32 seed4_volatile = ITERATIONS;
+volatile ee_s32 seed5_volatile = 0;
+
+ee_u32 default_num_contexts = 1;
+
+/* Measured duration of the last run (in sys_clk cycles), reported by the benchmark suite. */
+uint64_t coremark_cycles;
+
+static CORE_TICKS start_time_val, stop_time_val;
+
+void start_time(void)
+{
+	start_time_val = bench_cycles();
+}
+
+void stop_time(void)
+{
+	stop_time_val   = bench_cycles();
+	coremark_cycles = bench_elapsed(start_time_val, stop_time_val);
+}
+
+CORE_TICKS get_time(void)
+{
+	return bench_elapsed(start_time_val, stop_time_val);
+}
+
+secs_ret time_in_secs(CORE_TICKS ticks)
+{
+	return (secs_ret)(ticks/EE_TICKS_PER_SEC);
+}
+
+void portable_init(core_portable *p, int *argc, char *argv[])
+{
+	if (sizeof(ee_ptr_int) != sizeof(ee_u8 *))
+		ee_printf("ERROR! ee_ptr_int must hold a pointer!\n");
+	if (sizeof(ee_u32) != 4)
+		ee_printf("ERROR! ee_u32 must be 32-bit!\n");
+	p->portable_id = 1;
+}
+
+void portable_fini(core_portable *p)
+{
+	p->portable_id = 0;
+}
@@ -0,0 +1,248 @@
+// This file is part of LiteX-Boards.
+//
+// SPDX-License-Identifier: BSD-2-Clause
+
+// CPU/Memory benchmarks, results are reported as "BENCH <key>=<value>" lines.
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <inttypes.h>
+
+#include <irq.h>
+#include <system.h>
+#include <libbase/uart.h>
+#include <generated/csr.h>
+#include <generated/mem.h>
+#include <generated/soc.h>
+#ifdef CSR_SDRAM_BASE
+#include <generated/sdram_phy.h>
+#endif
+
+#include "bench.h"
+
+#ifndef BENCH_MEM_SIZE
+#define BENCH_MEM_SIZE (1024*1024)
+#endif
+
+#ifndef BENCH_LATENCY_LOADS
+#define BENCH_LATENCY_LOADS 16384
+#endif
+
+/*-----------------------------------------------------------------------*/
+/* Timer                                                                 */
+/*-----------------------------------------------------------------------*/
+
+void bench_timer_init(void)
+{
+	timer0_en_write(0);
+	timer0_reload_write(0xffffffff);
+	timer0_load_write(0xffffffff);
+	timer0_en_write(1);
+}
+
+uint64_t bench_cycles(void)
+{
+#ifdef CSR_TIMER0_UPTIME_CYCLES_ADDR
+	timer0_uptime_latch_write(1);
+	return timer0_uptime_cycles_read();
+#else
+	timer0_update_value_write(1);
+	return 0xffffffff - timer0_value_read();
+#endif
+}
+
+uint64_t bench_elapsed(uint64_t start, uint64_t end)
+{
+#ifdef CSR_TIMER0_UPTIME_CYCLES_ADDR
+	return end - start;
+#else
+	return (uint32_t)(end - start);
+#endif
+}
+
+/*-----------------------------------------------------------------------*/
+/* Memory                                                                */
+/*-----------------------------------------------------------------------*/
+
+static void flush_caches(void)
+{
+	flush_cpu_dcache();
+	flush_l2_cache();
+}
+
+static void report_bandwidth(const char *name, const char *test, unsigned long size, uint64_t cycles)
+{
+	uint64_t bandwidth = ((uint64_t)size)*CONFIG_CLOCK_FREQUENCY/(cycles ? cycles : 1);
+	printf("BENCH %s_%s_bps=%" PRIu64 "\n", name, test, bandwidth);
+}
+
+static void bench_mem(const char *name, uintptr_t base, unsigned long size, int writable)
+{
+	volatile uint32_t *array = (volatile uint32_t *)base;
+	unsigned long n = size/4;
+	unsigned long i;
+	uint32_t sum = 0;
+	uint64_t start;
+
+	printf("BENCH %s_size=%lu\n", name, size);
+
+	/* Sequential Write */
+	if (writable) {
+		flush_caches();
+		start = bench_cycles();
+		for (i = 0; i < n; i += 8) {
+			array[i + 0] = i;
+			array[i + 1] = i;
+			array[i + 2] = i;
+			array[i + 3] = i;
+			array[i + 4] = i;
+			array[i + 5] = i;
+			array[i + 6] = i;
+			array[i + 7] = i;
+		}
+		flush_cpu_dcache();
+		report_bandwidth(name, "write", size, bench_elapsed(start, bench_cycles()));
+	}
+
+	/* Sequential Read */
+	flush_caches();
+	start = bench_cycles();
+	for (i = 0; i < n; i += 8) {
+		sum += array[i + 0];
+		sum += array[i + 1];
+		sum += array[i + 2];
+		sum += array[i + 3];
+		sum += array[i + 4];
+		sum += array[i + 5];
+		sum += array[i + 6];
+		sum += array[i + 7];
+	}
+	report_bandwidth(name, "read", size, bench_elapsed(start, bench_cycles()));
+
+	if (!writable) {
+		printf("BENCH %s_checksum=0x%08" PRIx32 "\n", name, sum);
+		return;
+	}
+
+	/* Copy (first half to second half) */
+	flush_caches();
+	start = bench_cycles();
+	memcpy((void *)(base + size/2), (void *)base, size/2);
+	flush_cpu_dcache();
+	report_bandwidth(name, "copy", size/2, bench_elapsed(start, bench_cycles()));
+
+	/* Random Read Latency (pointer chasing through a random cycle to defeat caches/prefetching) */
+	{
+		unsigned long loads = n < BENCH_LATENCY_LOADS ? n : BENCH_LATENCY_LOADS;
+		uint32_t seed  = 0x12345678;
+		uint32_t index = 0;
+		uint32_t tmp;
+		uint64_t cycles;
+		unsigned long j;
+		/* Single cycle through all the words (Sattolo's shuffle, xorshift32 PRNG). */
+		for (i = 0; i < n; i++)
+			array[i] = i;
+		for (i = n - 1; i > 0; i--) {
+			seed ^= seed << 13;
+			seed ^= seed >> 17;
+			seed ^= seed << 5;
+			j = seed % i;
+			tmp      = array[i];
+			array[i] = array[j];
+			array[j] = tmp;
+		}
+		flush_caches();
+		start = bench_cycles();
+		for (i = 0; i < loads; i++)
+			index = array[index];
+		cycles = bench_elapsed(start, bench_cycles());
+		(void)index;
+		printf("BENCH %s_latency_ns=%" PRIu64 "\n", name, cycles*1000000000ULL/CONFIG_CLOCK_FREQUENCY/loads);
+	}
+}
+
+static void bench_memories(void)
+{
+#ifdef MAIN_RAM_BASE
+	/* Upper half of the Main RAM (code/data can be in the lower half). */
+	unsigned long main_ram_size = MAIN_RAM_SIZE/2 < BENCH_MEM_SIZE ? MAIN_RAM_SIZE/2 : BENCH_MEM_SIZE;
+	bench_mem("main_ram", MAIN_RAM_BASE + MAIN_RAM_SIZE/2, main_ram_size, 1);
+#endif
+#ifdef SPIFLASH_BASE
+	bench_mem("spiflash", SPIFLASH_BASE, SPIFLASH_SIZE < BENCH_MEM_SIZE ? SPIFLASH_SIZE : BENCH_MEM_SIZE, 0);
+#endif
+}
+
+/*-----------------------------------------------------------------------*/
+/* Configuration                                                         */
+/*-----------------------------------------------------------------------*/
+
+static void bench_config(void)
+{
+	printf("BENCH platform=%s\n", CONFIG_PLATFORM_NAME);
+	printf("BENCH cpu=%s\n", CONFIG_CPU_HUMAN_NAME);
+	printf("BENCH clk_freq=%d\n", CONFIG_CLOCK_FREQUENCY);
+#ifdef CONFIG_L2_SIZE
+	printf("BENCH l2_size=%d\n", CONFIG_L2_SIZE);
+#else
+	printf("BENCH l2_size=0\n");
+#endif
+#if defined(CSR_SDRAM_BASE) && defined(SDRAM_PHY_XDR)
+	printf("BENCH main_ram=%s x%d\n", (SDRAM_PHY_XDR == 1) ? "SDR" : "DDR", SDRAM_PHY_DATABITS);
+#elif defined(MAIN_RAM_BASE)
+	printf("BENCH main_ram=Integrated\n");
+#else
+	printf("BENCH main_ram=None\n");
+#endif
+#ifdef CSR_TIMER0_UPTIME_CYCLES_ADDR
+	printf("BENCH timer=64\n");
+#else
+	printf("BENCH timer=32\n");
+#endif
+}
+
+/*-----------------------------------------------------------------------*/
+/* CoreMark                                                              */
+/*-----------------------------------------------------------------------*/
+
+#ifdef WITH_COREMARK
+extern int coremark_main(void);
+extern uint64_t coremark_cycles;
+
+static void bench_coremark(void)
+{
+	coremark_main();
+	printf("BENCH coremark_iterations=%d\n", ITERATIONS);
+	printf("BENCH coremark_cycles=%" PRIu64 "\n", coremark_cycles);
+	/* CoreMark/MHz x1000 */
+	printf("BENCH coremark_per_mhz_x1000=%" PRIu64 "\n",
+		((uint64_t)ITERATIONS)*1000000ULL*1000/(coremark_cycles ? coremark_cycles : 1));
+}
+#endif
+
+/*-----------------------------------------------------------------------*/
+/* Main                                                                  */
+/*-----------------------------------------------------------------------*/
+
+int main(void)
+{
+#ifdef CONFIG_CPU_HAS_INTERRUPT
+	irq_setmask(0);
+	irq_setie(1);
+#endif
+	uart_init();
+	bench_timer_init();
+
+	printf("BENCH start\n");
+	bench_config();
+	bench_memories();
+#ifdef WITH_COREMARK
+	bench_coremark();
+#endif
+	printf("BENCH done\n");
+
+	while (1);
+
+	return 0;
+}
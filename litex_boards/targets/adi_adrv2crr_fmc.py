@@ -26,9 +26,6 @@ from litex.soc.cores.xadc import ZynqUSPSystemMonitor
 from litedram.modules import MT40A512M16
 from litedram.phy import usddrphy
 
-from litepcie.phy.usppciephy import USPPCIEPHY
-from litepcie.software import generate_litepcie_software
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(LiteXModule):
@@ -89,6 +86,7 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
+            from litepcie.phy.usppciephy import USPPCIEPHY
             assert self.csr_data_width == 32
 
             self.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
@@ -141,6 +139,7 @@ def main():
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
@@ -95,6 +95,7 @@ def main():
     parser.add_target_argument("--flash",           action="store_true",          help="Flash bitstream.")
     parser.add_target_argument("--variant",         default="au",                 help="Board variant (au or au+).")
     parser.add_target_argument("--sys-clk-freq",    default=83.333e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--fast-boot",       action="store_true",          help="Use fastest SPI Flash configuration settings supported by the board.")
     parser.add_target_argument("--with-spi-flash",  action="store_true",          help="Enable SPI Flash (MMAPed).")
     args = parser.parse_args()
 
@@ -105,6 +106,9 @@ def main():
         **parser.soc_argdict
     )
 
+    if args.fast_boot:
+        soc.platform.config_profile.fast_boot().apply(soc.platform)
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
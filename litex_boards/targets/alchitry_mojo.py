@@ -51,7 +51,6 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 
 from litex.soc.cores.clock import *
-from litex.soc.cores.video import VideoS6HDMIPHY
 from litex.soc.cores.led import LedChaser
 
 from litedram.modules import MT48LC32M8, SDRModule
@@ -131,6 +130,7 @@ class BaseSoC(SoCCore):
         
         # HDMI Options -----------------------------------------------------------------------------
         if with_hdmi_shield and (with_video_colorbars or with_video_framebuffer or with_video_terminal):
+            from litex.soc.cores.video import VideoS6HDMIPHY
             self.videophy = VideoS6HDMIPHY(platform.request("hdmi_out"), clock_domain="hdmi")
             if with_video_colorbars:
                 self.add_video_colorbars(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Build/Use:
+# ./berkeleylab_marblemini.py --with-sdram-bist --build --load
+# litex_term /dev/ttyUSBX (BIOS: memtest/memspeed at boot, sdram_bist for the LiteDRAM bandwidth)
+# ./berkeleylab_marblemini.py --with-etherbone --csr-csv=csr.csv --build --load
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex_boards.platforms import berkeleylab_marblemini
+
+from litex.soc.cores.clock import *
+from litex.soc.integration.soc_core import *
+from litex.soc.integration.builder import *
+
+from litedram.modules import MT41K512M16
+from litedram.phy import s7ddrphy
+
+# CRG ----------------------------------------------------------------------------------------------
+
+class _CRG(LiteXModule):
+    def __init__(self, platform, sys_clk_freq):
+        self.rst          = Signal()
+        self.cd_sys       = ClockDomain()
+        self.cd_sys4x     = ClockDomain()
+        self.cd_sys4x_dqs = ClockDomain()
+        self.cd_idelay    = ClockDomain()
+
+        # # #
+
+        # Clk (20MHz VCXO, enabled).
+        self.comb += platform.request("clk20_vcxo_en").eq(1)
+        clk20 = platform.request("clk20_vcxo")
+
+        # PLL.
+        self.pll = pll = S7MMCM(speedgrade=-2)
+        self.comb += pll.reset.eq(self.rst)
+        pll.register_clkin(clk20, 20e6)
+        pll.create_clkout(self.cd_sys,       sys_clk_freq)
+        pll.create_clkout(self.cd_sys4x,     4*sys_clk_freq)
+        pll.create_clkout(self.cd_sys4x_dqs, 4*sys_clk_freq, phase=90)
+        pll.create_clkout(self.cd_idelay,    200e6)
+        platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
+
+        self.idelayctrl = S7IDELAYCTRL(self.cd_idelay)
+
+# BaseSoC ------------------------------------------------------------------------------------------
+
+class BaseSoC(SoCCore):
+    def __init__(self, sys_clk_freq=100e6,
+        with_ethernet   = False,
+        with_etherbone  = False,
+        eth_ip          = "192.168.1.50",
+        with_sdram_bist = False,
+        **kwargs):
+        platform = berkeleylab_marblemini.Platform()
+
+        # CRG --------------------------------------------------------------------------------------
+        self.crg = _CRG(platform, sys_clk_freq)
+
+        # SoCCore ----------------------------------------------------------------------------------
+        SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Berkeley-Lab Marble-Mini", **kwargs)
+
+        # DDR3 SDRAM -------------------------------------------------------------------------------
+        if not self.integrated_main_ram_size:
+            self.ddrphy = s7ddrphy.A7DDRPHY(platform.request("ddram"),
+                memtype      = "DDR3",
+                nphases      = 4,
+                sys_clk_freq = sys_clk_freq
+            )
+            self.add_sdram("sdram",
+                phy           = self.ddrphy,
+                module        = MT41K512M16(sys_clk_freq, "1:4"),
+                l2_cache_size = kwargs.get("l2_size", 8192),
+                with_bist     = with_sdram_bist,
+            )
+
+        # Ethernet / Etherbone ---------------------------------------------------------------------
+        if with_ethernet or with_etherbone:
+            from liteeth.phy.s7rgmii import LiteEthPHYRGMII
+            self.ethphy = LiteEthPHYRGMII(
+                clock_pads = self.platform.request("eth_clocks"),
+                pads       = self.platform.request("eth"),
+                tx_delay   = 0
+            )
+            if with_ethernet:
+                self.add_ethernet(phy=self.ethphy)
+            if with_etherbone:
+                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
+
+# Build --------------------------------------------------------------------------------------------
+
+def main():
+    from litex.build.parser import LiteXArgumentParser
+    parser = LiteXArgumentParser(platform=berkeleylab_marblemini.Platform, description="LiteX SoC on Berkeley-Lab Marble-Mini.")
+    parser.add_target_argument("--sys-clk-freq",    default=100e6, type=float, help="System clock frequency.")
+    ethopts = parser.target_group.add_mutually_exclusive_group()
+    ethopts.add_argument("--with-ethernet",         action="store_true",       help="Enable Ethernet support.")
+    ethopts.add_argument("--with-etherbone",        action="store_true",       help="Enable Etherbone support.")
+    parser.add_target_argument("--eth-ip",          default="192.168.1.50",    help="Etherbone IP address.")
+    parser.add_target_argument("--with-sdram-bist", action="store_true",       help="Add DDR3 BIST Generator/Checker (BIOS sdram_bist bandwidth test).")
+    args = parser.parse_args()
+
+    soc = BaseSoC(
+        sys_clk_freq    = args.sys_clk_freq,
+        with_ethernet   = args.with_ethernet,
+        with_etherbone  = args.with_etherbone,
+        eth_ip          = args.eth_ip,
+        with_sdram_bist = args.with_sdram_bist,
+        **parser.soc_argdict
+    )
+    builder = Builder(soc, **parser.builder_argdict)
+    if args.build:
+        builder.build(**parser.toolchain_argdict)
+
+    if args.load:
+        prog = soc.platform.create_programmer()
+        prog.load_bitstream(builder.get_bitstream_filename(mode="sram"))
+
+if __name__ == "__main__":
+    main()
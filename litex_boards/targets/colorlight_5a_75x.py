@@ -33,6 +33,18 @@
 # ./colorlight_5a_75x.py --load
 # You should see the LiteX BIOS and be able to interact with it.
 #
+# 4) SoC driving HUB75 LED-panels (on J1-J8/J16) from frames received over UDP:
+# ./colorlight_5a_75x.py --revision=7.0 --uart-name=crossover --with-etherbone --with-hub75 --build
+# ./colorlight_5a_75x.py --load
+# python3 -m litex_boards.tools.hub75_stream --chains=8 --width=128 --height=32 --pattern
+#
+# 5) SoC with both Ethernet PHYs:
+# --eth-mode=dual:    Independent stacks: Ethernet/Etherbone on PHY0 and Etherbone on PHY1 (--eth-ip1).
+# --eth-mode=forward: Daisy-chained cards: frames are forwarded in hardware between PHY0 (upstream)
+#                     and PHY1 (downstream), Ethernet/Etherbone/HUB75 use the local port on PHY0.
+# ./colorlight_5a_75x.py --revision=7.0 --uart-name=crossover --with-etherbone --eth-mode=forward --build
+# Per-port counters: ethphy0_stats_*/ethphy1_stats_* (+ ethphy_*stream_* in forward mode).
+#
 # Note that you can also use a 5A-75E board:
 # ./colorlight_5a_75x.py --board=5a-75e --revision=7.1 (or 6.0) --build
 #
@@ -57,8 +69,6 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import M12L16161A, M12L64322A
 from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 
-from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -120,9 +130,17 @@ class BaseSoC(SoCCore):
         with_etherbone   = False,
         eth_ip           = "192.168.1.50",
         eth_phy          = 0,
+        eth_mode         = "single",
+        eth_ip1          = "192.168.1.51",
         with_led_chaser  = True,
         use_internal_osc = False,
         sdram_rate       = "1:1",
+        with_hub75       = False,
+        hub75_chains     = None,
+        hub75_width      = 128,
+        hub75_rows       = 16,
+        hub75_bit_depth  = 8,
+        hub75_refresh    = 400,
         **kwargs):
         board = board.lower()
         assert board in ["5a-75b", "5a-75e"]
@@ -164,15 +182,67 @@ class BaseSoC(SoCCore):
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
-        if with_ethernet or with_etherbone:
-            self.ethphy = LiteEthPHYRGMII(
+        if eth_mode in ["dual", "forward"]:
+            from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
+            from litex_boards.cores.ethernet import rgmii_datapath_io, EthernetPortStats, EthernetForwarder
+            # Both PHYs share reset/MDIO: only request the data path of PHY1.
+            platform.add_extension(rgmii_datapath_io(platform, 1))
+            self.ethphy0 = LiteEthPHYRGMII(
+                clock_pads = self.platform.request("eth_clocks", 0),
+                pads       = self.platform.request("eth", 0),
+                tx_delay   = 0e-9)
+            self.ethphy1 = ClockDomainsRenamer({"eth_tx": "eth1_tx", "eth_rx": "eth1_rx"})(LiteEthPHYRGMII(
+                clock_pads = self.platform.request("eth_clocks", 1),
+                pads       = self.platform.request("eth_datapath", 1),
+                tx_delay   = 0e-9))
+            self.ethphy0_stats = EthernetPortStats(self.ethphy0, cd="eth")
+            self.ethphy1_stats = EthernetPortStats(self.ethphy1, cd="eth1")
+            eth_rx_clks = [self.ethphy1.crg.cd_eth_rx.clk]
+            if not (with_ethernet or with_etherbone):
+                eth_rx_clks += [self.ethphy0.crg.cd_eth_rx.clk]
+            for eth_rx_clk in eth_rx_clks:
+                platform.add_period_constraint(eth_rx_clk, 1e9/125e6)
+            platform.add_false_path_constraints(self.crg.cd_sys.clk, *eth_rx_clks)
+            # Dual: Independent stacks, Ethernet/Etherbone on PHY0 and Etherbone on PHY1.
+            if eth_mode == "dual":
+                ethphy = self.ethphy0
+                self.add_etherbone(name="etherbone1", phy=self.ethphy1, phy_cd="eth1",
+                    ip_address              = eth_ip1,
+                    mac_address             = 0x10e2d5000001,
+                    with_timing_constraints = False,
+                )
+            # Forward: PHY0 (Upstream) <-> PHY1 (Downstream) forwarding in hardware, Ethernet/
+            # Etherbone on the local port.
+            if eth_mode == "forward":
+                self.ethphy = ethphy = EthernetForwarder(self.ethphy0, self.ethphy1, cd1="eth1")
+        elif with_ethernet or with_etherbone or with_hub75:
+            from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
+            self.ethphy = ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks", eth_phy),
                 pads       = self.platform.request("eth", eth_phy),
                 tx_delay   = 0e-9)
-            if with_ethernet:
-                self.add_ethernet(phy=self.ethphy, data_width=32)
-            if with_etherbone:
-                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip, data_width=32)
+        if with_ethernet:
+            self.add_ethernet(phy=ethphy, data_width=32)
+        if with_etherbone:
+            self.add_etherbone(phy=ethphy, ip_address=eth_ip, data_width=32)
+
+        # HUB75 ------------------------------------------------------------------------------------
+        if with_hub75:
+            from litex_boards.cores.hub75 import hub75_connector_io, add_hub75
+            assert not with_ethernet, "HUB75 and Ethernet can't share the Ethernet PHY."
+            connectors = [c for c in platform.constraint_manager.connector_manager.connector_table if c.startswith("j")]
+            connectors = connectors[:hub75_chains]
+            platform.add_extension(hub75_connector_io(connectors))
+            add_hub75(self,
+                control_pads = platform.request("hub75_control"),
+                chain_pads   = [platform.request("hub75_chain", i) for i in range(len(connectors))],
+                ethphy       = ethphy,
+                ip_address   = eth_ip,
+                width        = hub75_width,
+                rows         = hub75_rows,
+                depth        = hub75_bit_depth,
+                refresh_rate = hub75_refresh,
+            )
 
         # Leds -------------------------------------------------------------------------------------
         # Disable leds when serial is used.
@@ -194,8 +264,16 @@ def main():
     ethopts.add_argument("--with-etherbone",          action="store_true",    help="Enable Etherbone support.")
     parser.add_target_argument("--eth-ip",            default="192.168.1.50", help="Ethernet/Etherbone IP address.")
     parser.add_target_argument("--eth-phy",           default=0, type=int,    help="Ethernet PHY (0 or 1).")
+    parser.add_target_argument("--eth-mode",          default="single",       help="Ethernet mode (single, dual or forward).", choices=["single", "dual", "forward"])
+    parser.add_target_argument("--eth-ip1",           default="192.168.1.51", help="Etherbone IP address on PHY1 (dual mode).")
     parser.add_target_argument("--use-internal-osc",  action="store_true",    help="Use internal oscillator.")
     parser.add_target_argument("--sdram-rate",        default="1:1",          help="SDRAM Rate (1:1 Full Rate or 1:2 Half Rate).")
+    parser.add_target_argument("--with-hub75",        action="store_true",    help="Enable HUB75 LED-panels output (frames over UDP).")
+    parser.add_target_argument("--hub75-chains",      default=None, type=int, help="HUB75 chains (default: all the connectors).")
+    parser.add_target_argument("--hub75-width",       default=128, type=int,  help="HUB75 chain width (in pixels).")
+    parser.add_target_argument("--hub75-rows",        default=16, type=int,   help="HUB75 scan rows (panel height/2).")
+    parser.add_target_argument("--hub75-bit-depth",   default=8, type=int,    help="HUB75 BCM bit depth (per color).")
+    parser.add_target_argument("--hub75-refresh",     default=400, type=int,  help="HUB75 target refresh rate (Hz).")
     args = parser.parse_args()
 
     soc = BaseSoC(board=args.board, revision=args.revision,
@@ -205,8 +283,16 @@ def main():
         with_etherbone   = args.with_etherbone,
         eth_ip           = args.eth_ip,
         eth_phy          = args.eth_phy,
+        eth_mode         = args.eth_mode,
+        eth_ip1          = args.eth_ip1,
         use_internal_osc = args.use_internal_osc,
         sdram_rate       = args.sdram_rate,
+        with_hub75       = args.with_hub75,
+        hub75_chains     = args.hub75_chains,
+        hub75_width      = args.hub75_width,
+        hub75_rows       = args.hub75_rows,
+        hub75_bit_depth  = args.hub75_bit_depth,
+        hub75_refresh    = args.hub75_refresh,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -17,7 +17,6 @@ from litex_boards.platforms import colorlight_i5
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoHDMIPHY
 from litex.soc.cores.led import LedChaser
 
 from litex.soc.interconnect.csr import *
@@ -25,8 +24,6 @@ from litex.soc.interconnect.csr import *
 from litedram.modules import M12L64322A # Compatible with EM638325-6H.
 from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 
-from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -105,6 +102,12 @@ class BaseSoC(SoCCore):
         sdram_rate             = "1:1",
         with_video_terminal    = False,
         with_video_framebuffer = False,
+        with_hub75             = False,
+        hub75_pmods            = ["pmodf", "pmode"],
+        hub75_width            = 128,
+        hub75_rows             = 16,
+        hub75_bit_depth        = 8,
+        hub75_refresh          = 400,
         **kwargs):
         board = board.lower()
         assert board in ["i5", "i9"]
@@ -148,7 +151,8 @@ class BaseSoC(SoCCore):
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
-        if with_ethernet or with_etherbone:
+        if with_ethernet or with_etherbone or with_hub75:
+            from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
             self.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks", eth_phy),
                 pads       = self.platform.request("eth", eth_phy),
@@ -156,7 +160,23 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy)
+                self.add_etherbone(phy=self.ethphy, data_width=32 if with_hub75 else 8)
+
+        # HUB75 (Dual-PMOD HUB75 adapters) ---------------------------------------------------------
+        if with_hub75:
+            from litex_boards.cores.hub75 import hub75_pmod_io, add_hub75
+            assert not with_ethernet, "HUB75 and Ethernet can't share the Ethernet PHY."
+            platform.add_extension(hub75_pmod_io(control=hub75_pmods[0], chains=hub75_pmods[1:]))
+            add_hub75(self,
+                control_pads = platform.request("hub75_control"),
+                chain_pads   = [platform.request("hub75_chain", i) for i in range(len(hub75_pmods) - 1)],
+                ethphy       = self.ethphy,
+                ip_address   = local_ip or "192.168.1.50",
+                width        = hub75_width,
+                rows         = hub75_rows,
+                depth        = hub75_bit_depth,
+                refresh_rate = hub75_refresh,
+            )
 
         if local_ip:
             local_ip = local_ip.split(".")
@@ -174,6 +194,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoHDMIPHY
             self.videophy = VideoHDMIPHY(platform.request("gpdi"), clock_domain="hdmi")
             if with_video_terminal:
                 self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="hdmi")
@@ -202,8 +223,18 @@ def main():
     viopts = parser.target_group.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI).")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI).")
+    parser.add_target_argument("--with-hub75",       action="store_true",       help="Enable HUB75 LED-panels output (frames over UDP).")
+    parser.add_target_argument("--hub75-pmods",      default="pmodf,pmode",     help="HUB75 PMODs (control,chain0[,chain1...]).")
+    parser.add_target_argument("--hub75-width",      default=128, type=int,     help="HUB75 chain width (in pixels).")
+    parser.add_target_argument("--hub75-rows",       default=16, type=int,      help="HUB75 scan rows (panel height/2).")
+    parser.add_target_argument("--hub75-bit-depth",  default=8, type=int,       help="HUB75 BCM bit depth (per color).")
+    parser.add_target_argument("--hub75-refresh",    default=400, type=int,     help="HUB75 target refresh rate (Hz).")
     args = parser.parse_args()
 
+    hub75_pmods = args.hub75_pmods.split(",")
+    if args.with_hub75 and (args.with_spi_sdcard or args.with_sdcard):
+        assert "pmode" not in hub75_pmods, "SDCard and HUB75 can't share pmode (see --hub75-pmods)."
+
     soc = BaseSoC(board=args.board, revision=args.revision,
         toolchain              = args.toolchain,
         sys_clk_freq           = args.sys_clk_freq,
@@ -216,6 +247,12 @@ def main():
         sdram_rate             = args.sdram_rate,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        with_hub75             = args.with_hub75,
+        hub75_pmods            = hub75_pmods,
+        hub75_width            = args.hub75_width,
+        hub75_rows             = args.hub75_rows,
+        hub75_bit_depth        = args.hub75_bit_depth,
+        hub75_refresh          = args.hub75_refresh,
         **parser.soc_argdict
     )
     soc.platform.add_extension(colorlight_i5._sdcard_pmod_io)
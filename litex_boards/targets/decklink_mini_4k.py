@@ -22,14 +22,10 @@ from litex.soc.cores.clock import *
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoS7GTPHDMIPHY
 
 from litedram.modules import MT41K128M16
 from litedram.phy import s7ddrphy
 
-from litepcie.phy.s7pciephy import S7PCIEPHY
-from litepcie.software import generate_litepcie_software
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -103,6 +99,7 @@ class BaseSoC(SoCMini):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
+            from litepcie.phy.s7pciephy import S7PCIEPHY
             self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
                 data_width = 128,
                 bar0_size  = 0x20000)
@@ -140,6 +137,7 @@ class BaseSoC(SoCMini):
             self.add_sata(phy=self.sata_phy, mode="read+write")
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoS7GTPHDMIPHY
             self.videophy = VideoS7GTPHDMIPHY(platform.request("hdmi_out"),
                 sys_clk_freq = sys_clk_freq,
                 clock_domain = "hdmi"
@@ -178,6 +176,7 @@ def main():
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
@@ -29,9 +29,6 @@ from litedram.common import PHYPadsReducer
 from litedram.modules import MT41J256M16
 from litedram.phy import usddrphy
 
-from litepcie.phy.uspciephy import USPCIEPHY
-from litepcie.software import generate_litepcie_software
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -90,6 +87,7 @@ class BaseSoC(SoCCore):
         # FIXME: Does not seem to be working when also enabling DRAM. Has been tested succesfully by
         # disabling DRAM with --integrated-main-ram-size=0x100.
         if with_pcie:
+            from litepcie.phy.uspciephy import USPCIEPHY
             data_width = {
                 4 : 128,
                 8 : 256,
@@ -123,6 +121,7 @@ def main():
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
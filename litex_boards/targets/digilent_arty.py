@@ -24,18 +24,14 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 from litex.soc.cores.gpio import GPIOIn, GPIOTristate
-from litex.soc.cores.xadc import XADC
-from litex.soc.cores.dna  import DNA
 
 from litedram.modules import MT41K128M16
 from litedram.phy import s7ddrphy
 
-from liteeth.phy.mii import LiteEthPHYMII
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
-    def __init__(self, platform, sys_clk_freq, with_dram=True, with_rst=True):
+    def __init__(self, platform, sys_clk_freq, with_dram=True, with_rst=True, with_clk_reconfig=False):
         self.rst    = Signal()
         self.cd_sys = ClockDomain()
         self.cd_eth = ClockDomain()
@@ -54,6 +50,9 @@ class _CRG(LiteXModule):
         self.pll = pll = S7PLL(speedgrade=-1)
         self.comb += pll.reset.eq(rst | self.rst)
         pll.register_clkin(clk100, 100e6)
+        if with_clk_reconfig:
+            from litex_boards.cores.clock import XilinxClockReconfig
+            self.clk_reconfig = XilinxClockReconfig(pll, fixed=["eth", "idelay"])
         pll.create_clkout(self.cd_sys, sys_clk_freq)
         pll.create_clkout(self.cd_eth, 25e6)
         self.comb += platform.request("eth_ref_clk").eq(self.cd_eth.clk)
@@ -80,22 +79,25 @@ class BaseSoC(SoCCore):
         with_spi_flash  = False,
         with_buttons    = False,
         with_pmod_gpio  = False,
+        with_clk_reconfig = False,
         **kwargs):
         platform = digilent_arty.Platform(variant=variant, toolchain=toolchain)
 
         # CRG --------------------------------------------------------------------------------------
         with_dram = (kwargs.get("integrated_main_ram_size", 0) == 0)
-        self.crg  = _CRG(platform, sys_clk_freq, with_dram)
+        self.crg  = _CRG(platform, sys_clk_freq, with_dram, with_clk_reconfig=with_clk_reconfig)
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Arty A7", **kwargs)
 
         # XADC -------------------------------------------------------------------------------------
         if toolchain == "vivado":
+            from litex.soc.cores.xadc import XADC
             self.xadc = XADC()
 
         # DNA --------------------------------------------------------------------------------------
         if toolchain == "vivado":
+            from litex.soc.cores.dna import DNA
             self.dna = DNA()
             self.dna.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
 
@@ -113,6 +115,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy.mii import LiteEthPHYMII
             self.ethphy = LiteEthPHYMII(
                 clock_pads = self.platform.request("eth_clocks"),
                 pads       = self.platform.request("eth"))
@@ -159,8 +162,10 @@ def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=digilent_arty.Platform, description="LiteX SoC on Arty A7.")
     parser.add_target_argument("--flash",        action="store_true",       help="Flash bitstream.")
+    parser.add_target_argument("--flash-serial", default=None,              help="Only reprogram changed Flash sectors (manifest kept per board serial).")
     parser.add_target_argument("--variant",      default="a7-35",           help="Board variant (a7-35 or a7-100).")
     parser.add_target_argument("--sys-clk-freq", default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--fast-boot",    action="store_true",       help="Use fastest SPI Flash configuration settings supported by the board.")
     ethopts = parser.target_group.add_mutually_exclusive_group()
     ethopts.add_argument("--with-ethernet",        action="store_true",    help="Enable Ethernet support.")
     ethopts.add_argument("--with-etherbone",       action="store_true",    help="Enable Etherbone support.")
@@ -169,10 +174,13 @@ def main():
     sdopts = parser.target_group.add_mutually_exclusive_group()
     sdopts.add_argument("--with-spi-sdcard",       action="store_true", help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",           action="store_true", help="Enable SDCard support.")
+    parser.add_target_argument("--sdcard-clk-freq", default=25e6, type=float, help="SDCard clock frequency (4-bit SDCard mode).")
     parser.add_target_argument("--sdcard-adapter",                      help="SDCard PMOD adapter (digilent or numato).")
     parser.add_target_argument("--with-jtagbone",  action="store_true", help="Enable JTAGbone support.")
     parser.add_target_argument("--with-spi-flash", action="store_true", help="Enable SPI Flash (MMAPed).")
     parser.add_target_argument("--with-pmod-gpio", action="store_true", help="Enable GPIOs through PMOD.") # FIXME: Temporary test.
+    parser.add_target_argument("--with-clk-reconfig", action="store_true", help="Enable runtime Sys Clk reconfiguration (PLL DRP, see tools/clk_sweep.py).")
+    parser.add_target_argument("--with-bus-perf",  action="store_true", help="Enable Bus performance counters (see tools/bus_perf.py).")
     args = parser.parse_args()
 
     assert not (args.with_etherbone and args.eth_dynamic_ip)
@@ -188,6 +196,7 @@ def main():
         with_jtagbone  = args.with_jtagbone,
         with_spi_flash = args.with_spi_flash,
         with_pmod_gpio = args.with_pmod_gpio,
+        with_clk_reconfig = args.with_clk_reconfig,
         **parser.soc_argdict
     )
     if args.sdcard_adapter == "numato":
@@ -197,7 +206,15 @@ def main():
     if args.with_spi_sdcard:
         soc.add_spi_sdcard()
     if args.with_sdcard:
-        soc.add_sdcard()
+        from litex_boards.cores.sdcard import add_sdcard_dma
+        add_sdcard_dma(soc, clk_freq=args.sdcard_clk_freq)
+
+    if args.with_bus_perf:
+        from litex_boards.cores.bus_perf import add_bus_perf
+        add_bus_perf(soc)
+
+    if args.fast_boot:
+        soc.platform.config_profile.fast_boot().apply(soc.platform)
 
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
@@ -209,7 +226,11 @@ def main():
 
     if args.flash:
         prog = soc.platform.create_programmer()
-        prog.flash(0, builder.get_bitstream_filename(mode="flash"))
+        if args.flash_serial is not None:
+            from litex_boards.tools.delta_flash import DeltaFlasher
+            DeltaFlasher(prog, args.flash_serial).flash(0, builder.get_bitstream_filename(mode="flash"))
+        else:
+            prog.flash(0, builder.get_bitstream_filename(mode="flash"))
 
 if __name__ == "__main__":
     main()
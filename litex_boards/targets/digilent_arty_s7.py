@@ -92,6 +92,7 @@ def main():
     parser = LiteXArgumentParser(platform=digilent_arty_s7.Platform, description="LiteX SoC on Arty S7.")
     parser.add_target_argument("--variant",        default="s7-50",           help="Board variant (s7-50 or s7-25).")
     parser.add_target_argument("--sys-clk-freq",   default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--fast-boot",      action="store_true",       help="Use fastest SPI Flash configuration settings supported by the board.")
     parser.add_target_argument("--with-spi-flash", action="store_true",       help="Enable SPI Flash (MMAPed).")
     args = parser.parse_args()
 
@@ -101,6 +102,9 @@ def main():
         with_spi_flash = args.with_spi_flash,
         **parser.soc_argdict
     )
+    if args.fast_boot:
+        soc.platform.config_profile.fast_boot().apply(soc.platform)
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
@@ -23,7 +23,7 @@ from litex.soc.cores.led import LedChaser
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
-    def __init__(self, platform, sys_clk_freq):
+    def __init__(self, platform, sys_clk_freq, mipi_pixel_clk_freq=None):
         self.cd_sys = ClockDomain()
 
         # # #
@@ -37,14 +37,24 @@ class _CRG(LiteXModule):
         pll.register_clkin(clk50, 50e6)
         pll.create_clkout(self.cd_sys, sys_clk_freq, with_reset=True)
 
+        # MIPI RX Pixel Clock.
+        if mipi_pixel_clk_freq is not None:
+            self.cd_mipi_pixel = ClockDomain()
+            pll.create_clkout(self.cd_mipi_pixel, mipi_pixel_clk_freq, with_reset=True)
+
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=100e6, with_spi_flash=False, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=100e6, with_spi_flash=False, with_led_chaser=True,
+        with_mipi_camera    = False,
+        mipi_lanes          = 4,
+        mipi_format         = "raw10",
+        mipi_pixel_clk_freq = 50e6,
+        **kwargs):
         platform = efinix_trion_t20_mipi_dev_kit.Platform()
 
         # CRG --------------------------------------------------------------------------------------
-        self.crg = _CRG(platform, sys_clk_freq)
+        self.crg = _CRG(platform, sys_clk_freq, mipi_pixel_clk_freq if with_mipi_camera else None)
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Efinix Trion T20 MIPI Dev Kit", **kwargs)
@@ -55,6 +65,16 @@ class BaseSoC(SoCCore):
             from litespi.opcodes import SpiNorFlashOpCodes as Codes
             self.add_spi_flash(mode="1x", module=W25Q32JV(Codes.READ_1_1_1), with_master=True)
 
+        # MIPI Camera ------------------------------------------------------------------------------
+        if with_mipi_camera:
+            from litex_boards.cores.mipi_csi2 import TrionMIPIRX, add_mipi_csi2_capture
+            phy = TrionMIPIRX(platform,
+                nlanes     = mipi_lanes,
+                pixel_bits = {"raw8": 8, "raw10": 10, "raw12": 12}[mipi_format],
+                cd_pixel   = "mipi_pixel",
+            )
+            add_mipi_csi2_capture(self, phy=phy, data_type=mipi_format, cd_phy="mipi_pixel")
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.leds = LedChaser(
@@ -66,13 +86,21 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=efinix_trion_t20_mipi_dev_kit.Platform, description="LiteX SoC on Efinix Trion T20 MIPI Dev Kit.")
-    parser.add_target_argument("--sys-clk-freq",   default=100e6, type=float, help="System clock frequency.")
-    parser.add_target_argument("--with-spi-flash", action="store_true",       help="Enable SPI Flash (MMAPed).")
+    parser.add_target_argument("--sys-clk-freq",        default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--with-spi-flash",      action="store_true",       help="Enable SPI Flash (MMAPed).")
+    parser.add_target_argument("--with-mipi-camera",    action="store_true",       help="Enable MIPI CSI-2 capture (Hard MIPI RX).")
+    parser.add_target_argument("--mipi-lanes",          default=4, type=int,       help="MIPI CSI-2 lanes (1, 2 or 4).")
+    parser.add_target_argument("--mipi-format",         default="raw10",           help="MIPI CSI-2 data type (raw8, raw10 or raw12).")
+    parser.add_target_argument("--mipi-pixel-clk-freq", default=50e6, type=float,  help="MIPI RX pixel clock frequency (2 pixels per clock).")
     args = parser.parse_args()
 
     soc     = BaseSoC(
-        sys_clk_freq   = args.sys_clk_freq,
-        with_spi_flash = args.with_spi_flash,
+        sys_clk_freq        = args.sys_clk_freq,
+        with_spi_flash      = args.with_spi_flash,
+        with_mipi_camera    = args.with_mipi_camera,
+        mipi_lanes          = args.mipi_lanes,
+        mipi_format         = args.mipi_format,
+        mipi_pixel_clk_freq = args.mipi_pixel_clk_freq,
          **parser.soc_argdict)
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
@@ -22,6 +22,10 @@
 # ./litepcie_util scratch_test
 # ./litepcie_util dma_test
 # ./litepcie_util uart_test
+#
+# DMA-fed ICAP/Flash reconfiguration (--with-pcie-reconfig, over the PCIe DMA channel exported as
+# RECONFIG_DMA_CHANNEL in csr.csv, /dev/litepcie<RECONFIG_DMA_CHANNEL> is selected by the tool):
+# python3 litex_boards/tools/pcie_reconfig.py --csr-csv=csr.csv flash gateware.bin --offset=0x0
 
 import os
 
@@ -38,9 +42,6 @@ from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 from litex.soc.cores.clock import *
 
-from litepcie.phy.s7pciephy import S7PCIEPHY
-from litepcie.software import generate_litepcie_software
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(LiteXModule):
@@ -63,7 +64,7 @@ class CRG(LiteXModule):
 # BaseSoC -----------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=125e6, with_pcie=False, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=125e6, with_pcie=False, with_pcie_reconfig=False, with_led_chaser=True, **kwargs):
         platform = fairwaves_xtrx.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -75,23 +76,35 @@ class BaseSoC(SoCCore):
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Fairwaves XTRX", **kwargs)
 
         # PCIe -------------------------------------------------------------------------------------
+        if with_pcie_reconfig and not with_pcie:
+            raise ValueError("--with-pcie-reconfig requires --with-pcie.")
         if with_pcie:
+            from litepcie.phy.s7pciephy import S7PCIEPHY
             self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x2"),
                 data_width = 64,
                 bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
-
-            # ICAP (For FPGA reload over PCIe).
-            from litex.soc.cores.icap import ICAP
-            self.icap = ICAP()
-            self.icap.add_reload()
-            self.icap.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
-
-            # Flash (For SPIFlash update over PCIe).
-            from litex.soc.cores.gpio import GPIOOut
-            from litex.soc.cores.spi_flash import S7SPIFlash
-            self.flash_cs_n = GPIOOut(platform.request("flash_cs_n"))
-            self.flash      = S7SPIFlash(platform.request("flash"), sys_clk_freq, 25e6)
+            self.add_pcie(phy=self.pcie_phy, ndmas=2 if with_pcie_reconfig else 1)
+
+            # ICAP/Flash fed by a dedicated PCIe DMA channel (For fast reconfiguration/update).
+            if with_pcie_reconfig:
+                from litex_boards.cores.reconfig import add_pcie_reconfig
+                add_pcie_reconfig(self,
+                    dma_channel     = 1,
+                    flash_pads      = platform.request("flash"),
+                    flash_cs_n_pads = platform.request("flash_cs_n"),
+                )
+            else:
+                # ICAP (For FPGA reload over PCIe).
+                from litex.soc.cores.icap import ICAP
+                self.icap = ICAP()
+                self.icap.add_reload()
+                self.icap.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
+
+                # Flash (For SPIFlash update over PCIe).
+                from litex.soc.cores.gpio import GPIOOut
+                from litex.soc.cores.spi_flash import S7SPIFlash
+                self.flash_cs_n = GPIOOut(platform.request("flash_cs_n"))
+                self.flash      = S7SPIFlash(platform.request("flash"), sys_clk_freq, 25e6)
 
 
         # Leds -------------------------------------------------------------------------------------
@@ -105,22 +118,29 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=fairwaves_xtrx.Platform, description="LiteX SoC on Fairwaves XTRX.")
-    parser.add_target_argument("--flash",           action="store_true",       help="Flash bitstream.")
-    parser.add_target_argument("--sys-clk-freq",    default=125e6, type=float, help="System clock frequency.")
-    parser.add_target_argument("--with-pcie",       action="store_true",       help="Enable PCIe support.")
-    parser.add_target_argument("--driver",          action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--flash",              action="store_true",       help="Flash bitstream.")
+    parser.add_target_argument("--sys-clk-freq",       default=125e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--fast-boot",          action="store_true",       help="Use fastest SPI Flash configuration settings supported by the board.")
+    parser.add_target_argument("--with-pcie",          action="store_true",       help="Enable PCIe support.")
+    parser.add_target_argument("--with-pcie-reconfig", action="store_true",       help="Enable DMA-fed ICAP/QSPI Flash programming over PCIe.")
+    parser.add_target_argument("--driver",             action="store_true",       help="Generate PCIe driver.")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = args.sys_clk_freq,
-        with_pcie    = args.with_pcie,
+        sys_clk_freq       = args.sys_clk_freq,
+        with_pcie          = args.with_pcie,
+        with_pcie_reconfig = args.with_pcie_reconfig,
         **parser.soc_argdict
     )
+    if args.fast_boot:
+        soc.platform.config_profile.fast_boot().apply(soc.platform)
+
     builder  = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
@@ -145,8 +145,10 @@ class _CRGSDRAM(LiteXModule):
 
 class BaseSoC(SoCCore):
     def __init__(self, revision="0.2", device="25F", sys_clk_freq=48e6, toolchain="trellis",
-        sdram_device    = "MT41K64M16",
-        with_led_chaser = True,
+        sdram_device      = "MT41K64M16",
+        with_led_chaser   = True,
+        with_usb_acm_fifo = False,
+        usb_acm_mode      = "console",
         **kwargs):
         platform = gsd_orangecrab.Platform(revision=revision, device=device ,toolchain=toolchain)
 
@@ -157,8 +159,15 @@ class BaseSoC(SoCCore):
         # SoCCore ----------------------------------------------------------------------------------
         # Defaults to USB ACM through ValentyUSB.
         kwargs["uart_name"] = "usb_acm"
+        if with_usb_acm_fifo:
+            kwargs["with_uart"] = False
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on OrangeCrab", **kwargs)
 
+        # USB-ACM FIFO -----------------------------------------------------------------------------
+        if with_usb_acm_fifo:
+            from litex_boards.cores.usb_acm import add_usb_acm_fifo
+            add_usb_acm_fifo(self, default_mode=usb_acm_mode)
+
         # DDR3 SDRAM -------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
             available_sdram_modules = {
@@ -199,19 +208,23 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=gsd_orangecrab.Platform, description="LiteX SoC on OrangeCrab.")
-    parser.add_target_argument("--sys-clk-freq",    default=48e6, type=float, help="System clock frequency.")
-    parser.add_target_argument("--revision",        default="0.2",            help="Board Revision (0.1 or 0.2).")
-    parser.add_target_argument("--device",          default="25F",            help="ECP5 device (25F, 45F or 85F).")
-    parser.add_target_argument("--sdram-device",    default="MT41K64M16",     help="SDRAM device (MT41K64M16, MT41K128M16, MT41K256M16 or MT41K512M16).")
-    parser.add_target_argument("--with-spi-sdcard", action="store_true",      help="Enable SPI-mode SDCard support.")
+    parser.add_target_argument("--sys-clk-freq",      default=48e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--revision",          default="0.2",            help="Board Revision (0.1 or 0.2).")
+    parser.add_target_argument("--device",            default="25F",            help="ECP5 device (25F, 45F or 85F).")
+    parser.add_target_argument("--sdram-device",      default="MT41K64M16",     help="SDRAM device (MT41K64M16, MT41K128M16, MT41K256M16 or MT41K512M16).")
+    parser.add_target_argument("--with-spi-sdcard",   action="store_true",      help="Enable SPI-mode SDCard support.")
+    parser.add_target_argument("--with-usb-acm-fifo", action="store_true",      help="Enable high-throughput USB-ACM (Deep FIFOs, DMA and Bridge modes).")
+    parser.add_target_argument("--usb-acm-mode",      default="console",        help="USB-ACM FIFO default mode (console, dma or bridge).")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        toolchain    = args.toolchain,
-        revision     = args.revision,
-        device       = args.device,
-        sdram_device = args.sdram_device,
-        sys_clk_freq = args.sys_clk_freq,
+        toolchain         = args.toolchain,
+        revision          = args.revision,
+        device            = args.device,
+        sdram_device      = args.sdram_device,
+        sys_clk_freq      = args.sys_clk_freq,
+        with_usb_acm_fifo = args.with_usb_acm_fifo,
+        usb_acm_mode      = args.usb_acm_mode,
         **parser.soc_argdict)
     if args.with_spi_sdcard:
         soc.add_spi_sdcard()
@@ -29,7 +29,6 @@ from litex.soc.cores.clock import iCE40PLL
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoDVIPHY
 from litex.soc.cores.led import LedChaser
 
 kB = 1024
@@ -113,6 +112,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal:
+            from litex.soc.cores.video import VideoDVIPHY
             platform.add_extension(icebreaker.dvi_pmod)
             self.videophy = VideoDVIPHY(platform.request("dvi"), clock_domain="sys")
             self.add_video_terminal(phy=self.videophy, timings="640x480@75Hz", clock_domain="sys")
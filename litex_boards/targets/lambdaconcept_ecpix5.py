@@ -17,14 +17,11 @@ from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.video import VideoDVIPHY
 from litex.soc.cores.bitbang import I2CMaster
 
 from litedram.modules import MT41K256M16
 from litedram.phy import ECP5DDRPHY
 
-from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -105,6 +102,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
             self.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks"),
                 pads       = self.platform.request("eth"),
@@ -116,6 +114,7 @@ class BaseSoC(SoCCore):
 
         # HDMI -------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoDVIPHY
             # PHY + IT6613 I2C initialization.
             hdmi_pads = platform.request("hdmi")
             self.videophy = VideoDVIPHY(hdmi_pads, clock_domain="init")
@@ -226,6 +225,7 @@ def main():
     parser.add_target_argument("--device",          default="85F",            help="ECP5 device (45F or 85F).")
     parser.add_target_argument("--sys-clk-freq",    default=75e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--with-sdcard",     action="store_true",      help="Enable SDCard support.")
+    parser.add_target_argument("--sdcard-clk-freq", default=50e6, type=float, help="SDCard clock frequency (4-bit SDCard mode).")
     ethopts = parser.target_group.add_mutually_exclusive_group()
     ethopts.add_argument("--with-ethernet",  action="store_true", help="Enable Ethernet support.")
     ethopts.add_argument("--with-etherbone", action="store_true", help="Enable Etherbone support.")
@@ -246,7 +246,8 @@ def main():
         **parser.soc_argdict
     )
     if args.with_sdcard:
-        soc.add_sdcard()
+        from litex_boards.cores.sdcard import add_sdcard_dma
+        add_sdcard_dma(soc, clk_freq=args.sdcard_clk_freq)
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
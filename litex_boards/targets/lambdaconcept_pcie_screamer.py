@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# PCIe Screamer / Screamer M.2: PCIe TLPs and DMA streams to the host over USB3 (FT601).
+#
+# - TLP taps: TLPs received (channel 0) and sent (channel 1) by the PCIe PHY.
+# - DMA: PCIe DMA reader stream (channel 2, from the PCIe host memory); USB -> PCIe DMA writer.
+# Frames are batched in large USB transfers, counters/FIFO watermark are in the usb_bridge CSRs.
+#
+# Build/Use:
+# ./lambdaconcept_pcie_screamer.py --build --load
+# ./lambdaconcept_pcie_screamer.py --variant=m2 --pcie-lanes=4 --build --load
+# python3 litex_boards/tools/usb_bridge.py --duration=10 (--device=loopback without hardware)
+# ./lambdaconcept_pcie_screamer.py --with-usb-loopback --build --load (USB3 link only)
+
+import os
+
+from migen import *
+from migen.genlib.resetsync import AsyncResetSynchronizer
+
+from litex.gen import LiteXModule
+
+from litex_boards.platforms import lambdaconcept_pcie_screamer
+from litex_boards.platforms import lambdaconcept_pcie_screamer_m2
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.integration.soc_core import *
+from litex.soc.integration.builder import *
+
+from litex.soc.cores.clock import *
+from litex.soc.cores.led import LedChaser
+from litex.soc.cores.usb_fifo import FT245PHYSynchronous
+
+from litepcie.phy.s7pciephy import S7PCIEPHY
+
+# CRG ----------------------------------------------------------------------------------------------
+
+class _CRG(LiteXModule):
+    def __init__(self, platform, sys_clk_freq):
+        self.rst    = Signal()
+        self.cd_sys = ClockDomain()
+        self.cd_usb = ClockDomain()
+
+        # # #
+
+        # Clk.
+        clk100 = platform.request("clk100")
+
+        # PLL.
+        self.pll = pll = S7PLL(speedgrade=-2)
+        self.comb += pll.reset.eq(self.rst)
+        pll.register_clkin(clk100, 100e6)
+        pll.create_clkout(self.cd_sys, sys_clk_freq)
+        platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
+
+        # USB (FT601 100MHz clock).
+        usb_clk = platform.request("usb_fifo_clock")
+        self.comb += self.cd_usb.clk.eq(usb_clk)
+        self.specials += AsyncResetSynchronizer(self.cd_usb, ResetSignal("sys"))
+        platform.add_period_constraint(usb_clk, 1e9/100e6)
+        platform.add_false_path_constraints(self.cd_sys.clk, usb_clk)
+
+# BaseSoC ------------------------------------------------------------------------------------------
+
+class BaseSoC(SoCCore):
+    def __init__(self, variant="default", sys_clk_freq=125e6,
+        pcie_lanes        = 1,
+        with_usb_loopback = False,
+        usb_fifo_depth    = 8192,
+        usb_batch         = 1024,
+        with_led_chaser   = True,
+        **kwargs):
+        platform = {
+            "default" : lambdaconcept_pcie_screamer,
+            "m2"      : lambdaconcept_pcie_screamer_m2,
+        }[variant].Platform()
+        assert pcie_lanes in [1, 4]
+        assert not (pcie_lanes == 4 and variant != "m2")
+
+        # CRG --------------------------------------------------------------------------------------
+        self.crg = _CRG(platform, sys_clk_freq)
+
+        # SoCCore ----------------------------------------------------------------------------------
+        SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on PCIe Screamer", **kwargs)
+
+        # PCIe -------------------------------------------------------------------------------------
+        self.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+            data_width = {1: 64, 4: 128}[pcie_lanes],
+            bar0_size  = 0x20000)
+        self.add_pcie(phy=self.pcie_phy, ndmas=1)
+        platform.add_period_constraint(self.crg.cd_sys.clk, 1e9/sys_clk_freq)
+        platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks {sys_clk}] -group [get_clocks userclk2] -asynchronous", sys_clk=self.crg.cd_sys.clk)
+        platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks {sys_clk}] -group [get_clocks clk_125mhz] -asynchronous", sys_clk=self.crg.cd_sys.clk)
+        platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks {sys_clk}] -group [get_clocks clk_250mhz] -asynchronous", sys_clk=self.crg.cd_sys.clk)
+        platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks clk_125mhz] -group [get_clocks clk_250mhz] -asynchronous")
+
+        # USB-FIFO (FT601) -------------------------------------------------------------------------
+        usb_pads = platform.request("usb_fifo")
+        self.comb += [
+            usb_pads.rst.eq(1),
+            usb_pads.siwua.eq(1),
+        ]
+        self.usb_phy = usb_phy = FT245PHYSynchronous(
+            pads       = usb_pads,
+            clk_freq   = sys_clk_freq,
+            fifo_depth = 64,
+            read_time  = 128,
+            write_time = 128,
+        )
+        if with_usb_loopback:
+            self.comb += usb_phy.source.connect(usb_phy.sink)
+        else:
+            from litex_boards.cores.usb_bridge import USBBridge
+            self.usb_bridge = usb_bridge = USBBridge(fifo_depth=usb_fifo_depth, batch=usb_batch,
+                timeout = int(sys_clk_freq*1e-3))
+            # PCIe TLPs (RX/TX).
+            usb_bridge.add_tap(self.pcie_phy.source, data="dat")
+            usb_bridge.add_tap(self.pcie_phy.sink,   data="dat")
+            # PCIe DMA (Reader -> USB, USB -> Writer).
+            dma_sink = usb_bridge.add_channel(len(self.pcie_dma0.source.data))
+            self.comb += self.pcie_dma0.source.connect(dma_sink)
+            self.usb_dma_converter = stream.Converter(32, len(self.pcie_dma0.sink.data))
+            self.comb += [
+                usb_phy.source.connect(self.usb_dma_converter.sink),
+                self.usb_dma_converter.source.connect(self.pcie_dma0.sink),
+                usb_bridge.source.connect(usb_phy.sink),
+            ]
+
+        # Leds -------------------------------------------------------------------------------------
+        if with_led_chaser:
+            self.leds = LedChaser(
+                pads         = platform.request_all("user_led"),
+                sys_clk_freq = sys_clk_freq)
+
+# Build --------------------------------------------------------------------------------------------
+
+def main():
+    from litex.build.parser import LiteXArgumentParser
+    parser = LiteXArgumentParser(platform=lambdaconcept_pcie_screamer.Platform, description="LiteX SoC on PCIe Screamer.")
+    parser.add_target_argument("--variant",           default="default",  help="Board variant (default or m2).")
+    parser.add_target_argument("--sys-clk-freq",      default=125e6,      type=float, help="System clock frequency.")
+    parser.add_target_argument("--pcie-lanes",        default=1,          type=int,   help="PCIe lanes (1 or 4, 4 on m2 only).")
+    parser.add_target_argument("--usb-fifo-depth",    default=8192,       type=int,   help="USB bridge FIFO depth (32-bit words).")
+    parser.add_target_argument("--usb-batch",         default=1024,       type=int,   help="USB bridge batch size (32-bit words).")
+    parser.add_target_argument("--with-usb-loopback", action="store_true",            help="Loop USB FIFO data back to the host (USB3 link test).")
+    parser.add_target_argument("--driver",            action="store_true",            help="Generate PCIe driver.")
+    args = parser.parse_args()
+
+    soc = BaseSoC(
+        variant           = args.variant,
+        sys_clk_freq      = args.sys_clk_freq,
+        pcie_lanes        = args.pcie_lanes,
+        usb_fifo_depth    = args.usb_fifo_depth,
+        usb_batch         = args.usb_batch,
+        with_usb_loopback = args.with_usb_loopback,
+        **parser.soc_argdict
+    )
+    builder = Builder(soc, **parser.builder_argdict)
+    if args.build:
+        builder.build(**parser.toolchain_argdict)
+
+    if args.driver:
+        from litepcie.software import generate_litepcie_software
+        generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
+
+    if args.load:
+        prog = soc.platform.create_programmer()
+        prog.load_bitstream(builder.get_bitstream_filename(mode="sram"))
+
+if __name__ == "__main__":
+    main()
@@ -16,8 +16,6 @@ from litex.gen import LiteXModule
 
 from litex_boards.platforms import lattice_crosslink_nx_vip
 
-from litex.soc.cores.hyperbus import HyperRAM
-
 from litex.soc.cores.ram import NXLRAM
 from litex.build.io import CRG
 from litex.build.generic_platform import *
@@ -67,6 +65,10 @@ class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=75e6, toolchain="radiant",
         hyperram        = "none",
         with_led_chaser = True,
+        mipi_camera     = None,
+        mipi_lanes      = 4,
+        mipi_format     = "raw10",
+        lram_mode       = "single",
         **kwargs):
         platform = lattice_crosslink_nx_vip.Platform(toolchain=toolchain)
         platform.add_platform_command("ldc_set_sysconfig {{MASTER_SPI_PORT=SERIAL}}")
@@ -80,13 +82,24 @@ class BaseSoC(SoCCore):
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Crosslink-NX VIP Input Board", **kwargs)
 
         # SRAM/HyperRAM ----------------------------------------------------------------------------
+        if lram_mode != "single" and (hyperram != "none" or mipi_camera is None):
+            raise ValueError("--lram-mode requires the LRAM (no --with-hyperram) and --with-mipi-camera.")
         if hyperram == "none":
             # 128KB LRAM (used as SRAM) ------------------------------------------------------------
             size = 128*kB
-            self.spram = NXLRAM(32, size)
-            self.bus.add_slave("sram", slave=self.spram.bus, region=SoCRegion(origin=self.mem_map["sram"],
+            if lram_mode == "single":
+                self.spram = NXLRAM(32, size)
+                lram_bus   = self.spram.bus
+            else:
+                # Banked/Wide LRAM with arbitration (CPU port here, MIPI DMA port below).
+                from litex_boards.cores.banked_ram import BankedRAM, lattice_ram_banks
+                banks, bank_size = lattice_ram_banks(NXLRAM, size, lram_mode)
+                self.spram = BankedRAM(banks, bank_size, interleaved=(lram_mode == "interleaved"))
+                lram_bus   = self.spram.add_port("cpu")
+            self.bus.add_slave("sram", slave=lram_bus, region=SoCRegion(origin=self.mem_map["sram"],
                 size=size))
         else:
+            from litex.soc.cores.hyperbus import HyperRAM
             # Use HyperRAM generic PHY as SRAM -----------------------------------------------------
             size = 8*1024*kB
             hr_pads = platform.request("hyperram", int(hyperram))
@@ -94,6 +107,16 @@ class BaseSoC(SoCCore):
             self.bus.add_slave("sram", slave=self.hyperram.bus, region=SoCRegion(origin=self.mem_map["sram"],
                 size=size))
 
+        # MIPI Camera ------------------------------------------------------------------------------
+        if mipi_camera is not None:
+            from litex_boards.cores.mipi_csi2 import NXDPHYRX, add_mipi_csi2_capture
+            phy = NXDPHYRX(platform.request("camera", int(mipi_camera)), nlanes=mipi_lanes)
+            # Frame DMA on its own LRAM port when banked (frame buffers must then be in the LRAM).
+            port = None
+            if lram_mode != "single":
+                port = self.spram.add_port("mipi")
+            add_mipi_csi2_capture(self, phy=phy, data_type=mipi_format, port=port)
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.leds = LedChaser(
@@ -105,15 +128,23 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=lattice_crosslink_nx_vip.Platform, description="LiteX SoC on Crosslink-NX VIP Board.")
-    parser.add_target_argument("--sys-clk-freq",  default=75e6, type=float, help="System clock frequency.")
-    parser.add_target_argument("--with-hyperram", default="none",           help="Enable use of HyperRAM chip (none, 0 or 1).")
-    parser.add_target_argument("--prog-target",   default="direct",         help="Programming Target (direct or flash).")
+    parser.add_target_argument("--sys-clk-freq",     default=75e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--with-hyperram",    default="none",           help="Enable use of HyperRAM chip (none, 0 or 1).")
+    parser.add_target_argument("--prog-target",      default="direct",         help="Programming Target (direct or flash).")
+    parser.add_target_argument("--with-mipi-camera", default=None,             help="Enable MIPI CSI-2 capture from camera (2 or 3).")
+    parser.add_target_argument("--mipi-lanes",       default=4, type=int,      help="MIPI CSI-2 lanes (1, 2 or 4).")
+    parser.add_target_argument("--mipi-format",      default="raw10",          help="MIPI CSI-2 data type (raw8, raw10, raw12 or yuv422).")
+    parser.add_target_argument("--lram-mode",        default="single",         help="LRAM mode (MIPI DMA on its own LRAM port when not single).", choices=["single", "linear", "interleaved", "wide"])
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
         hyperram     = args.with_hyperram,
         toolchain    = args.toolchain,
+        mipi_camera  = args.with_mipi_camera,
+        mipi_lanes   = args.mipi_lanes,
+        mipi_format  = args.mipi_format,
+        lram_mode    = args.lram_mode,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -22,7 +22,6 @@ from litex.soc.cores.led import LedChaser
 
 from litedram.modules import MT41K64M16
 from litedram.phy import ECP5DDRPHY
-from litex.soc.cores.video import VideoVGAPHY
 from litex.soc.cores.bitbang import I2CMaster
 
 
@@ -110,6 +109,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoVGAPHY
             pads = platform.request("hdmi")
             self.videophy = VideoVGAPHY(pads, clock_domain="hdmi")
             self.videoi2c = I2CMaster(pads)
@@ -25,9 +25,6 @@ from litex.soc.interconnect import stream
 
 from litex.soc.cores.led import LedChaser
 from litex.soc.cores.bitbang import I2CMaster
-from litex.soc.cores.usb_fifo import FT245PHYSynchronous
-
-from litescope import LiteScopeAnalyzer
 
 # CRG ----------------------------------------------------------------------------------------------
 
@@ -94,6 +91,8 @@ class BaseSoC(SoCCore):
 
         # USB-FIFO ---------------------------------------------------------------------------------
         if with_usb_fifo:
+            from litex.soc.cores.usb_fifo import FT245PHYSynchronous
+            from litescope import LiteScopeAnalyzer
             usb_pads = platform.request("usb_fifo")
             self.usb_phy = usb_phy = FT245PHYSynchronous(
                 pads       = usb_pads,
@@ -22,8 +22,6 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import M12L64322A
 from litedram.phy import GENSDRPHY
 
-from liteeth.phy.s6rgmii import LiteEthPHYRGMII
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -53,6 +51,12 @@ class BaseSoC(SoCCore):
         with_etherbone  = False,
         eth_phy         = 0,
         with_led_chaser = True,
+        with_hub75      = False,
+        hub75_chains    = 10,
+        hub75_width     = 128,
+        hub75_rows      = 16,
+        hub75_bit_depth = 8,
+        hub75_refresh   = 400,
         **kwargs):
         platform     = linsn_rv901t.Platform()
 
@@ -72,7 +76,8 @@ class BaseSoC(SoCCore):
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
-        if with_ethernet or with_etherbone:
+        if with_ethernet or with_etherbone or with_hub75:
+            from liteeth.phy.s6rgmii import LiteEthPHYRGMII
             self.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks", eth_phy),
                 pads       = self.platform.request("eth", eth_phy),
@@ -80,11 +85,26 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy, with_timing_constraints=False)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy, with_timing_constraints=False)
+                self.add_etherbone(phy=self.ethphy, data_width=32 if with_hub75 else 8, with_timing_constraints=False)
             # Timing Constraints.
             platform.add_period_constraint(platform.lookup_request("eth_clocks", eth_phy).rx, 1e9/125e6)
             platform.add_false_path_constraints(self.crg.cd_sys.clk, platform.lookup_request("eth_clocks", eth_phy).rx)
 
+        # HUB75 ------------------------------------------------------------------------------------
+        if with_hub75:
+            from litex_boards.cores.hub75 import add_hub75
+            assert not with_ethernet, "HUB75 and Ethernet can't share the Ethernet PHY."
+            platform.add_extension(linsn_rv901t.hub75e)
+            add_hub75(self,
+                control_pads = platform.request("hub75_control"),
+                chain_pads   = [platform.request("hub75_chain", i) for i in range(hub75_chains)],
+                ethphy       = self.ethphy,
+                width        = hub75_width,
+                rows         = hub75_rows,
+                depth        = hub75_bit_depth,
+                refresh_rate = hub75_refresh,
+            )
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.leds = LedChaser(
@@ -101,13 +121,25 @@ def main():
     ethopts.add_argument("--with-ethernet",  action="store_true", help="Enable Ethernet support.")
     ethopts.add_argument("--with-etherbone", action="store_true", help="Enable Etherbone support.")
     parser.add_target_argument("--eth-phy", default=0, type=int,  help="Ethernet PHY (0 or 1).")
+    parser.add_target_argument("--with-hub75",      action="store_true",   help="Enable HUB75 LED-panels output (frames over UDP).")
+    parser.add_target_argument("--hub75-chains",    default=10, type=int,  help="HUB75 chains (J1-J10).")
+    parser.add_target_argument("--hub75-width",     default=128, type=int, help="HUB75 chain width (in pixels).")
+    parser.add_target_argument("--hub75-rows",      default=16, type=int,  help="HUB75 scan rows (panel height/2).")
+    parser.add_target_argument("--hub75-bit-depth", default=8, type=int,   help="HUB75 BCM bit depth (per color).")
+    parser.add_target_argument("--hub75-refresh",   default=400, type=int, help="HUB75 target refresh rate (Hz).")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq   = args.sys_clk_freq,
-        with_ethernet  = args.with_ethernet,
-        with_etherbone = args.with_etherbone,
-        eth_phy        = int(args.eth_phy),
+        sys_clk_freq    = args.sys_clk_freq,
+        with_ethernet   = args.with_ethernet,
+        with_etherbone  = args.with_etherbone,
+        eth_phy         = int(args.eth_phy),
+        with_hub75      = args.with_hub75,
+        hub75_chains    = args.hub75_chains,
+        hub75_width     = args.hub75_width,
+        hub75_rows      = args.hub75_rows,
+        hub75_bit_depth = args.hub75_bit_depth,
+        hub75_refresh   = args.hub75_refresh,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
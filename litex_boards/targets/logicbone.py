@@ -23,7 +23,6 @@ from litex.soc.cores.led import LedChaser
 
 from litedram.modules import MT41K512M16
 from litedram.phy import ECP5DDRPHY
-from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
 
 # _CRG ---------------------------------------------------------------------------------------------
 
@@ -92,9 +91,11 @@ class _CRG(LiteXModule):
 class BaseSoC(SoCCore):
     def __init__(self, revision="rev0", device="45F", sdram_device="MT41K512M16",
         sys_clk_freq    = 75e6,
-        with_ethernet   = False,
-        with_led_chaser = True,
-        toolchain       = "trellis",
+        with_ethernet     = False,
+        with_led_chaser   = True,
+        with_usb_acm_fifo = False,
+        usb_acm_mode      = "console",
+        toolchain         = "trellis",
         **kwargs):
         platform = logicbone.Platform(revision=revision, device=device ,toolchain=toolchain)
 
@@ -104,8 +105,15 @@ class BaseSoC(SoCCore):
         # SoCCore ----------------------------------------------------------------------------------
         # Defaults to USB ACM through ValentyUSB.
         kwargs["uart_name"] = "usb_acm"
+        if with_usb_acm_fifo:
+            kwargs["with_uart"] = False
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Logicbone", **kwargs)
 
+        # USB-ACM FIFO -----------------------------------------------------------------------------
+        if with_usb_acm_fifo:
+            from litex_boards.cores.usb_acm import add_usb_acm_fifo
+            add_usb_acm_fifo(self, default_mode=usb_acm_mode)
+
         # DDR3 SDRAM -------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
             available_sdram_modules = {
@@ -127,6 +135,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet ---------------------------------------------------------------------------------
         if with_ethernet:
+            from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
             self.ethphy = LiteEthPHYRGMII(
                 clock_pads = self.platform.request("eth_clocks"),
                 pads       = self.platform.request("eth"))
@@ -144,19 +153,23 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=logicbone.Platform, description="LiteX SoC on Logicbone.")
-    parser.add_target_argument("--sys-clk-freq",   default=75e6, type=float, help="System clock frequency.")
-    parser.add_target_argument("--device",         default="45F",            help="FPGA device (45F or 85F).")
-    parser.add_target_argument("--sdram-device",   default="MT41K512M16",    help="SDRAM device (MT41K512M16).")
-    parser.add_target_argument("--with-ethernet",  action="store_true",      help="Enable Ethernet support.")
-    parser.add_target_argument("--with-sdcard",    action="store_true",      help="Enable SDCard support.")
+    parser.add_target_argument("--sys-clk-freq",      default=75e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--device",            default="45F",            help="FPGA device (45F or 85F).")
+    parser.add_target_argument("--sdram-device",      default="MT41K512M16",    help="SDRAM device (MT41K512M16).")
+    parser.add_target_argument("--with-ethernet",     action="store_true",      help="Enable Ethernet support.")
+    parser.add_target_argument("--with-sdcard",       action="store_true",      help="Enable SDCard support.")
+    parser.add_target_argument("--with-usb-acm-fifo", action="store_true",      help="Enable high-throughput USB-ACM (Deep FIFOs, DMA and Bridge modes).")
+    parser.add_target_argument("--usb-acm-mode",      default="console",        help="USB-ACM FIFO default mode (console, dma or bridge).")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        toolchain     = args.toolchain,
-        device        = args.device,
-        sys_clk_freq  = args.sys_clk_freq,
-        sdram_device  = args.sdram_device,
-        with_ethernet = args.with_ethernet,
+        toolchain         = args.toolchain,
+        device            = args.device,
+        sys_clk_freq      = args.sys_clk_freq,
+        sdram_device      = args.sdram_device,
+        with_ethernet     = args.with_ethernet,
+        with_usb_acm_fifo = args.with_usb_acm_fifo,
+        usb_acm_mode      = args.usb_acm_mode,
         **parser.soc_argdict
     )
     if args.with_sdcard:
@@ -20,8 +20,6 @@ from litex.build.io import DDROutput
 
 from litex.soc.cores.clock import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.usb_ohci import USBOHCI
-from litex.soc.cores.video import VideoVGAPHY
 from litex.soc.cores.video import VideoHDMIPHY
 
 from litex.soc.integration.soc_core import *
@@ -142,6 +140,7 @@ class BaseSoC(SoCCore):
 
         # USB Host ---------------------------------------------------------------------------------
         if with_usb_host:
+            from litex.soc.cores.usb_ohci import USBOHCI
             self.submodules.usb_ohci = USBOHCI(platform, platform.request("usb_host"), usb_clk_freq=int(48e6))
             self.bus.add_slave("usb_ohci_ctrl", self.usb_ohci.wb_ctrl, region=SoCRegion(origin=self.mem_map["usb_ohci"], size=0x100000, cached=False))
             self.dma_bus.add_master("usb_ohci_dma", master=self.usb_ohci.wb_dma)
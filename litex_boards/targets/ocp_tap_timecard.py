@@ -22,6 +22,17 @@
 # ./litepcie_util scratch_test
 # ./litepcie_util dma_test
 # ./litepcie_util uart_test
+#
+# Timestamping (--with-timestamping, PPS In/Out pins of the carrier given with --pps-pins):
+# ./ocp_tap_timecard.py --uart-name=crossover --with-pcie --with-timestamping --pps-pins=<in>,<out> --build --driver --driver-low-latency --load
+# --driver-low-latency sets the driver DMA_BUFFER_SIZE to the timestamping block size and
+# DMA_BUFFER_PER_IRQ to 1: this is global to the driver and also applies to the other DMA channels.
+# Events are streamed over PCIe DMA channel 1 (/dev/litepcie1), measure latency with:
+# python3 -m litex_boards.tools.timestamp_latency --csr-csv=csr.csv
+#
+# DMA-fed ICAP/Flash reconfiguration (--with-pcie-reconfig, over the PCIe DMA channel exported as
+# RECONFIG_DMA_CHANNEL in csr.csv, /dev/litepcie<RECONFIG_DMA_CHANNEL> is selected by the tool):
+# python3 litex_boards/tools/pcie_reconfig.py --csr-csv=csr.csv flash gateware.bin --offset=0x0
 
 import os
 
@@ -40,9 +51,6 @@ from litex.soc.cores.led import LedChaser
 from litex.soc.cores.xadc import XADC
 from litex.soc.cores.dna  import DNA
 
-from litepcie.phy.s7pciephy import S7PCIEPHY
-from litepcie.software import generate_litepcie_software
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(LiteXModule):
@@ -64,8 +72,11 @@ class CRG(LiteXModule):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=100e6,
-        with_led_chaser = True,
-        with_pcie       = False,
+        with_led_chaser    = True,
+        with_pcie          = False,
+        with_pcie_reconfig = False,
+        with_timestamping  = False,
+        pps_pins           = None,
         **kwargs):
         platform = ocp_tap_timecard.Platform()
 
@@ -83,25 +94,52 @@ class BaseSoC(SoCCore):
         self.dna.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
 
         # PCIe -------------------------------------------------------------------------------------
+        if with_pcie_reconfig and not with_pcie:
+            raise ValueError("--with-pcie-reconfig requires --with-pcie.")
         if with_pcie:
+            from litepcie.phy.s7pciephy import S7PCIEPHY
             self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x1"),
                 data_width = 64,
                 bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1, address_width=64)
+            ndmas = 1 + with_timestamping + with_pcie_reconfig
+            self.add_pcie(phy=self.pcie_phy, ndmas=ndmas, address_width=64)
             # FIXME: Apply it to all targets (integrate it in LitePCIe?).
             platform.add_period_constraint(self.crg.cd_sys.clk, 1e9/sys_clk_freq)
 
-            # ICAP (For FPGA reload over PCIe).
-            from litex.soc.cores.icap import ICAP
-            self.icap = ICAP()
-            self.icap.add_reload()
-            self.icap.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
-
-            # Flash (For SPIFlash update over PCIe).
-            from litex.soc.cores.gpio import GPIOOut
-            from litex.soc.cores.spi_flash import S7SPIFlash
-            self.flash_cs_n = GPIOOut(platform.request("flash_cs_n"))
-            self.flash      = S7SPIFlash(platform.request("flash"), sys_clk_freq, 25e6)
+            # ICAP/Flash fed by a dedicated PCIe DMA channel (For fast reconfiguration/update).
+            if with_pcie_reconfig:
+                from litex_boards.cores.reconfig import add_pcie_reconfig
+                add_pcie_reconfig(self,
+                    dma_channel     = ndmas - 1,
+                    flash_pads      = platform.request("flash"),
+                    flash_cs_n_pads = platform.request("flash_cs_n"),
+                )
+            else:
+                # ICAP (For FPGA reload over PCIe).
+                from litex.soc.cores.icap import ICAP
+                self.icap = ICAP()
+                self.icap.add_reload()
+                self.icap.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
+
+                # Flash (For SPIFlash update over PCIe).
+                from litex.soc.cores.gpio import GPIOOut
+                from litex.soc.cores.spi_flash import S7SPIFlash
+                self.flash_cs_n = GPIOOut(platform.request("flash_cs_n"))
+                self.flash      = S7SPIFlash(platform.request("flash"), sys_clk_freq, 25e6)
+
+        # Timestamping -----------------------------------------------------------------------------
+        if with_timestamping:
+            assert with_pcie
+            from litex_boards.cores.timestamp import add_pcie_timestamping
+            # PPS In/Out pads (optional, PPS In channel idle without them).
+            pps_pads = None
+            if pps_pins is not None:
+                platform.add_extension(ocp_tap_timecard.pps_io(*pps_pins))
+                pps_pads = platform.request("pps")
+            add_pcie_timestamping(self,
+                dma  = self.pcie_dma1,
+                pads = pps_pads,
+            )
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -115,24 +153,42 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=ocp_tap_timecard.Platform, description="LiteX SoC on OCP-TAP TimeCard.")
-    parser.add_target_argument("--flash",        action="store_true",       help="Flash bitstream.")
-    parser.add_target_argument("--sys-clk-freq", default=100e6, type=float, help="System clock frequency.")
-    parser.add_target_argument("--with-pcie",    action="store_true", help="Enable PCIe support.")
-    parser.add_target_argument("--driver",       action="store_true", help="Generate PCIe driver.")
+    parser.add_target_argument("--flash",              action="store_true",       help="Flash bitstream.")
+    parser.add_target_argument("--sys-clk-freq",       default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--fast-boot",          action="store_true",       help="Use fastest SPI Flash configuration settings supported by the board.")
+    parser.add_target_argument("--with-pcie",          action="store_true",       help="Enable PCIe support.")
+    parser.add_target_argument("--with-pcie-reconfig", action="store_true",       help="Enable DMA-fed ICAP/QSPI Flash programming over PCIe.")
+    parser.add_target_argument("--with-timestamping",  action="store_true",       help="Enable PTP Timestamping (PPS In/Out capture streamed over PCIe DMA).")
+    parser.add_target_argument("--pps-pins",           default=None,              help="Timestamping PPS In/Out FPGA pins (ex: --pps-pins=<in>,<out>).")
+    parser.add_target_argument("--driver",             action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--driver-low-latency", action="store_true",       help="Size the driver DMA buffers to the timestamping blocks (all DMA channels).")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = args.sys_clk_freq,
-        with_pcie    = args.with_pcie,
+        sys_clk_freq       = args.sys_clk_freq,
+        with_pcie          = args.with_pcie,
+        with_pcie_reconfig = args.with_pcie_reconfig,
+        with_timestamping  = args.with_timestamping,
+        pps_pins           = args.pps_pins.split(",") if args.pps_pins else None,
         **parser.soc_argdict
     )
 
+    if args.fast_boot:
+        soc.platform.config_profile.fast_boot().apply(soc.platform)
+
     builder  = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
+        if args.with_timestamping and args.driver_low_latency:
+            from litex_boards.cores.timestamp import set_litepcie_dma_buffering
+            set_litepcie_dma_buffering(os.path.join(builder.output_dir, "driver"),
+                buffer_size    = soc.constants["TIMESTAMPING_BLOCK_SIZE"],
+                buffer_per_irq = 1,
+            )
 
     if args.load:
         prog = soc.platform.create_programmer()
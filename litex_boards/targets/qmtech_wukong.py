@@ -15,7 +15,6 @@ from litex_boards.platforms import qmtech_wukong
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoS7HDMIPHY
 from litex.soc.cores.video import video_timings
 from litex.soc.cores.led import LedChaser
 from litex.soc.cores.gpio import GPIOIn
@@ -23,9 +22,6 @@ from litex.soc.cores.gpio import GPIOIn
 from litedram.modules import MT41K128M16
 from litedram.phy import s7ddrphy
 
-from liteeth.phy import LiteEthPHY
-from liteeth.phy import LiteEthPHYMII
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -107,6 +103,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy import LiteEthPHY
             self.ethphy = LiteEthPHY(
                 clock_pads = self.platform.request("eth_clocks"),
                 pads       = self.platform.request("eth"),
@@ -124,6 +121,7 @@ class BaseSoC(SoCCore):
 
             # Video ----------------------------------- -------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoS7HDMIPHY
             self.videophy = VideoS7HDMIPHY(platform.request("hdmi_out"), clock_domain="hdmi")
             if with_video_terminal:
                 self.add_video_terminal(phy=self.videophy, timings=video_timing, clock_domain="hdmi")
@@ -19,7 +19,6 @@ from litex_boards.platforms import radiona_ulx3s
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoHDMIPHY
 from litex.soc.cores.led import LedChaser
 from litex.soc.cores.spi import SPIMaster
 from litex.soc.cores.gpio import GPIOOut
@@ -93,17 +92,26 @@ class BaseSoC(SoCCore):
         with_video_terminal    = False,
         with_video_framebuffer = False,
         with_spi_flash         = False,
+        with_usb_acm_fifo      = False,
+        usb_acm_mode           = "console",
         **kwargs):
         platform = radiona_ulx3s.Platform(device=device, revision=revision, toolchain=toolchain)
 
         # CRG --------------------------------------------------------------------------------------
-        with_usb_pll   = kwargs.get("uart_name", None) == "usb_acm"
+        with_usb_pll   = kwargs.get("uart_name", None) == "usb_acm" or with_usb_acm_fifo
         with_video_pll = with_video_terminal or with_video_framebuffer
         self.crg = _CRG(platform, sys_clk_freq, with_usb_pll, with_video_pll, sdram_rate=sdram_rate)
 
         # SoCCore ----------------------------------------------------------------------------------
+        if with_usb_acm_fifo:
+            kwargs["with_uart"] = False
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on ULX3S", **kwargs)
 
+        # USB-ACM FIFO -----------------------------------------------------------------------------
+        if with_usb_acm_fifo:
+            from litex_boards.cores.usb_acm import add_usb_acm_fifo
+            add_usb_acm_fifo(self, default_mode=usb_acm_mode)
+
         # SDR SDRAM --------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
             sdrphy_cls = HalfRateGENSDRPHY if sdram_rate == "1:2" else GENSDRPHY
@@ -117,6 +125,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoHDMIPHY
             self.videophy = VideoHDMIPHY(platform.request("gpdi"), clock_domain="hdmi")
             if with_video_terminal:
                 self.add_video_terminal(phy=self.videophy, timings="640x480@75Hz", clock_domain="hdmi")
@@ -153,9 +162,12 @@ def main():
     parser.add_target_argument("--sys-clk-freq",    default=50e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--sdram-module",    default="MT48LC16M16",    help="SDRAM module (MT48LC16M16, AS4C32M16 or AS4C16M16).")
     parser.add_target_argument("--with-spi-flash",  action="store_true",      help="Enable SPI Flash (MMAPed).")
+    parser.add_target_argument("--with-usb-acm-fifo", action="store_true",     help="Enable high-throughput USB-ACM (Deep FIFOs, DMA and Bridge modes).")
+    parser.add_target_argument("--usb-acm-mode",      default="console",       help="USB-ACM FIFO default mode (console, dma or bridge).")
     sdopts = parser.target_group.add_mutually_exclusive_group()
     sdopts.add_argument("--with-spi-sdcard",   action="store_true", help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",       action="store_true", help="Enable SDCard support.")
+    parser.add_target_argument("--sdcard-clk-freq", default=50e6, type=float, help="SDCard clock frequency (4-bit SDCard mode).")
     parser.add_target_argument("--with-oled",  action="store_true", help="Enable SDD1331 OLED support.")
     parser.add_target_argument("--sdram-rate", default="1:1",       help="SDRAM Rate (1:1 Full Rate or 1:2 Half Rate).")
     viopts = parser.target_group.add_mutually_exclusive_group()
@@ -173,11 +185,14 @@ def main():
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
         with_spi_flash         = args.with_spi_flash,
+        with_usb_acm_fifo      = args.with_usb_acm_fifo,
+        usb_acm_mode           = args.usb_acm_mode,
         **parser.soc_argdict)
     if args.with_spi_sdcard:
         soc.add_spi_sdcard()
     if args.with_sdcard:
-        soc.add_sdcard()
+        from litex_boards.cores.sdcard import add_sdcard_dma
+        add_sdcard_dma(soc, clk_freq=args.sdcard_clk_freq)
     if args.with_oled:
         soc.add_oled()
 
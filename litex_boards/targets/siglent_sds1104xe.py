@@ -27,14 +27,11 @@ from litex_boards.platforms import siglent_sds1104xe
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoVGAPHY
 
 from litedram.common import PHYPadsReducer
 from litedram.modules import MT41K64M16
 from litedram.phy import s7ddrphy
 
-from liteeth.phy.mii import LiteEthPHYMII
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -97,6 +94,7 @@ class BaseSoC(SoCCore):
 
         # Etherbone --------------------------------------------------------------------------------
         if with_etherbone:
+            from liteeth.phy.mii import LiteEthPHYMII
             # FIXME: Simplify LiteEth Hybrid MAC integration.
             from liteeth.common import convert_ip
             from liteeth.mac import LiteEthMAC
@@ -157,6 +155,7 @@ class BaseSoC(SoCCore):
             "v_sync_width"  : 1,
         })
         if with_video_terminal or with_video_framebuffer:
+            from litex.soc.cores.video import VideoVGAPHY
             self.videophy = VideoVGAPHY(platform.request("lcd"), clock_domain="dvi")
             if with_video_terminal:
                 self.add_video_terminal(phy=self.videophy, timings=video_timings, clock_domain="dvi")
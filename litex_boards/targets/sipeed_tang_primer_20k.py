@@ -18,9 +18,6 @@ from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser, WS2812
 from litex.soc.cores.gpio import GPIOIn
-from litex.soc.cores.video import *
-
-from liteeth.phy.rmii import LiteEthPHYRMII
 
 from litex_boards.platforms import sipeed_tang_primer_20k
 
@@ -162,6 +159,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy.rmii import LiteEthPHYRMII
             # FIXME: Un-tested.
             from liteeth.phy.rmii import LiteEthPHYRMII
             self.ethphy = LiteEthPHYRMII(
@@ -176,6 +174,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal:
+            from litex.soc.cores.video import VideoHDMIPHY
             # FIXME: Un-tested.
             hdmi_pads = platform.request("hdmi")
             self.comb += hdmi_pads.hdp.eq(1)
@@ -22,6 +22,10 @@
 # ./litepcie_util scratch_test
 # ./litepcie_util dma_test
 # ./litepcie_util uart_test
+#
+# DMA-fed ICAP/Flash reconfiguration (--with-pcie-reconfig, over the PCIe DMA channel exported as
+# RECONFIG_DMA_CHANNEL in csr.csv, /dev/litepcie<RECONFIG_DMA_CHANNEL> is selected by the tool):
+# python3 litex_boards/tools/pcie_reconfig.py --csr-csv=csr.csv flash gateware.bin --offset=0x0
 
 import os
 
@@ -43,9 +47,6 @@ from litex.soc.cores.dna  import DNA
 from litedram.modules import MT41K512M16
 from litedram.phy import s7ddrphy
 
-from litepcie.phy.s7pciephy import S7PCIEPHY
-from litepcie.software import generate_litepcie_software
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(LiteXModule):
@@ -75,9 +76,10 @@ class CRG(LiteXModule):
 
 class BaseSoC(SoCCore):
     def __init__(self, variant="cle-215+", sys_clk_freq=100e6,
-        with_led_chaser = True,
-        with_pcie       = False,
-        with_sata       = False,
+        with_led_chaser    = True,
+        with_pcie          = False,
+        with_pcie_reconfig = False,
+        with_sata          = False,
         **kwargs):
         platform = sqrl_acorn.Platform(variant=variant)
 
@@ -108,11 +110,14 @@ class BaseSoC(SoCCore):
             )
 
         # PCIe -------------------------------------------------------------------------------------
+        if with_pcie_reconfig and not with_pcie:
+            raise ValueError("--with-pcie-reconfig requires --with-pcie.")
         if with_pcie:
+            from litepcie.phy.s7pciephy import S7PCIEPHY
             self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
                 data_width = 128,
                 bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1, address_width=64)
+            self.add_pcie(phy=self.pcie_phy, ndmas=2 if with_pcie_reconfig else 1, address_width=64)
             # FIXME: Apply it to all targets (integrate it in LitePCIe?).
             platform.add_period_constraint(self.crg.cd_sys.clk, 1e9/sys_clk_freq)
             platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks {sys_clk}] -group [get_clocks userclk2] -asynchronous", sys_clk=self.crg.cd_sys.clk)
@@ -120,17 +125,26 @@ class BaseSoC(SoCCore):
             platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks {sys_clk}] -group [get_clocks clk_250mhz] -asynchronous", sys_clk=self.crg.cd_sys.clk)
             platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks clk_125mhz] -group [get_clocks clk_250mhz] -asynchronous")
 
-            # ICAP (For FPGA reload over PCIe).
-            from litex.soc.cores.icap import ICAP
-            self.icap = ICAP()
-            self.icap.add_reload()
-            self.icap.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
-
-            # Flash (For SPIFlash update over PCIe).
-            from litex.soc.cores.gpio import GPIOOut
-            from litex.soc.cores.spi_flash import S7SPIFlash
-            self.flash_cs_n = GPIOOut(platform.request("flash_cs_n"))
-            self.flash      = S7SPIFlash(platform.request("flash"), sys_clk_freq, 25e6)
+            # ICAP/Flash fed by a dedicated PCIe DMA channel (For fast reconfiguration/update).
+            if with_pcie_reconfig:
+                from litex_boards.cores.reconfig import add_pcie_reconfig
+                add_pcie_reconfig(self,
+                    dma_channel     = 1,
+                    flash_pads      = platform.request("flash"),
+                    flash_cs_n_pads = platform.request("flash_cs_n"),
+                )
+            else:
+                # ICAP (For FPGA reload over PCIe).
+                from litex.soc.cores.icap import ICAP
+                self.icap = ICAP()
+                self.icap.add_reload()
+                self.icap.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
+
+                # Flash (For SPIFlash update over PCIe).
+                from litex.soc.cores.gpio import GPIOOut
+                from litex.soc.cores.spi_flash import S7SPIFlash
+                self.flash_cs_n = GPIOOut(platform.request("flash_cs_n"))
+                self.flash      = S7SPIFlash(platform.request("flash"), sys_clk_freq, 25e6)
 
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
@@ -177,31 +191,43 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=sqrl_acorn.Platform, description="LiteX SoC on Acorn CLE-101/215(+).")
-    parser.add_target_argument("--flash",           action="store_true",       help="Flash bitstream.")
-    parser.add_target_argument("--variant",         default="cle-215+",        help="Board variant (cle-215+, cle-215 or cle-101).")
-    parser.add_target_argument("--sys-clk-freq",    default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--flash",              action="store_true",       help="Flash bitstream.")
+    parser.add_target_argument("--variant",            default="cle-215+",        help="Board variant (cle-215+, cle-215 or cle-101).")
+    parser.add_target_argument("--sys-clk-freq",       default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--fast-boot",          action="store_true",       help="Use fastest SPI Flash configuration settings supported by the board.")
     pcieopts = parser.target_group.add_mutually_exclusive_group()
-    pcieopts.add_argument("--with-pcie",            action="store_true", help="Enable PCIe support.")
-    parser.add_target_argument("--driver",          action="store_true", help="Generate PCIe driver.")
-    parser.add_target_argument("--with-spi-sdcard", action="store_true", help="Enable SPI-mode SDCard support (requires SDCard adapter on P2).")
-    pcieopts.add_argument("--with-sata",            action="store_true", help="Enable SATA support (over PCIe2SATA).")
+    pcieopts.add_argument("--with-pcie",               action="store_true",       help="Enable PCIe support.")
+    parser.add_target_argument("--with-pcie-reconfig", action="store_true",       help="Enable DMA-fed ICAP/QSPI Flash programming over PCIe.")
+    parser.add_target_argument("--driver",             action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--with-spi-sdcard",    action="store_true",       help="Enable SPI-mode SDCard support (requires SDCard adapter on P2).")
+    pcieopts.add_argument("--with-sata",               action="store_true",       help="Enable SATA support (over PCIe2SATA).")
+    parser.add_target_argument("--with-bus-perf",      action="store_true",       help="Enable Bus performance counters (see tools/bus_perf.py).")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        variant      = args.variant,
-        sys_clk_freq = args.sys_clk_freq,
-        with_pcie    = args.with_pcie,
-        with_sata    = args.with_sata,
+        variant            = args.variant,
+        sys_clk_freq       = args.sys_clk_freq,
+        with_pcie          = args.with_pcie,
+        with_pcie_reconfig = args.with_pcie_reconfig,
+        with_sata          = args.with_sata,
         **parser.soc_argdict
     )
     if args.with_spi_sdcard:
         soc.add_spi_sdcard()
 
+    if args.with_bus_perf:
+        from litex_boards.cores.bus_perf import add_bus_perf
+        add_bus_perf(soc)
+
+    if args.fast_boot:
+        soc.platform.config_profile.fast_boot().apply(soc.platform)
+
     builder  = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
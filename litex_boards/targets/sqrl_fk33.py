@@ -24,15 +24,8 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.interconnect.axi import *
-from litex.soc.cores.ram.xilinx_usp_hbm2 import USPHBM2
 from litex.soc.cores.led import LedChaser
 
-from litepcie.phy.usppciephy import USPHBMPCIEPHY
-from litepcie.core import LitePCIeEndpoint, LitePCIeMSI
-from litepcie.frontend.dma import LitePCIeDMA
-from litepcie.frontend.wishbone import LitePCIeWishboneBridge
-from litepcie.software import generate_litepcie_software
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -80,6 +73,7 @@ class BaseSoC(SoCCore):
 
         # HBM --------------------------------------------------------------------------------------
         if with_hbm:
+            from litex.soc.cores.ram.xilinx_usp_hbm2 import USPHBM2
             # Add HBM Core.
             self.hbm = hbm = ClockDomainsRenamer({"axi": "sys"})(USPHBM2(platform))
 
@@ -99,6 +93,10 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
+            from litepcie.phy.usppciephy import USPHBMPCIEPHY
+            from litepcie.core import LitePCIeEndpoint, LitePCIeMSI
+            from litepcie.frontend.dma import LitePCIeDMA
+            from litepcie.frontend.wishbone import LitePCIeWishboneBridge
             assert self.csr_data_width == 32
             # PHY
             self.pcie_phy = USPHBMPCIEPHY(platform, platform.request("pcie_x4"),
@@ -159,6 +157,7 @@ def main():
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
@@ -19,7 +19,6 @@ from litex.soc.cores.clock import CycloneVPLL
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoVGAPHY
 from litex.soc.cores.led import LedChaser
 
 from litedram.modules import AS4C32M16
@@ -68,6 +67,7 @@ class BaseSoC(SoCCore):
         with_mister_sdram          = True,
         with_mister_video_terminal = False,
         sdram_rate                 = "1:1",
+        with_hps                   = False,
         **kwargs):
         platform = terasic_de10nano.Platform()
 
@@ -87,8 +87,14 @@ class BaseSoC(SoCCore):
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
 
+        # HPS (H2F/LWH2F Bridges, F2SDRAM) ---------------------------------------------------------
+        if with_hps:
+            from litex_boards.cores.hps import add_hps
+            add_hps(self)
+
         # Video Terminal ---------------------------------------------------------------------------
         if with_mister_video_terminal:
+            from litex.soc.cores.video import VideoVGAPHY
             self.videophy = VideoVGAPHY(platform.request("vga"), clock_domain="vga")
             self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="vga")
 
@@ -107,6 +113,7 @@ def main():
     parser.add_target_argument("--with-mister-sdram",          action="store_true",      help="Enable SDRAM with MiSTer expansion board.")
     parser.add_target_argument("--with-mister-video-terminal", action="store_true",      help="Enable Video Terminal with Mister expansion board.")
     parser.add_target_argument("--sdram-rate",                 default="1:1",            help="SDRAM Rate (1:1 Full Rate or 1:2 Half Rate).")
+    parser.add_target_argument("--with-hps",                   action="store_true",      help="Enable HPS with H2F/LWH2F bridges and F2SDRAM ports.")
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -114,6 +121,7 @@ def main():
         with_mister_sdram          = args.with_mister_sdram,
         with_mister_video_terminal = args.with_mister_video_terminal,
         sdram_rate                 = args.sdram_rate,
+        with_hps                   = args.with_hps,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -49,7 +49,7 @@ class _CRG(LiteXModule):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=50e6, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=50e6, with_led_chaser=True, with_hps=False, **kwargs):
         platform = terasic_de1soc.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -67,6 +67,11 @@ class BaseSoC(SoCCore):
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
 
+        # HPS (H2F/LWH2F Bridges, F2SDRAM) ---------------------------------------------------------
+        if with_hps:
+            from litex_boards.cores.hps import add_hps
+            add_hps(self)
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.leds = LedChaser(
@@ -79,10 +84,12 @@ def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=terasic_de1soc.Platform, description="LiteX SoC on DE1-SoC.")
     parser.add_target_argument("--sys-clk-freq", default=50e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--with-hps",     action="store_true",      help="Enable HPS with H2F/LWH2F bridges and F2SDRAM ports.")
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
+        with_hps     = args.with_hps,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
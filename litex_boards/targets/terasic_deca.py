@@ -9,6 +9,8 @@
 # Build/Use:
 # ./terasic_deca.py --uart-name jtag_uart --build --load
 # litex_term --jtag-config ../prog/openocd_max10_blaster2.cfg jtag
+# (DDR3 main_ram: UniPHY controller generated with Platform Designer, memtest/memspeed at BIOS boot,
+#  use --integrated-main-ram-size to build without it).
 
 from migen import *
 from litex_boards.platforms import terasic_deca
@@ -18,11 +20,8 @@ from litex.gen import LiteXModule
 from litex.soc.cores.clock import Max10PLL
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoDVIPHY
 from litex.soc.cores.led import LedChaser
 
-from liteeth.phy.mii import LiteEthPHYMII
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -35,7 +34,7 @@ class _CRG(LiteXModule):
         # # #
 
         # Clk / Rst.
-        clk50 = platform.request("clk50")
+        self.clk50 = clk50 = platform.request("clk50")
 
         # PLL
         self.pll = pll = Max10PLL(speedgrade="-6")
@@ -84,6 +83,14 @@ class BaseSoC(SoCCore):
             kwargs["uart_name"] = "crossover"
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Terasic DECA", **kwargs)
 
+        # DDR3 SDRAM -------------------------------------------------------------------------------
+        if not self.integrated_main_ram_size:
+            from litex_boards.cores.uniphy import add_max10_ddr3
+            add_max10_ddr3(self,
+                ref_clk       = self.crg.clk50,
+                l2_cache_size = kwargs.get("l2_size", 8192),
+            )
+
         # UARTbone ---------------------------------------------------------------------------------
         if with_uartbone:
             self.add_uartbone(name=real_uart_name, baudrate=kwargs["uart_baudrate"])
@@ -94,6 +101,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet ---------------------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy.mii import LiteEthPHYMII
             self.platform.toolchain.additional_sdc_commands += [
                 'create_clock -name eth_rx_clk -period 40.0 [get_ports {eth_clocks_rx}]',
                 'create_clock -name eth_tx_clk -period 40.0 [get_ports {eth_clocks_tx}]',
@@ -111,6 +119,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal:
+            from litex.soc.cores.video import VideoDVIPHY
             self.videophy = VideoDVIPHY(platform.request("hdmi"), clock_domain="hdmi")
             self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="hdmi")
 
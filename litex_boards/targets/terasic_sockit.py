@@ -15,7 +15,6 @@ from litex.soc.cores.clock import CycloneVPLL
 from litex.soc.integration.soc_core  import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.video import VideoVGAPHY
 
 from litex.build.io import DDROutput
 
@@ -68,6 +67,7 @@ class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=50e6, revision="revd", sdram_rate="1:2", mister_sdram=None,
         with_led_chaser     = True,
         with_video_terminal = False,
+        with_hps            = False,
         **kwargs):
         platform = terasic_sockit.Platform(revision)
 
@@ -94,8 +94,14 @@ class BaseSoC(SoCCore):
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
 
+        # HPS (H2F/LWH2F Bridges, F2SDRAM) ---------------------------------------------------------
+        if with_hps:
+            from litex_boards.cores.hps import add_hps
+            add_hps(self)
+
         # Video Terminal ---------------------------------------------------------------------------
         if with_video_terminal:
+            from litex.soc.cores.video import VideoVGAPHY
             vga_pads = platform.request("vga")
             self.comb += [ vga_pads.sync_n.eq(0), vga_pads.blank_n.eq(1) ]
             self.specials += DDROutput(i1=1, i2=0, o=vga_pads.clk, clk=ClockSignal("vga"))
@@ -119,6 +125,7 @@ def main():
     parser.add_target_argument("--revision",            default="revd",           help="Board revision (revb, revc or revd).")
     parser.add_target_argument("--sys-clk-freq",        default=50e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--with-video-terminal", action="store_true",      help="Enable Video Terminal (VGA).")
+    parser.add_target_argument("--with-hps",            action="store_true",      help="Enable HPS with H2F/LWH2F bridges and F2SDRAM ports.")
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -127,6 +134,7 @@ def main():
         sdram_rate          = "1:1" if args.single_rate_sdram else "1:2",
         mister_sdram        = "xs_v22" if args.mister_sdram_xs_v22 else "xs_v24" if args.mister_sdram_xs_v24 else None,
         with_video_terminal = args.with_video_terminal,
+        with_hps            = args.with_hps,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -23,8 +23,6 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import MT48LC16M16
 from litedram.phy import GENSDRPHY
 
-from liteeth.phy.mii import LiteEthPHYMII
-
 from litex.soc.cores.hyperbus import HyperRAM
 
 # CRG ----------------------------------------------------------------------------------------------
@@ -86,6 +84,7 @@ class BaseSoC(SoCCore):
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
+            from liteeth.phy.mii import LiteEthPHYMII
             self.ethphy = LiteEthPHYMII(
                 clock_pads = self.platform.request("eth_clocks"),
                 pads       = self.platform.request("eth"))
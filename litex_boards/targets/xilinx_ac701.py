@@ -24,13 +24,6 @@ from litedram.common import PHYPadsReducer
 from litedram.modules import MT8JTF12864
 from litedram.phy import s7ddrphy
 
-from liteeth.phy.a7_gtp import QPLLSettings, QPLL
-from liteeth.phy.a7_1000basex import A7_1000BASEX
-from liteeth.phy.s7rgmii import LiteEthPHYRGMII
-
-from litepcie.phy.s7pciephy import S7PCIEPHY
-from litepcie.software import generate_litepcie_software
-
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -89,6 +82,7 @@ class BaseSoC(SoCCore):
         if with_ethernet:
             # RGMII Ethernet PHY -------------------------------------------------------------------
             if eth_phy == "rgmii":
+                from liteeth.phy.s7rgmii import LiteEthPHYRGMII
                 # phy
                 self.ethphy = LiteEthPHYRGMII(
                     clock_pads = self.platform.request("eth_clocks"),
@@ -96,6 +90,8 @@ class BaseSoC(SoCCore):
 
             # 1000BaseX Ethernet PHY ---------------------------------------------------------------
             if eth_phy == "1000basex":
+                from liteeth.phy.a7_gtp import QPLLSettings, QPLL
+                from liteeth.phy.a7_1000basex import A7_1000BASEX
                 # phy
                 self.comb += self.platform.request("sfp_mgt_clk_sel0", 0).eq(0)
                 self.comb += self.platform.request("sfp_mgt_clk_sel1", 0).eq(0)
@@ -130,6 +126,7 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
+            from litepcie.phy.s7pciephy import S7PCIEPHY
             self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
                 data_width = 128,
                 bar0_size  = 0x20000)
@@ -166,6 +163,7 @@ def main():
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
@@ -27,19 +27,12 @@ from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.interconnect.axi import *
 from litex.soc.interconnect.csr import *
-from litex.soc.cores.ram.xilinx_usp_hbm2 import USPHBM2
 
 from litex.soc.cores.led import LedChaser
 from litedram.modules import MTA18ASF2G72PZ
 from litedram.phy import usddrphy
 
-from litepcie.phy.usppciephy import USPPCIEPHY
-from litepcie.software import generate_litepcie_software
-
 from litedram.common import *
-from litedram.frontend.axi import *
-
-from litescope import LiteScopeAnalyzer
 
 # CRG ----------------------------------------------------------------------------------------------
 
@@ -91,6 +84,9 @@ class BaseSoC(SoCCore):
         with_pcie       = False,
         with_led_chaser = False,
         with_hbm        = False,
+        with_analyzer   = False,
+        analyzer_dma    = None,
+        analyzer_depth  = 2**20,
         **kwargs):
         platform = xilinx_alveo_u280.Platform()
         if with_hbm:
@@ -107,6 +103,7 @@ class BaseSoC(SoCCore):
             # JTAGBone -----------------------------------------------------------------------------
             #self.add_jtagbone(chain=2) # Chain 1 already used by HBM2 debug probes.
 
+            from litex.soc.cores.ram.xilinx_usp_hbm2 import USPHBM2
             # Add HBM Core.
             self.hbm = hbm = ClockDomainsRenamer({"axi": "sys"})(USPHBM2(platform))
 
@@ -133,10 +130,12 @@ class BaseSoC(SoCCore):
                     sys_clk_freq     = sys_clk_freq,
                     iodelay_clk_freq = 600e6,
                     is_rdimm         = True)
+                # Upper 512MB reserved for the Analyzer deep captures (--analyzer-dma=memory).
+                analyzer_ram = with_analyzer and (analyzer_dma == "memory")
                 self.add_sdram("sdram",
                     phy           = self.ddrphy,
                     module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
-                    size          = 0x40000000,
+                    size          = 0x20000000 if analyzer_ram else 0x40000000,
                     l2_cache_size = kwargs.get("l2_size", 8192)
                 )
 
@@ -145,6 +144,7 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
+            from litepcie.phy.usppciephy import USPPCIEPHY
             self.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
                 data_width = 128,
                 bar0_size  = 0x20000)
@@ -156,17 +156,80 @@ class BaseSoC(SoCCore):
                 pads         = platform.request_all("gpio_led"),
                 sys_clk_freq = sys_clk_freq)
 
+        # Analyzer ---------------------------------------------------------------------------------
+        if with_analyzer:
+            # Memory accesses (HBM2 channel 0 / LiteDRAM port after L2) and PCIe PHY handshakes.
+            if with_hbm:
+                axi = hbm.axi[0]
+                analyzer_signals = [
+                    axi.aw.valid, axi.aw.ready, axi.aw.addr, axi.aw.len,
+                    axi.w.valid,  axi.w.ready,  axi.w.last,
+                    axi.ar.valid, axi.ar.ready, axi.ar.addr, axi.ar.len,
+                    axi.r.valid,  axi.r.ready,  axi.r.last,
+                ]
+            else:
+                port = self.sdram.crossbar.masters[0]
+                analyzer_signals = [
+                    port.cmd.valid,   port.cmd.ready, port.cmd.we, port.cmd.addr,
+                    port.wdata.valid, port.wdata.ready,
+                    port.rdata.valid, port.rdata.ready,
+                ]
+            if with_pcie:
+                for ep in [self.pcie_phy.req_sink, self.pcie_phy.cmp_sink, self.pcie_phy.req_source, self.pcie_phy.cmp_source]:
+                    analyzer_signals += [ep.valid, ep.ready, ep.first, ep.last]
+            # Deep captures in HBM2 (hbm3 region)/DDR4 (upper 512MB) or streamed over PCIe (DMA0 Writer).
+            if analyzer_dma is not None:
+                from litex_boards.cores.scope import LiteScopeDMAAnalyzer
+                if analyzer_dma == "pcie":
+                    assert with_pcie
+                    dma, base, bus_base, size = self.pcie_dma0.sink, 0, 0, None
+                elif with_hbm:
+                    from litedram.frontend.axi import LiteDRAMAXIPort
+                    dma, base, bus_base, size = LiteDRAMAXIPort(data_width=256, address_width=33, id_width=6), 0x7000_0000, 0x7000_0000, 0x1000_0000
+                    self.comb += dma.connect(hbm.axi[4])
+                else:
+                    # Upper 512MB of the DDR4 (out of main_ram), exposed on the bus for the host.
+                    from litex.soc.interconnect import wishbone
+                    from litedram.frontend.wishbone import LiteDRAMWishbone2Native
+                    dma, base, bus_base, size = self.sdram.crossbar.get_port(), 0x2000_0000, self.mem_map["main_ram"] + 0x2000_0000, 0x2000_0000
+                    analyzer_wb = wishbone.Interface(data_width=self.bus.data_width, address_width=32, addressing="word")
+                    self.bus.add_slave("analyzer_ram", analyzer_wb, SoCRegion(origin=bus_base, size=size, cached=False))
+                    self.analyzer_ram = LiteDRAMWishbone2Native(analyzer_wb, self.sdram.crossbar.get_port(),
+                        base_address = self.mem_map["main_ram"])
+                self.analyzer = LiteScopeDMAAnalyzer(analyzer_signals,
+                    depth        = analyzer_depth,
+                    dma          = dma,
+                    base         = base,
+                    bus_base     = bus_base,
+                    clock_domain = "sys",
+                    samplerate   = sys_clk_freq,
+                    csr_csv      = "analyzer.csv"
+                )
+                if size is not None:
+                    assert analyzer_depth*self.analyzer.storage.sample_width//8 <= size
+            else:
+                from litescope import LiteScopeAnalyzer
+                self.analyzer = LiteScopeAnalyzer(analyzer_signals,
+                    depth        = 1024,
+                    clock_domain = "sys",
+                    samplerate   = sys_clk_freq,
+                    csr_csv      = "analyzer.csv"
+                )
+
 # Build --------------------------------------------------------------------------------------------
 
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=xilinx_alveo_u280.Platform, description="LiteX SoC on Alveo U280.")
     parser.add_target_argument("--sys-clk-freq",    default=150e6, type=float, help="System clock frequency.") # HBM2 with 250MHz, DDR4 with 150MHz (1:4)
+    parser.add_target_argument("--fast-boot",       action="store_true",       help="Use fastest SPI Flash configuration settings supported by the board.")
     parser.add_target_argument("--ddram-channel",   default="0",               help="DDRAM channel (0, 1, 2 or 3).") # also selects clk 0 or 1
     parser.add_target_argument("--with-pcie",       action="store_true",       help="Enable PCIe support.")
     parser.add_target_argument("--driver",          action="store_true",       help="Generate PCIe driver.")
     parser.add_target_argument("--with-hbm",        action="store_true",       help="Use HBM2.")
     parser.add_target_argument("--with-analyzer",   action="store_true",       help="Enable Analyzer.")
+    parser.add_target_argument("--analyzer-dma",    default=None,              help="Analyzer deep captures storage.", choices=["memory", "pcie"])
+    parser.add_target_argument("--analyzer-depth",  default=2**20, type=int,   help="Analyzer deep captures depth (samples).")
     parser.add_target_argument("--with-led-chaser", action="store_true",       help="Enable LED Chaser.")
     args = parser.parse_args()
 
@@ -180,13 +243,19 @@ def main():
         with_led_chaser = args.with_led_chaser,
         with_hbm        = args.with_hbm,
         with_analyzer   = args.with_analyzer,
+        analyzer_dma    = args.analyzer_dma,
+        analyzer_depth  = args.analyzer_depth,
         **parser.soc_argdict
 	)
+    if args.fast_boot:
+        soc.platform.config_profile.fast_boot().apply(soc.platform)
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
 
     if args.driver:
+        from litepcie.software import generate_litepcie_software
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
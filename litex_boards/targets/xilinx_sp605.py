@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Build/Use:
+# ./xilinx_sp605.py --build --load
+
+from migen import *
+from migen.genlib.resetsync import AsyncResetSynchronizer
+
+from litex.gen import LiteXModule
+
+from litex_boards.platforms import xilinx_sp605
+
+from litex.soc.integration.soc_core import *
+from litex.soc.integration.builder import *
+from litex.soc.cores.led import LedChaser
+
+from litedram.modules import MT41K64M16
+from litedram.phy import s6ddrphy
+
+# CRG ----------------------------------------------------------------------------------------------
+
+class _CRG(LiteXModule):
+    def __init__(self, platform, sys_clk_freq):
+        self.rst              = Signal()
+        self.cd_sys           = ClockDomain()
+        self.cd_sdram_half    = ClockDomain()
+        self.cd_sdram_full_wr = ClockDomain()
+        self.cd_sdram_full_rd = ClockDomain()
+
+        # # #
+
+        # Input clock ------------------------------------------------------------------------------
+        clk200_freq = int(200e6)
+        clk200      = platform.request("clk200")
+        clk200b     = Signal()
+        self.specials += Instance("IBUFGDS", i_I=clk200.p, i_IB=clk200.n, o_O=clk200b)
+
+        # PLL --------------------------------------------------------------------------------------
+        pll_lckd         = Signal()
+        pll_fb           = Signal()
+        pll_sdram_full   = Signal()
+        pll_sdram_half_a = Signal()
+        pll_sdram_half_b = Signal()
+        pll_unused_a     = Signal()
+        pll_unused_b     = Signal()
+        pll_sys          = Signal()
+
+        # VCO at 8x sys_clk_freq.
+        p = 8
+        assert (p*int(sys_clk_freq)) % clk200_freq == 0
+        assert 400e6 <= p*sys_clk_freq <= 1080e6
+
+        self.specials.pll = Instance(
+            "PLL_ADV",
+            name="crg_pll_adv",
+            p_SIM_DEVICE="SPARTAN6", p_BANDWIDTH="OPTIMIZED", p_COMPENSATION="INTERNAL",
+            p_REF_JITTER=.01,
+            i_DADDR=0, i_DCLK=0, i_DEN=0, i_DI=0, i_DWE=0, i_RST=0, i_REL=0,
+            p_DIVCLK_DIVIDE=1,
+            # Input Clocks (200MHz)
+            i_CLKIN1=clk200b,
+            p_CLKIN1_PERIOD=1e9/clk200_freq,
+            i_CLKIN2=0,
+            p_CLKIN2_PERIOD=0.,
+            i_CLKINSEL=1,
+            # Feedback
+            i_CLKFBIN=pll_fb, o_CLKFBOUT=pll_fb, o_LOCKED=pll_lckd,
+            p_CLK_FEEDBACK="CLKFBOUT",
+            p_CLKFBOUT_MULT=p*int(sys_clk_freq)//clk200_freq, p_CLKFBOUT_PHASE=0.,
+            # (400MHz) sdram wr rd
+            o_CLKOUT0=pll_sdram_full, p_CLKOUT0_DUTY_CYCLE=.5,
+            p_CLKOUT0_PHASE=0., p_CLKOUT0_DIVIDE=p//4,
+            # unused
+            o_CLKOUT1=pll_unused_a, p_CLKOUT1_DUTY_CYCLE=.5,
+            p_CLKOUT1_PHASE=0., p_CLKOUT1_DIVIDE=15,
+            # (200MHz) sdram_half - sdram dqs adr ctrl
+            o_CLKOUT2=pll_sdram_half_a, p_CLKOUT2_DUTY_CYCLE=.5,
+            p_CLKOUT2_PHASE=270., p_CLKOUT2_DIVIDE=p//2,
+            # (200MHz) off-chip ddr
+            o_CLKOUT3=pll_sdram_half_b, p_CLKOUT3_DUTY_CYCLE=.5,
+            p_CLKOUT3_PHASE=250., p_CLKOUT3_DIVIDE=p//2,
+            # unused
+            o_CLKOUT4=pll_unused_b, p_CLKOUT4_DUTY_CYCLE=.5,
+            p_CLKOUT4_PHASE=0., p_CLKOUT4_DIVIDE=16,
+            # (100MHz) sysclk
+            o_CLKOUT5=pll_sys, p_CLKOUT5_DUTY_CYCLE=.5,
+            p_CLKOUT5_PHASE=0., p_CLKOUT5_DIVIDE=p//1,
+        )
+
+        # Power on reset
+        reset = platform.request("cpu_reset") | self.rst
+        self.cd_por = ClockDomain()
+        por = Signal(max=1 << 11, reset=(1 << 11) - 1)
+        self.sync.por += If(por != 0, por.eq(por - 1))
+        self.specials += AsyncResetSynchronizer(self.cd_por, reset)
+
+        # System clock
+        self.specials += Instance("BUFG", i_I=pll_sys, o_O=self.cd_sys.clk)
+        self.comb += self.cd_por.clk.eq(self.cd_sys.clk)
+        self.specials += AsyncResetSynchronizer(self.cd_sys, ~pll_lckd | (por > 0))
+        platform.add_period_constraint(self.cd_sys.clk, 1e9/sys_clk_freq)
+
+        # SDRAM clocks -----------------------------------------------------------------------------
+        self.clk4x_wr_strb = Signal()
+        self.clk4x_rd_strb = Signal()
+
+        # SDRAM full clock
+        self.specials += Instance("BUFPLL", name="sdram_full_bufpll",
+            p_DIVIDE       = 4,
+            i_PLLIN        = pll_sdram_full, i_GCLK=self.cd_sys.clk,
+            i_LOCKED       = pll_lckd,
+            o_IOCLK        = self.cd_sdram_full_wr.clk,
+            o_SERDESSTROBE = self.clk4x_wr_strb)
+        self.comb += [
+            self.cd_sdram_full_rd.clk.eq(self.cd_sdram_full_wr.clk),
+            self.clk4x_rd_strb.eq(self.clk4x_wr_strb),
+        ]
+        # SDRAM_half clock
+        self.specials += Instance("BUFG", name="sdram_half_a_bufpll",
+            i_I=pll_sdram_half_a, o_O=self.cd_sdram_half.clk)
+        clk_sdram_half_shifted = Signal()
+        self.specials += Instance("BUFG", name="sdram_half_b_bufpll",
+            i_I=pll_sdram_half_b, o_O=clk_sdram_half_shifted)
+
+        output_clk = Signal()
+        clk = platform.request("ddram_clock")
+        self.specials += Instance("ODDR2", p_DDR_ALIGNMENT="NONE",
+            p_INIT=0, p_SRTYPE="SYNC",
+            i_D0=1, i_D1=0, i_S=0, i_R=0, i_CE=1,
+            i_C0=clk_sdram_half_shifted,
+            i_C1=~clk_sdram_half_shifted,
+            o_Q=output_clk)
+        self.specials += Instance("OBUFDS", i_I=output_clk, o_O=clk.p, o_OB=clk.n)
+
+# BaseSoC ------------------------------------------------------------------------------------------
+
+class BaseSoC(SoCCore):
+    def __init__(self, sys_clk_freq=100e6,
+        with_led_chaser = True,
+        **kwargs):
+        platform = xilinx_sp605.Platform()
+
+        # CRG --------------------------------------------------------------------------------------
+        self.crg = _CRG(platform, sys_clk_freq)
+
+        # SoCCore ----------------------------------------------------------------------------------
+        SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on SP605", **kwargs)
+
+        # DDR3 SDRAM -------------------------------------------------------------------------------
+        if not self.integrated_main_ram_size:
+            self.ddrphy = s6ddrphy.S6HalfRateDDRPHY(platform.request("ddram"),
+                memtype           = "DDR3",
+                rd_bitslip        = 0,
+                wr_bitslip        = 4,
+                dqs_ddr_alignment = "C0")
+            self.comb += [
+                self.ddrphy.clk4x_wr_strb.eq(self.crg.clk4x_wr_strb),
+                self.ddrphy.clk4x_rd_strb.eq(self.crg.clk4x_rd_strb),
+            ]
+            self.add_sdram("sdram",
+                phy           = self.ddrphy,
+                module        = MT41K64M16(sys_clk_freq, "1:2"),
+                l2_cache_size = kwargs.get("l2_size", 8192),
+            )
+
+        # Leds -------------------------------------------------------------------------------------
+        if with_led_chaser:
+            self.leds = LedChaser(
+                pads         = platform.request_all("user_led"),
+                sys_clk_freq = sys_clk_freq)
+
+# Build --------------------------------------------------------------------------------------------
+
+def main():
+    from litex.build.parser import LiteXArgumentParser
+    parser = LiteXArgumentParser(platform=xilinx_sp605.Platform, description="LiteX SoC on SP605.")
+    parser.add_target_argument("--sys-clk-freq", default=100e6, type=float, help="System clock frequency.")
+    args = parser.parse_args()
+
+    soc = BaseSoC(
+        sys_clk_freq = args.sys_clk_freq,
+        **parser.soc_argdict
+    )
+    builder = Builder(soc, **parser.builder_argdict)
+    if args.build:
+        builder.build(**parser.toolchain_argdict)
+
+    if args.load:
+        prog = soc.platform.create_programmer()
+        prog.load_bitstream(builder.get_bitstream_filename(mode="sram"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Persistent elaboration worker.
+#
+# Elaborating a target is dominated by the interpreter startup and the imports of Migen/LiteX and
+# the cores (LiteDRAM, LiteEth, LitePCIe, LiteSATA, LiteSPI...). The build server imports them once
+# and elaborates each job (target, arguments, output directory) in a forked child: module-level
+# state of the target (and anything it modifies) never leaks between builds and a crashing build
+# only affects its job. Results (success, artifacts, log, timings) are returned per job.
+#
+# Jobs can be run directly from Python (BuildServer.run_jobs) or sent to a server over a local
+# socket (BuildClient), ex from CI or an IDE regenerating many small variants. Requests are
+# unpickled and run arbitrary targets: TCP addresses (host:port) require an authentication key
+# (--authkey), Unix sockets are only reachable by local users with access to the path.
+#
+# Use:
+# ./build_server.py serve --address=/tmp/litex_build.sock --jobs=8 &
+# ./build_server.py build --address=/tmp/litex_build.sock digilent_arty -- --cpu-type=vexriscv --no-compile --build
+# ./build_server.py build --address=/tmp/litex_build.sock digilent_arty:arty_eth -- --with-ethernet --build --no-compile
+# ./build_server.py run digilent_arty sqrl_acorn -- --build --no-compile (No server, one shot).
+# ./build_server.py serve --address=0.0.0.0:6000 --authkey=<key> (TCP, authenticated).
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import traceback
+
+from multiprocessing.connection import Listener, Client
+
+# Constants ----------------------------------------------------------------------------------------
+
+DEFAULT_PRELOAD = [
+    "migen",
+    "litex.gen",
+    "litex.build.generic_platform",
+    "litex.build.parser",
+    "litex.soc.cores.clock",
+    "litex.soc.integration.soc_core",
+    "litex.soc.integration.builder",
+    "litedram.modules",
+    "litedram.phy",
+    "liteeth.phy",
+    "litepcie.phy.s7pciephy",
+    "litesata.phy",
+    "litespi.modules",
+    "litespi.opcodes",
+]
+
+LOG_TAIL = 4096 # Bytes of log returned with the result.
+
+# Build Job ----------------------------------------------------------------------------------------
+
+class BuildJob:
+    """Elaboration job: target (litex_boards.targets name or module path), arguments, output dir.
+
+    The output directory defaults to build/<name>, name defaulting to the target.
+    """
+    def __init__(self, target, args=None, output_dir=None, name=None, cwd=None):
+        self.target     = target
+        self.args       = [] if args is None else list(args)
+        self.name       = name if name is not None else target.split(".")[-1]
+        self.output_dir = output_dir if output_dir is not None else os.path.join("build", self.name)
+        self.cwd        = cwd
+
+    @property
+    def module(self):
+        return self.target if "." in self.target else f"litex_boards.targets.{self.target}"
+
+    def to_dict(self):
+        return {"target": self.target, "args": self.args, "output_dir": self.output_dir,
+            "name": self.name, "cwd": self.cwd}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+class BuildResult:
+    def __init__(self, job, success, timings, artifacts=None, log="", error=None):
+        self.job       = job
+        self.success   = success
+        self.timings   = timings   # Seconds: import, main, total (wall, fork to exit).
+        self.artifacts = [] if artifacts is None else artifacts # Paths relative to the output directory.
+        self.log       = log       # Log tail.
+        self.error     = error
+
+    def to_dict(self):
+        return {"job": self.job.to_dict(), "success": self.success, "timings": self.timings,
+            "artifacts": self.artifacts, "log": self.log, "error": self.error}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(BuildJob.from_dict(d["job"]), d["success"], d["timings"], d["artifacts"],
+            d["log"], d["error"])
+
+# Build Server -------------------------------------------------------------------------------------
+
+def _list_artifacts(output_dir):
+    artifacts = []
+    for root, dirs, files in os.walk(output_dir):
+        for f in files:
+            artifacts.append(os.path.relpath(os.path.join(root, f), output_dir))
+    return sorted(artifacts)
+
+def _run_child(job, status_fd, log_path):
+    # Runs in the forked child, never returns.
+    status = {"timings": {}, "error": None}
+    code   = 0
+    try:
+        log = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.dup2(log, 1)
+        os.dup2(log, 2)
+        sys.stdout = open(1, "w", closefd=False)
+        sys.stderr = open(2, "w", closefd=False)
+        if job.cwd is not None:
+            os.chdir(job.cwd)
+        sys.argv = [job.module, *job.args, "--output-dir", job.output_dir]
+        start  = time.time()
+        module = importlib.import_module(job.module)
+        status["timings"]["import"] = time.time() - start
+        start  = time.time()
+        try:
+            module.main()
+        except SystemExit as e:
+            if e.code not in [None, 0]:
+                raise
+        status["timings"]["main"] = time.time() - start
+    except BaseException as e:
+        traceback.print_exc()
+        status["error"] = f"{type(e).__name__}: {e}"[:1024]
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.write(status_fd, json.dumps(status).encode())
+        os.close(status_fd)
+        os._exit(code)
+
+class BuildServer:
+    """Warm elaboration worker: preloads modules and runs jobs in forked children."""
+    def __init__(self, preload=DEFAULT_PRELOAD, jobs=1):
+        self.jobs    = jobs
+        self.preload = {}
+        for module in preload:
+            # Optional cores are preloaded when installed.
+            start = time.time()
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                continue
+            self.preload[module] = time.time() - start
+
+    def _start(self, job):
+        log_dir = job.output_dir if job.cwd is None else os.path.join(job.cwd, job.output_dir)
+        os.makedirs(log_dir, exist_ok=True)
+        log_path = os.path.abspath(os.path.join(log_dir, "build_server.log"))
+        rfd, wfd = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            os.close(rfd)
+            _run_child(job, wfd, log_path)
+        os.close(wfd)
+        return pid, rfd, log_path, time.time()
+
+    def _finish(self, job, rfd, log_path, start, exit_status):
+        data = b""
+        while True:
+            chunk = os.read(rfd, 65536)
+            if not chunk:
+                break
+            data += chunk
+        os.close(rfd)
+        status = json.loads(data) if data else {"timings": {}, "error": f"Worker died (status {exit_status})."}
+        status["timings"]["total"] = time.time() - start
+        with open(log_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - LOG_TAIL))
+            log = f.read().decode(errors="replace")
+        log_dir = os.path.dirname(log_path)
+        return BuildResult(job,
+            success   = (exit_status == 0) and (status["error"] is None),
+            timings   = status["timings"],
+            artifacts = [a for a in _list_artifacts(log_dir) if a != "build_server.log"],
+            log       = log,
+            error     = status["error"])
+
+    def run_jobs(self, jobs, callback=None):
+        """Run jobs (up to self.jobs in parallel), returns the results in jobs order."""
+        pending = list(enumerate(jobs))
+        running = {}
+        results = [None]*len(jobs)
+        while pending or running:
+            while pending and len(running) < self.jobs:
+                n, job = pending.pop(0)
+                pid, rfd, log_path, start = self._start(job)
+                running[pid] = (n, job, rfd, log_path, start)
+            pid, exit_status = os.wait()
+            if pid not in running:
+                continue
+            n, job, rfd, log_path, start = running.pop(pid)
+            results[n] = self._finish(job, rfd, log_path, start, os.waitstatus_to_exitcode(exit_status))
+            if callback is not None:
+                callback(results[n])
+        return results
+
+    def run_job(self, job):
+        return self.run_jobs([job])[0]
+
+    def serve(self, address, authkey=None):
+        """Serve requests ({"jobs": [job dicts]}) on address (Unix socket path or (host, port)).
+
+        Requests are unpickled and import/run the requested targets: serving on TCP requires an
+        authkey (clients without it are rejected before any request is received).
+        """
+        family = "AF_UNIX" if isinstance(address, str) else "AF_INET"
+        if family == "AF_INET" and authkey is None:
+            raise ValueError("Serving on a TCP address requires an authkey.")
+        if family == "AF_UNIX" and os.path.exists(address):
+            os.unlink(address)
+        with Listener(address, family=family, authkey=authkey) as listener:
+            while True:
+                with listener.accept() as conn:
+                    try:
+                        request = conn.recv()
+                    except EOFError:
+                        continue
+                    if request.get("shutdown", False):
+                        conn.send({"results": []})
+                        return
+                    jobs    = [BuildJob.from_dict(d) for d in request["jobs"]]
+                    results = self.run_jobs(jobs)
+                    conn.send({"results": [r.to_dict() for r in results]})
+
+# Build Client -------------------------------------------------------------------------------------
+
+class BuildClient:
+    def __init__(self, address, authkey=None):
+        self.address = address
+        self.authkey = authkey
+
+    def _request(self, request):
+        family = "AF_UNIX" if isinstance(self.address, str) else "AF_INET"
+        with Client(self.address, family=family, authkey=self.authkey) as conn:
+            conn.send(request)
+            return conn.recv()
+
+    def run_jobs(self, jobs):
+        response = self._request({"jobs": [job.to_dict() for job in jobs]})
+        return [BuildResult.from_dict(d) for d in response["results"]]
+
+    def run_job(self, job):
+        return self.run_jobs([job])[0]
+
+    def shutdown(self):
+        self._request({"shutdown": True})
+
+# Run ----------------------------------------------------------------------------------------------
+
+def parse_address(address):
+    # host:port (TCP) or Unix socket path.
+    if ":" in address and not address.startswith("/"):
+        host, port = address.rsplit(":", 1)
+        return (host, int(port))
+    return address
+
+def print_result(result):
+    timings = " ".join(f"{k}: {v:.2f}s" for k, v in result.timings.items())
+    status  = "OK" if result.success else f"FAILED ({result.error})"
+    print(f"{result.job.name:<40} {status} ({timings}, {len(result.artifacts)} artifacts in {result.job.output_dir}).")
+    if not result.success:
+        print(result.log)
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent elaboration worker.")
+    parser.add_argument("command",   choices=["serve", "build", "run", "shutdown"], help="Command.")
+    parser.add_argument("targets",   nargs="*", help="Targets (target or target:name), followed by -- and the target arguments.")
+    parser.add_argument("--address", default="/tmp/litex_boards_build.sock", help="Server address (Unix socket path or host:port).")
+    parser.add_argument("--authkey", default=None, help="Authentication key (required for host:port addresses).")
+    parser.add_argument("--jobs",    default=os.cpu_count(), type=int, help="Parallel builds.")
+    parser.add_argument("--output-dir", default="build", help="Base output directory (<output-dir>/<name>).")
+    argv = sys.argv[1:]
+    target_args = []
+    if "--" in argv:
+        target_args = argv[argv.index("--") + 1:]
+        argv        = argv[:argv.index("--")]
+    args    = parser.parse_intermixed_args(argv)
+    address = parse_address(args.address)
+    authkey = None if args.authkey is None else args.authkey.encode()
+
+    jobs = []
+    for target in args.targets:
+        target, _, name = target.partition(":")
+        name = name or target.split(".")[-1]
+        jobs.append(BuildJob(target, target_args,
+            output_dir = os.path.join(args.output_dir, name),
+            name       = name,
+            cwd        = os.getcwd()))
+
+    if args.command == "serve":
+        server = BuildServer(jobs=args.jobs)
+        print(f"Preloaded {len(server.preload)} modules in {sum(server.preload.values()):.2f}s, serving on {args.address}.")
+        server.serve(address, authkey=authkey)
+    elif args.command == "shutdown":
+        BuildClient(address, authkey=authkey).shutdown()
+    else:
+        if args.command == "build":
+            results = BuildClient(address, authkey=authkey).run_jobs(jobs)
+            for result in results:
+                print_result(result)
+        else:
+            results = BuildServer(jobs=args.jobs).run_jobs(jobs, callback=print_result)
+        sys.exit(0 if all(r.success for r in results) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Bus performance counters viewer.
+#
+# Host side of the --with-bus-perf option (litex_boards.cores.bus_perf): counters are cleared,
+# snapshotted after each interval and displayed per monitor (Bus masters/slaves, LiteDRAM ports after
+# the L2 cache, PCIe DMAs):
+# - MB/s and transactions/s.
+# - Wait : % of cycles the initiator waited on the target (target/DRAM bound).
+# - Stall: % of cycles the target waited on the initiator (initiator/CPU bound).
+# - Latency histogram (sampled requests, in cycles) and its median bucket.
+#
+# LiteDRAM ports whose user could not be identified are reported as sdram_port<n> (crossbar order).
+#
+# Use:
+# litex_server --udp --udp-ip=192.168.1.50 (or --jtag, --uart...)
+# ./bus_perf.py --csr-csv=csr.csv
+# ./bus_perf.py --csr-csv=csr.csv --interval=0.5 --filter=sdram --histogram
+
+import time
+import argparse
+
+# Bus Perf -----------------------------------------------------------------------------------------
+
+COUNTERS = ["transactions", "bytes", "wait_cycles", "stall_cycles"]
+
+class BusPerf:
+    def __init__(self, bus, name="bus_perf"):
+        self.bus      = bus
+        self.name     = name
+        self.monitors = {}
+        for reg in bus.regs.__dict__.keys():
+            if reg.startswith(f"{name}_") and reg.endswith("_transactions"):
+                monitor = reg[len(name) + 1:-len("_transactions")]
+                buckets = 0
+                while hasattr(bus.regs, f"{name}_{monitor}_latency{buckets}"):
+                    buckets += 1
+                self.monitors[monitor] = buckets
+
+    def _reg(self, name):
+        return getattr(self.bus.regs, f"{self.name}_{name}")
+
+    def clear(self):
+        self._reg("clear").write(1)
+
+    def snapshot(self):
+        """Latch and read all the counters, return (cycles, {monitor: {counter: value}})."""
+        self._reg("snapshot").write(1)
+        cycles   = self._reg("cycles").read()
+        counters = {}
+        for monitor, buckets in self.monitors.items():
+            values = {c: self._reg(f"{monitor}_{c}").read() for c in COUNTERS}
+            values["latency"] = [self._reg(f"{monitor}_latency{i}").read() for i in range(buckets)]
+            counters[monitor] = values
+        return cycles, counters
+
+# Display ------------------------------------------------------------------------------------------
+
+def bucket_range(i, buckets):
+    low = 1 if i == 0 else 2**i
+    return f"{low}+" if i == (buckets - 1) else f"{low}-{2**(i + 1) - 1}"
+
+def median_bucket(histogram):
+    total = sum(histogram)
+    if total == 0:
+        return "-"
+    acc = 0
+    for i, n in enumerate(histogram):
+        acc += n
+        if 2*acc >= total:
+            return bucket_range(i, len(histogram))
+
+def format_counters(cycles, counters, clk_freq, histogram=False):
+    seconds = max(cycles, 1)/clk_freq
+    lines   = []
+    lines.append(f"{'Monitor':32} {'MB/s':>10} {'Trans/s':>12} {'Wait%':>7} {'Stall%':>7} {'Latency':>9}")
+    for monitor, values in counters.items():
+        lines.append(f"{monitor:32} "
+            f"{values['bytes']/seconds/1e6:10.2f} "
+            f"{values['transactions']/seconds:12.0f} "
+            f"{100*values['wait_cycles']/max(cycles, 1):7.2f} "
+            f"{100*values['stall_cycles']/max(cycles, 1):7.2f} "
+            f"{median_bucket(values['latency']):>9}")
+        if histogram and sum(values["latency"]):
+            lines.append(" "*4 + " ".join(f"{bucket_range(i, len(values['latency']))}:{n}"
+                for i, n in enumerate(values["latency"])))
+    return "\n".join(lines)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards Bus performance counters viewer.")
+    parser.add_argument("--csr-csv",   default="csr.csv",               help="SoC CSR file.")
+    parser.add_argument("--host",      default="localhost",             help="litex_server host.")
+    parser.add_argument("--port",      default=1234,        type=int,   help="litex_server port.")
+    parser.add_argument("--name",      default="bus_perf",              help="Bus performance CSRs prefix.")
+    parser.add_argument("--interval",  default=1.0,         type=float, help="Display interval (in seconds).")
+    parser.add_argument("--count",     default=0,           type=int,   help="Number of intervals (0: infinite).")
+    parser.add_argument("--filter",    default=None,                    help="Only display monitors containing this string.")
+    parser.add_argument("--histogram", action="store_true",             help="Display the latency histograms.")
+    args = parser.parse_args()
+
+    from litex import RemoteClient
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    bus_perf = BusPerf(bus, name=args.name)
+    if args.filter is not None:
+        bus_perf.monitors = {k: v for k, v in bus_perf.monitors.items() if args.filter in k}
+    clk_freq = bus.constants.config_clock_frequency
+
+    n = 0
+    try:
+        while args.count == 0 or n < args.count:
+            bus_perf.clear()
+            time.sleep(args.interval)
+            cycles, counters = bus_perf.snapshot()
+            print(format_counters(cycles, counters, clk_freq, args.histogram))
+            print()
+            n += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bus.close()
+
+if __name__ == "__main__":
+    main()
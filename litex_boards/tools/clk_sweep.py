@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Sys Clk frequency sweep.
+#
+# Host side of the --with-clk-reconfig option (litex_boards.cores.clock): the PLL VCO (CLKFBOUT_MULT/
+# DIVCLK_DIVIDE) and output dividers are reprogrammed through the DRP for each frequency step, scaling
+# sys_clk and the outputs derived from it (ex DRAM PHY clocks, ratios kept) without rebuilding; fixed
+# outputs (ex Ethernet PHY/IDELAYCTRL reference clocks) get their divider recomputed to stay close to
+# their nominal frequency.
+# A test is then run at each step: a memory test over the bridge and/or a user command.
+#
+# The bridge must not depend on sys_clk frequency (Etherbone/JTAGBone/PCIe, not UARTBone).
+#
+# Output phases (PHASE_MUX/DELAY_TIME) are recomputed for the new dividers to keep their nominal value
+# in degrees (ex 90° sys4x_dqs of the DDR3 PHYs). The PLL LOCK/FILTER registers are set for the new
+# CLKFBOUT_MULT from the XAPP888 tables (7-Series PLLE2/MMCME2, BANDWIDTH=OPTIMIZED); the tables are
+# checked against the nominal configuration (set by Vivado) and, on other primitives or a mismatch,
+# LOCK/FILTER are kept at their nominal values (reported). A step that does not lock is reported and
+# the nominal configuration restored.
+#
+# Use:
+# litex_server --udp --udp-ip=192.168.1.50
+# ./clk_sweep.py --csr-csv=csr.csv --start=80e6 --stop=140e6 --step=5e6 --mem-test
+# ./clk_sweep.py --csr-csv=csr.csv --start=80e6 --stop=140e6 --step=5e6 --reset --command="./test.sh {freq}"
+# ./clk_sweep.py --csr-csv=csr.csv --freq=120e6 --keep                    (Set a frequency and exit).
+
+import time
+import random
+import argparse
+import subprocess
+
+# DRP Registers (7-Series/UltraScale PLL/MMCM) -----------------------------------------------------
+
+DRP_CLKOUT = {
+    0: (0x08, 0x09),
+    1: (0x0a, 0x0b),
+    2: (0x0c, 0x0d),
+    3: (0x0e, 0x0f),
+    4: (0x10, 0x11),
+    5: (0x06, 0x07),
+    6: (0x12, 0x13),
+}
+DRP_CLKFBOUT = (0x14, 0x15)
+DRP_DIVCLK   = 0x16
+
+def drp_counter(divide):
+    """High/Low times, Edge and No Count of a DRP counter (50% duty cycle, 64 encoded as 0)."""
+    if divide == 1:
+        return (1, 1, 0, 1)
+    high = divide//2
+    return (high & 0x3f, (divide - high) & 0x3f, divide%2, 0)
+
+def _time(value):
+    return value if value else 64
+
+def drp_divide(reg1, reg2, fractional=True):
+    """Divide value of a CLKOUT/CLKFBOUT counter from its DRP registers."""
+    if (reg2 >> 6) & 0x1:
+        return 1
+    divide = _time((reg1 >> 6) & 0x3f) + _time(reg1 & 0x3f)
+    if fractional and (reg2 >> 11) & 0x1:
+        divide += ((reg2 >> 12) & 0x7)/8
+    return divide
+
+def drp_divclk_divide(reg):
+    if (reg >> 12) & 0x1:
+        return 1
+    return _time((reg >> 6) & 0x3f) + _time(reg & 0x3f)
+
+def drp_phase(reg1, reg2):
+    """Phase of a CLKOUT/CLKFBOUT counter in 1/8 VCO periods (DELAY_TIME/PHASE_MUX)."""
+    return 8*(reg2 & 0x3f) + ((reg1 >> 13) & 0x7)
+
+def counter_entries(adrs, divide, reg1, reg2, nominal_divide):
+    """DRP entries (adr, mask, data) setting an integer CLKOUT/CLKFBOUT counter.
+
+    reg1/reg2 are the nominal registers of the counter (with nominal_divide), the phase is rescaled
+    to the new divide to stay the same in degrees.
+    """
+    high, low, edge, no_count = drp_counter(divide)
+    phase = min(round(drp_phase(reg1, reg2)*divide/nominal_divide), 8*63 + 7)
+    delay, mux = phase//8, phase%8
+    mask2 = 0x8300 if (reg2 >> 11) & 0x1 else 0xff00 # Clear fractional settings when enabled.
+    return [
+        (adrs[0], 0x1000, (mux << 13) | (high << 6) | low),
+        (adrs[1], mask2,  (edge << 7) | (no_count << 6) | delay),
+    ]
+
+def divclk_entries(divide):
+    high, low, edge, no_count = drp_counter(divide)
+    return [(DRP_DIVCLK, 0xc000, (edge << 13) | (no_count << 12) | (high << 6) | low)]
+
+# LOCK/FILTER Tables (XAPP888, 7-Series, BANDWIDTH=OPTIMIZED) --------------------------------------
+
+DRP_LOCK   = (0x18, 0x19, 0x1a)
+DRP_FILTER = (0x4e, 0x4f)
+
+PRIMITIVES = {1: "PLLE2", 2: "MMCME2"} # XilinxClockReconfig primitive constant.
+
+# LockRefDly, LockFBDly, LockCnt, LockSatHigh, UnlockCnt (same for PLLE2/MMCME2), per CLKFBOUT_MULT.
+_LOCK_DLY = [6, 6, 8, 11, 14, 17, 19, 22, 25, 28] # Mult 1-10, then 31.
+_LOCK_CNT = [1000]*10 + [900, 825, 748, 700, 650, 625, 575, 550, 525, 500, 475, 450, 425, 400, 400,
+    375, 350, 350, 325, 325, 300, 300, 300, 275, 275, 275] + [250]*28
+
+def lock_lookup(mult):
+    dly = _LOCK_DLY[mult - 1] if mult <= 10 else 31
+    return (dly, dly, _LOCK_CNT[mult - 1], 1001, 1)
+
+# CP_RES_LFHF (10-bit), per CLKFBOUT_MULT 1-64.
+FILTER_LOOKUP = {
+    "PLLE2": [
+        0b0011011100, 0b0011011100, 0b0101111100, 0b0111111100, 0b0111101100, 0b1101011100,
+        0b1110101100, 0b1110110100, 0b1111110100, 0b1111011100, 0b1111101100, 0b1111110100,
+        0b1111001100, 0b1110010100, 0b1111010100, 0b1111010100, 0b1111010100, 0b1111010100,
+        0b0111011000, 0b0111011000, 0b0111011000, 0b0111011000, 0b0101110000, 0b0101110000,
+        0b0101110000, 0b1100000100, 0b1100000100, 0b1100000100, 0b1100000100, 0b1100000100,
+        0b1100000100, 0b1100000100, 0b1100000100, 0b0100001000, 0b0100001000, 0b0100001000,
+        0b0010100000, 0b0010100000, 0b0010100000, 0b0011010000, 0b0010100000, 0b0010100000,
+        0b0010100000, 0b0010100000, 0b0010100000, 0b0010100000, 0b0010100000, 0b0010100000,
+        0b0010100000, 0b0010100000, 0b0010100000, 0b0010100000, 0b0010100000, 0b0100110000,
+        0b0100110000, 0b0100110000, 0b0100110000, 0b0100110000, 0b0100110000, 0b0100110000,
+        0b0010010000, 0b0010010000, 0b0010010000, 0b0010010000,
+    ],
+    "MMCME2": [
+        0b0010111100, 0b0100111100, 0b0101101100, 0b0111011100, 0b1101011100, 0b1110101100,
+        0b1110110100, 0b1111001100, 0b1110010100, 0b1111010100, 0b1111100100, 0b1101000100,
+        0b1111100100, 0b1111100100, 0b1111100100, 0b1111100100, 0b1111010100, 0b1111010100,
+        0b1100000100, 0b1100000100, 0b1100000100, 0b0101110000, 0b0101110000, 0b0101110000,
+        0b0101110000, 0b0011010000, 0b0011010000, 0b0011010000, 0b0011010000, 0b0011010000,
+        0b0011010000, 0b0011010000, 0b0011010000, 0b0011010000, 0b0011010000, 0b0011010000,
+        0b0011010000, 0b0011010000, 0b0011010000, 0b0011010000, 0b0011010000, 0b0010100000,
+        0b0010100000, 0b0010100000, 0b0010100000, 0b0010100000, 0b0111000100, 0b0111000100,
+        0b0100110000, 0b0100110000, 0b0100110000, 0b0100110000, 0b0110000100, 0b0110000100,
+        0b0101011000, 0b0101011000, 0b0101011000, 0b0010010000, 0b0010010000, 0b0010010000,
+        0b0010010000, 0b0100101000, 0b0011110000, 0b0011110000,
+    ],
+}
+
+def lock_filter_entries(primitive, mult):
+    """DRP entries (adr, mask, data) of the LOCK/FILTER registers for a CLKFBOUT_MULT."""
+    ref_dly, fb_dly, lock_cnt, sat_high, unlock_cnt = lock_lookup(mult)
+    f = FILTER_LOOKUP[primitive][mult - 1]
+    b = lambda n: (f >> n) & 0x1
+    return [
+        (DRP_LOCK[0],   0xfc00, lock_cnt),
+        (DRP_LOCK[1],   0x8000, (fb_dly  << 10) | unlock_cnt),
+        (DRP_LOCK[2],   0x8000, (ref_dly << 10) | sat_high),
+        (DRP_FILTER[0], 0x66ff, (b(9) << 15) | (b(8) << 12) | (b(7) << 11) | (b(6) << 8)),
+        (DRP_FILTER[1], 0x666f, (b(5) << 15) | (b(4) << 12) | (b(3) << 11) | (b(2) << 8) | (b(1) << 7) | (b(0) << 4)),
+    ]
+
+def entries_match(config, entries):
+    """True when the DRP registers of config are those set by entries."""
+    return all((config[adr] & ~mask & 0xffff) == data for adr, mask, data in entries)
+
+# Clock Reconfig -----------------------------------------------------------------------------------
+
+class ClockReconfig:
+    def __init__(self, bus, name="crg_clk_reconfig", timeout=1.0):
+        self.bus     = bus
+        self.name    = name
+        self.timeout = timeout
+
+        # PLL/Outputs description.
+        self.clkin_freq = self._constant("clkin_freq")
+        self.vco_range  = (self._constant("vco_min"),  self._constant("vco_max"))
+        self.mult_range = (self._constant("mult_min"), self._constant("mult_max"))
+        self.div_max    = self._constant("div_max")
+        self.pfd_min    = self._constant("pfd_min")
+        self.sys_clkout = self._constant("sys_clkout")
+        self.clkouts    = {}
+        for n in DRP_CLKOUT.keys():
+            if hasattr(bus.constants, f"{name}_clkout{n}_freq"):
+                self.clkouts[n] = (self._constant(f"clkout{n}_freq"), self._constant(f"clkout{n}_fixed"))
+
+        self.primitive  = PRIMITIVES.get(getattr(bus.constants, f"{name}_primitive", 0), None)
+
+        # Nominal configuration (as built).
+        self.nominal = self.read_config()
+        self.tables  = self.primitive is not None and entries_match(self.nominal,
+            lock_filter_entries(self.primitive, int(self.clkfbout_mult())))
+
+    def _constant(self, name):
+        return getattr(self.bus.constants, f"{self.name}_{name}")
+
+    def _reg(self, name):
+        return getattr(self.bus.regs, f"{self.name}_{name}")
+
+    def _wait(self):
+        timeout = time.time() + self.timeout
+        while self._reg("status").read() & 0x1:
+            if time.time() > timeout:
+                raise TimeoutError("Clock reconfiguration timeout.")
+
+    def drp_read(self, adr):
+        self._reg("read_adr").write(adr)
+        self._reg("read").write(1)
+        self._wait()
+        return self._reg("read_data").read()
+
+    def read_config(self):
+        """Current configuration: DRP registers of the counters (dict adr: value)."""
+        adrs = [DRP_DIVCLK, *DRP_CLKFBOUT]
+        for n in self.clkouts.keys():
+            adrs += DRP_CLKOUT[n]
+        if self.primitive is not None:
+            adrs += [*DRP_LOCK, *DRP_FILTER]
+        return {adr: self.drp_read(adr) for adr in adrs}
+
+    def clkfbout_mult(self, config=None):
+        config = self.nominal if config is None else config
+        return drp_divide(config[DRP_CLKFBOUT[0]], config[DRP_CLKFBOUT[1]])
+
+    def vco_freq(self, config=None):
+        config = self.nominal if config is None else config
+        divide = drp_divclk_divide(config[DRP_DIVCLK])
+        return self.clkin_freq*self.clkfbout_mult(config)/divide
+
+    def clkout_divide(self, n, config=None):
+        config = self.nominal if config is None else config
+        adrs   = DRP_CLKOUT[n]
+        return drp_divide(config[adrs[0]], config[adrs[1]], fractional=(n == 0))
+
+    def compute(self, sys_freq):
+        """DRP entries and VCO frequency for a sys_clk frequency (None if not reachable).
+
+        The VCO and the dividers of the scaled outputs are recomputed together: scaled outputs keep
+        their ratio to sys_clk, fixed outputs stay close to their nominal frequency. Phases are kept
+        in degrees, LOCK/FILTER are set for the new multiplier (when self.tables).
+        """
+        sys_divide = self.clkout_divide(self.sys_clkout)
+        scaled     = [n for n, (freq, fixed) in self.clkouts.items() if not fixed]
+        best = None
+        for new_sys_divide in range(1, 128 + 1):
+            # Scaled outputs dividers must stay integers.
+            divides = {n: self.clkout_divide(n)*new_sys_divide/sys_divide for n in scaled}
+            if any((d != int(d)) or (d > 128) for d in divides.values()):
+                continue
+            vco = sys_freq*new_sys_divide
+            if not (self.vco_range[0] <= vco <= self.vco_range[1]):
+                continue
+            for divide in range(1, self.div_max + 1):
+                if self.clkin_freq/divide < self.pfd_min:
+                    break
+                mult = round(vco*divide/self.clkin_freq)
+                if not (self.mult_range[0] <= mult <= self.mult_range[1]):
+                    continue
+                freq = self.clkin_freq*mult/divide
+                if not (self.vco_range[0] <= freq <= self.vco_range[1]):
+                    continue
+                error = abs(freq/new_sys_divide - sys_freq)
+                if best is None or error < best[0]:
+                    best = (error, mult, divide, freq, divides)
+        if best is None:
+            return None
+        _, mult, divide, vco, divides = best
+        entries  = divclk_entries(divide)
+        entries += counter_entries(DRP_CLKFBOUT, mult, *self._nominal_counter(DRP_CLKFBOUT), self.clkfbout_mult())
+        for n, (freq, fixed) in self.clkouts.items():
+            clkout_divide = min(max(round(vco/freq), 1), 128) if fixed else int(divides[n])
+            entries += counter_entries(DRP_CLKOUT[n], clkout_divide, *self._nominal_counter(DRP_CLKOUT[n]), self.clkout_divide(n))
+        if self.tables:
+            entries += lock_filter_entries(self.primitive, mult)
+        return entries, vco
+
+    def _nominal_counter(self, adrs):
+        return self.nominal[adrs[0]], self.nominal[adrs[1]]
+
+    def apply(self, entries):
+        """Apply DRP entries, return True when the PLL locked."""
+        for i, (adr, mask, data) in enumerate(entries):
+            self._reg("entry_index").write(i)
+            self._reg("entry_adr").write(adr)
+            self._reg("entry_mask").write(mask)
+            self._reg("entry_data").write(data)
+            self._reg("entry_write").write(1)
+        self._reg("count").write(len(entries))
+        self._reg("start").write(1)
+        self._wait()
+        return not (self._reg("status").read() & 0x2)
+
+    def set_sys_freq(self, sys_freq):
+        """Reprogram the PLL for sys_freq, return (locked, vco) (None if not reachable)."""
+        r = self.compute(sys_freq)
+        if r is None:
+            return None
+        entries, vco = r
+        return self.apply(entries), vco
+
+    def restore(self):
+        """Restore the nominal configuration."""
+        entries = [(adr, 0x0000, value) for adr, value in self.nominal.items()]
+        return self.apply(entries)
+
+    def measure(self):
+        time.sleep(0.05) # > 2 frequency meter windows.
+        return self._reg("sys_freq").read()
+
+# Memory Test --------------------------------------------------------------------------------------
+
+def mem_test(bus, base, size, seed=0, chunk=256):
+    """Write/Read-back a pseudo-random pattern over the bridge, return the number of errored words."""
+    rng   = random.Random(seed)
+    words = size//4
+    datas = [rng.getrandbits(32) for _ in range(words)]
+    for i in range(0, words, chunk):
+        bus.write(base + 4*i, datas[i:i + chunk])
+    errors = 0
+    for i in range(0, words, chunk):
+        n = min(chunk, words - i)
+        for data, expected in zip(bus.read(base + 4*i, n), datas[i:i + n]):
+            errors += int(data != expected)
+    return errors
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards Sys Clk frequency sweep (PLL DRP reconfiguration).")
+    parser.add_argument("--csr-csv",     default="csr.csv",          help="SoC CSR file.")
+    parser.add_argument("--host",        default="localhost",        help="litex_server host.")
+    parser.add_argument("--port",        default=1234,   type=int,   help="litex_server port.")
+    parser.add_argument("--name",        default="crg_clk_reconfig", help="Clock reconfiguration CSRs prefix.")
+    parser.add_argument("--freq",        default=None,   type=float, help="Set a single frequency.")
+    parser.add_argument("--start",       default=None,   type=float, help="Sweep start frequency.")
+    parser.add_argument("--stop",        default=None,   type=float, help="Sweep stop frequency (included).")
+    parser.add_argument("--step",        default=1e6,    type=float, help="Sweep step.")
+    parser.add_argument("--reset",       action="store_true",        help="Reset the SoC after each step (re-runs BIOS init/DRAM calibration).")
+    parser.add_argument("--reset-wait",  default=2.0,    type=float, help="Delay after reset (in seconds).")
+    parser.add_argument("--mem-test",    action="store_true",        help="Run a memory test over the bridge at each step.")
+    parser.add_argument("--mem-base",    default=None,               help="Memory test base address (default: main_ram).")
+    parser.add_argument("--mem-size",    default="0x10000",          help="Memory test size (in bytes).")
+    parser.add_argument("--command",     default=None,               help="Command run at each step ({freq} replaced, pass on exit code 0).")
+    parser.add_argument("--stop-on-fail", action="store_true",      help="Stop the sweep on the first failing step.")
+    parser.add_argument("--keep",        action="store_true",        help="Keep the last configuration (do not restore the nominal one).")
+    args = parser.parse_args()
+
+    from litex import RemoteClient
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    clk = ClockReconfig(bus, name=args.name)
+    sys_nominal = clk.vco_freq()/clk.clkout_divide(clk.sys_clkout)
+    if not clk.tables:
+        print(f"Warning: No LOCK/FILTER tables for this PLL ({clk.primitive or 'unknown primitive'}, or not matching the nominal configuration), kept at their nominal values.")
+    print(f"Nominal: sys_clk {sys_nominal/1e6:.3f}MHz, VCO {clk.vco_freq()/1e6:.3f}MHz (measured: {clk.measure()/1e6:.3f}MHz).")
+
+    if args.freq is not None:
+        freqs = [args.freq]
+    else:
+        assert args.start is not None and args.stop is not None
+        freqs = []
+        freq  = args.start
+        while freq <= args.stop + 1:
+            freqs.append(freq)
+            freq += args.step
+
+    mem_base = getattr(bus.mems, "main_ram").base if args.mem_base is None else int(args.mem_base, 0)
+
+    print("| Requested (MHz) | VCO (MHz) | Measured (MHz) | Locked | Mem Errors | Command |")
+    print("|-----------------|-----------|----------------|--------|------------|---------|")
+    try:
+        for freq in freqs:
+            r = clk.set_sys_freq(freq)
+            if r is None:
+                print(f"| {freq/1e6:15.3f} | {'-':>9} | {'-':>14} | {'n/a':>6} | {'-':>10} | {'-':>7} |")
+                continue
+            locked, vco = r
+            measured = clk.measure() if locked else 0
+            errors   = "-"
+            command  = "-"
+            if locked:
+                if args.reset:
+                    bus.regs.ctrl_reset.write(1)
+                    time.sleep(args.reset_wait)
+                if args.mem_test:
+                    errors = mem_test(bus, mem_base, int(args.mem_size, 0))
+                if args.command is not None:
+                    command = "pass" if subprocess.call(args.command.format(freq=int(freq)), shell=True) == 0 else "fail"
+            print(f"| {freq/1e6:15.3f} | {vco/1e6:9.3f} | {measured/1e6:14.3f} | {str(locked):>6} | {str(errors):>10} | {command:>7} |")
+            failed = (not locked) or (errors not in ["-", 0]) or (command == "fail")
+            if not locked:
+                clk.restore()
+            if failed and args.stop_on_fail:
+                break
+    finally:
+        if not args.keep:
+            clk.restore()
+        bus.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Helpers shared by the host tools: csr.csv parsing and LitePCIe driver access.
+
+import os
+import fcntl
+import struct
+
+# Constants ----------------------------------------------------------------------------------------
+
+def _IOWR(type, nr, size):
+    return (3 << 30) | (size << 16) | (ord(type) << 8) | nr
+
+LITEPCIE_IOCTL_REG_FORMAT        = "IIB3x"
+LITEPCIE_IOCTL_DMA_WRITER_FORMAT = "B7xqq"
+LITEPCIE_IOCTL_DMA_READER_FORMAT = "B7xqq"
+LITEPCIE_IOCTL_REG               = _IOWR("S",  0, struct.calcsize(LITEPCIE_IOCTL_REG_FORMAT))
+LITEPCIE_IOCTL_DMA_WRITER        = _IOWR("S", 21, struct.calcsize(LITEPCIE_IOCTL_DMA_WRITER_FORMAT))
+LITEPCIE_IOCTL_DMA_READER        = _IOWR("S", 22, struct.calcsize(LITEPCIE_IOCTL_DMA_READER_FORMAT))
+
+# CSR Helpers --------------------------------------------------------------------------------------
+
+def read_csr_csv(filename):
+    csrs = {}
+    csr_data_width = 32
+    with open(filename) as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            fields = line.strip().split(",")
+            if fields[0] == "csr_register":
+                csrs[fields[1]] = (int(fields[2], 0), int(fields[3]))
+            if fields[0] == "constant" and fields[1] == "config_csr_data_width":
+                csr_data_width = int(fields[2])
+    return csrs, csr_data_width
+
+def read_csr_constants(filename):
+    constants = {}
+    with open(filename) as f:
+        for line in f:
+            fields = line.strip().split(",")
+            if fields[0] == "constant":
+                constants[fields[1]] = fields[2]
+    return constants
+
+# LitePCIe Device ----------------------------------------------------------------------------------
+
+class LitePCIeDevice:
+    """Minimal LitePCIe kernel driver access (registers and DMA read/write)."""
+    def __init__(self, device, csr_csv):
+        self.fd = os.open(device, os.O_RDWR)
+        self.csrs, self.csr_data_width = read_csr_csv(csr_csv)
+
+    def close(self):
+        os.close(self.fd)
+
+    def _reg(self, addr, value=0, is_write=False):
+        buf = bytearray(struct.pack(LITEPCIE_IOCTL_REG_FORMAT, addr, value, is_write))
+        fcntl.ioctl(self.fd, LITEPCIE_IOCTL_REG, buf)
+        return struct.unpack(LITEPCIE_IOCTL_REG_FORMAT, buf)[1]
+
+    def read(self, name):
+        addr, nwords = self.csrs[name]
+        value = 0
+        for i in range(nwords): # MSB first.
+            value = (value << self.csr_data_width) | self._reg(addr + 4*i)
+        return value
+
+    def write(self, name, value):
+        addr, nwords = self.csrs[name]
+        for i in range(nwords):
+            shift = self.csr_data_width*(nwords - 1 - i)
+            self._reg(addr + 4*i, (value >> shift) & (2**self.csr_data_width - 1), is_write=True)
+
+    def dma_writer(self, enable):
+        buf = bytearray(struct.pack(LITEPCIE_IOCTL_DMA_WRITER_FORMAT, enable, 0, 0))
+        fcntl.ioctl(self.fd, LITEPCIE_IOCTL_DMA_WRITER, buf)
+
+    def dma_read(self, length):
+        return os.read(self.fd, length)
+
+    def dma_reader(self, enable):
+        buf = bytearray(struct.pack(LITEPCIE_IOCTL_DMA_READER_FORMAT, enable, 0, 0))
+        fcntl.ioctl(self.fd, LITEPCIE_IOCTL_DMA_READER, buf)
+
+    def dma_write(self, data):
+        """Write data (multiple of the DMA buffer size), returns the number of bytes written."""
+        return os.write(self.fd, data)
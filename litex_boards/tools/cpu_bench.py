@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# CPU/Memory benchmark suite.
+#
+# Builds the benchmark firmware (litex_boards/software/bench) against a target's generated software
+# (build/<target>/software), runs it and collects its results ("BENCH <key>=<value>" lines) into a
+# table keyed by target and configuration:
+# - Memory: Main RAM sequential write/read/copy bandwidth and random read latency (outside of the
+#   CPU caches/L2, pointer chasing through a random cycle), SPI Flash sequential read bandwidth.
+# - CPU: CoreMark/MHz (with --coremark-dir, sources from an eembc/coremark checkout), iterations
+#   sized from the SoC clock frequency for the 10s minimum run of CoreMark.
+#
+# The firmware is run in simulation (litex_boards.tools.target_sim, target arguments after the
+# target name, a few CoreMark iterations: the result is labelled as a sim run and CoreMark's "too
+# short" error is accepted), or on hardware: serial boot (--port, BIOS serialboot) or loaded through litex_server
+# (--csr-csv, UARTBone/Etherbone/PCIe) and booted from the BIOS console over a crossover UART.
+# --timer-uptime is recommended (64-bit cycles counter, the 32-bit timer wraps).
+#
+# Use:
+# ./cpu_bench.py sim digilent_arty --coremark-dir=coremark --timer-uptime --cpu-variant=full
+# ./cpu_bench.py serial digilent_arty --port=/dev/ttyUSB1 --build-dir=build/digilent_arty --label=full
+# ./cpu_bench.py remote digilent_arty --csr-csv=csr.csv --build-dir=build/digilent_arty
+# ./cpu_bench.py table
+
+import os
+import re
+import sys
+import csv
+import json
+import math
+import time
+import shutil
+import queue
+import struct
+import argparse
+import threading
+import subprocess
+
+# Results ------------------------------------------------------------------------------------------
+
+BENCH_PREFIX = "BENCH "
+
+COREMARK_DURATION_ERROR = "Must execute for at least"
+
+def parse_results(lines, sim=False):
+    """Parse "BENCH <key>=<value>" lines (and CoreMark errors) into a dict.
+
+    Any CoreMark "ERROR!" line (CRC mismatches, run shorter than 10s, port errors) invalidates the
+    CoreMark result, errors are counted in "errors". Simulation runs are too short for CoreMark's
+    minimum duration: this error is accepted and the results are marked with "sim".
+    """
+    results = {}
+    if sim:
+        results["sim"] = 1
+    for line in lines:
+        if line.startswith(BENCH_PREFIX) and "=" in line:
+            key, value = line[len(BENCH_PREFIX):].strip().split("=", 1)
+            results[key] = int(value) if value.isdigit() else value
+        if sim and COREMARK_DURATION_ERROR in line:
+            continue
+        if "ERROR!" in line:
+            results["errors"]         = results.get("errors", 0) + 1
+            results["coremark_valid"] = 0
+    if "coremark_cycles" in results:
+        results.setdefault("coremark_valid", 1)
+    return results
+
+def save_results(filename, target, label, results):
+    entries = []
+    if os.path.exists(filename):
+        with open(filename, "r") as f:
+            entries = json.load(f)
+    entries = [e for e in entries if (e["target"], e["label"]) != (target, label)]
+    entries.append({"target": target, "label": label, "results": results})
+    with open(filename, "w") as f:
+        json.dump(entries, f, indent=4)
+
+TABLE_COLUMNS = [
+    # Title,          Key,                      Scale.
+    ("CPU",           "cpu",                    None),
+    ("MHz",           "clk_freq",               1e6),
+    ("L2",            "l2_size",                None),
+    ("Main RAM",      "main_ram",               None),
+    ("Wr MB/s",       "main_ram_write_bps",     1e6),
+    ("Rd MB/s",       "main_ram_read_bps",      1e6),
+    ("Cpy MB/s",      "main_ram_copy_bps",      1e6),
+    ("Lat ns",        "main_ram_latency_ns",    None),
+    ("Flash MB/s",    "spiflash_read_bps",      1e6),
+    ("CoreMark/MHz",  "coremark_per_mhz_x1000", 1e3),
+]
+
+def format_table(entries):
+    rows = [["Target", "Configuration"] + [title for title, _, _ in TABLE_COLUMNS]]
+    for entry in sorted(entries, key=lambda e: (e["target"], e["label"])):
+        row = [entry["target"], entry["label"]]
+        for _, key, scale in TABLE_COLUMNS:
+            value = entry["results"].get(key, "-")
+            if scale is not None and isinstance(value, int):
+                value = f"{value/scale:.2f}"
+            if key == "coremark_per_mhz_x1000" and not entry["results"].get("coremark_valid", 1):
+                value += " (invalid)"
+            elif key == "coremark_per_mhz_x1000" and entry["results"].get("sim", 0) and value != "-":
+                value += " (sim)"
+            row.append(str(value))
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines  = []
+    for n, row in enumerate(rows):
+        lines.append("| " + " | ".join(cell.ljust(width) for cell, width in zip(row, widths)) + " |")
+        if n == 0:
+            lines.append("|" + "|".join("-"*(width + 2) for width in widths) + "|")
+    return "\n".join(lines)
+
+# Firmware -----------------------------------------------------------------------------------------
+
+COREMARK_MIN_DURATION   = 10  # In seconds (shorter runs are reported as errors by CoreMark).
+COREMARK_MAX_PER_MHZ    = 5.0 # Upper bound of the LiteX CPUs CoreMark/MHz.
+COREMARK_SIM_ITERATIONS = 10  # Simulation runs at a few kHz: too slow for the minimum duration.
+
+def coremark_iterations(clk_freq, duration=COREMARK_MIN_DURATION, max_per_mhz=COREMARK_MAX_PER_MHZ):
+    """CoreMark iterations running for at least duration on the fastest CPUs at clk_freq."""
+    return max(1, math.ceil(duration*max_per_mhz*clk_freq/1e6))
+
+def read_clk_freq(build_dir):
+    """SoC clock frequency from build_dir's generated software."""
+    with open(os.path.join(build_dir, "software", "include", "generated", "soc.h"), "r") as f:
+        return int(re.search(r"#define CONFIG_CLOCK_FREQUENCY (\d+)", f.read()).group(1))
+
+def build_firmware(build_dir, coremark_dir=None, iterations=None, mem="main_ram"):
+    """Build the benchmark firmware against build_dir's software, returns the binary filename.
+
+    CoreMark iterations are sized from the SoC clock frequency when not specified.
+    """
+    if iterations is None:
+        iterations = coremark_iterations(read_clk_freq(build_dir))
+    src_dir   = os.path.join(os.path.dirname(__file__), "..", "software", "bench")
+    bench_dir = os.path.join(build_dir, "bench")
+    os.makedirs(bench_dir, exist_ok=True)
+    for filename in os.listdir(src_dir):
+        shutil.copy(os.path.join(src_dir, filename), bench_dir)
+    # Update memory region.
+    with open(os.path.join(bench_dir, "linker.ld"), "r") as f:
+        linker = f.read()
+    with open(os.path.join(bench_dir, "linker.ld"), "w") as f:
+        f.write(linker.replace("> main_ram", f"> {mem}"))
+    cmd = ["make", "-C", bench_dir, f"BUILD_DIR={os.path.abspath(build_dir)}", f"ITERATIONS={iterations}"]
+    if coremark_dir is not None:
+        cmd.append(f"COREMARK_DIR={os.path.abspath(coremark_dir)}")
+    subprocess.check_call(cmd)
+    return os.path.join(bench_dir, "bench.bin")
+
+def read_mem_regions(csr_csv):
+    regions = {}
+    with open(csr_csv, "r") as f:
+        for row in csv.reader(f):
+            if len(row) >= 4 and row[0] == "memory_region":
+                regions[row[1]] = (int(row[2], 0), int(row[3], 0))
+    return regions
+
+def stream_readline(stream, poll=0.1):
+    """Non-blocking readline on stream: returns None when no line was received within poll.
+
+    Lines are read from a thread, raises EOFError at the end of stream.
+    """
+    lines = queue.Queue()
+    def reader():
+        for line in iter(stream.readline, ""):
+            lines.put(line.rstrip("\r\n"))
+        lines.put(EOFError)
+    threading.Thread(target=reader, daemon=True).start()
+    def readline():
+        try:
+            line = lines.get(timeout=poll)
+        except queue.Empty:
+            return None
+        if line is EOFError:
+            lines.put(EOFError)
+            raise EOFError("End of output.")
+        return line
+    return readline
+
+def read_output(readline, timeout):
+    """Read (and echo) firmware output lines until the end of the benchmarks.
+
+    readline must not block (returns None when no line is available) for the timeout to be enforced.
+    """
+    lines = []
+    start = time.time()
+    while time.time() - start < timeout:
+        line = readline()
+        if line is None:
+            continue
+        print(line)
+        lines.append(line)
+        if line.startswith(BENCH_PREFIX + "done"):
+            return lines
+    raise TimeoutError("Benchmarks timeout.")
+
+# Simulation ---------------------------------------------------------------------------------------
+
+def run_sim(target, target_args, coremark_dir, iterations, mem, timeout):
+    sim = [sys.executable, "-m", "litex_boards.tools.target_sim", target, *target_args]
+    build_dir = os.path.join("build", f"{target}_sim")
+    for arg in target_args:
+        if arg.startswith("--output-dir="):
+            build_dir = arg.split("=", 1)[1]
+
+    # Generate the SoC software, build the firmware against it.
+    if iterations is None:
+        iterations = COREMARK_SIM_ITERATIONS
+    subprocess.check_call(sim + ["--no-compile-gateware"])
+    image = build_firmware(build_dir, coremark_dir, iterations, mem)
+
+    # Boot the firmware in simulation.
+    process = subprocess.Popen(sim + [f"--sim-ram-init={image}", "--sim-non-interactive"],
+        stdout = subprocess.PIPE,
+        text   = True)
+    output = stream_readline(process.stdout)
+    def readline():
+        try:
+            return output()
+        except EOFError:
+            raise RuntimeError("Simulation exited.")
+    try:
+        return read_output(readline, timeout)
+    finally:
+        process.terminate()
+        process.wait()
+
+# Serial Boot --------------------------------------------------------------------------------------
+
+def run_serial(port, baudrate, image, address, timeout):
+    import serial
+    from litex.tools.litex_term import SFLFrame
+    from litex.tools.litex_term import sfl_prompt_req, sfl_prompt_ack, sfl_magic_req, sfl_magic_ack
+    from litex.tools.litex_term import sfl_cmd_load, sfl_cmd_jump, sfl_ack_success
+
+    def send_frame(port, cmd, payload):
+        frame = SFLFrame()
+        frame.cmd     = cmd
+        frame.payload = payload
+        while True:
+            port.write(frame.encode())
+            reply = port.read()
+            if reply == sfl_ack_success:
+                return
+            if reply != b"C": # CRC error: retry.
+                raise IOError(f"Serial boot error (reply {reply}).")
+
+    with open(image, "rb") as f:
+        data = f.read()
+
+    port = serial.serial_for_url(port, baudrate, timeout=1)
+    try:
+        # Reboot from the BIOS console and wait for the serial boot request.
+        print("Rebooting, waiting for serial boot...")
+        port.write(b"\nreboot\n")
+        prompt = bytes(len(sfl_prompt_req))
+        magic  = bytes(len(sfl_magic_req))
+        start  = time.time()
+        while magic != sfl_magic_req:
+            if time.time() - start > timeout:
+                raise TimeoutError("No serial boot request (reset the board).")
+            for b in port.read(max(1, port.in_waiting)):
+                prompt = prompt[1:] + bytes([b])
+                magic  = magic[1:]  + bytes([b])
+                if prompt == sfl_prompt_req:
+                    port.write(sfl_prompt_ack)
+        port.write(sfl_magic_ack)
+
+        # Upload/Boot.
+        print(f"Uploading {image} to 0x{address:08x} ({len(data)} bytes)...")
+        for offset in range(0, len(data), 251):
+            send_frame(port, sfl_cmd_load, (address + offset).to_bytes(4, "big") + data[offset:offset + 251])
+        send_frame(port, sfl_cmd_jump, address.to_bytes(4, "big"))
+
+        buf = bytearray()
+        def readline():
+            while b"\n" not in buf:
+                chunk = port.read(max(1, port.in_waiting))
+                if not chunk:
+                    return None
+                buf.extend(chunk)
+            n    = buf.index(b"\n")
+            line = buf[:n].decode("utf-8", errors="replace").rstrip("\r")
+            del buf[:n + 1]
+            return line
+        return read_output(readline, timeout)
+    finally:
+        port.close()
+
+# Remote (litex_server) ----------------------------------------------------------------------------
+
+def run_remote(csr_csv, image, address, timeout, xover="uart_xover"):
+    from litex import RemoteClient
+    bus = RemoteClient(csr_csv=csr_csv)
+    bus.open()
+    try:
+        with open(image, "rb") as f:
+            data = f.read()
+        data += bytes(-len(data) % 4)
+        words = struct.unpack(f"<{len(data)//4}I", data)
+        print(f"Loading {image} to 0x{address:08x} ({len(data)} bytes)...")
+        for offset in range(0, len(words), 256):
+            bus.write(address + 4*offset, list(words[offset:offset + 256]))
+
+        # Boot from the BIOS console (crossover UART).
+        rxtx    = getattr(bus.regs, f"{xover}_rxtx")
+        rxempty = getattr(bus.regs, f"{xover}_rxempty")
+        for c in f"\nboot 0x{address:08x}\n".encode():
+            rxtx.write(c)
+
+        buf = bytearray()
+        def readline():
+            while b"\n" not in buf:
+                if rxempty.read():
+                    time.sleep(1e-3)
+                    return None
+                buf.append(rxtx.read())
+            n    = buf.index(b"\n")
+            line = buf[:n].decode("utf-8", errors="replace").rstrip("\r")
+            del buf[:n + 1]
+            return line
+        return read_output(readline, timeout)
+    finally:
+        bus.close()
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards CPU/Memory benchmark suite.",
+        epilog="With sim, other arguments are passed to the target.")
+    parser.add_argument("command",        choices=["sim", "serial", "remote", "table"], help="Command.")
+    parser.add_argument("target",         nargs="?",                help="Target name.")
+    parser.add_argument("--label",        default=None,             help="Configuration label (default: target arguments).")
+    parser.add_argument("--build-dir",    default=None,             help="Target build directory (serial/remote).")
+    parser.add_argument("--coremark-dir", default=None,             help="CoreMark sources (eembc/coremark checkout).")
+    parser.add_argument("--iterations",   default=None, type=int,   help="CoreMark iterations (default: 10s at the SoC clock frequency, 10 in sim).")
+    parser.add_argument("--mem",          default="main_ram",       help="Memory region where the firmware is loaded/executed.")
+    parser.add_argument("--port",         default="/dev/ttyUSB1",   help="Serial port (serial).")
+    parser.add_argument("--baudrate",     default=115200, type=int, help="Serial baudrate (serial).")
+    parser.add_argument("--csr-csv",      default="csr.csv",        help="SoC CSR configuration file (remote).")
+    parser.add_argument("--timeout",      default=3600.0, type=float, help="Benchmarks timeout (in seconds).")
+    parser.add_argument("--results",      default="bench.json",     help="Results file.")
+    args, target_args = parser.parse_known_args()
+
+    if args.command == "table":
+        with open(args.results, "r") as f:
+            print(format_table(json.load(f)))
+        return
+
+    if args.target is None:
+        parser.error("target required.")
+    label = args.label
+    if label is None:
+        label = " ".join(target_args) if target_args else "default"
+
+    if args.command == "sim":
+        lines = run_sim(args.target, target_args, args.coremark_dir, args.iterations, args.mem, args.timeout)
+    else:
+        build_dir = args.build_dir or os.path.join("build", args.target)
+        image     = build_firmware(build_dir, args.coremark_dir, args.iterations, args.mem)
+        csr_csv   = args.csr_csv if os.path.exists(args.csr_csv) else os.path.join(build_dir, "csr.csv")
+        address   = read_mem_regions(csr_csv)[args.mem][0]
+        if args.command == "serial":
+            lines = run_serial(args.port, args.baudrate, image, address, args.timeout)
+        else:
+            lines = run_remote(csr_csv, image, address, args.timeout)
+
+    results = parse_results(lines, sim=(args.command == "sim"))
+    save_results(args.results, args.target, label, results)
+    print(format_table([{"target": args.target, "label": label, "results": results}]))
+
+if __name__ == "__main__":
+    main()
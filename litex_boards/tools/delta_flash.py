@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Delta SPI Flash programming.
+#
+# Keeps a manifest of the last image programmed on each board (identified by its serial) and only
+# reprograms the erase sectors that changed, followed by a CRC verification of the whole image read
+# back from the Flash. The manifest is only saved once the image is verified (or --no-verify is
+# used): a failed/interrupted programming or a failed verification forces a full programming on the
+# next run.
+#
+# Use:
+# ./delta_flash.py --platform=digilent_arty --serial=210319A8D2E4 build/digilent_arty/gateware/digilent_arty.bin
+# ./delta_flash.py --file-flash=flash.img --serial=test image.bin (File-backed Flash stand-in).
+
+import os
+import json
+import zlib
+import tempfile
+import argparse
+import importlib
+
+kB = 1024
+MB = 1024*kB
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def get_sectors_crcs(data, sector_size):
+    crcs = []
+    for offset in range(0, len(data), sector_size):
+        sector = data[offset:offset + sector_size]
+        sector = sector + b"\xff"*(sector_size - len(sector)) # Pad with erased value.
+        crcs.append(zlib.crc32(sector))
+    return crcs
+
+def get_changed_runs(old_crcs, new_crcs, merge_gap=0):
+    """Return the (first_sector, nsectors) runs of sectors that differ between two images."""
+    changed = [i for i, crc in enumerate(new_crcs) if (i >= len(old_crcs)) or (old_crcs[i] != crc)]
+    runs = []
+    for i in changed:
+        if runs and (i - (runs[-1][0] + runs[-1][1])) <= merge_gap:
+            runs[-1][1] = i - runs[-1][0] + 1
+        else:
+            runs.append([i, 1])
+    return [tuple(run) for run in runs]
+
+# File Flash ---------------------------------------------------------------------------------------
+
+class FileFlash:
+    """File-backed SPI Flash stand-in exposing the programmer interface (flash/read)."""
+    def __init__(self, filename, size=16*MB, sector_size=64*kB):
+        self.filename    = filename
+        self.size        = size
+        self.sector_size = sector_size
+        self.writes      = []
+        if not os.path.exists(filename):
+            with open(filename, "wb") as f:
+                f.write(b"\xff"*size)
+
+    def flash(self, address, data_file):
+        with open(data_file, "rb") as f:
+            data = f.read()
+        assert address + len(data) <= self.size
+        # Erase affected sectors.
+        start = (address // self.sector_size)*self.sector_size
+        end   = ((address + len(data) + self.sector_size - 1) // self.sector_size)*self.sector_size
+        with open(self.filename, "r+b") as f:
+            f.seek(start)
+            f.write(b"\xff"*(end - start))
+            f.seek(address)
+            f.write(data)
+        self.writes.append((address, len(data)))
+
+    def read(self, address, length):
+        with open(self.filename, "rb") as f:
+            f.seek(address)
+            return f.read(length)
+
+# OpenOCD Program/Readback -------------------------------------------------------------------------
+
+def openocd_flash(prog, runs):
+    """Program (address, filename) runs in a single OpenOCD session through the JTAGSPI proxy.
+
+    The FPGA is only reconfigured (fpga_program) once all runs are written, so that it never boots
+    from a partially updated Flash.
+    """
+    script = "; ".join([
+        "init",
+        "jtagspi_init 0 {{{}}}".format(prog.find_flash_proxy()),
+    ] + [
+        "jtagspi_program {{{}}} 0x{:x}".format(filename, address) for address, filename in runs
+    ] + [
+        "fpga_program",
+        "exit",
+    ])
+    prog.call(["openocd", "-f", prog.find_config(), "-c", script])
+
+def openocd_read(prog, address, length):
+    """Read back SPI Flash content through OpenOCD's JTAGSPI proxy (and reload the user design)."""
+    with tempfile.TemporaryDirectory() as d:
+        filename = os.path.join(d, "readback.bin")
+        script = "; ".join([
+            "init",
+            "jtagspi_init 0 {{{}}}".format(prog.find_flash_proxy()),
+            "flash read_bank 0 {{{}}} 0x{:x} 0x{:x}".format(filename, address, length),
+            "fpga_program",
+            "exit",
+        ])
+        prog.call(["openocd", "-f", prog.find_config(), "-c", script])
+        with open(filename, "rb") as f:
+            return f.read()
+
+# Delta Flasher ------------------------------------------------------------------------------------
+
+class DeltaFlashError(Exception):
+    pass
+
+class DeltaFlasher:
+    def __init__(self, prog, serial,
+        manifest_dir = "~/.litex/flash_manifests",
+        sector_size  = 64*kB,
+        merge_gap    = 1,
+        verify       = True):
+        self.prog         = prog
+        self.serial       = serial
+        self.manifest_dir = os.path.expanduser(manifest_dir)
+        self.sector_size  = sector_size
+        self.merge_gap    = merge_gap
+        self.verify       = verify
+
+    @property
+    def manifest_filename(self):
+        return os.path.join(self.manifest_dir, f"{self.serial}.json")
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_filename):
+            return {}
+        with open(self.manifest_filename) as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest):
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        with open(self.manifest_filename, "w") as f:
+            json.dump(manifest, f, indent=4)
+
+    def remove_manifest(self):
+        if os.path.exists(self.manifest_filename):
+            os.remove(self.manifest_filename)
+
+    def can_read(self):
+        if hasattr(self.prog, "read"):
+            return True
+        from litex.build.openocd import OpenOCD
+        return isinstance(self.prog, OpenOCD)
+
+    def read(self, address, length):
+        if hasattr(self.prog, "read"):
+            return self.prog.read(address, length)
+        return openocd_read(self.prog, address, length)
+
+    def program(self, runs):
+        from litex.build.openocd import OpenOCD
+        if isinstance(self.prog, OpenOCD):
+            openocd_flash(self.prog, runs)
+        else:
+            for address, filename in runs:
+                self.prog.flash(address, filename)
+
+    def check(self, address, data):
+        """Read back the whole image and compare its CRC, raise DeltaFlashError on mismatch."""
+        readback = self.read(address, len(data))
+        if zlib.crc32(readback) != zlib.crc32(data):
+            old_crcs = get_sectors_crcs(readback, self.sector_size)
+            new_crcs = get_sectors_crcs(data,     self.sector_size)
+            sectors  = [i for i, crc in enumerate(new_crcs) if i >= len(old_crcs) or old_crcs[i] != crc]
+            raise DeltaFlashError("CRC mismatch on {} sector(s), first at 0x{:08x}.".format(
+                len(sectors), address + sectors[0]*self.sector_size))
+
+    def flash(self, address, filename, force=False):
+        """Program filename at address, only rewriting the sectors that changed.
+
+        Returns the list of (address, length) regions that were programmed.
+        """
+        assert address % self.sector_size == 0
+        if self.verify and not self.can_read():
+            raise DeltaFlashError("Programmer has no readback support, can't verify (use --no-verify).")
+        with open(filename, "rb") as f:
+            data = f.read()
+        new_crcs = get_sectors_crcs(data, self.sector_size)
+
+        # Only reuse the manifest when it describes the same Flash layout.
+        manifest = self.load_manifest()
+        old_crcs = []
+        if (not force and
+            manifest.get("address")     == address and
+            manifest.get("sector_size") == self.sector_size):
+            old_crcs = manifest.get("crcs", [])
+
+        # Invalidate manifest until the image is programmed and verified.
+        self.remove_manifest()
+
+        # Program changed runs.
+        regions = []
+        with tempfile.TemporaryDirectory() as d:
+            runs = []
+            for sector, nsectors in get_changed_runs(old_crcs, new_crcs, self.merge_gap):
+                offset = sector*self.sector_size
+                chunk  = data[offset:offset + nsectors*self.sector_size]
+                chunk_filename = os.path.join(d, f"chunk{sector}.bin")
+                with open(chunk_filename, "wb") as f:
+                    f.write(chunk)
+                runs.append((address + offset, chunk_filename))
+                regions.append((address + offset, len(chunk)))
+            if runs:
+                self.program(runs)
+
+        # Verify whole image (Also catches sectors changed since the manifest was saved).
+        if self.verify:
+            self.check(address, data)
+
+        # Update manifest.
+        self.save_manifest({
+            "address"     : address,
+            "sector_size" : self.sector_size,
+            "length"      : len(data),
+            "crcs"        : new_crcs,
+        })
+        return regions
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards delta SPI Flash programming.")
+    parser.add_argument("image",                                    help="Image to program.")
+    parser.add_argument("--serial",       required=True,            help="Board serial (Manifest key).")
+    parser.add_argument("--platform",     default=None,             help="Platform providing the programmer (ex: digilent_arty).")
+    parser.add_argument("--file-flash",   default=None,             help="Use a file-backed Flash stand-in instead of a programmer.")
+    parser.add_argument("--address",      default="0x0",            help="Flash address.")
+    parser.add_argument("--sector-size",  default="0x10000",        help="Flash erase sector size.")
+    parser.add_argument("--manifest-dir", default="~/.litex/flash_manifests", help="Manifests directory.")
+    parser.add_argument("--force",        action="store_true",      help="Ignore manifest and reprogram the full image.")
+    parser.add_argument("--no-verify",    action="store_true",      help="Disable CRC verification.")
+    args = parser.parse_args()
+
+    sector_size = int(args.sector_size, 0)
+    if args.file_flash is not None:
+        prog = FileFlash(args.file_flash, sector_size=sector_size)
+    elif args.platform is not None:
+        platform = importlib.import_module(f"litex_boards.platforms.{args.platform}").Platform()
+        prog     = platform.create_programmer()
+    else:
+        parser.error("--platform or --file-flash required.")
+
+    flasher = DeltaFlasher(prog, args.serial,
+        manifest_dir = args.manifest_dir,
+        sector_size  = sector_size,
+        verify       = not args.no_verify,
+    )
+    regions = flasher.flash(int(args.address, 0), args.image, force=args.force)
+    length  = sum(length for _, length in regions)
+    print(f"Programmed {len(regions)} region(s), {length} bytes:")
+    for region_address, region_length in regions:
+        print(f"- 0x{region_address:08x}: {region_length} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Etherbone remote memory map.
+#
+# Host library/tool to access the CSRs and memories of targets with add_etherbone from their
+# generated csr.csv, with batched and pipelined accesses instead of a round-trip per register:
+# - Batches: reads/writes are queued and executed together; writes to adjacent addresses are
+#   coalesced in burst records, reads are grouped (up to max_burst per record).
+# - Pipelining: up to window read records are in flight, replies are matched on their return
+#   address (tag) and lost requests are re-sent after a timeout.
+# - Ordering: records are sent in the order of the batch (the target executes them in order);
+#   writes are only sent once the previous reads completed, so a re-sent read can't overtake them.
+# - Write throttling: writes are not acked, a read-back fence is sent every window write records.
+#
+# LiteEth's Etherbone handles one record per packet (records_per_packet=1) and buffers buffer_depth
+# words per record (add_etherbone default: 16, max_burst must not exceed it).
+#
+# LoopbackServer is a local UDP stand-in for the target (host side tests/benchmark).
+#
+# Use:
+# ./etherbone_map.py --csr-csv=csr.csv read ctrl_scratch ctrl_bus_errors 0x40000000
+# ./etherbone_map.py --csr-csv=csr.csv write ctrl_scratch 0x12345678
+# ./etherbone_map.py --csr-csv=csr.csv dump                          (All CSRs, one batch).
+# ./etherbone_map.py --csr-csv=csr.csv poll --duration=10            (CSRs polls/s, single vs batched).
+# ./etherbone_map.py --csr-csv=csr.csv --loopback poll               (Against the local stand-in).
+
+import csv
+import time
+import socket
+import struct
+import argparse
+import threading
+
+# Etherbone Encoding -------------------------------------------------------------------------------
+
+ETHERBONE_MAGIC   = 0x4e6f
+ETHERBONE_VERSION = 1
+
+def encode_packet(records, probe=False, probe_reply=False):
+    """Encode an Etherbone packet (32-bit addresses/data), records are encoded records."""
+    flags  = (ETHERBONE_VERSION << 4) | (int(probe_reply) << 1) | int(probe)
+    header = struct.pack(">HBBI", ETHERBONE_MAGIC, flags, 0x44, 0)
+    return header + b"".join(records)
+
+def encode_record(writes=None, reads=None):
+    """Encode a record: writes is (base_addr, datas), reads is (base_ret_addr, addrs)."""
+    wcount = 0 if writes is None else len(writes[1])
+    rcount = 0 if reads  is None else len(reads[1])
+    assert wcount <= 255 and rcount <= 255
+    record = struct.pack(">BBBB", 0x00, 0x0f, wcount, rcount)
+    if wcount:
+        record += struct.pack(f">{1 + wcount}I", writes[0], *writes[1])
+    if rcount:
+        record += struct.pack(f">{1 + rcount}I", reads[0], *reads[1])
+    return record
+
+def decode_packet(data):
+    """Decode an Etherbone packet, returns (probe, probe_reply, records).
+
+    Records are (writes, reads) with writes (base_addr, datas)/reads (base_ret_addr, addrs) or None.
+    """
+    magic, flags, sizes, _ = struct.unpack_from(">HBBI", data)
+    if magic != ETHERBONE_MAGIC or sizes != 0x44:
+        raise ValueError("Invalid Etherbone packet.")
+    records = []
+    offset  = 8
+    while offset + 4 <= len(data):
+        _, _, wcount, rcount = struct.unpack_from(">BBBB", data, offset)
+        offset += 4
+        writes = reads = None
+        if wcount:
+            words  = struct.unpack_from(f">{1 + wcount}I", data, offset)
+            writes = (words[0], list(words[1:]))
+            offset += 4*(1 + wcount)
+        if rcount:
+            words  = struct.unpack_from(f">{1 + rcount}I", data, offset)
+            reads  = (words[0], list(words[1:]))
+            offset += 4*(1 + rcount)
+        records.append((writes, reads))
+    return bool(flags & 0x1), bool(flags & 0x2), records
+
+# Transport ----------------------------------------------------------------------------------------
+
+class EtherboneUDP:
+    """Pipelined Etherbone over UDP.
+
+    The target replies to the Etherbone port (local_port defaults to port, as LiteEth); window is
+    the number of read records (or of write records between fences) in flight, a lost reply
+    re-sends the pending reads after timeout.
+    """
+    def __init__(self, host="192.168.1.50", port=1234, local_port=None, timeout=0.1, retries=10,
+        window=8, max_burst=16, records_per_packet=1):
+        self.host               = host
+        self.port               = port
+        self.local_port         = port if local_port is None else local_port
+        self.timeout            = timeout
+        self.retries            = retries
+        self.window             = window
+        self.max_burst          = max_burst
+        self.records_per_packet = records_per_packet
+        self.tag                = 0
+        self.socket             = None
+        self.stats              = {"packets": 0, "records": 0, "retries": 0}
+
+    def open(self, probe=True):
+        if self.socket is not None:
+            return
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("", self.local_port))
+        self.socket.settimeout(self.timeout)
+        if probe:
+            self.probe()
+
+    def close(self):
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def _send(self, records):
+        self.socket.sendto(encode_packet(records), (self.host, self.port))
+        self.stats["packets"] += 1
+        self.stats["records"] += len(records)
+
+    def probe(self):
+        for _ in range(self.retries):
+            self.socket.sendto(encode_packet([], probe=True) + bytes(4), (self.host, self.port))
+            try:
+                data, _ = self.socket.recvfrom(65536)
+            except socket.timeout:
+                continue
+            if decode_packet(data)[1]:
+                return
+        raise TimeoutError(f"Unable to probe Etherbone server at {self.host}:{self.port}.")
+
+    def execute(self, records):
+        """Execute records (in order): ("w", base_addr, datas) or ("r", addrs).
+
+        Read records are pipelined (up to window in flight, lost ones re-sent). Write records are
+        only sent once all the previous reads have completed, so that a re-sent read never executes
+        after a later write. Writes are not acked: a read-back fence (of the last written address)
+        is sent every window write records and after the last one to throttle them.
+
+        Returns the read datas, a list per read record (None for write records).
+        """
+        results = [None]*len(records)
+        pending = {} # tag -> (record index or None for fences, encoded record).
+        tries   = 0
+        queue   = []
+        nwrites = 0  # Write records since the last read/fence.
+        n       = 0
+
+        def push(encoded):
+            queue.append(encoded)
+            if len(queue) == self.records_per_packet:
+                self._send(queue)
+                queue.clear()
+
+        def read(index, addrs):
+            self.tag = (self.tag + 1) & 0xffffffff
+            encoded  = encode_record(reads=(self.tag, addrs))
+            pending[self.tag] = (index, encoded)
+            push(encoded)
+
+        while n < len(records) or pending:
+            # Send records while the window allows it (writes wait for the previous reads).
+            while n < len(records) and len(pending) < self.window:
+                record = records[n]
+                if record[0] == "w":
+                    if pending:
+                        break
+                    push(encode_record(writes=(record[1], record[2])))
+                    nwrites += 1
+                    if (nwrites == self.window) or ((n + 1) == len(records)):
+                        read(None, [record[1]]) # Fence.
+                        nwrites = 0
+                else:
+                    read(n, record[1])
+                    nwrites = 0
+                n += 1
+            if queue:
+                self._send(queue)
+                queue.clear()
+            if not pending:
+                continue
+
+            # Receive replies (re-send pending reads on timeout).
+            try:
+                data, _ = self.socket.recvfrom(65536)
+            except socket.timeout:
+                tries += 1
+                if tries > self.retries:
+                    raise TimeoutError(f"No reply from {self.host}:{self.port} after {self.retries} retries.")
+                self.stats["retries"] += 1
+                for _, encoded in pending.values():
+                    self._send([encoded])
+                continue
+            for writes, _ in decode_packet(data)[2]:
+                if writes is not None and writes[0] in pending:
+                    index, _ = pending.pop(writes[0])
+                    if index is not None:
+                        results[index] = writes[1]
+                    tries = 0
+        return results
+
+# Batch --------------------------------------------------------------------------------------------
+
+class ReadResult:
+    """Result of a batched read, available after the batch is executed."""
+    def __init__(self, length, convert=None):
+        self.length  = length
+        self.convert = convert
+        self.datas   = None
+
+    @property
+    def value(self):
+        if self.datas is None:
+            raise ValueError("Batch not executed.")
+        if self.convert is not None:
+            return self.convert(self.datas)
+        return self.datas[0] if self.length is None else self.datas
+
+class Batch:
+    """Queued reads/writes, executed (in order) on flush or at the end of a with block."""
+    def __init__(self, transport):
+        self.transport = transport
+        self.records   = [] # ["w", base_addr, datas] / ["r", addrs].
+        self.reads     = [] # (ReadResult, [(record index, offset)]).
+
+    def write(self, addr, datas):
+        datas = datas if isinstance(datas, list) else [datas]
+        for data in datas:
+            last = self.records[-1] if self.records else None
+            # Coalesce adjacent writes in a burst record.
+            if (last is not None and last[0] == "w" and
+                last[1] + 4*len(last[2]) == addr and len(last[2]) < self.transport.max_burst):
+                last[2].append(data)
+            else:
+                self.records.append(["w", addr, [data]])
+            addr += 4
+
+    def read(self, addr, length=None, convert=None):
+        result    = ReadResult(length, convert)
+        locations = []
+        for i in range(1 if length is None else length):
+            last = self.records[-1] if self.records else None
+            # Group reads in records.
+            if last is None or last[0] != "r" or len(last[1]) >= self.transport.max_burst:
+                self.records.append(["r", []])
+                last = self.records[-1]
+            locations.append((len(self.records) - 1, len(last[1])))
+            last[1].append(addr + 4*i)
+        self.reads.append((result, locations))
+        return result
+
+    def flush(self):
+        results = self.transport.execute(self.records)
+        for result, locations in self.reads:
+            result.datas = [results[r][o] for r, o in locations]
+        self.records = []
+        self.reads   = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+# CSR Map ------------------------------------------------------------------------------------------
+
+class CSRMap:
+    """CSR registers, constants and memory regions of a csr.csv."""
+    def __init__(self, csr_csv):
+        self.bases     = {}
+        self.registers = {} # name -> (addr, length, mode).
+        self.constants = {}
+        self.memories  = {} # name -> (base, size, type).
+        with open(csr_csv) as f:
+            for row in csv.reader(line for line in f if not line.startswith("#")):
+                if len(row) < 3:
+                    continue
+                kind, name = row[0], row[1]
+                if kind == "csr_base":
+                    self.bases[name] = int(row[2], 0)
+                elif kind == "csr_register":
+                    self.registers[name] = (int(row[2], 0), int(row[3]), row[4])
+                elif kind == "constant":
+                    self.constants[name] = int(row[2]) if row[2].lstrip("-").isdigit() else row[2]
+                elif kind == "memory_region":
+                    self.memories[name] = (int(row[2], 0), int(row[3]), row[4])
+        self.data_width = self.constants.get("config_csr_data_width", 32)
+
+    def decode(self, datas):
+        value = 0
+        for data in datas:
+            value = (value << self.data_width) | data
+        return value
+
+    def encode(self, name, value):
+        length = self.registers[name][1]
+        mask   = 2**self.data_width - 1
+        return [(value >> ((length - 1 - i)*self.data_width)) & mask for i in range(length)]
+
+# Remote Memory ------------------------------------------------------------------------------------
+
+class Register:
+    def __init__(self, memory, name):
+        self.memory = memory
+        self.name   = name
+
+    def read(self):
+        return self.memory.read_registers([self.name])[self.name]
+
+    def write(self, value):
+        self.memory.write_registers({self.name: value})
+
+class Registers:
+    def __init__(self, memory):
+        self._memory = memory
+
+    def __getattr__(self, name):
+        if name not in self._memory.csr_map.registers:
+            raise AttributeError(name)
+        return Register(self._memory, name)
+
+class MemoryView:
+    """Word view of a memory region (indexes/slices in 32-bit words)."""
+    def __init__(self, memory, base, size):
+        self.memory = memory
+        self.base   = base
+        self.size   = size
+
+    def _addr(self, index):
+        if not 0 <= index < self.size//4:
+            raise IndexError(index)
+        return self.base + 4*index
+
+    def __len__(self):
+        return self.size//4
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            assert step == 1
+            return self.memory.read(self._addr(start), stop - start) if stop > start else []
+        return self.memory.read(self._addr(index))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            assert step == 1 and len(value) == stop - start
+            self.memory.write(self._addr(start), list(value))
+        else:
+            self.memory.write(self._addr(index), value)
+
+class RemoteMemory:
+    """Memory-mapped view of a remote target (CSRs by name from csr.csv, regions, raw addresses)."""
+    def __init__(self, transport, csr_csv=None):
+        self.transport = transport
+        self.csr_map   = CSRMap(csr_csv) if csr_csv is not None else None
+        self.regs      = Registers(self)
+
+    def open(self, probe=True):
+        self.transport.open(probe=probe)
+
+    def close(self):
+        self.transport.close()
+
+    def batch(self):
+        return Batch(self.transport)
+
+    def read(self, addr, length=None):
+        with self.batch() as batch:
+            result = batch.read(addr, length)
+        return result.value
+
+    def write(self, addr, datas):
+        with self.batch() as batch:
+            batch.write(addr, datas)
+
+    def read_registers(self, names=None):
+        """Read CSRs (all readable ones by default) in one batch, returns {name: value}."""
+        registers = self.csr_map.registers
+        if names is None:
+            names = [n for n, (_, _, mode) in registers.items() if mode in ["rw", "ro"]]
+        results = {}
+        with self.batch() as batch:
+            for name in names:
+                addr, length, _ = registers[name]
+                results[name] = batch.read(addr, length,
+                    convert = self.csr_map.decode)
+        return {name: result.value for name, result in results.items()}
+
+    def write_registers(self, values):
+        with self.batch() as batch:
+            for name, value in values.items():
+                batch.write(self.csr_map.registers[name][0], self.csr_map.encode(name, value))
+
+    def region(self, name):
+        base, size, _ = self.csr_map.memories[name]
+        return MemoryView(self, base, size)
+
+# Loopback Server ----------------------------------------------------------------------------------
+
+class LoopbackServer:
+    """Local UDP stand-in for an Etherbone target (memory in a dict, one reply packet per read record).
+
+    drop_every drops one request packet every drop_every (loss/retry test).
+    """
+    def __init__(self, host="127.0.0.1", port=0, drop_every=0):
+        self.memory     = {}
+        self.drop_every = drop_every
+        self.requests   = 0
+        self.socket     = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.settimeout(0.1)
+        self.address    = self.socket.getsockname()
+        self.running    = False
+
+    def handle(self, data):
+        """Handle a request packet, returns the reply packets."""
+        probe, _, records = decode_packet(data)
+        if probe:
+            return [encode_packet([], probe_reply=True) + bytes(4)]
+        replies = []
+        for writes, reads in records:
+            if writes is not None:
+                for i, value in enumerate(writes[1]):
+                    self.memory[writes[0] + 4*i] = value
+            if reads is not None:
+                datas = [self.memory.get(addr, 0) for addr in reads[1]]
+                replies.append(encode_packet([encode_record(writes=(reads[0], datas))]))
+        return replies
+
+    def run(self):
+        while self.running:
+            try:
+                data, address = self.socket.recvfrom(65536)
+            except socket.timeout:
+                continue
+            self.requests += 1
+            if self.drop_every and (self.requests % self.drop_every) == 0:
+                continue
+            for reply in self.handle(data):
+                self.socket.sendto(reply, address)
+
+    def start(self):
+        self.running = True
+        self.thread  = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        self.socket.close()
+
+# Run ----------------------------------------------------------------------------------------------
+
+def poll_benchmark(memory, names, duration):
+    """CSRs polls/s with a round-trip per register and with batches."""
+    for mode in ["single", "batched"]:
+        polls = 0
+        start = time.time()
+        while time.time() - start < duration/2:
+            if mode == "single":
+                for name in names:
+                    memory.read_registers([name])
+            else:
+                memory.read_registers(names)
+            polls += len(names)
+        print(f"{mode:>8}: {polls/(time.time() - start):10.0f} CSRs/s ({len(names)} CSRs).")
+
+def main():
+    parser = argparse.ArgumentParser(description="Etherbone remote memory map.")
+    parser.add_argument("command",      choices=["read", "write", "dump", "poll"], help="Command.")
+    parser.add_argument("args",         nargs="*", help="Registers/addresses (read), register/address and value (write).")
+    parser.add_argument("--csr-csv",    default="csr.csv",      help="CSR file.")
+    parser.add_argument("--host",       default="192.168.1.50", help="Target IP address.")
+    parser.add_argument("--port",       default=1234, type=int, help="Etherbone UDP port.")
+    parser.add_argument("--window",     default=8,    type=int, help="Read records in flight.")
+    parser.add_argument("--max-burst",  default=16,   type=int, help="Words per record (<= add_etherbone buffer_depth).")
+    parser.add_argument("--duration",   default=10.0, type=float, help="Poll benchmark duration (s).")
+    parser.add_argument("--loopback",   action="store_true",    help="Use a local stand-in server.")
+    args = parser.parse_args()
+
+    server = None
+    if args.loopback:
+        server = LoopbackServer()
+        server.start()
+        transport = EtherboneUDP(*server.address, local_port=0, window=args.window, max_burst=args.max_burst)
+    else:
+        transport = EtherboneUDP(args.host, args.port, window=args.window, max_burst=args.max_burst)
+    memory = RemoteMemory(transport, args.csr_csv)
+    memory.open()
+    registers = memory.csr_map.registers
+    try:
+        if args.command == "read":
+            names = [a for a in args.args if a in registers]
+            values = memory.read_registers(names)
+            for a in args.args:
+                value = values[a] if a in registers else memory.read(int(a, 0))
+                print(f"{a}: 0x{value:08x}")
+        elif args.command == "write":
+            target, value = args.args[0], int(args.args[1], 0)
+            if target in registers:
+                memory.write_registers({target: value})
+            else:
+                memory.write(int(target, 0), value)
+        elif args.command == "dump":
+            for name, value in memory.read_registers().items():
+                print(f"{name:<48} 0x{value:08x}")
+        elif args.command == "poll":
+            names = args.args or [n for n, (_, _, mode) in registers.items() if mode in ["rw", "ro"]]
+            poll_benchmark(memory, names, args.duration)
+        print(f"Packets: {transport.stats['packets']}, records: {transport.stats['records']}, retries: {transport.stats['retries']}.")
+    finally:
+        memory.close()
+        if server is not None:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
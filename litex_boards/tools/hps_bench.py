@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Cyclone V HPS bridges/F2SDRAM bandwidth test.
+#
+# Host/HPS side of the --with-hps option (litex_boards.cores.hps) of the Cyclone V SoC targets:
+# - F2SDRAM: write/read bandwidth of a LiteX DMA (BIST generator/checker) to the HPS DDR3, in a region
+#   not used by Linux (ex boot with mem=768M and use the last 256MB).
+# - H2F    : HPS CPU write/read bandwidth to the LiteX main_ram through the H2F bridge (--devmem only).
+#
+# Runs from a host through litex_server or directly on the HPS Linux with --devmem (/dev/mem mappings
+# of the H2F/LWH2F bridges, needs root).
+#
+# Use:
+# ./hps_bench.py --csr-csv=csr.csv --devmem (on the HPS)
+# litex_server --jtag (or --uart...) && ./hps_bench.py --csr-csv=csr.csv (from a host)
+
+import os
+import mmap
+import time
+import struct
+import argparse
+
+from litex.tools.remote.csr_builder import CSRBuilder
+
+# HPS bridges windows (HPS physical addresses, see litex_boards.cores.hps).
+H2F_BASE   = 0xc000_0000
+H2F_SIZE   = 0x3c00_0000
+LWH2F_BASE = 0xff20_0000
+LWH2F_SIZE = 0x0020_0000
+
+# DevMem Client ------------------------------------------------------------------------------------
+
+class DevMemClient(CSRBuilder):
+    """LiteX bus accesses from the HPS Linux through /dev/mem (LWH2F for CSRs, H2F for the others)."""
+    def __init__(self, csr_csv):
+        CSRBuilder.__init__(self, comm=self, csr_csv=csr_csv)
+        # H2F window on main_ram (or first 1GB when no main_ram), only main_ram/sram is mapped.
+        h2f_region    = self.mems.d.get("main_ram", self.mems.d.get("sram"))
+        self.csr_base = self.mems.csr.base
+        self.h2f_base = h2f_region.base & ~(2**30 - 1)
+        self.h2f_size = min(h2f_region.base + h2f_region.size - self.h2f_base, H2F_SIZE)
+        self.h2f_test = (h2f_region.base - self.h2f_base, h2f_region.size)
+        self.fd       = None
+
+    def open(self):
+        self.fd    = os.open("/dev/mem", os.O_RDWR | os.O_SYNC)
+        self.lwh2f = mmap.mmap(self.fd, LWH2F_SIZE, offset=LWH2F_BASE)
+        self.h2f   = mmap.mmap(self.fd, self.h2f_size, offset=H2F_BASE)
+
+    def close(self):
+        self.lwh2f.close()
+        self.h2f.close()
+        os.close(self.fd)
+
+    def _window(self, addr):
+        if self.csr_base <= addr < self.csr_base + LWH2F_SIZE:
+            return self.lwh2f, addr - self.csr_base
+        if self.h2f_base <= addr < self.h2f_base + self.h2f_size:
+            return self.h2f, addr - self.h2f_base
+        raise ValueError(f"Address 0x{addr:08x} not mapped by the HPS bridges.")
+
+    def read(self, addr, length=None, burst="incr"):
+        window, offset = self._window(addr)
+        n     = 1 if length is None else length
+        datas = list(struct.unpack(f"<{n}I", window[offset:offset + 4*n]))
+        return datas[0] if length is None else datas
+
+    def write(self, addr, datas):
+        datas  = datas if isinstance(datas, list) else [datas]
+        window, offset = self._window(addr)
+        window[offset:offset + 4*len(datas)] = struct.pack(f"<{len(datas)}I", *datas)
+
+# F2SDRAM Bandwidth --------------------------------------------------------------------------------
+
+def f2sdram_bench(bus, base, size, name="hps_f2sdram"):
+    """Write then check size bytes at base (HPS physical address) with the F2SDRAM BIST."""
+    clk_freq = bus.constants.config_clock_frequency
+    results  = {}
+    for module in ["generator", "checker"]:
+        regs = lambda reg: getattr(bus.regs, f"{name}_{module}_{reg}")
+        regs("reset").write(1)
+        regs("base").write(base)
+        regs("end").write(base + size)
+        regs("length").write(size)
+        regs("random").write(0)
+        regs("start").write(1)
+        while not regs("done").read():
+            time.sleep(0.01)
+        ticks  = regs("ticks").read()
+        errors = regs("errors").read() if module == "checker" else 0
+        results["write" if module == "generator" else "read"] = (size*clk_freq/max(ticks, 1), errors)
+    return results
+
+# H2F Bandwidth ------------------------------------------------------------------------------------
+
+def h2f_bench(bus, size):
+    """HPS CPU write/read of size bytes through the H2F bridge (LiteX main_ram or sram)."""
+    offset, region_size = bus.h2f_test
+    size  = min(size, region_size)
+    data  = os.urandom(size)
+    start = time.time()
+    bus.h2f[offset:offset + size] = data
+    write = size/(time.time() - start)
+    start = time.time()
+    readback = bus.h2f[offset:offset + size]
+    read  = size/(time.time() - start)
+    return {"write": (write, 0), "read": (read, int(readback != data))}
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards Cyclone V HPS bridges/F2SDRAM bandwidth test.")
+    parser.add_argument("--csr-csv",      default="csr.csv",                    help="SoC CSR file.")
+    parser.add_argument("--host",         default="localhost",                  help="litex_server host.")
+    parser.add_argument("--port",         default=1234,        type=int,        help="litex_server port.")
+    parser.add_argument("--devmem",       action="store_true",                  help="Run on the HPS Linux through /dev/mem.")
+    parser.add_argument("--name",         default="hps_f2sdram",                help="F2SDRAM BIST CSRs prefix.")
+    parser.add_argument("--f2sdram-base", default="0x30000000",                 help="F2SDRAM test base (HPS physical address).")
+    parser.add_argument("--size",         default="0x1000000",                  help="Test size (bytes, power of 2).")
+    parser.add_argument("--h2f-size",     default="0x100000",                   help="H2F test size (bytes, --devmem only).")
+    args = parser.parse_args()
+
+    size = int(args.size, 0)
+    assert size & (size - 1) == 0
+
+    if args.devmem:
+        bus = DevMemClient(csr_csv=args.csr_csv)
+    else:
+        from litex import RemoteClient
+        bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    try:
+        benches = [("F2SDRAM", lambda: f2sdram_bench(bus, int(args.f2sdram_base, 0), size, args.name))]
+        if args.devmem:
+            benches.append(("H2F", lambda: h2f_bench(bus, int(args.h2f_size, 0))))
+        for name, bench in benches:
+            for direction, (bandwidth, errors) in bench().items():
+                print(f"{name:8} {direction:5}: {bandwidth/1e6:8.2f} MB/s" + (f" ({errors} errors)" if errors else ""))
+    finally:
+        bus.close()
+
+if __name__ == "__main__":
+    main()
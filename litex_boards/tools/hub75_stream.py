@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# HUB75 UDP frame streamer.
+#
+# Host side of the --with-hub75 option (litex_boards.cores.hub75): frames are converted to the
+# scan order expected by the gateware and sent over UDP, directly written to the back framebuffer
+# in SDRAM and swapped on the last packet of the frame.
+#
+# Images are raw RGB24 files of width x (chains*height) pixels (chains stacked vertically).
+#
+# Use:
+# ./hub75_stream.py --chains=8 --width=128 --height=32 --pattern              (Test pattern).
+# ./hub75_stream.py --chains=8 --width=128 --height=32 --image=frame.rgb
+# ./hub75_stream.py --chains=8 --width=128 --height=32 --pattern --csr-csv=csr.csv (+ Board stats,
+#   through litex_server).
+
+import time
+import socket
+import struct
+import argparse
+
+# Constants ----------------------------------------------------------------------------------------
+
+HUB75_FLAG_SWAP = (1 << 0)
+
+HUB75_PACKET_PIXELS = (1472 - 8)//4 # Fits in a 1500 bytes MTU.
+
+# Frame --------------------------------------------------------------------------------------------
+
+def scan_order(rgb, chains, width, height):
+    """Convert a RGB24 image (chains stacked vertically) to the scan order (0x00BBGGRR words)."""
+    rows  = height//2
+    frame = bytearray(4*chains*width*height)
+    i     = 0
+    for row in range(rows):
+        for x in range(width):
+            for chain in range(chains):
+                for y in [row, row + rows]:
+                    p = 3*((chain*height + y)*width + x)
+                    frame[i:i+3] = rgb[p:p+3]
+                    i += 4
+    return bytes(frame)
+
+def test_pattern(chains, width, height, t):
+    """Moving RGB gradient, one hue offset per chain."""
+    rgb = bytearray(3*chains*width*height)
+    for chain in range(chains):
+        for y in range(height):
+            for x in range(width):
+                p = 3*((chain*height + y)*width + x)
+                rgb[p + 0] = (x*256//width + t) & 0xff
+                rgb[p + 1] = (y*256//height + 32*chain) & 0xff
+                rgb[p + 2] = (t*4) & 0xff
+    return bytes(rgb)
+
+# HUB75 Streamer -----------------------------------------------------------------------------------
+
+class HUB75Streamer:
+    def __init__(self, ip_address="192.168.1.50", udp_port=6000):
+        self.addr = (ip_address, udp_port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, frame):
+        """Send a frame (scan order), the framebuffers are swapped on the last packet."""
+        npixels = len(frame)//4
+        for offset in range(0, npixels, HUB75_PACKET_PIXELS):
+            n     = min(HUB75_PACKET_PIXELS, npixels - offset)
+            flags = HUB75_FLAG_SWAP if (offset + n) == npixels else 0
+            self.sock.sendto(struct.pack("<II", offset, flags) + frame[4*offset:4*(offset + n)], self.addr)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards HUB75 UDP frame streamer.")
+    parser.add_argument("--ip-address", default="192.168.1.50",   help="Board IP address.")
+    parser.add_argument("--udp-port",   default=6000, type=int,   help="HUB75 UDP port (HUB75_UDP_PORT).")
+    parser.add_argument("--chains",     default=8,    type=int,   help="HUB75 chains (HUB75_CHAINS).")
+    parser.add_argument("--width",      default=128,  type=int,   help="Chain width (in pixels).")
+    parser.add_argument("--height",     default=32,   type=int,   help="Panel height (in pixels, 2x scan rows).")
+    parser.add_argument("--image",      default=None,             help="Raw RGB24 image to send.")
+    parser.add_argument("--pattern",    action="store_true",      help="Send an animated test pattern.")
+    parser.add_argument("--fps",        default=30.0, type=float, help="Frame rate (with --pattern).")
+    parser.add_argument("--frames",     default=0,    type=int,   help="Number of frames to send (0: infinite).")
+    parser.add_argument("--csr-csv",    default=None,             help="SoC CSR file, display board stats (through litex_server).")
+    args = parser.parse_args()
+
+    streamer = HUB75Streamer(args.ip_address, args.udp_port)
+
+    if args.image is not None:
+        with open(args.image, "rb") as f:
+            streamer.send(scan_order(f.read(), args.chains, args.width, args.height))
+    if not args.pattern:
+        return
+
+    bus = None
+    if args.csr_csv is not None:
+        from litex import RemoteClient
+        bus = RemoteClient(csr_csv=args.csr_csv)
+        bus.open()
+
+    frames = 0
+    start  = time.time()
+    last   = start
+    try:
+        while args.frames == 0 or frames < args.frames:
+            rgb = test_pattern(args.chains, args.width, args.height, frames)
+            streamer.send(scan_order(rgb, args.chains, args.width, args.height))
+            frames += 1
+            time.sleep(max(0, start + frames/args.fps - time.time()))
+            if time.time() - last > 1.0:
+                last = time.time()
+                print(f"{frames/(last - start):.1f} fps sent", end="")
+                if bus is not None:
+                    period = bus.regs.hub75_refresh_period.read()
+                    print(f", refresh: {bus.constants.config_clock_frequency/max(period, 1):.1f} Hz"
+                          f", underruns: {bus.regs.hub75_underruns.read()}"
+                          f", frames: {bus.regs.hub75_receiver_frames.read()}"
+                          f", drops: {bus.regs.hub75_receiver_drops.read()}", end="")
+                print()
+    finally:
+        if bus is not None:
+            bus.close()
+
+if __name__ == "__main__":
+    main()
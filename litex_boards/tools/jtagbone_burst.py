@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# JTAGbone burst access/benchmark.
+#
+# Host side of add_jtagbone (UARTBone over the JTAGPHY of the FPGA's user chain) with multi-word
+# commands and several commands per JTAG scan, instead of litex_server --jtag (JTAG UART stream,
+# 16 bytes polled per scan, a round-trip per register and writes split in 8-word bursts):
+# - Bursts: reads/writes of up to 255 words per UARTBone command (consecutive addresses).
+# - Scans: commands are packed in DR scans of up to max_scan slots (10-bit slot per byte). A read
+#   command is followed by empty slots for its reply (+gap slots for the JTAG clock domain
+#   crossing), so the target is never sending when the next command arrives.
+# - Pipelining: up to window scans are queued to the OpenOCD server, replies are read in order.
+# - Overflows: the server checks the ready bit of the slot following each sent byte (byte dropped
+#   by the target). A batch with an overflow is re-executed once UARTBone has timed out (100ms).
+# - Adapter speed: set with --speed=<kHz> or swept with --speed=auto (highest speed with
+#   consistent write/read-backs of the scratch register), default is the one of the config.
+#
+# The OpenOCD server (jtagbone_serve TCL procedure) uses the configs of litex_boards/prog (--config
+# or from the programmer of --platform) and the IR of the chain used by add_jtagbone (--chain, ex 2
+# on sqrl_fk33). LoopbackServer is a local stand-in for OpenOCD and the target (tests/benchmark).
+#
+# Use:
+# ./jtagbone_burst.py --platform=digilent_arty --csr-csv=csr.csv read ctrl_scratch 0x40000000
+# ./jtagbone_burst.py --platform=digilent_arty --csr-csv=csr.csv write ctrl_scratch 0x12345678
+# ./jtagbone_burst.py --platform=digilent_arty --csr-csv=csr.csv tune        (Adapter speed sweep).
+# ./jtagbone_burst.py --platform=digilent_arty --csr-csv=csr.csv bench       (Words/s, single vs burst).
+# ./jtagbone_burst.py --config=openocd_xc7_ft2232.cfg --chain=2 server       (OpenOCD server only).
+# ./jtagbone_burst.py --loopback bench
+
+import os
+import time
+import socket
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import deque
+
+from litex_boards.tools.etherbone_map import RemoteMemory
+
+# Constants ----------------------------------------------------------------------------------------
+
+CMD_WRITE_BURST_INCR  = 0x01 # Must match litex.soc.cores.uart.Stream2Wishbone.
+CMD_READ_BURST_INCR   = 0x02
+CMD_WRITE_BURST_FIXED = 0x03
+CMD_READ_BURST_FIXED  = 0x04
+
+MAX_BURST = 255
+
+SPEEDS = [30000, 25000, 20000, 15000, 10000, 6000, 3000, 1000] # kHz.
+
+# UARTBone Encoding --------------------------------------------------------------------------------
+
+def encode_write(addr, datas, addr_width=32, burst="incr"):
+    """Encode a write command (byte address, up to 255 datas)."""
+    assert 1 <= len(datas) <= MAX_BURST
+    cmd = {"incr": CMD_WRITE_BURST_INCR, "fixed": CMD_WRITE_BURST_FIXED}[burst]
+    r   = bytes([cmd, len(datas)]) + (addr//4).to_bytes(addr_width//8, "big")
+    return r + b"".join(data.to_bytes(4, "big") for data in datas)
+
+def encode_read(addr, length, addr_width=32, burst="incr"):
+    """Encode a read command (byte address, up to 255 words), the reply is 4*length bytes."""
+    assert 1 <= length <= MAX_BURST
+    cmd = {"incr": CMD_READ_BURST_INCR, "fixed": CMD_READ_BURST_FIXED}[burst]
+    return bytes([cmd, length]) + (addr//4).to_bytes(addr_width//8, "big")
+
+def split_reads(addrs, max_burst=MAX_BURST):
+    """Split read addresses in runs of consecutive words, returns [(base, length)]."""
+    runs = []
+    for addr in addrs:
+        if runs and runs[-1][0] + 4*runs[-1][1] == addr and runs[-1][1] < max_burst:
+            runs[-1][1] += 1
+        else:
+            runs.append([addr, 1])
+    return [tuple(run) for run in runs]
+
+# OpenOCD Stream Server ----------------------------------------------------------------------------
+
+# Line protocol (one reply line per request line):
+# - "scan <hex>:<gap> ...": DR scan of the bytes of each segment followed by gap empty slots (and a
+#   trailing empty slot), reply: "<received bytes hex> <overflow>".
+# - "speed <kHz>": set the adapter speed, reply: "ok".
+STREAM_TCL = """
+proc jtagbone_speed {khz} {
+    if {[catch {adapter speed $khz}]} {
+        adapter_khz $khz
+    }
+}
+
+proc jtagbone_scan {tap endstate segments} {
+    set fields {}
+    set valid  {}
+    foreach segment $segments {
+        lassign [split $segment ":"] tx gap
+        for {set i 0} {$i < [string length $tx]} {incr i 2} {
+            set b [expr {"0x[string range $tx $i [expr {$i + 1}]]"}]
+            lappend fields 10 [format 0x%03x [expr {0x201 | ($b << 1)}]]
+            lappend valid 1
+        }
+        for {set i 0} {$i < $gap} {incr i} {
+            lappend fields 10 0x001
+            lappend valid 0
+        }
+    }
+    lappend fields 10 0x001
+    lappend valid 0
+    set rxi [split [drscan $tap {*}$fields {*}$endstate] " "]
+    set rx ""
+    set overflow 0
+    set i 0
+    foreach rxj $rxi {
+        set w [expr {"0x${rxj}"}]
+        if {$w & 0x200} {
+            append rx [format %02x [expr {($w >> 1) & 0xff}]]
+        }
+        if {$i > 0 && [lindex $valid [expr {$i - 1}]] && !($w & 0x1)} {
+            set overflow 1
+        }
+        incr i
+    }
+    return "$rx $overflow"
+}
+
+proc jtagbone_request {tap endstate line} {
+    set segments [lassign [split [string trim $line] " "] cmd]
+    if {$cmd eq "speed"} {
+        jtagbone_speed [lindex $segments 0]
+        return "ok"
+    }
+    return [jtagbone_scan $tap $endstate $segments]
+}
+
+proc jtagbone_serve {tap port endstate} {
+    set sock [socket stream.server $port]
+    while {1} {
+        set client [$sock accept]
+        while {[$client gets line] >= 0} {
+            $client puts [jtagbone_request $tap $endstate $line]
+            $client flush
+        }
+        $client close
+    }
+}
+"""
+
+def platform_config(name):
+    """OpenOCD config of the programmer of a LiteX-Boards platform."""
+    import importlib
+    platform = importlib.import_module(f"litex_boards.platforms.{name}").Platform()
+    prog     = platform.create_programmer()
+    if not hasattr(prog, "get_tap_name"):
+        raise ValueError(f"{name} programmer is not OpenOCD ({prog.__class__.__name__}), use --config.")
+    return prog.config
+
+class OpenOCDStream:
+    """OpenOCD JTAGbone server (jtagbone_serve) on the chain of add_jtagbone."""
+    def __init__(self, config="openocd_xc7_ft2232.cfg", chain=1, port=20000, speed=None):
+        self.config  = config
+        self.chain   = chain
+        self.port    = port
+        self.speed   = speed
+        self.process = None
+
+    def find_config(self):
+        from litex.build.openocd import OpenOCD
+        prog_dir = os.path.join(os.path.dirname(__file__), "..", "prog")
+        if not os.path.exists(self.config) and os.path.exists(os.path.join(prog_dir, self.config)):
+            return os.path.abspath(os.path.join(prog_dir, self.config))
+        return OpenOCD(self.config).find_config()
+
+    def command(self, tcl):
+        from litex.build.openocd import OpenOCD
+        prog     = OpenOCD(self.config)
+        config   = self.find_config()
+        tap_name = prog.get_tap_name(config)
+        ir       = prog.get_ir(self.chain, config)
+        endstate = prog.get_endstate(config)
+        script = "; ".join([
+            "init",
+            "irscan {} {:d}".format(tap_name, ir),
+        ] + ([] if self.speed is None else [f"jtagbone_speed {self.speed:d}"]) + [
+            "jtagbone_serve {} {:d} {{{}}}".format(tap_name, self.port, endstate),
+            "exit",
+        ])
+        return ["openocd", "-f", config, "-f", tcl, "-c", script]
+
+    def start(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tcl = os.path.join(self.tmp.name, "jtagbone.tcl")
+        with open(tcl, "w") as f:
+            f.write(STREAM_TCL)
+        self.process = subprocess.Popen(self.command(tcl))
+
+    def run(self):
+        self.start()
+        self.process.wait()
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait()
+            self.process = None
+            self.tmp.cleanup()
+
+# Transport ----------------------------------------------------------------------------------------
+
+class JTAGBoneError(IOError):
+    pass
+
+class JTAGBone:
+    """Burst/pipelined JTAGbone transport (execute interface of etherbone_map.RemoteMemory).
+
+    max_burst words per command, commands packed in scans of max_scan slots (a scan per command
+    with max_scan=0), window scans in flight, gap extra empty slots after each read reply.
+    """
+    def __init__(self, host="localhost", port=20000, timeout=5.0, retries=3, max_burst=MAX_BURST,
+        max_scan=4096, window=4, gap=8, addr_width=32, resync_delay=0.15):
+        self.host         = host
+        self.port         = port
+        self.timeout      = timeout
+        self.retries      = retries
+        self.max_burst    = max_burst
+        self.max_scan     = max_scan
+        self.window       = window
+        self.gap          = gap
+        self.addr_width   = addr_width
+        self.resync_delay = resync_delay
+        self.socket       = None
+        self.stats        = {"scans": 0, "commands": 0, "slots": 0, "retries": 0}
+
+    def open(self, probe=True):
+        if self.socket is not None:
+            return
+        for _ in range(50):
+            try:
+                self.socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.1)
+        else:
+            raise JTAGBoneError(f"Unable to connect to JTAGbone server at {self.host}:{self.port}.")
+        self.file = self.socket.makefile("rw", newline="\n")
+        if probe:
+            self.drain()
+
+    def close(self):
+        if self.socket is not None:
+            self.file.close()
+            self.socket.close()
+            self.socket = None
+
+    def _send(self, line):
+        self.file.write(line + "\n")
+        self.file.flush()
+
+    def _receive(self):
+        line = self.file.readline()
+        if not line:
+            raise JTAGBoneError("JTAGbone server closed the connection.")
+        return line.strip()
+
+    def set_speed(self, khz):
+        self._send(f"speed {khz:d}")
+        self._receive()
+
+    def _scan_line(self, segments):
+        self.stats["scans"] += 1
+        self.stats["slots"] += sum(len(tx) + gap for tx, gap in segments) + 1
+        return "scan " + " ".join(f"{tx.hex()}:{gap}" for tx, gap in segments)
+
+    def _decode(self, line):
+        rx, overflow = line.rsplit(" ", 1) if " " in line else ("", line)
+        return bytes.fromhex(rx), overflow == "1"
+
+    def scan(self, segments):
+        """Single scan of (bytes, gap) segments, returns (received bytes, overflow)."""
+        self._send(self._scan_line(segments))
+        return self._decode(self._receive())
+
+    def drain(self, slots=64):
+        """Poll the target until it has nothing to send (stale replies)."""
+        while self.scan([(b"", slots)])[0]:
+            pass
+
+    def commands(self, records):
+        """UARTBone commands of records, returns [(bytes, reply length)]."""
+        commands = []
+        for record in records:
+            if record[0] == "w":
+                addr, datas = record[1], record[2]
+                for i in range(0, len(datas), self.max_burst):
+                    chunk = datas[i:i + self.max_burst]
+                    commands.append((encode_write(addr + 4*i, chunk, self.addr_width), 0))
+            else:
+                for base, length in split_reads(record[1], self.max_burst):
+                    commands.append((encode_read(base, length, self.addr_width), 4*length))
+        return commands
+
+    def pack(self, commands):
+        """Pack commands in scans, returns a list of scans (lists of (bytes, gap) segments)."""
+        scans = []
+        slots = 0
+        for tx, length in commands:
+            segment = (tx, length + self.gap if length else 0)
+            size    = len(tx) + segment[1]
+            if not scans or slots + size + 1 > self.max_scan:
+                scans.append([])
+                slots = 0
+            scans[-1].append(segment)
+            slots += size
+        return scans
+
+    def _execute(self, commands):
+        expected = sum(length for _, length in commands)
+        scans    = deque(self.pack(commands))
+        inflight = 0
+        rx       = b""
+        overflow = False
+        while scans or inflight:
+            while scans and inflight < self.window:
+                self._send(self._scan_line(scans.popleft()))
+                inflight += 1
+            data, o   = self._decode(self._receive())
+            inflight -= 1
+            rx       += data
+            overflow |= o
+        if overflow:
+            raise JTAGBoneError("JTAGbone overflow (byte dropped by the target).")
+        deadline = time.time() + self.timeout
+        while len(rx) < expected:
+            if time.time() > deadline:
+                raise JTAGBoneError(f"JTAGbone timeout ({len(rx)}/{expected} bytes received).")
+            rx += self.scan([(b"", max(expected - len(rx), 16))])[0]
+        if len(rx) != expected:
+            raise JTAGBoneError(f"JTAGbone unexpected reply ({len(rx)}/{expected} bytes received).")
+        return rx
+
+    def execute(self, records):
+        """Execute records (in order): ("w", base_addr, datas) or ("r", addrs).
+
+        Returns the read datas, a list per read record (None for write records). A batch with an
+        overflow/timeout is re-executed (CSRs with read/write side-effects are accessed again).
+        """
+        commands = self.commands(records)
+        self.stats["commands"] += len(commands)
+        for tries in range(self.retries + 1):
+            try:
+                rx = self._execute(commands)
+                break
+            except JTAGBoneError:
+                time.sleep(self.resync_delay) # Let UARTBone time out and return to idle.
+                self.drain()
+                if tries == self.retries:
+                    raise
+                self.stats["retries"] += 1
+        words   = [int.from_bytes(rx[i:i + 4], "big") for i in range(0, len(rx), 4)]
+        results = []
+        for record in records:
+            if record[0] == "w":
+                results.append(None)
+            else:
+                results.append(words[:len(record[1])])
+                words = words[len(record[1]):]
+        return results
+
+# Loopback Server ----------------------------------------------------------------------------------
+
+class LoopbackServer:
+    """Local TCP stand-in for the OpenOCD server and the target (UARTBone + JTAGPHY slot model).
+
+    The target consumes a received byte per slot (through a fifo_depth bytes RX FIFO, bytes are
+    dropped when full) and sends its replies one byte per slot, not consuming bytes while sending.
+    Commands not completed after timeout are aborted (as UARTBone). Received data is corrupted when
+    the adapter speed is above max_speed.
+    """
+    def __init__(self, host="127.0.0.1", port=0, fifo_depth=4, timeout=0.1, max_speed=None):
+        self.memory     = {}
+        self.fifo_depth = fifo_depth
+        self.timeout    = timeout
+        self.max_speed  = max_speed
+        self.speed      = None
+        self.rx_fifo    = deque()
+        self.tx_fifo    = deque()
+        self.command    = b""
+        self.started    = None
+        self.ready      = 1
+        self.socket     = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, port))
+        self.socket.listen(1)
+        self.socket.settimeout(0.1)
+        self.address    = self.socket.getsockname()
+        self.running    = False
+
+    def _target(self):
+        # UARTBone: consume a byte when not sending, execute commands once complete.
+        if self.tx_fifo or not self.rx_fifo:
+            return
+        self.command += bytes([self.rx_fifo.popleft()])
+        if self.started is None:
+            self.started = time.time()
+        if len(self.command) < 6:
+            return
+        cmd, length = self.command[0], self.command[1]
+        addr = 4*int.from_bytes(self.command[2:6], "big")
+        incr = cmd in [CMD_WRITE_BURST_INCR, CMD_READ_BURST_INCR]
+        if cmd in [CMD_WRITE_BURST_INCR, CMD_WRITE_BURST_FIXED]:
+            if len(self.command) < 6 + 4*length:
+                return
+            for i in range(length):
+                self.memory[addr + 4*i*incr] = int.from_bytes(self.command[6 + 4*i:10 + 4*i], "big")
+        elif cmd in [CMD_READ_BURST_INCR, CMD_READ_BURST_FIXED]:
+            for i in range(length):
+                self.tx_fifo.extend(self.memory.get(addr + 4*i*incr, 0).to_bytes(4, "big"))
+        self.command = b""
+        self.started = None
+
+    def slot(self, tx=None):
+        """One 10-bit slot (tx: byte sent by the host or None), returns the received word."""
+        word = self.ready
+        if self.tx_fifo:
+            data = self.tx_fifo.popleft()
+            if self.max_speed is not None and self.speed is not None and self.speed > self.max_speed:
+                data ^= 0x10
+            word |= 0x200 | (data << 1)
+        self.ready = int(len(self.rx_fifo) < self.fifo_depth)
+        if tx is not None and self.ready:
+            self.rx_fifo.append(tx)
+        self._target()
+        return word
+
+    def scan(self, segments):
+        if self.started is not None and time.time() - self.started > self.timeout:
+            self.rx_fifo.clear()
+            self.tx_fifo.clear()
+            self.command = b""
+            self.started = None
+        slots = []
+        for segment in segments:
+            tx, gap = segment.split(":")
+            slots += list(bytes.fromhex(tx)) + [None]*int(gap)
+        slots.append(None)
+        words    = [self.slot(tx) for tx in slots]
+        rx       = bytes((w >> 1) & 0xff for w in words if w & 0x200)
+        overflow = any(slots[i] is not None and not (words[i + 1] & 0x1) for i in range(len(slots) - 1))
+        return f"{rx.hex()} {int(overflow)}"
+
+    def handle(self, line):
+        cmd, *args = line.strip().split(" ")
+        if cmd == "speed":
+            self.speed = int(args[0])
+            return "ok"
+        return self.scan(args)
+
+    def run(self):
+        while self.running:
+            try:
+                client, _ = self.socket.accept()
+            except socket.timeout:
+                continue
+            with client, client.makefile("rw", newline="\n") as f:
+                for line in f:
+                    f.write(self.handle(line) + "\n")
+                    f.flush()
+
+    def start(self):
+        self.running = True
+        self.thread  = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        self.socket.close()
+
+# Tuning/Benchmark ---------------------------------------------------------------------------------
+
+def check_link(transport, addr, n=64, seed=0):
+    """Write/read-back n patterns to addr (a scratch register), returns True when consistent."""
+    rng      = random.Random(seed)
+    patterns = [rng.getrandbits(32) for _ in range(n)]
+    records  = []
+    for pattern in patterns:
+        records += [("w", addr, [pattern]), ("r", [addr])]
+    try:
+        results = transport.execute(records)
+    except JTAGBoneError:
+        return False
+    return [r[0] for r in results if r is not None] == patterns
+
+def tune_speed(transport, addr, speeds=SPEEDS, iterations=4, verbose=True):
+    """Adapter speed sweep, sets and returns the highest speed passing check_link (None if none)."""
+    for speed in sorted(speeds, reverse=True):
+        transport.set_speed(speed)
+        ok = all(check_link(transport, addr, seed=i) for i in range(iterations))
+        if verbose:
+            print(f"{speed:>6d} kHz: {'OK' if ok else 'KO'}")
+        if ok:
+            return speed
+    return None
+
+def benchmark(transport, addr, words=1024, duration=4.0, write=False):
+    """Words/s with a scan per single-word command and with bursts (returns {mode: words/s})."""
+    results = {}
+    for mode in ["single", "burst"]:
+        config = (transport.max_burst, transport.max_scan, transport.window)
+        if mode == "single":
+            transport.max_burst, transport.max_scan, transport.window = 1, 0, 1
+        for op in ["read"] + (["write"] if write else []):
+            n     = 0
+            start = time.time()
+            while time.time() - start < duration/(4 if write else 2):
+                if op == "read":
+                    transport.execute([("r", [addr + 4*i for i in range(words)])])
+                else:
+                    transport.execute([("w", addr, list(range(words)))])
+                n += words
+            results[f"{mode} {op}"] = n/(time.time() - start)
+        transport.max_burst, transport.max_scan, transport.window = config
+    return results
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="JTAGbone burst access/benchmark.")
+    parser.add_argument("command",      choices=["read", "write", "tune", "bench", "server"], help="Command.")
+    parser.add_argument("args",         nargs="*", help="Registers/addresses (read), register/address and value (write).")
+    parser.add_argument("--config",     default=None, help="OpenOCD config (default: from --platform or openocd_xc7_ft2232.cfg).")
+    parser.add_argument("--platform",   default=None, help="LiteX-Boards platform (OpenOCD config of its programmer).")
+    parser.add_argument("--chain",      default=1,    type=int, help="JTAG chain (of add_jtagbone).")
+    parser.add_argument("--port",       default=20000, type=int, help="JTAGbone server TCP port.")
+    parser.add_argument("--connect",    action="store_true", help="Connect to a running server (instead of starting OpenOCD).")
+    parser.add_argument("--speed",      default=None, help="Adapter speed (kHz) or auto (default: from config).")
+    parser.add_argument("--csr-csv",    default=None, help="CSR file.")
+    parser.add_argument("--addr",       default=None, help="Bench (default: rom region)/tune (default: ctrl_scratch) address.")
+    parser.add_argument("--words",      default=1024, type=int, help="Words per bench access.")
+    parser.add_argument("--write",      action="store_true", help="Also bench writes (overwrites --addr).")
+    parser.add_argument("--duration",   default=4.0,  type=float, help="Bench duration (s).")
+    parser.add_argument("--max-scan",   default=4096, type=int, help="Slots per JTAG scan.")
+    parser.add_argument("--window",     default=4,    type=int, help="Scans in flight.")
+    parser.add_argument("--loopback",   action="store_true", help="Use a local stand-in server/target.")
+    args = parser.parse_args()
+
+    config = args.config
+    if config is None:
+        config = "openocd_xc7_ft2232.cfg" if args.platform is None else platform_config(args.platform)
+    speed  = None if args.speed in [None, "auto"] else int(args.speed)
+
+    # Server.
+    server = None
+    if args.command == "server":
+        OpenOCDStream(config, args.chain, args.port, speed).run()
+        return
+    if args.loopback:
+        server = LoopbackServer()
+        server.memory.update({0xf0000004: 0, 0x00000000: 0x6f})
+        server.start()
+        host, port = server.address
+    else:
+        host, port = "localhost", args.port
+        if not args.connect:
+            server = OpenOCDStream(config, args.chain, args.port, speed)
+            server.start()
+    transport = JTAGBone(host, port, max_scan=args.max_scan, window=args.window)
+    memory    = RemoteMemory(transport, args.csr_csv)
+
+    def address(value, default):
+        value = default if value is None else value
+        if memory.csr_map is not None:
+            if value in memory.csr_map.registers:
+                return memory.csr_map.registers[value][0]
+            if value in memory.csr_map.memories:
+                return memory.csr_map.memories[value][0]
+        return int(value, 0)
+
+    try:
+        memory.open()
+        if args.speed == "auto" or args.command == "tune":
+            speed = tune_speed(transport, address(args.addr if args.command == "tune" else None, "0xf0000004"))
+            if speed is None:
+                raise JTAGBoneError("No adapter speed with a consistent link.")
+            print(f"Adapter speed: {speed} kHz.")
+        if args.command == "read":
+            registers = memory.csr_map.registers if memory.csr_map is not None else {}
+            values    = memory.read_registers([a for a in args.args if a in registers]) if registers else {}
+            for a in args.args:
+                value = values[a] if a in registers else memory.read(int(a, 0))
+                print(f"{a}: 0x{value:08x}")
+        elif args.command == "write":
+            target, value = args.args[0], int(args.args[1], 0)
+            if memory.csr_map is not None and target in memory.csr_map.registers:
+                memory.write_registers({target: value})
+            else:
+                memory.write(int(target, 0), value)
+        elif args.command == "bench":
+            addr = address(args.addr, "rom" if memory.csr_map is not None else "0x00000000")
+            for mode, rate in benchmark(transport, addr, args.words, args.duration, args.write).items():
+                print(f"{mode:>12}: {rate:10.0f} words/s ({args.words} words @ 0x{addr:08x}).")
+        print(f"Scans: {transport.stats['scans']}, commands: {transport.stats['commands']}, retries: {transport.stats['retries']}.")
+    finally:
+        memory.close()
+        if server is not None:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
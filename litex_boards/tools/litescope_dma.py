@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# LiteScope deep captures (litex_boards.cores.scope.LiteScopeDMAAnalyzer) client.
+#
+# Same trigger/subsampling/dump options as litescope_cli, with captures stored in external memory
+# (DRAM/HBM ring buffer read back over the bridge) or streamed to the host memory over PCIe (recorded
+# with the LitePCIe litepcie_test utility while the capture is running).
+#
+# Use:
+# litex_server --udp --udp-ip=192.168.1.50 (or --jtag, --uart, --pcie...)
+# ./litescope_dma.py --rising-edge=main_basesoc_sdram_cmd_valid --length=1000000 --offset=1000 --dump=dump.vcd
+# ./litescope_dma.py --value-trigger main_basesoc_pcie_phy_source_valid 1 --dump=dump.vcd (PCIe streaming)
+
+import os
+import time
+import signal
+import argparse
+import tempfile
+import subprocess
+
+from litescope.software.driver.analyzer import LiteScopeAnalyzerDriver
+from litescope.software.dump.common import DumpData
+
+# LiteScope DMA Analyzer Driver --------------------------------------------------------------------
+
+class LiteScopeDMAAnalyzerDriver(LiteScopeAnalyzerDriver):
+    def __init__(self, regs, name, config_csv=None, bus=None, pcie_device="/dev/litepcie0", debug=False):
+        LiteScopeAnalyzerDriver.__init__(self, regs, name, config_csv, debug)
+        self.bus         = bus
+        self.pcie_device = pcie_device
+        self.record      = None
+
+    def run(self, offset=0, length=None):
+        # Ring buffer wraps on DMA words.
+        ratio = max(self.dma_width//self.sample_width, 1)
+        assert (length or self.depth) % ratio == 0, f"Length must be a multiple of {ratio}."
+        # Stream mode: start recording the DMA before arming the analyzer.
+        if self.stream:
+            fd, self.record_file = tempfile.mkstemp(suffix=".bin")
+            os.close(fd)
+            self.record = subprocess.Popen(["litepcie_test", "-c", self.pcie_device,
+                "record", self.record_file, "0"])
+            time.sleep(0.5)
+        LiteScopeAnalyzerDriver.run(self, offset, length)
+
+    def wait_done(self):
+        while not self.done():
+            time.sleep(0.01)
+        if self.record is not None:
+            self.record.send_signal(signal.SIGINT)
+            self.record.wait()
+            self.record = None
+
+    def _samples(self, raw, n):
+        sample_bytes = self.sample_width//8
+        mask = 2**self.data_width - 1
+        return [int.from_bytes(raw[i*sample_bytes:(i + 1)*sample_bytes], "little") & mask for i in range(n)]
+
+    def _read_memory(self, length):
+        # Single bus read per 255 words (Etherbone record limit).
+        words  = length*self.sample_width//32
+        raw    = bytearray()
+        for i in range(0, words, 255):
+            n = min(255, words - i)
+            for word in self.bus.read(self.bus_base + 4*i, n):
+                raw += word.to_bytes(4, "little")
+            if self.debug:
+                print(f"[uploading] {100*(i + n)//words}%", end="\r")
+        return raw
+
+    def upload(self):
+        count   = self.storage_count.read()
+        trigger = self.storage_trigger.read()
+        end     = self.storage_end.read()
+        if self.storage_overflow.read():
+            print("[warning] samples lost during the capture (sample rate higher than the DMA bandwidth).")
+
+        if self.stream:
+            # Stream: samples since enable, keep offset samples before the trigger.
+            with open(self.record_file, "rb") as f:
+                raw = f.read()
+            os.remove(self.record_file)
+            samples = self._samples(raw, min(end, len(raw)*8//self.sample_width))
+            start   = max(trigger - self.offset, 0)
+            samples = samples[start:end]
+            self.offset = trigger - start
+        else:
+            # Memory: ring buffer, oldest sample at end when wrapped.
+            length  = self.length
+            ring    = self._samples(self._read_memory(length), length)
+            total   = min(count, length)
+            start   = (end - total) % length
+            samples = [ring[(start + i) % length] for i in range(total)]
+            self.offset = (trigger - start) % length
+
+        self.data = DumpData(self.data_width)
+        for sample in samples:
+            self.data.append(sample)
+        return self.data
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards LiteScope deep captures client.")
+    parser.add_argument("--csr-csv",        default="csr.csv",                         help="SoC CSR file.")
+    parser.add_argument("--csv",            default="analyzer.csv",                    help="Analyzer CSV file.")
+    parser.add_argument("--host",           default="localhost",                       help="litex_server host.")
+    parser.add_argument("--port",           default=1234,             type=int,        help="litex_server port.")
+    parser.add_argument("--name",           default="analyzer",                        help="Analyzer CSRs prefix.")
+    parser.add_argument("--group",          default=0,                type=int,        help="Capture group.")
+    parser.add_argument("--subsampling",    default=1,                type=int,        help="Capture subsampling.")
+    parser.add_argument("--length",         default=None,             type=int,        help="Capture length (samples, default: depth).")
+    parser.add_argument("--offset",         default=32,               type=int,        help="Samples kept before the trigger.")
+    parser.add_argument("--rising-edge",    action="append",                           help="Add rising edge trigger.")
+    parser.add_argument("--falling-edge",   action="append",                           help="Add falling edge trigger.")
+    parser.add_argument("--value-trigger",  action="append",          nargs=2,         help="Add conditional trigger with given value.", metavar=("TRIGGER", "VALUE"))
+    parser.add_argument("--pcie-device",    default="/dev/litepcie0",                  help="LitePCIe device (PCIe streaming).")
+    parser.add_argument("--dump",           default="dump.vcd",                        help="Dump file (.vcd, .csv, .sr...).")
+    args = parser.parse_args()
+
+    from litex import RemoteClient
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    try:
+        analyzer = LiteScopeDMAAnalyzerDriver(bus.regs, args.name, config_csv=args.csv, bus=bus,
+            pcie_device = args.pcie_device,
+            debug       = True,
+        )
+        analyzer.configure_group(args.group)
+        analyzer.configure_subsampler(args.subsampling)
+        for name in args.rising_edge or []:
+            analyzer.add_rising_edge_trigger(name)
+        for name in args.falling_edge or []:
+            analyzer.add_falling_edge_trigger(name)
+        for name, value in args.value_trigger or []:
+            analyzer.add_trigger(cond={name: value})
+        if not (args.rising_edge or args.falling_edge or args.value_trigger):
+            analyzer.add_trigger(cond={})
+        analyzer.run(offset=args.offset, length=args.length)
+        analyzer.wait_done()
+        analyzer.upload()
+        analyzer.save(args.dump)
+    finally:
+        bus.close()
+
+if __name__ == "__main__":
+    main()
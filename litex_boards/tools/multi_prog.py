@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Parallel multi-board programming.
+#
+# Programs a list of boards concurrently, with one programmer process per USB adapter and bounded
+# parallelism, and reports per-board timing/failures.
+#
+# Boards are described in a JSON file:
+# [
+#     {"name": "arty0", "platform": "digilent_arty", "serial": "210319A8D2E4", "bitstream": "arty.bit"},
+#     {"name": "arty1", "platform": "digilent_arty", "location": "1-2.4",      "bitstream": "arty.bin", "mode": "flash"},
+#     {"name": "ecp0",  "platform": "lambdaconcept_ecpix5", "platform_args": {"device": "85F"}, ...}
+# ]
+#
+# Use:
+# ./multi_prog.py boards.json --jobs=8
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import traceback
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Board --------------------------------------------------------------------------------------------
+
+class Board:
+    def __init__(self, name, bitstream,
+        platform      = None,
+        target        = None,
+        platform_args = None,
+        serial        = None,
+        location      = None,
+        mode          = "load",
+        address       = 0):
+        assert mode in ["load", "flash"]
+        assert (platform is not None) or (target is not None)
+        self.name          = name
+        self.bitstream     = bitstream
+        self.platform      = platform if platform is not None else target
+        self.platform_args = {} if platform_args is None else platform_args
+        self.serial        = serial
+        self.location      = location
+        self.mode          = mode
+        self.address       = address
+
+    @property
+    def adapter(self):
+        # Boards without serial/location share the default adapter.
+        return self.serial or self.location or "default"
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+class BoardResult:
+    def __init__(self, board, success, start, duration, error=None):
+        self.board    = board
+        self.success  = success
+        self.start    = start
+        self.duration = duration
+        self.error    = error
+
+# Adapter Selection --------------------------------------------------------------------------------
+
+def select_adapter(prog, serial=None, location=None):
+    """Restrict a platform programmer to a specific USB adapter."""
+    from litex.build.openocd import OpenOCD
+    from litex.build.openfpgaloader import OpenFPGALoader
+    if isinstance(prog, OpenOCD):
+        # Configuration sourcing the board's one followed by the adapter selection (before init).
+        lines = [
+            "source {{{}}}".format(os.path.abspath(prog.find_config())),
+            # Avoid port conflicts between concurrent OpenOCD instances.
+            "gdb_port disabled",
+            "telnet_port disabled",
+            "tcl_port disabled",
+        ]
+        if serial is not None:
+            lines.append(f"adapter serial {serial}")
+        if location is not None:
+            lines.append(f"adapter usb location {location}")
+        adapter = serial if serial is not None else location
+        config  = os.path.join(prog.prog_local, "openocd_{}.cfg".format(
+            "default" if adapter is None else adapter.replace("/", "_")))
+        os.makedirs(prog.prog_local, exist_ok=True)
+        with open(config, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        prog.config = config
+    elif isinstance(prog, OpenFPGALoader):
+        if serial is not None:
+            prog.cmd += ["--ftdi-serial", serial]
+        if location is not None:
+            raise ValueError("openFPGALoader adapter selection only supported by serial.")
+    elif (serial is not None) or (location is not None):
+        raise ValueError(f"Adapter selection not supported with {prog.__class__.__name__}.")
+    return prog
+
+def create_programmer(board):
+    platform = importlib.import_module(f"litex_boards.platforms.{board.platform}")
+    platform = platform.Platform(**board.platform_args)
+    prog     = platform.create_programmer()
+    return select_adapter(prog, serial=board.serial, location=board.location)
+
+# Multi-Programmer ---------------------------------------------------------------------------------
+
+class MultiProgrammer:
+    def __init__(self, boards, jobs=4, programmer_factory=create_programmer, log=None):
+        self.boards             = boards
+        self.jobs               = jobs
+        self.programmer_factory = programmer_factory
+        self.log                = log
+        self.lock               = threading.Lock()
+
+    def _log(self, msg):
+        if self.log is not None:
+            with self.lock:
+                self.log(msg)
+
+    def _program(self, board):
+        start = time.time()
+        try:
+            self._log(f"[{board.name}] Programming {board.bitstream} ({board.mode}) on {board.adapter}...")
+            prog = self.programmer_factory(board)
+            if board.mode == "load":
+                prog.load_bitstream(board.bitstream)
+            else:
+                prog.flash(board.address, board.bitstream)
+            result = BoardResult(board, True, start, time.time() - start)
+        except Exception as e:
+            result = BoardResult(board, False, start, time.time() - start, error=e)
+        self._log(f"[{board.name}] {'Done' if result.success else 'Failed'} in {result.duration:.2f}s.")
+        return result
+
+    def _program_adapter(self, boards):
+        # Boards behind the same adapter are programmed sequentially.
+        return [(index, self._program(board)) for index, board in boards]
+
+    def run(self):
+        # Results are returned in boards order (Board names are only labels and can be duplicated).
+        adapters = {}
+        for index, board in enumerate(self.boards):
+            adapters.setdefault(board.adapter, []).append((index, board))
+        results = [None]*len(self.boards)
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for adapter_results in executor.map(self._program_adapter, adapters.values()):
+                for index, result in adapter_results:
+                    results[index] = result
+        return results
+
+# Report -------------------------------------------------------------------------------------------
+
+def format_report(results, total_duration):
+    lines = []
+    lines.append(f"{'Board':<20} {'Adapter':<20} {'Status':<8} {'Time (s)':>8}")
+    lines.append("-"*59)
+    for r in results:
+        status = "OK" if r.success else "FAIL"
+        lines.append(f"{r.board.name:<20} {r.board.adapter:<20} {status:<8} {r.duration:>8.2f}")
+    for r in results:
+        if not r.success:
+            lines.append(f"{r.board.name}: {r.error}")
+    nfails = sum(not r.success for r in results)
+    lines.append(f"{len(results) - nfails}/{len(results)} boards programmed in {total_duration:.2f}s.")
+    return "\n".join(lines)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards parallel multi-board programming.")
+    parser.add_argument("boards",                     help="JSON boards description.")
+    parser.add_argument("--jobs",    default=4, type=int, help="Maximum number of adapters programmed in parallel.")
+    parser.add_argument("--verbose", action="store_true", help="Display tracebacks of failures.")
+    args = parser.parse_args()
+
+    with open(args.boards) as f:
+        boards = [Board.from_dict(d) for d in json.load(f)]
+
+    start   = time.time()
+    mprog   = MultiProgrammer(boards, jobs=args.jobs, log=print)
+    results = mprog.run()
+    print(format_report(results, time.time() - start))
+    if args.verbose:
+        for r in results:
+            if not r.success:
+                traceback.print_exception(type(r.error), r.error, r.error.__traceback__)
+    sys.exit(0 if all(r.success for r in results) else 1)
+
+if __name__ == "__main__":
+    main()
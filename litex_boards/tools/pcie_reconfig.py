@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# PCIe ICAP/Flash reconfiguration.
+#
+# Host side of the --with-pcie-reconfig option (litex_boards.cores.reconfig): images are streamed
+# over a LitePCIe DMA channel to the ICAP (partial bitstreams at ICAP line rate) or to the QSPI Flash
+# programmer (erase/program/verify done on-chip, page by page). Only a few CSR accesses are done
+# per image, through the LitePCIe driver register ioctl.
+#
+# Use:
+# ./pcie_reconfig.py --csr-csv=csr.csv flash  gateware.bin --offset=0x0
+# ./pcie_reconfig.py --csr-csv=csr.csv icap   partial.bin
+# ./pcie_reconfig.py --csr-csv=csr.csv reboot --offset=0x800000 (Multiboot).
+#
+# The DMA channel device (/dev/litepcie<n>) is selected from the RECONFIG_DMA_CHANNEL constant of
+# csr.csv, --device overrides it.
+
+import time
+import struct
+import argparse
+
+from litex_boards.tools.common import LitePCIeDevice, read_csr_constants
+
+# Constants ----------------------------------------------------------------------------------------
+
+RECONFIG_SEL_ICAP  = 0
+RECONFIG_SEL_FLASH = 1
+
+ICAP_NOOP       = 0x20000000
+ICAP_REG_CMD    = 0b00100
+ICAP_REG_WBSTAR = 0b10000
+ICAP_CMD_IPROG  = 0b01111
+
+def reconfig_device(csr_csv):
+    """LitePCIe device of the reconfiguration DMA channel (RECONFIG_DMA_CHANNEL constant)."""
+    constants = read_csr_constants(csr_csv)
+    if "reconfig_dma_channel" not in constants:
+        raise ValueError(f"No reconfig_dma_channel constant in {csr_csv} (SoC built without --with-pcie-reconfig?).")
+    return f"/dev/litepcie{int(constants['reconfig_dma_channel'])}"
+
+# Reconfiguration ----------------------------------------------------------------------------------
+
+class PCIeReconfig:
+    def __init__(self, dev, dma_buffer_size=8192, timeout=60.0):
+        self.dev             = dev
+        self.dma_buffer_size = dma_buffer_size
+        self.timeout         = timeout
+
+    def _wait(self, name, value):
+        start = time.time()
+        while self.dev.read(name) != value:
+            if time.time() - start > self.timeout:
+                raise TimeoutError(f"{name} timeout.")
+
+    def stream(self, sel, data):
+        """Stream data (32-bit words, little-endian) to the ICAP or Flash programmer."""
+        assert len(data) % 4 == 0
+        nwords = len(data)//4
+        # Pad to the DMA buffer size, padding is dropped by the router.
+        data += bytes(-len(data) % self.dma_buffer_size)
+        self.dev.write("reconfig_sel",    sel)
+        self.dev.write("reconfig_length", nwords)
+        self.dev.write("reconfig_start",  1)
+        # Fill the DMA buffers before enabling the DMA, then keep them filled.
+        offset = 0
+        enable = False
+        while offset < len(data):
+            offset += self.dev.dma_write(data[offset:])
+            if not enable:
+                self.dev.dma_reader(1)
+                enable = True
+        self._wait("reconfig_count", nwords)
+        self.dev.dma_reader(0)
+
+    def icap(self, bitstream):
+        """Write a (partial) .bin bitstream to the ICAP."""
+        bitstream += bytes(-len(bitstream) % 4)
+        words = struct.unpack(f">{len(bitstream)//4}I", bitstream)
+        words = words + (ICAP_NOOP,)*8
+        self.stream(RECONFIG_SEL_ICAP, struct.pack(f"<{len(words)}I", *words))
+
+    def flash(self, image, offset, erase=True, verify=True, quad_enable=True, page_size=256, sector_size=65536):
+        """Program image at offset, returns the number of verify errors and first error address.
+
+        quad_enable: set the Flash Quad Enable bit (done by the programmer before the first page).
+        """
+        if erase:
+            assert offset % sector_size == 0
+        image += b"\xff"*(-len(image) % page_size)
+        pages = len(image)//page_size
+        self.dev.write("flash_programmer_erase",       erase)
+        self.dev.write("flash_programmer_verify",      verify)
+        self.dev.write("flash_programmer_quad_enable", quad_enable)
+        self.dev.write("flash_programmer_address",     offset)
+        self.dev.write("flash_programmer_enable",      1)
+        try:
+            self.stream(RECONFIG_SEL_FLASH, image)
+            self._wait("flash_programmer_pages", pages)
+            self._wait("flash_programmer_busy",  0)
+            errors  = self.dev.read("flash_programmer_errors")
+            address = self.dev.read("flash_programmer_error_address")
+        finally:
+            self.dev.write("flash_programmer_enable", 0)
+        return errors, address
+
+    def icap_write(self, addr, data, wait=True):
+        self.dev.write("icap_addr",  addr)
+        self.dev.write("icap_data",  data)
+        self.dev.write("icap_write", 1)
+        if wait:
+            self._wait("icap_done", 1)
+            self.dev.write("icap_write", 0)
+
+    def reboot(self, offset):
+        """Reboot the FPGA from the bitstream at offset (Multiboot), the PCIe link goes down."""
+        self.icap_write(ICAP_REG_WBSTAR, offset)
+        self.icap_write(ICAP_REG_CMD,    ICAP_CMD_IPROG, wait=False)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards PCIe ICAP/Flash reconfiguration.")
+    parser.add_argument("--device",          default=None,              help="LitePCIe DMA channel device (default: from csr.csv).")
+    parser.add_argument("--csr-csv",         default="csr.csv",         help="SoC CSR configuration file.")
+    parser.add_argument("--dma-buffer-size", default=8192, type=int,    help="LitePCIe driver DMA_BUFFER_SIZE.")
+    parser.add_argument("--offset",          default="0",               help="Flash offset.")
+    parser.add_argument("--no-erase",        action="store_true",       help="Disable Flash erase.")
+    parser.add_argument("--no-verify",       action="store_true",       help="Disable Flash verify.")
+    parser.add_argument("--no-quad-enable",  action="store_true",       help="Don't set the Flash Quad Enable bit (Already set/not required).")
+    parser.add_argument("command",           choices=["flash", "icap", "reboot"], help="Command.")
+    parser.add_argument("filename",          nargs="?",                 help="Image/Bitstream file.")
+    args = parser.parse_args()
+
+    device   = args.device or reconfig_device(args.csr_csv)
+    dev      = LitePCIeDevice(device, args.csr_csv)
+    reconfig = PCIeReconfig(dev, dma_buffer_size=args.dma_buffer_size)
+    offset   = int(args.offset, 0)
+
+    data = b""
+    if args.filename is not None:
+        with open(args.filename, "rb") as f:
+            data = f.read()
+
+    start = time.time()
+    try:
+        if args.command == "flash":
+            errors, address = reconfig.flash(data, offset,
+                erase       = not args.no_erase,
+                verify      = not args.no_verify,
+                quad_enable = not args.no_quad_enable)
+            if errors:
+                print(f"Verify failed: {errors} error(s), first at 0x{address:08x}.")
+        elif args.command == "icap":
+            reconfig.icap(data)
+        else:
+            reconfig.reboot(offset)
+    finally:
+        dev.close()
+    duration = time.time() - start
+
+    if data:
+        print(f"{len(data)} bytes in {duration:.3f}s: {len(data)/duration/1e6:.3f} MB/s.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# SDCard throughput benchmark.
+#
+# Drives the LiteSDCard core of a SoC (built with --with-sdcard) from the host through a
+# litex_server bridge (UARTBone/Etherbone/JTAGBone): initializes the card in 4-bit mode, then times
+# single-block and multi-block (CMD18/CMD25) DMA transfers to/from main RAM and reports MB/s.
+# The CPU should be idle (BIOS prompt) while the benchmark runs. Timings include the bridge's
+# register access latency, which the multi-block bursts amortize.
+#
+# Use:
+# litex_server --uart --uart-port=/dev/ttyUSB1
+# ./sdcard_bench.py --csr-csv=csr.csv --clk-freq=50e6 --blocks=2048
+# ./sdcard_bench.py --csr-csv=csr.csv --write (Destructive: overwrites the blocks at --block).
+
+import time
+import argparse
+
+from litex_boards.cores.sdcard import get_sdcard_clk_freq
+
+# Constants ----------------------------------------------------------------------------------------
+
+SDCARD_CTRL_DATA_TRANSFER_NONE  = 0
+SDCARD_CTRL_DATA_TRANSFER_READ  = 1
+SDCARD_CTRL_DATA_TRANSFER_WRITE = 2
+
+SDCARD_CTRL_RESPONSE_NONE       = 0
+SDCARD_CTRL_RESPONSE_SHORT      = 1
+SDCARD_CTRL_RESPONSE_LONG       = 2
+SDCARD_CTRL_RESPONSE_SHORT_BUSY = 3
+
+SD_SWITCH_SWITCH    = 1
+SD_GROUP_ACCESSMODE = 0
+SD_SPEED_SDR25      = 1
+
+BLOCK_SIZE = 512
+
+class SDCardError(Exception):
+    pass
+
+# SDCard Driver ------------------------------------------------------------------------------------
+
+class SDCardDriver:
+    """Host port of the BIOS LiteSDCard driver (liblitesdcard/sdcard.c)."""
+    def __init__(self, bus, name="sdcard", timeout=1.0):
+        self.bus     = bus
+        self.name    = name
+        self.timeout = timeout
+
+    def reg(self, name):
+        return getattr(self.bus.regs, f"{self.name}_{name}")
+
+    # Helpers.
+
+    def set_clk_freq(self, clk_freq):
+        sys_clk_freq = self.bus.constants.config_clock_frequency
+        clk_freq     = get_sdcard_clk_freq(sys_clk_freq, clk_freq)
+        self.reg("phy_clocker_divider").write(round(sys_clk_freq/clk_freq))
+        return clk_freq
+
+    def _wait(self, reg):
+        start = time.time()
+        while True:
+            event = self.reg(reg).read()
+            if event & 0x1:
+                break
+            if time.time() - start > self.timeout:
+                raise SDCardError(f"{reg} timeout.")
+        if event & 0x4:
+            raise SDCardError(f"{reg}: SDCard timeout.")
+        if event & 0x8:
+            raise SDCardError(f"{reg}: SDCard CRC error.")
+
+    def wait_cmd_done(self):
+        self._wait("core_cmd_event")
+
+    def wait_data_done(self):
+        self._wait("core_data_event")
+
+    def wait_dma_done(self, dma):
+        # Timeout when the DMA offset no longer progresses (long bursts are allowed to complete), the
+        # offset is only read on deadlines to keep the polling loop (and timings) unchanged.
+        offset   = None
+        deadline = time.time() + self.timeout
+        while not (self.reg(f"{dma}_done").read() & 0x1):
+            if time.time() > deadline:
+                last, offset = offset, self.reg(f"{dma}_offset").read()
+                if offset == last:
+                    raise SDCardError(f"{dma} timeout (offset {offset}).")
+                deadline = time.time() + self.timeout
+
+    def command(self, cmd, arg=0, rsp=SDCARD_CTRL_RESPONSE_SHORT, data=SDCARD_CTRL_DATA_TRANSFER_NONE):
+        self.reg("core_cmd_argument").write(arg)
+        self.reg("core_cmd_command").write((cmd << 8) | (data << 5) | rsp)
+        self.reg("core_cmd_send").write(1)
+        self.wait_cmd_done()
+        return self.reg("core_cmd_response").read()
+
+    def data_command(self, cmd, arg, block_length, block_count, data=SDCARD_CTRL_DATA_TRANSFER_READ):
+        self.reg("core_block_length").write(block_length)
+        self.reg("core_block_count").write(block_count)
+        return self.command(cmd, arg, SDCARD_CTRL_RESPONSE_SHORT, data)
+
+    # Initialization.
+
+    def init(self, clk_freq=25e6):
+        self.set_clk_freq(400e3)
+        for _ in range(1000):
+            self.reg("phy_init_initialize").write(1)
+            try:
+                self.command(0, rsp=SDCARD_CTRL_RESPONSE_NONE) # GO_IDLE.
+                break
+            except SDCardError:
+                pass
+        else:
+            raise SDCardError("No SDCard.")
+        self.command(8, 0x000001aa)                            # SEND_EXT_CSD.
+        clk_freq = self.set_clk_freq(clk_freq)
+        for _ in range(1000):
+            self.command(55, 0)                                # APP_CMD.
+            r = self.command(41, 0x70ff8000, SDCARD_CTRL_RESPONSE_SHORT_BUSY) # APP_SEND_OP_COND.
+            if r & 0x80000000:
+                break
+        else:
+            raise SDCardError("SDCard initialization timeout.")
+        self.command(2, rsp=SDCARD_CTRL_RESPONSE_LONG)         # ALL_SEND_CID.
+        rca = (self.command(3) >> 16) & 0xffff                 # SET_RELATIVE_ADDRESS.
+        self.command(9, rca << 16, SDCARD_CTRL_RESPONSE_LONG)  # SEND_CSD.
+        self.command(7, rca << 16, SDCARD_CTRL_RESPONSE_SHORT_BUSY) # SELECT_CARD.
+        self.command(55, rca << 16)                            # APP_CMD.
+        self.command(6, 2)                                     # APP_SET_BUS_WIDTH (4-bit).
+        arg  = (SD_SWITCH_SWITCH << 31) | 0xffffff
+        arg &= ~(0xf << (SD_GROUP_ACCESSMODE*4))
+        arg |= SD_SPEED_SDR25 << (SD_GROUP_ACCESSMODE*4)
+        self.data_command(6, arg, 64, 1)                       # SWITCH_FUNC (High-Speed).
+        self.wait_data_done()
+        self.command(16, BLOCK_SIZE)                           # SET_BLOCKLEN.
+        return clk_freq
+
+    # Transfers.
+
+    def read(self, block, count, address):
+        dma = "block2mem_dma"
+        self.reg(f"{dma}_enable").write(0)
+        self.reg(f"{dma}_base").write(address)
+        self.reg(f"{dma}_length").write(BLOCK_SIZE*count)
+        self.reg(f"{dma}_enable").write(1)
+        self.data_command(18 if count > 1 else 17, block, BLOCK_SIZE, count)
+        self.wait_data_done()
+        self.wait_dma_done(dma)
+        if count > 1:
+            self.command(12, rsp=SDCARD_CTRL_RESPONSE_SHORT_BUSY) # STOP_TRANSMISSION.
+
+    def write(self, block, count, address):
+        dma = "mem2block_dma"
+        self.reg(f"{dma}_enable").write(0)
+        self.reg(f"{dma}_base").write(address)
+        self.reg(f"{dma}_length").write(BLOCK_SIZE*count)
+        self.reg(f"{dma}_enable").write(1)
+        self.data_command(25 if count > 1 else 24, block, BLOCK_SIZE, count, SDCARD_CTRL_DATA_TRANSFER_WRITE)
+        self.wait_dma_done(dma)
+        self.wait_data_done()
+        if count > 1:
+            self.command(12, rsp=SDCARD_CTRL_RESPONSE_SHORT_BUSY) # STOP_TRANSMISSION.
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def benchmark(driver, block, blocks, address, burst, write=False):
+    """Transfer blocks by bursts of burst blocks, return throughput in MB/s."""
+    transfer = driver.write if write else driver.read
+    start = time.time()
+    for offset in range(0, blocks, burst):
+        transfer(block + offset, min(burst, blocks - offset), address + BLOCK_SIZE*offset)
+    return BLOCK_SIZE*blocks/(time.time() - start)/1e6
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards SDCard throughput benchmark.")
+    parser.add_argument("--csr-csv",  default="csr.csv",             help="SoC CSR configuration file.")
+    parser.add_argument("--host",     default="localhost",           help="litex_server host.")
+    parser.add_argument("--port",     default=1234, type=int,        help="litex_server port.")
+    parser.add_argument("--name",     default="sdcard",              help="SDCard name in the SoC.")
+    parser.add_argument("--clk-freq", default=50e6, type=float,      help="SDCard clock frequency.")
+    parser.add_argument("--block",    default=0, type=int,           help="First SDCard block.")
+    parser.add_argument("--blocks",   default=1024, type=int,        help="Number of blocks to transfer.")
+    parser.add_argument("--address",  default=None,                  help="Main RAM buffer address (default: main_ram base + 1MB).")
+    parser.add_argument("--write",    action="store_true",           help="Also benchmark writes (Destructive).")
+    args = parser.parse_args()
+
+    from litex import RemoteClient
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    address = int(args.address, 0) if args.address is not None else bus.mems.main_ram.base + 0x100000
+    driver  = SDCardDriver(bus, name=args.name)
+    clk_freq = driver.init(clk_freq=args.clk_freq)
+    print(f"SDCard initialized in 4-bit mode at {clk_freq/1e6:.2f}MHz.")
+
+    print(f"{'Transfer':<24} {'MB/s':>8}")
+    for write in ([False, True] if args.write else [False]):
+        for burst in [1, 8, 64, args.blocks]:
+            mbps = benchmark(driver, args.block, args.blocks, address, burst, write=write)
+            name = f"{'Write' if write else 'Read'} ({burst} block(s))"
+            print(f"{name:<24} {mbps:>8.2f}")
+
+    bus.close()
+
+if __name__ == "__main__":
+    main()
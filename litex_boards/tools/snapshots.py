@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Golden-output snapshots.
+#
+# Fingerprints the outputs of an elaboration (--build --no-compile) and compares them to stored
+# snapshots, to catch silent changes (ex after a dependency bump) before place and route:
+# - Verilog (gateware/*.v): hash of the normalized sources.
+# - Constraints (xdc, lpf, pcf, sdc, cst, pdc, qsf, ccf): hash and hash per line (+/- lines summary).
+# - CSR map (csr.csv): hash per entry (CSR bases/registers, constants).
+# - Memory map (memory regions of csr.csv): hash per region.
+# - csr.json: hash.
+# Snapshots only contain hashes (and entry/file names). Comments, build dates and the output
+# directory are normalized out.
+#
+# test_targets compares its elaborations to the snapshots of LITEX_BOARDS_TEST_SNAPSHOTS (and
+# updates them with LITEX_BOARDS_TEST_SNAPSHOTS_UPDATE=1). The outputs cache of test_select only
+# tracks LiteX-Boards files: compare without LITEX_BOARDS_TEST_CACHE after a dependency bump.
+#
+# Use:
+# ./snapshots.py update build/digilent_arty --snapshots=snapshots/targets
+# ./snapshots.py compare build/digilent_arty --snapshots=snapshots/targets
+# LITEX_BOARDS_TEST_SNAPSHOTS=snapshots python3 -m unittest test.test_targets
+
+import os
+import re
+import sys
+import json
+import glob
+import hashlib
+import argparse
+from collections import Counter
+
+# Constants ----------------------------------------------------------------------------------------
+
+CONSTRAINTS_EXTENSIONS = ["xdc", "lpf", "pcf", "sdc", "cst", "pdc", "qsf", "ccf"]
+
+DATE_RE = re.compile(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d")
+
+# Normalization ------------------------------------------------------------------------------------
+
+def _hash(data):
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+def _normalize(text, output_dir):
+    text = DATE_RE.sub("<date>", text)
+    text = text.replace(os.path.abspath(output_dir), "<output_dir>")
+    return text
+
+def normalize_verilog(text, output_dir="."):
+    text  = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL) # Block comments (ex hierarchy).
+    lines = [l.rstrip() for l in _normalize(text, output_dir).split("\n")]
+    return [l for l in lines if l.strip() and not l.lstrip().startswith("//")]
+
+def normalize_constraints(text, output_dir="."):
+    lines = [l.rstrip() for l in _normalize(text, output_dir).split("\n")]
+    return [l for l in lines if l.strip() and not l.lstrip().startswith(("#", "//"))]
+
+# Fingerprint --------------------------------------------------------------------------------------
+
+def _read(path):
+    with open(path, errors="replace") as f:
+        return f.read()
+
+def fingerprint(output_dir):
+    """Fingerprint of the outputs of an elaboration (paths relative to output_dir)."""
+    fp = {"verilog": {}, "constraints": {}, "csr": {}, "memory_map": {}, "csr_json": None}
+
+    # Verilog.
+    for path in sorted(glob.glob(os.path.join(output_dir, "gateware", "*.v"))):
+        lines = normalize_verilog(_read(path), output_dir)
+        fp["verilog"][os.path.relpath(path, output_dir)] = _hash("\n".join(lines))
+
+    # Constraints.
+    for ext in CONSTRAINTS_EXTENSIONS:
+        for path in sorted(glob.glob(os.path.join(output_dir, "gateware", f"*.{ext}"))):
+            lines = normalize_constraints(_read(path), output_dir)
+            fp["constraints"][os.path.relpath(path, output_dir)] = {
+                "hash"  : _hash("\n".join(lines)),
+                "lines" : [_hash(l)[:8] for l in lines],
+            }
+
+    # CSR/Memory map.
+    csr_csv = os.path.join(output_dir, "csr.csv")
+    if os.path.exists(csr_csv):
+        for line in _normalize(_read(csr_csv), output_dir).split("\n"):
+            if not line.strip() or line.startswith("#"):
+                continue
+            kind, name, value = (line.split(",", 2) + ["", ""])[:3]
+            if kind == "memory_region":
+                fp["memory_map"][name] = _hash(value)
+            else:
+                fp["csr"][f"{kind}:{name}"] = _hash(value)
+    csr_json = os.path.join(output_dir, "csr.json")
+    if os.path.exists(csr_json):
+        fp["csr_json"] = _hash(_normalize(_read(csr_json), output_dir))
+
+    return fp
+
+# Compare ------------------------------------------------------------------------------------------
+
+def _names(names, n=4):
+    names = sorted(names)
+    return ", ".join(names[:n]) + (f", ... ({len(names)})" if len(names) > n else "")
+
+def _compare_entries(category, old, new):
+    added   = set(new) - set(old)
+    removed = set(old) - set(new)
+    changed = {k for k in set(old) & set(new) if old[k] != new[k]}
+    summary = []
+    for what, names in [("added", added), ("removed", removed), ("changed", changed)]:
+        if names:
+            summary.append(f"{category}: {len(names)} {what} ({_names(names)}).")
+    return summary
+
+def compare(old, new):
+    """Differences between two fingerprints, returns a list of summary lines (empty when equal)."""
+    summary = []
+
+    # Verilog.
+    summary += _compare_entries("Verilog", old["verilog"], new["verilog"])
+
+    # Constraints (lines added/removed per file).
+    for path in sorted(set(old["constraints"]) | set(new["constraints"])):
+        if path not in new["constraints"]:
+            summary.append(f"Constraints: {path} removed.")
+        elif path not in old["constraints"]:
+            summary.append(f"Constraints: {path} added.")
+        elif old["constraints"][path]["hash"] != new["constraints"][path]["hash"]:
+            o = Counter(old["constraints"][path]["lines"])
+            n = Counter(new["constraints"][path]["lines"])
+            summary.append(f"Constraints: {path}: +{sum((n - o).values())}/-{sum((o - n).values())} lines.")
+
+    # CSR/Memory map.
+    summary += _compare_entries("CSR",        old["csr"],        new["csr"])
+    summary += _compare_entries("Memory map", old["memory_map"], new["memory_map"])
+    if old["csr_json"] != new["csr_json"] and not summary:
+        summary.append("csr.json changed.")
+
+    return summary
+
+# Snapshots Store ----------------------------------------------------------------------------------
+
+class SnapshotStore:
+    """Directory of snapshots (<directory>/<name>.json, name can contain sub-directories)."""
+    def __init__(self, directory, update=False):
+        self.directory = directory
+        self.update    = update
+
+    @classmethod
+    def from_env(cls):
+        directory = os.environ.get("LITEX_BOARDS_TEST_SNAPSHOTS", None)
+        if directory is None:
+            return None
+        return cls(directory, update=os.environ.get("LITEX_BOARDS_TEST_SNAPSHOTS_UPDATE", "0") == "1")
+
+    def _filename(self, name):
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, name):
+        filename = self._filename(name)
+        if not os.path.exists(filename):
+            return None
+        with open(filename) as f:
+            return json.load(f)
+
+    def save(self, name, fp):
+        filename = self._filename(name)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w") as f:
+            json.dump(fp, f, indent=1, sort_keys=True)
+
+    def check(self, name, output_dir):
+        """Compare (or update) the snapshot of name, returns the differences (summary lines).
+
+        Elaborations without snapshot are not compared (and recorded in update mode).
+        """
+        fp  = fingerprint(output_dir)
+        old = self.load(name)
+        if self.update:
+            self.save(name, fp)
+            return []
+        if old is None:
+            return []
+        return compare(old, fp)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-output snapshots.")
+    parser.add_argument("command",     choices=["update", "compare"], help="Command.")
+    parser.add_argument("output_dirs", nargs="+", help="Elaboration output directories (snapshot name: directory name).")
+    parser.add_argument("--snapshots", default="snapshots", help="Snapshots directory.")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.snapshots, update=(args.command == "update"))
+    differences = 0
+    for output_dir in args.output_dirs:
+        name    = os.path.basename(os.path.normpath(output_dir))
+        summary = store.check(name, output_dir)
+        if args.command == "update":
+            print(f"{name}: updated.")
+        elif store.load(name) is None:
+            print(f"{name}: no snapshot.")
+        elif summary:
+            differences += 1
+            print(f"{name}: differs.")
+            for line in summary:
+                print(f"  {line}")
+        else:
+            print(f"{name}: OK.")
+    sys.exit(1 if differences else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Target simulation (Verilator).
+#
+# Simulates a target's BaseSoC without the board: the target is elaborated with its own arguments
+# (CPU, memory map, integrated memories, add_sdram module/geometry, Ethernet/Etherbone, SPI Flash)
+# and this configuration is replayed on a SimPlatform SoC where the board PHYs are replaced with
+# simulation models:
+# - SDRAM: LiteDRAM SDRAMPHYModel of the target's module (geometry/timings at the target sys_clk_freq,
+#   data width of the target PHY).
+# - Ethernet: LiteEthPHYModel connected to a TAP interface (first Ethernet PHY of the target).
+# - SPI Flash: LiteSPIPHYModel of the target's module, initialized from a Flash image.
+# - UART: Console.
+# Other board peripherals (LEDs, Video, PCIe, etc...) are not simulated.
+#
+# Other arguments are passed to the target and its builder arguments are reused for the simulation:
+# --no-compile (target argument) only generates the simulation, --build is not required.
+#
+# Use:
+# ./target_sim.py digilent_arty --cpu-type=vexriscv                                   (BIOS/SDRAM).
+# ./target_sim.py digilent_arty --with-ethernet --sim-tap=tap0 --sim-remote-ip=192.168.1.100
+# ./target_sim.py colorlight_i5 --sim-flash-init=flash.bin
+# ./target_sim.py digilent_arty --sim-ram-init=firmware.bin                           (Boot firmware).
+
+import os
+import sys
+import inspect
+import argparse
+import importlib
+
+from migen import *
+
+from litex.build.io               import CRG
+from litex.build.generic_platform import *
+from litex.build.sim              import SimPlatform
+from litex.build.sim.config       import SimConfig
+
+from litex.soc.integration.common   import get_mem_data, get_boot_address
+from litex.soc.integration.soc      import LiteXSoC
+from litex.soc.integration.soc_core import SoCCore
+from litex.soc.integration.builder  import Builder
+
+# IOs ----------------------------------------------------------------------------------------------
+
+_io = [
+    # Clk / Rst.
+    ("sys_clk", 0, Pins(1)),
+    ("sys_rst", 0, Pins(1)),
+
+    # Serial.
+    ("serial", 0,
+        Subsignal("source_valid", Pins(1)),
+        Subsignal("source_ready", Pins(1)),
+        Subsignal("source_data",  Pins(8)),
+
+        Subsignal("sink_valid",   Pins(1)),
+        Subsignal("sink_ready",   Pins(1)),
+        Subsignal("sink_data",    Pins(8)),
+    ),
+
+    # Ethernet (Stream Endpoint).
+    ("eth_clocks", 0,
+        Subsignal("tx", Pins(1)),
+        Subsignal("rx", Pins(1)),
+    ),
+    ("eth", 0,
+        Subsignal("source_valid", Pins(1)),
+        Subsignal("source_ready", Pins(1)),
+        Subsignal("source_data",  Pins(8)),
+
+        Subsignal("sink_valid",   Pins(1)),
+        Subsignal("sink_ready",   Pins(1)),
+        Subsignal("sink_data",    Pins(8)),
+    ),
+]
+
+# Target Capture -----------------------------------------------------------------------------------
+
+def _call_kwargs(function, *args, **kwargs):
+    """Arguments of a method call as keyword arguments (self excluded)."""
+    bound  = inspect.signature(function).bind(*args, **kwargs)
+    params = inspect.signature(function).parameters
+    call   = {}
+    for name, value in list(bound.arguments.items())[1:]:
+        if params[name].kind == inspect.Parameter.VAR_KEYWORD:
+            call.update(value)
+        else:
+            call[name] = value
+    return call
+
+class TargetConfig:
+    """BaseSoC configuration of a target, captured while elaborating it."""
+    def __init__(self, name):
+        self.name           = name
+        self.soc            = None
+        self.soc_kwargs     = {}
+        self.sdram          = None
+        self.ethernet       = []
+        self.spi_flash      = None
+        self.builder_kwargs = {}
+        self.dropped        = []
+
+    @property
+    def sys_clk_freq(self):
+        return int(self.soc_kwargs["clk_freq"])
+
+    @property
+    def uart_name(self):
+        # UART PHYs are replaced with the simulation UART (console).
+        uart_name = self.soc_kwargs.get("uart_name", "serial")
+        return uart_name if uart_name in ["crossover", "stub"] else "sim"
+
+class _CaptureBuilder:
+    def __init__(self, config):
+        self.config = config
+
+    def __call__(self, soc, **kwargs):
+        self.config.builder_kwargs = kwargs
+        return self
+
+    def build(self, *args, **kwargs):
+        pass
+
+def capture_target(name, args=None):
+    """Elaborate target name (with its command line args) and capture its BaseSoC configuration."""
+    module = importlib.import_module(f"litex_boards.targets.{name}")
+    config = TargetConfig(name)
+    depth  = [0]
+
+    def record(soc, method, kwargs):
+        if method == "__init__":
+            if config.soc is None:
+                kwargs.pop("platform")
+                config.soc        = soc
+                config.soc_kwargs = kwargs
+        elif method == "add_sdram":
+            config.sdram = kwargs
+        elif method == "add_spi_flash":
+            config.spi_flash = kwargs
+        elif method in ["add_ethernet", "add_etherbone"]:
+            # Only the first Ethernet PHY is simulated.
+            if config.ethernet and (kwargs["phy"] is not config.ethernet[0][1]["phy"]):
+                config.dropped.append(f"{method}({kwargs.get('name', '')})")
+            else:
+                config.ethernet.append((method, kwargs))
+
+    def patch(cls, method):
+        original = getattr(cls, method)
+        def wrapper(soc, *args, **kwargs):
+            if depth[0] == 0:
+                record(soc, method, _call_kwargs(original, soc, *args, **kwargs))
+            depth[0] += 1
+            try:
+                return original(soc, *args, **kwargs)
+            finally:
+                depth[0] -= 1
+        # Keep the signature (introspected by soc_core_argdict).
+        wrapper.__signature__ = inspect.signature(original)
+        setattr(cls, method, wrapper)
+        return (cls, method, original)
+
+    patches = [patch(SoCCore, "__init__")]
+    for method in ["add_sdram", "add_ethernet", "add_etherbone", "add_spi_flash"]:
+        patches.append(patch(LiteXSoC, method))
+    builder  = module.Builder
+    sys_argv = sys.argv
+    try:
+        module.Builder = _CaptureBuilder(config)
+        sys.argv       = [module.__file__, *(args or [])]
+        module.main()
+    finally:
+        module.Builder = builder
+        sys.argv       = sys_argv
+        for cls, method, original in patches:
+            setattr(cls, method, original)
+
+    if config.soc is None:
+        raise ValueError(f"No SoC elaborated by {name} target.")
+    return config
+
+# Target Simulation SoC ----------------------------------------------------------------------------
+
+class TargetSimSoC(SoCCore):
+    def __init__(self, config, rom_init=None, ram_init=None, flash_init=None):
+        # Platform ---------------------------------------------------------------------------------
+        platform     = SimPlatform("SIM", list(_io), name=f"{config.name}_sim")
+        sys_clk_freq = config.sys_clk_freq
+
+        # CRG --------------------------------------------------------------------------------------
+        self.crg = CRG(platform.request("sys_clk"))
+
+        # SoCCore ----------------------------------------------------------------------------------
+        self.mem_map = dict(config.soc.mem_map)
+        soc_kwargs   = dict(config.soc_kwargs)
+        soc_kwargs["with_jtagbone"] = False
+        soc_kwargs["with_uartbone"] = False
+        soc_kwargs["uart_name"]     = config.uart_name
+        if rom_init:
+            soc_kwargs["integrated_rom_init"] = rom_init
+        if ram_init and soc_kwargs.get("integrated_main_ram_size", 0):
+            soc_kwargs["integrated_main_ram_init"] = ram_init
+        SoCCore.__init__(self, platform, **soc_kwargs)
+        self.comb += platform.trace.eq(1)
+
+        # SDRAM ------------------------------------------------------------------------------------
+        if config.sdram is not None:
+            from litedram.phy.model import SDRAMPHYModel, sdram_module_nphases
+            sdram   = dict(config.sdram)
+            phy     = sdram.pop("phy")
+            module  = sdram["module"]
+            # The model has the standard number of phases of the memory type.
+            rate = "1:{}".format(sdram_module_nphases[module.memtype])
+            if module.rate != rate:
+                module = module.__class__(module.clk_freq, rate,
+                    speedgrade        = module.speedgrade,
+                    fine_refresh_mode = module.timing_settings.fine_refresh_mode)
+            self.sdrphy = SDRAMPHYModel(
+                module     = module,
+                data_width = phy.settings.databits,
+                clk_freq   = sys_clk_freq,
+                init       = ram_init or [])
+            sdram["module"] = module
+            self.add_sdram(phy=self.sdrphy, **sdram)
+            if ram_init:
+                # Skip SDRAM test to avoid corrupting pre-initialized contents.
+                self.add_constant("SDRAM_TEST_DISABLE")
+            else:
+                # Reduce memtest size for simulation speedup.
+                self.add_constant("MEMTEST_DATA_SIZE", 8*1024)
+                self.add_constant("MEMTEST_ADDR_SIZE", 8*1024)
+
+        # Ethernet / Etherbone ---------------------------------------------------------------------
+        if config.ethernet:
+            from liteeth.phy.model import LiteEthPHYModel
+            self.ethphy = LiteEthPHYModel(platform.request("eth", 0))
+            for method, kwargs in config.ethernet:
+                kwargs = dict(kwargs)
+                kwargs.update(phy=self.ethphy, phy_cd="eth", with_timing_constraints=False)
+                getattr(self, method)(**kwargs)
+            self.add_constant("HW_PREAMBLE_CRC")
+
+        # SPI Flash --------------------------------------------------------------------------------
+        if config.spi_flash is not None:
+            from litespi.phy.model import LiteSPIPHYModel
+            spiflash = dict(config.spi_flash)
+            spiflash.pop("phy", None)
+            name = spiflash.get("name", "spiflash")
+            spiflash_phy = LiteSPIPHYModel(spiflash["module"], init=flash_init or None)
+            self.add_module(name=f"{name}_phy", module=spiflash_phy)
+            self.add_spi_flash(phy=spiflash_phy, **spiflash)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards target simulation (Verilator).",
+        epilog="Other arguments are passed to the target.")
+    parser.add_argument("target",                                       help="Target name (litex_boards.targets module).")
+    parser.add_argument("--sim-rom-init",        default=None,          help="ROM init file (.bin or .json).")
+    parser.add_argument("--sim-ram-init",        default=None,          help="Main RAM/SDRAM init file (.bin or .json).")
+    parser.add_argument("--sim-flash-init",      default=None,          help="SPI Flash image (.bin or .json).")
+    parser.add_argument("--sim-tap",             default="tap0",        help="Ethernet TAP interface.")
+    parser.add_argument("--sim-remote-ip",       default=None,          help="Ethernet TAP IP address (default: Target's remote IP).")
+    parser.add_argument("--sim-threads",         default=1, type=int,   help="Number of simulation threads.")
+    parser.add_argument("--sim-opt-level",       default="O3",          help="Simulation compilation optimization level.")
+    parser.add_argument("--sim-trace",           action="store_true",   help="Enable Tracing.")
+    parser.add_argument("--sim-non-interactive", action="store_true",   help="Run simulation without user input.")
+    args, target_args = parser.parse_known_args()
+
+    # Target Configuration -------------------------------------------------------------------------
+    config = capture_target(args.target, target_args)
+    for dropped in config.dropped:
+        print(f"Not simulated: {dropped}.")
+
+    # Memories Init --------------------------------------------------------------------------------
+    data_width = config.soc.bus.data_width
+    endianness = config.soc.cpu.endianness
+    rom_init   = get_mem_data(args.sim_rom_init, data_width=data_width, endianness=endianness)
+    ram_init   = get_mem_data(args.sim_ram_init,
+        data_width = data_width,
+        endianness = endianness,
+        offset     = config.soc.mem_map["main_ram"])
+    flash_init = get_mem_data(args.sim_flash_init, endianness="big")
+
+    # SoC ------------------------------------------------------------------------------------------
+    soc = TargetSimSoC(config, rom_init=rom_init, ram_init=ram_init, flash_init=flash_init)
+    if args.sim_ram_init is not None:
+        boot_address = get_boot_address(args.sim_ram_init)
+        soc.add_constant("ROM_BOOT_ADDRESS", boot_address or soc.mem_map["main_ram"])
+
+    # Simulation Configuration ---------------------------------------------------------------------
+    sim_config = SimConfig()
+    sim_config.add_clocker("sys_clk", freq_hz=config.sys_clk_freq)
+    if config.uart_name == "sim":
+        sim_config.add_module("serial2console", "serial")
+    if config.ethernet:
+        remote_ip = args.sim_remote_ip
+        if remote_ip is None:
+            method, kwargs = config.ethernet[0]
+            remote_ip = kwargs.get("remote_ip" if method == "add_ethernet" else "ethmac_remote_ip")
+        sim_config.add_module("ethernet", "eth", args={
+            "interface" : args.sim_tap,
+            "ip"        : remote_ip or "192.168.1.100",
+        })
+
+    # Build/Run ------------------------------------------------------------------------------------
+    builder_kwargs = dict(config.builder_kwargs)
+    if builder_kwargs.get("output_dir", None) is None:
+        builder_kwargs["output_dir"] = os.path.join("build", f"{config.name}_sim")
+    builder = Builder(soc, **builder_kwargs)
+    builder.build(
+        sim_config  = sim_config,
+        interactive = not args.sim_non_interactive,
+        threads     = args.sim_threads,
+        opt_level   = args.sim_opt_level,
+        trace       = args.sim_trace,
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Dependency-aware test selection.
+#
+# Statically maps targets and platforms to the LiteX-Boards files they use: litex_boards imports
+# (platforms, cores, build helpers...), followed transitively, and OpenOCD configurations of prog/
+# referenced by name. From this, only the elaborations of test_targets affected by a change are run:
+# - Git diff (--since=<rev>): targets/platforms depending on a changed file.
+# - Outputs cache: targets/platforms whose dependencies (contents), arguments and installed
+#   LiteX/Migen/Lite* packages (versions, git commits of development installs) are unchanged since
+#   their last successful elaboration are skipped.
+# Changes to setup.py or test_targets select everything, changes to the simple target select all
+# platforms.
+#
+# test_targets uses the same selection with LITEX_BOARDS_TEST_SINCE and LITEX_BOARDS_TEST_CACHE.
+#
+# Use:
+# ./test_select.py --since=origin/master                         (List affected targets/platforms).
+# ./test_select.py --deps=colorlight_5a_75x                       (Show dependencies).
+# LITEX_BOARDS_TEST_SINCE=origin/master python3 -m unittest test.test_targets
+# LITEX_BOARDS_TEST_CACHE=.test_cache.json python3 -m unittest test.test_targets
+
+import os
+import ast
+import json
+import hashlib
+import argparse
+import subprocess
+import importlib.util
+import importlib.metadata
+
+# Constants ----------------------------------------------------------------------------------------
+
+GLOBAL_FILES = [
+    "setup.py",
+    "test/test_targets.py",
+    "litex_boards/tools/build_server.py",
+    "litex_boards/tools/test_select.py",
+    "litex_boards/tools/snapshots.py",
+]
+
+# Installed packages used by the targets/platforms (part of the outputs cache fingerprints).
+PACKAGES = [
+    "migen",
+    "litex",
+    "litedram",
+    "liteeth",
+    "litepcie",
+    "litesata",
+    "litesdcard",
+    "litespi",
+    "litescope",
+    "valentyusb",
+]
+
+# Dependency Graph ---------------------------------------------------------------------------------
+
+class DependencyGraph:
+    """Static dependencies of the litex_boards modules (paths relative to the repository root)."""
+    def __init__(self, root="."):
+        self.root  = os.path.abspath(root)
+        self._deps = {}
+
+    def _exists(self, path):
+        return os.path.isfile(os.path.join(self.root, path))
+
+    def _module_path(self, module):
+        path = module.replace(".", "/")
+        for p in [f"{path}.py", f"{path}/__init__.py"]:
+            if self._exists(p):
+                return p
+        return None
+
+    def direct_deps(self, path):
+        if path in self._deps:
+            return self._deps[path]
+        deps = set()
+        with open(os.path.join(self.root, path)) as f:
+            try:
+                tree = ast.parse(f.read(), filename=path)
+            except SyntaxError:
+                tree = ast.Module(body=[], type_ignores=[])
+        for node in ast.walk(tree):
+            modules = []
+            if isinstance(node, ast.Import):
+                modules = [a.name for a in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+                # from litex_boards.platforms import x: x is a module or a name of the package.
+                modules = [f"{node.module}.{a.name}" for a in node.names] + [node.module]
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                # OpenOCD configurations (ex OpenOCD("openocd_xc7_ft2232.cfg")).
+                if node.value.endswith(".cfg") and self._exists(f"litex_boards/prog/{node.value}"):
+                    deps.add(f"litex_boards/prog/{node.value}")
+            for module in modules:
+                if module.startswith("litex_boards."):
+                    dep = self._module_path(module)
+                    if dep is not None:
+                        deps.add(dep)
+        deps.discard(path)
+        self._deps[path] = deps
+        return deps
+
+    def deps(self, path):
+        """Transitive dependencies of path (including path)."""
+        result  = set()
+        pending = [path]
+        while pending:
+            p = pending.pop()
+            if p in result:
+                continue
+            result.add(p)
+            if p.endswith(".py"):
+                pending += self.direct_deps(p)
+        return result
+
+    def _names(self, directory):
+        return sorted(f[:-3] for f in os.listdir(os.path.join(self.root, directory))
+            if f.endswith(".py") and f != "__init__.py")
+
+    def targets(self):
+        return self._names("litex_boards/targets")
+
+    def platforms(self):
+        return self._names("litex_boards/platforms")
+
+    def target_deps(self, name):
+        return self.deps(f"litex_boards/targets/{name}.py")
+
+    def platform_deps(self, name):
+        # Platforms are tested with the simple target.
+        return self.deps(f"litex_boards/platforms/{name}.py") | self.deps("litex_boards/targets/simple.py")
+
+    def affected(self, changed, targets=None, platforms=None):
+        """Targets and platforms depending on the changed files, returns (targets, platforms)."""
+        targets   = self.targets()   if targets   is None else targets
+        platforms = self.platforms() if platforms is None else platforms
+        changed   = set(changed)
+        if changed & set(GLOBAL_FILES):
+            return list(targets), list(platforms)
+        return (
+            [t for t in targets   if self.target_deps(t)   & changed],
+            [p for p in platforms if self.platform_deps(p) & changed])
+
+def changed_files(since, root="."):
+    """Files changed since a git revision (committed, uncommitted and untracked changes)."""
+    cmd = ["git", "-C", root, "diff", "--name-only", since]
+    changed = subprocess.check_output(cmd, text=True).split()
+    cmd = ["git", "-C", root, "ls-files", "--others", "--exclude-standard"]
+    changed += subprocess.check_output(cmd, text=True).split()
+    return sorted(set(changed))
+
+def package_version(name):
+    """Version of an installed package, with git commit/changes for development installs."""
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    try:
+        version = importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    if spec.submodule_search_locations:
+        path = list(spec.submodule_search_locations)[0]
+    else:
+        path = os.path.dirname(spec.origin)
+    try:
+        git    = ["git", "-C", path]
+        commit = subprocess.check_output(git + ["log", "-1", "--format=%H", "--", "."],
+            text=True, stderr=subprocess.DEVNULL).strip()
+        if commit:
+            diff    = subprocess.check_output(git + ["diff", "HEAD", "--", "."], stderr=subprocess.DEVNULL)
+            version = f"{version}+{commit}"
+            if diff:
+                version += f"+{hashlib.sha256(diff).hexdigest()[:16]}"
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return version
+
+def packages_versions(packages=PACKAGES):
+    return {name: package_version(name) for name in packages}
+
+# Outputs Cache ------------------------------------------------------------------------------------
+
+class OutputsCache:
+    """Fingerprints (dependencies contents + arguments + installed packages) of the last successful
+    elaborations."""
+    def __init__(self, filename, graph, packages=None):
+        self.filename = filename
+        self.graph    = graph
+        self.packages = packages_versions() if packages is None else packages
+        self.entries  = {}
+        if os.path.exists(filename):
+            with open(filename) as f:
+                self.entries = json.load(f)
+
+    def fingerprint(self, deps, args=[]):
+        h = hashlib.sha256()
+        for dep in sorted(deps):
+            h.update(dep.encode())
+            with open(os.path.join(self.graph.root, dep), "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+        h.update(json.dumps(list(args)).encode())
+        h.update(json.dumps(self.packages, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def _key(self, kind, name):
+        return f"{kind}:{name}"
+
+    def _deps(self, kind, name):
+        return self.graph.target_deps(name) if kind == "target" else self.graph.platform_deps(name)
+
+    def valid(self, kind, name, args=[]):
+        return self.entries.get(self._key(kind, name)) == self.fingerprint(self._deps(kind, name), args)
+
+    def update(self, kind, name, args=[]):
+        self.entries[self._key(kind, name)] = self.fingerprint(self._deps(kind, name), args)
+
+    def save(self):
+        with open(self.filename, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+
+# Test Selection -----------------------------------------------------------------------------------
+
+class TargetSelection:
+    """Selection of test_targets elaborations (git diff and/or outputs cache)."""
+    def __init__(self, root=".", since=None, cache=None):
+        self.graph = DependencyGraph(root)
+        self.since = since
+        self.cache = OutputsCache(cache, self.graph) if cache is not None else None
+
+    @classmethod
+    def from_env(cls, root="."):
+        return cls(root,
+            since = os.environ.get("LITEX_BOARDS_TEST_SINCE", None),
+            cache = os.environ.get("LITEX_BOARDS_TEST_CACHE", None))
+
+    def _filter(self, kind, names, args):
+        if self.since is not None:
+            changed = changed_files(self.since, self.graph.root)
+            if kind == "target":
+                names = self.graph.affected(changed, targets=names, platforms=[])[0]
+            else:
+                names = self.graph.affected(changed, targets=[], platforms=names)[1]
+        if self.cache is not None:
+            names = [n for n in names if not self.cache.valid(kind, n, args)]
+        return names
+
+    def filter_targets(self, names, args=[]):
+        return self._filter("target", names, args)
+
+    def filter_platforms(self, names, args=[]):
+        return self._filter("platform", names, args)
+
+    def passed(self, kind, name, args=[]):
+        """Record a successful elaboration in the outputs cache."""
+        if self.cache is not None:
+            self.cache.update(kind, name, args)
+            self.cache.save()
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Dependency-aware test selection.")
+    parser.add_argument("--root",   default=".",  help="Repository root.")
+    parser.add_argument("--since",  default=None, help="Git revision, select targets/platforms affected since.")
+    parser.add_argument("--files",  default=[],   nargs="+", help="Changed files (instead of --since).")
+    parser.add_argument("--deps",   default=None, help="Show dependencies of a target.")
+    args = parser.parse_args()
+
+    graph = DependencyGraph(args.root)
+    if args.deps is not None:
+        for dep in sorted(graph.target_deps(args.deps)):
+            print(dep)
+        return
+
+    changed = args.files if args.since is None else changed_files(args.since, args.root)
+    targets, platforms = graph.affected(changed)
+    print(f"Changed files: {len(changed)}.")
+    print(f"Targets   ({len(targets)}/{len(graph.targets())}): {' '.join(targets)}")
+    print(f"Platforms ({len(platforms)}/{len(graph.platforms())}): {' '.join(platforms)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Timestamping capture-to-userspace latency measurement.
+#
+# Host side of the --with-timestamping option (litex_boards.cores.timestamp): events are streamed
+# in fixed-size blocks over a LitePCIe DMA channel and read from its character device. For each
+# event, the board's Time-of-Day is latched through the LitePCIe driver register ioctl as soon as
+# the event is received in userspace: the difference with the event timestamp is the capture to
+# userspace latency, measured with the board's clock (it includes the latch register write, whose
+# duration is estimated and reported separately).
+#
+# Requires the driver generated with --driver --driver-low-latency (DMA_BUFFER_SIZE set to the
+# block size and DMA_BUFFER_PER_IRQ set to 1).
+#
+# Use:
+# ./timestamp_latency.py --csr-csv=csr.csv --events=1000        (Software triggered events).
+# ./timestamp_latency.py --csr-csv=csr.csv --events=10 --pps    (PPS In events).
+
+import struct
+import argparse
+
+from litex_boards.tools.common import LitePCIeDevice
+
+# Constants ----------------------------------------------------------------------------------------
+
+TIMESTAMP_CHANNEL_PPS_IN = 0
+TIMESTAMP_CHANNEL_SOFT   = 2
+TIMESTAMP_CHANNEL_NULL   = 0xff
+
+# Timestamping -------------------------------------------------------------------------------------
+
+def decode_events(block):
+    """Decode a block of 128-bit events, returns (channel, seq, ns) tuples (Null events skipped)."""
+    events = []
+    for i in range(0, len(block), 16):
+        lo, hi = struct.unpack("<QQ", block[i:i+16])
+        channel = lo & 0xff
+        if channel == TIMESTAMP_CHANNEL_NULL:
+            continue
+        seq  = (lo >> 8) & 0xffffff
+        sec  = (lo >> 32) | ((hi & 0xffff) << 32)
+        ns   = (hi >> 16) & 0xffffffff
+        frac = (hi >> 48)
+        events.append((channel, seq, sec*int(1e9) + ns + frac/2**16))
+    return events
+
+class Timestamping:
+    def __init__(self, dev, name="timestamping"):
+        self.dev  = dev
+        self.name = name
+
+    def now(self):
+        """Board's Time-of-Day in ns."""
+        self.dev.write(f"{self.name}_tod_time_latch", 1)
+        sec  = self.dev.read(f"{self.name}_tod_time_sec")
+        ns   = self.dev.read(f"{self.name}_tod_time_ns")
+        frac = self.dev.read(f"{self.name}_tod_time_frac")
+        return sec*int(1e9) + ns + frac/2**32
+
+    def trigger(self):
+        self.dev.write(f"{self.name}_capture_trigger", 1)
+
+    def register_access_time(self, n=100):
+        """Median duration of a register access (in ns), from back to back Time-of-Day reads."""
+        accesses = 1 + sum(self.dev.csrs[f"{self.name}_tod_time_{reg}"][1] for reg in ["sec", "ns", "frac"])
+        samples  = []
+        for _ in range(n):
+            t0 = self.now()
+            t1 = self.now()
+            samples.append((t1 - t0)/accesses)
+        return sorted(samples)[n//2]
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards Timestamping latency measurement.")
+    parser.add_argument("--device",     default="/dev/litepcie1",  help="LitePCIe DMA channel device.")
+    parser.add_argument("--csr-csv",    default="csr.csv",         help="SoC CSR configuration file.")
+    parser.add_argument("--name",       default="timestamping",    help="Timestamping name in the SoC.")
+    parser.add_argument("--events",     default=1000, type=int,    help="Number of events to measure.")
+    parser.add_argument("--block-size", default=256, type=int,     help="DMA block size (TIMESTAMPING_BLOCK_SIZE).")
+    parser.add_argument("--pps",        action="store_true",       help="Measure PPS In events instead of software triggers.")
+    args = parser.parse_args()
+
+    dev = LitePCIeDevice(args.device, args.csr_csv)
+    ts  = Timestamping(dev, name=args.name)
+    ts.now() # Warm-up.
+    channel = TIMESTAMP_CHANNEL_PPS_IN if args.pps else TIMESTAMP_CHANNEL_SOFT
+    print(f"Register access time: {ts.register_access_time()/1e3:.3f}us.")
+
+    dev.dma_writer(1)
+    latencies = []
+    lost      = 0
+    last_seq  = None
+    try:
+        while len(latencies) < args.events:
+            if not args.pps:
+                ts.trigger()
+            block = dev.dma_read(args.block_size)
+            now   = ts.now()
+            for _channel, seq, timestamp in decode_events(block):
+                if last_seq is not None:
+                    lost += (seq - last_seq - 1) % 2**24
+                last_seq = seq
+                if _channel == channel:
+                    latencies.append(now - timestamp)
+    finally:
+        dev.dma_writer(0)
+        dev.close()
+
+    latencies.sort()
+    n = len(latencies)
+    print(f"{n} events ({lost} lost), capture to userspace latency:")
+    print(f"min: {latencies[0]/1e3:.3f}us, median: {latencies[n//2]/1e3:.3f}us, "
+          f"p99: {latencies[int(n*0.99)]/1e3:.3f}us, max: {latencies[-1]/1e3:.3f}us.")
+
+if __name__ == "__main__":
+    main()
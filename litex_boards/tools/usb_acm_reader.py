@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# USB-ACM bulk reader.
+#
+# Host side of the --with-usb-acm-fifo option (litex_boards.cores.usb_acm):
+# - Bridge mode: dumps memory with 255-word UARTBone bursts, keeping several requests in flight so
+#   that the USB link never idles between bursts.
+# - DMA mode: configures the streamer's DMA reader through the bridge, switches the streamer to DMA
+#   mode and captures the raw stream (the board stays in DMA mode until reset or switched back by
+#   firmware).
+#
+# The streamer must be in Bridge mode for dump/capture: build with --usb-acm-mode=bridge or switch
+# from firmware with <name>_streamer_mode_write(2).
+#
+# Use:
+# ./gsd_orangecrab.py --with-usb-acm-fifo --usb-acm-mode=bridge --csr-csv=csr.csv --build --load
+# ./usb_acm_reader.py --port=/dev/ttyACM0 --csr-csv=csr.csv dump 0x40000000 0x100000 --output=dump.bin
+# ./usb_acm_reader.py --port=/dev/ttyACM0 --csr-csv=csr.csv capture 0x40000000 0x100000
+# ./usb_acm_reader.py --port=/dev/ttyACM0 raw 0x100000 (Firmware already in DMA mode).
+
+import time
+import argparse
+
+from litex_boards.tools.common import read_csr_csv
+
+# Constants ----------------------------------------------------------------------------------------
+
+CMD_WRITE_BURST_INCR = 0x01
+CMD_READ_BURST_INCR  = 0x02
+
+USB_ACM_MODE_CONSOLE = 0
+USB_ACM_MODE_DMA     = 1
+USB_ACM_MODE_BRIDGE  = 2
+
+MAX_BURST = 255 # In 32-bit words.
+
+# USB-ACM Reader -----------------------------------------------------------------------------------
+
+class USBACMReader:
+    def __init__(self, port, burst=MAX_BURST, pipeline=4, addr_width=32):
+        assert 1 <= burst <= MAX_BURST
+        self.port       = port
+        self.burst      = burst
+        self.pipeline   = pipeline
+        self.addr_bytes = addr_width//8
+
+    def _read(self, length):
+        data = bytearray()
+        while len(data) < length:
+            chunk = self.port.read(length - len(data))
+            if not chunk:
+                raise TimeoutError(f"Timeout, {len(data)}/{length} bytes received.")
+            data += chunk
+        return bytes(data)
+
+    def _read_request(self, addr, length):
+        return bytes([CMD_READ_BURST_INCR, length]) + (addr//4).to_bytes(self.addr_bytes, "big")
+
+    def read_words(self, addr, length):
+        """Read length 32-bit words at addr, returns their bytes in memory (little-endian) order."""
+        assert addr % 4 == 0
+        bursts = []
+        while length:
+            n = min(length, self.burst)
+            bursts.append((addr, n))
+            addr   += 4*n
+            length -= n
+
+        # Keep up to pipeline requests in flight, responses come back in order.
+        data = bytearray()
+        sent = 0
+        for _ in range(min(self.pipeline, len(bursts))):
+            self.port.write(self._read_request(*bursts[sent]))
+            sent += 1
+        for i, (_, n) in enumerate(bursts):
+            response = self._read(4*n)
+            if sent < len(bursts):
+                self.port.write(self._read_request(*bursts[sent]))
+                sent += 1
+            # UARTBone returns big-endian words, swap to memory order.
+            for j in range(0, len(response), 4):
+                data += response[j:j+4][::-1]
+        return bytes(data)
+
+    def read(self, addr, length):
+        """Read length bytes at addr."""
+        offset = addr % 4
+        nwords = (offset + length + 3)//4
+        data   = self.read_words(addr - offset, nwords)
+        return data[offset:offset + length]
+
+    def write_word(self, addr, value):
+        self.port.write(bytes([CMD_WRITE_BURST_INCR, 1]) +
+            (addr//4).to_bytes(self.addr_bytes, "big") +
+            value.to_bytes(4, "big"))
+
+    def write_csr(self, addr, value, nbits=32, csr_data_width=32):
+        # CSRs wider than the CSR data width are split MSB first.
+        nwords = (nbits + csr_data_width - 1)//csr_data_width
+        for i in range(nwords):
+            shift = csr_data_width*(nwords - 1 - i)
+            self.write_word(addr + 4*i, (value >> shift) & (2**csr_data_width - 1))
+
+    def capture(self, length):
+        """Capture length bytes of raw stream (DMA mode)."""
+        return self._read(length)
+
+# CSR Helpers --------------------------------------------------------------------------------------
+
+def dma_capture(reader, csr_csv, name, addr, length):
+    csrs, csr_data_width = read_csr_csv(csr_csv)
+    def write(reg, value):
+        reg_addr, nwords = csrs[f"{name}_streamer_{reg}"]
+        reader.write_csr(reg_addr, value, nbits=nwords*csr_data_width, csr_data_width=csr_data_width)
+    write("dma_reader_enable", 0)
+    write("dma_reader_base",   addr)
+    write("dma_reader_length", length)
+    write("dma_reader_loop",   0)
+    write("dma_reader_enable", 1)
+    write("mode",              USB_ACM_MODE_DMA)
+    return reader.capture(length)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards USB-ACM bulk reader.")
+    parser.add_argument("--port",     default="/dev/ttyACM0",   help="USB-ACM serial port.")
+    parser.add_argument("--csr-csv",  default="csr.csv",        help="SoC CSR configuration file.")
+    parser.add_argument("--name",     default="uart",           help="USB-ACM UART name in the SoC.")
+    parser.add_argument("--pipeline", default=4, type=int,      help="Number of bursts in flight.")
+    parser.add_argument("--timeout",  default=2.0, type=float,  help="Serial timeout (s).")
+    parser.add_argument("--output",   default=None,             help="Output file.")
+    parser.add_argument("mode",       choices=["dump", "capture", "raw"], help="Dump (Bridge), capture (DMA) or raw capture.")
+    parser.add_argument("args",       nargs="+",                help="dump/capture: address length, raw: length.")
+    args = parser.parse_args()
+
+    import serial
+    port   = serial.serial_for_url(args.port, timeout=args.timeout)
+    reader = USBACMReader(port, pipeline=args.pipeline)
+    port.reset_input_buffer()
+
+    start = time.time()
+    if args.mode == "dump":
+        addr, length = [int(a, 0) for a in args.args]
+        data = reader.read(addr, length)
+    elif args.mode == "capture":
+        addr, length = [int(a, 0) for a in args.args]
+        data = dma_capture(reader, args.csr_csv, args.name, addr, length)
+    else:
+        length = int(args.args[0], 0)
+        data   = reader.capture(length)
+    duration = time.time() - start
+
+    print(f"{len(data)} bytes in {duration:.3f}s: {len(data)/duration/1e6:.3f} MB/s.")
+    if args.output is not None:
+        with open(args.output, "wb") as f:
+            f.write(data)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+# USB bridge bulk reader/benchmark.
+#
+# Host side of litex_boards.cores.usb_bridge (ex lambdaconcept_pcie_screamer target): reads the
+# FT601 IN pipe with large bulk transfers, parses the frames and reports per channel MB/s, packets/s
+# and drops (packets dropped by the gateware are flagged on the next frame of the channel).
+#
+# --device=loopback replaces the FT601 with a software stand-in generating frames (tool/host
+# throughput and parser test without hardware). With --csr-csv, the gateware counters are read
+# through litex_server at the end of the run.
+#
+# Use:
+# ./usb_bridge.py --duration=10
+# ./usb_bridge.py --duration=10 --output=capture.bin (Raw capture).
+# ./usb_bridge.py --device=loopback --duration=5
+# ./usb_bridge.py --csr-csv=csr.csv --duration=10 (with litex_server running).
+
+import time
+import random
+import argparse
+
+# Frame Format -------------------------------------------------------------------------------------
+
+FRAME_MAGIC = 0xa5 # Must match litex_boards.cores.usb_bridge.
+
+def frame_header(channel, length, dropped=False):
+    return (FRAME_MAGIC << 24) | (channel << 20) | (int(dropped) << 16) | length
+
+def build_frame(channel, payload, timestamp=0, dropped=False):
+    """Build a frame from payload (bytes, multiple of 4)."""
+    assert len(payload) % 4 == 0
+    header = frame_header(channel, len(payload)//4, dropped)
+    return header.to_bytes(4, "little") + (timestamp & 0xffffffff).to_bytes(4, "little") + payload
+
+# Frame Parser -------------------------------------------------------------------------------------
+
+class Frame:
+    def __init__(self, channel, timestamp, payload, dropped):
+        self.channel   = channel
+        self.timestamp = timestamp
+        self.payload   = payload
+        self.dropped   = dropped
+
+class FrameParser:
+    """Incremental frame parser (Frames can span several USB transfers).
+
+    On an invalid header, the parser resynchronizes on the next word with a valid magic (the skipped
+    bytes are counted in resyncs/skipped).
+    """
+    def __init__(self):
+        self.buffer  = bytearray()
+        self.skipped = 0
+        self.resyncs = 0
+        self.synced  = True
+
+    def feed(self, data):
+        """Feed received bytes, returns the list of complete frames."""
+        self.buffer += data
+        frames = []
+        offset = 0
+        while len(self.buffer) - offset >= 8:
+            header = int.from_bytes(self.buffer[offset:offset+4], "little")
+            if (header >> 24) != FRAME_MAGIC:
+                if self.synced:
+                    self.resyncs += 1
+                    self.synced = False
+                self.skipped += 4
+                offset += 4
+                continue
+            self.synced = True
+            length = 4*(header & 0xffff)
+            if len(self.buffer) - offset < 8 + length:
+                break
+            frames.append(Frame(
+                channel   = (header >> 20) & 0xf,
+                timestamp = int.from_bytes(self.buffer[offset+4:offset+8], "little"),
+                payload   = bytes(self.buffer[offset+8:offset+8+length]),
+                dropped   = bool((header >> 16) & 0x1)))
+            offset += 8 + length
+        del self.buffer[:offset]
+        return frames
+
+# Statistics ---------------------------------------------------------------------------------------
+
+class ChannelStats:
+    def __init__(self):
+        self.frames   = 0
+        self.bytes    = 0
+        self.dropped  = 0 # Frames preceded by (at least one) dropped packet.
+
+    def update(self, frame):
+        self.frames  += 1
+        self.bytes   += len(frame.payload)
+        self.dropped += frame.dropped
+
+# Devices ------------------------------------------------------------------------------------------
+
+FT_OPEN_BY_INDEX = 0x10 # D3XX FT_Create flag.
+
+class FT601Device:
+    """FT601 IN pipe through FTDI's D3XX Python wrapper (ftd3xx)."""
+    def __init__(self, index=0, pipe=0x82, timeout=1000):
+        import ftd3xx
+        self.dev = ftd3xx.create(index, FT_OPEN_BY_INDEX)
+        if self.dev is None:
+            raise OSError(f"FT601 {index} not found.")
+        self.pipe = pipe
+        self.dev.setPipeTimeout(pipe, timeout)
+
+    def read(self, size):
+        result = self.dev.readPipeEx(self.pipe, size, raw=True)
+        return bytes(result["bytes"][:result["bytesTransferred"]])
+
+    def close(self):
+        self.dev.close()
+
+class LoopbackDevice:
+    """Software stand-in for the FT601: returns random frames (ex for the host side benchmark).
+
+    Frames are generated for nchannels channels (max_words payload words) with a drop flag every
+    drop_every frames and, if garbage, invalid words between frames (resynchronization test).
+    """
+    def __init__(self, nchannels=3, max_words=64, drop_every=0, garbage=False, seed=0):
+        self.rng        = random.Random(seed)
+        self.nchannels  = nchannels
+        self.max_words  = max_words
+        self.drop_every = drop_every
+        self.garbage    = garbage
+        self.pending    = bytearray()
+        self.sent       = []
+        self.timestamp  = 0
+
+    def _frame(self):
+        n        = len(self.sent)
+        channel  = self.rng.randrange(self.nchannels)
+        payload  = self.rng.randbytes(4*self.rng.randint(1, self.max_words))
+        dropped  = self.drop_every != 0 and (n % self.drop_every) == (self.drop_every - 1)
+        self.timestamp += self.rng.randint(1, 1000)
+        self.sent.append(Frame(channel, self.timestamp & 0xffffffff, payload, dropped))
+        frame = build_frame(channel, payload, self.timestamp, dropped)
+        if self.garbage and self.rng.random() < 0.1:
+            frame = bytes(4*self.rng.randint(1, 4)) + frame
+        return frame
+
+    def read(self, size):
+        while len(self.pending) < size:
+            self.pending += self._frame()
+        data = bytes(self.pending[:size])
+        del self.pending[:size]
+        return data
+
+    def close(self):
+        pass
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def benchmark(device, duration, transfer_size=1024*1024, output=None, verbose=True):
+    parser = FrameParser()
+    stats  = {}
+    total  = 0
+    start  = time.time()
+    last   = start
+    last_total = 0
+    while time.time() - start < duration:
+        data = device.read(transfer_size)
+        if output is not None:
+            output.write(data)
+        total += len(data)
+        for frame in parser.feed(data):
+            stats.setdefault(frame.channel, ChannelStats()).update(frame)
+        now = time.time()
+        if verbose and now - last >= 1.0:
+            print(f"{(total - last_total)/(now - last)/1e6:8.2f} MB/s")
+            last, last_total = now, total
+    elapsed = time.time() - start
+    return total, elapsed, stats, parser
+
+def print_report(total, elapsed, stats, parser):
+    print(f"Total: {total/1e6:.2f} MB in {elapsed:.2f}s: {total/elapsed/1e6:.2f} MB/s.")
+    print(f"{'Channel':>8} {'Frames':>12} {'Frames/s':>12} {'MB/s':>10} {'Drops':>8}")
+    for channel, s in sorted(stats.items()):
+        print(f"{channel:>8} {s.frames:>12} {s.frames/elapsed:>12.0f} {s.bytes/elapsed/1e6:>10.2f} {s.dropped:>8}")
+    if parser.resyncs:
+        print(f"Resyncs: {parser.resyncs} ({parser.skipped} bytes skipped).")
+
+def print_counters(csr_csv, name="usb_bridge"):
+    from litex import RemoteClient
+    bus = RemoteClient(csr_csv=csr_csv)
+    bus.open()
+    regs = bus.regs.__dict__
+    print(f"Gateware: words: {regs[f'{name}_words'].read()}, FIFO level max: {regs[f'{name}_level_max'].read()}.")
+    n = 0
+    while f"{name}_ch{n}_packets" in regs:
+        print(f"  ch{n}: packets: {regs[f'{name}_ch{n}_packets'].read()}, drops: {regs[f'{name}_ch{n}_drops'].read()}.")
+        n += 1
+    bus.close()
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="USB bridge bulk reader/benchmark.")
+    parser.add_argument("--device",        default="ft601",      help="Device: ft601 or loopback.")
+    parser.add_argument("--index",         default=0,            type=int,   help="FT601 index.")
+    parser.add_argument("--duration",      default=10.0,         type=float, help="Duration (s).")
+    parser.add_argument("--transfer-size", default=1024*1024,    type=int,   help="Bulk transfer size (bytes).")
+    parser.add_argument("--output",        default=None,         help="Raw capture file.")
+    parser.add_argument("--csr-csv",       default=None,         help="CSR file, read gateware counters through litex_server.")
+    args = parser.parse_args()
+
+    if args.device == "loopback":
+        device = LoopbackDevice()
+    else:
+        device = FT601Device(index=args.index)
+    output = open(args.output, "wb") if args.output is not None else None
+    try:
+        print_report(*benchmark(device, args.duration, args.transfer_size, output))
+    finally:
+        device.close()
+        if output is not None:
+            output.close()
+    if args.csr_csv is not None:
+        print_counters(args.csr_csv)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.banked_ram import BankedRAM
+
+class TestBankedRAM(unittest.TestCase):
+    def run_ports(self, interleaved, offsets):
+        # Two ports writing then reading back 16 words each (at word offsets), returns the read
+        # values, and the conflicts of each port.
+        banks = [wishbone.SRAM(1024) for _ in range(2)]
+        dut   = BankedRAM(banks, bank_size=1024, interleaved=interleaved)
+        ports = [dut.add_port("cpu"), dut.add_port("dma")]
+        results   = [[], []]
+        conflicts = [0, 0]
+
+        def master(n):
+            for i in range(16):
+                yield from ports[n].write(offsets[n] + i, 0x1000*n + i)
+            for i in range(16):
+                results[n].append((yield from ports[n].read(offsets[n] + i)))
+            conflicts[n] = (yield dut.counters[n][1].status)
+
+        run_simulation(dut, [master(0), master(1)])
+        return results, conflicts
+
+    def test_data(self):
+        for interleaved in [False, True]:
+            results, _ = self.run_ports(interleaved, offsets=[0, 256])
+            self.assertEqual(results[0], [i for i in range(16)])
+            self.assertEqual(results[1], [0x1000 + i for i in range(16)])
+
+    def test_conflicts(self):
+        # Linear: ports in different banks never conflict, in the same bank they do.
+        _, conflicts = self.run_ports(interleaved=False, offsets=[0, 256])
+        self.assertEqual(conflicts, [0, 0])
+        _, conflicts = self.run_ports(interleaved=False, offsets=[0, 16])
+        self.assertGreater(sum(conflicts), 0)
@@ -0,0 +1,100 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import time
+import tempfile
+import textwrap
+import threading
+import unittest
+
+from litex_boards.tools.build_server import BuildJob, BuildServer, BuildClient
+
+# Minimal target: writes its arguments to <output-dir>/gateware/top.v and leaks module state.
+target_py = """
+import os
+import sys
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output-dir")
+    parser.add_argument("--fail", action="store_true")
+    args, extra = parser.parse_known_args()
+    leaked = getattr(sys, "_build_server_leak", 0)
+    sys._build_server_leak = leaked + 1
+    print("building", extra)
+    if args.fail:
+        raise ValueError("Build failed.")
+    os.makedirs(os.path.join(args.output_dir, "gateware"), exist_ok=True)
+    with open(os.path.join(args.output_dir, "gateware", "top.v"), "w") as f:
+        f.write(f"{extra} {leaked}")
+"""
+
+class TestBuildServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp.name, "fake_targets"))
+        open(os.path.join(self.tmp.name, "fake_targets", "__init__.py"), "w").close()
+        with open(os.path.join(self.tmp.name, "fake_targets", "fake_target.py"), "w") as f:
+            f.write(target_py)
+        sys.path.insert(0, self.tmp.name)
+
+    def tearDown(self):
+        sys.path.remove(self.tmp.name)
+        self.tmp.cleanup()
+
+    def job(self, name, args=None):
+        return BuildJob("fake_targets.fake_target", args, name=name,
+            output_dir=os.path.join(self.tmp.name, name))
+
+    def check_results(self, results):
+        self.assertEqual([r.success for r in results], [True, False, True])
+        self.assertEqual(results[0].artifacts, [os.path.join("gateware", "top.v")])
+        self.assertIn("ValueError: Build failed.", results[1].error)
+        self.assertIn("building", results[1].log)
+        self.assertIn("main", results[0].timings)
+        # Each build starts from a clean interpreter state (no leak from previous builds).
+        with open(os.path.join(self.tmp.name, "c", "gateware", "top.v")) as f:
+            self.assertEqual(f.read(), "['--x=3'] 0")
+        self.assertFalse(hasattr(sys, "_build_server_leak"))
+        self.assertNotIn("fake_targets.fake_target", sys.modules)
+
+    def test_run_jobs(self):
+        server  = BuildServer(preload=[], jobs=2)
+        results = server.run_jobs([
+            self.job("a", ["--x=1"]),
+            self.job("b", ["--fail"]),
+            self.job("c", ["--x=3"]),
+        ])
+        self.check_results(results)
+
+    def test_client(self):
+        address = os.path.join(self.tmp.name, "server.sock")
+        server  = BuildServer(preload=[])
+        thread  = threading.Thread(target=server.serve, args=(address,))
+        thread.start()
+        for _ in range(100):
+            if os.path.exists(address):
+                break
+            time.sleep(0.01)
+        client  = BuildClient(address)
+        results = client.run_jobs([
+            self.job("a", ["--x=1"]),
+            self.job("b", ["--fail"]),
+            self.job("c", ["--x=3"]),
+        ])
+        client.shutdown()
+        thread.join()
+        self.check_results(results)
+
+    def test_tcp_requires_authkey(self):
+        server = BuildServer(preload=[])
+        with self.assertRaises(ValueError):
+            server.serve(("127.0.0.1", 0))
+
+if __name__ == "__main__":
+    unittest.main()
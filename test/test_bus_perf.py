@@ -0,0 +1,46 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.soc.interconnect import axi
+
+from litex_boards.cores.bus_perf import BusPerf
+
+class TestBusPerf(unittest.TestCase):
+    def test_axi_simultaneous_aw_ar(self):
+        bus = axi.AXIInterface(data_width=32, address_width=32, id_width=1)
+        dut = BusPerf()
+        dut.add_monitor("axi", bus)
+        results = {}
+
+        def generator():
+            yield dut.clear.re.eq(1)
+            yield
+            yield dut.clear.re.eq(0)
+            # 8 cycles with simultaneous AW/AR handshakes, then 4 with AR only.
+            for aw in [1]*8 + [0]*4:
+                yield bus.aw.valid.eq(aw)
+                yield bus.aw.ready.eq(1)
+                yield bus.ar.valid.eq(1)
+                yield bus.ar.ready.eq(1)
+                yield
+            yield bus.aw.valid.eq(0)
+            yield bus.ar.valid.eq(0)
+            yield dut.snapshot.re.eq(1)
+            yield
+            yield dut.snapshot.re.eq(0)
+            yield
+            results["transactions"] = (yield dut.axi.transactions.status)
+            results["cycles"]       = (yield dut.cycles.status)
+
+        run_simulation(dut, generator())
+        self.assertEqual(results["transactions"], 2*8 + 4)
+        self.assertEqual(results["cycles"], 8 + 4)
+
+if __name__ == "__main__":
+    unittest.main()
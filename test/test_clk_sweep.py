@@ -0,0 +1,112 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+from types import SimpleNamespace
+
+from litex_boards.tools.clk_sweep import DRP_CLKOUT, DRP_CLKFBOUT, DRP_DIVCLK
+from litex_boards.tools.clk_sweep import drp_counter, drp_divide, drp_divclk_divide, drp_phase
+from litex_boards.tools.clk_sweep import counter_entries, divclk_entries, lock_filter_entries
+from litex_boards.tools.clk_sweep import ClockReconfig
+
+def apply_entries(config, entries):
+    config = dict(config)
+    for adr, mask, data in entries:
+        config[adr] = (config.get(adr, 0) & mask) | data
+    return config
+
+class FakeDRPBus:
+    """Bus of a XilinxClockReconfig (CSRs/constants), DRP registers in a dict."""
+    def __init__(self, drp, constants, name="crg_clk_reconfig"):
+        self.drp       = drp
+        self.constants = SimpleNamespace(**{f"{name}_{k}": v for k, v in constants.items()})
+        self.values    = {}
+        self.regs      = SimpleNamespace(**{f"{name}_{k}": self._reg(k)
+            for k in ["status", "read_adr", "read", "read_data"]})
+
+    def _reg(self, name):
+        def write(value):
+            self.values[name] = value
+            if name == "read":
+                self.values["read_data"] = self.drp[self.values["read_adr"]]
+        return SimpleNamespace(read=lambda: self.values.get(name, 0), write=write)
+
+# Arty like configuration: 100MHz input, VCO 1600MHz, sys 100MHz, eth 25MHz, sys4x 400MHz, sys4x_dqs
+# 400MHz/90°, idelay 200MHz.
+CLKOUTS = [(16, 0), (64, 0), (4, 0), (4, 90), (8, 0)]
+
+def arty_drp(mult=16):
+    config = apply_entries({}, divclk_entries(1))
+    config = apply_entries(config, counter_entries(DRP_CLKFBOUT, mult, 0, 0, mult))
+    for n, (divide, phase) in enumerate(CLKOUTS):
+        # Phase in 1/8 VCO periods (as set by Vivado).
+        ticks  = round(phase/360*divide*8)
+        config = apply_entries(config, counter_entries(DRP_CLKOUT[n], divide, (ticks%8) << 13, ticks//8, divide))
+    return apply_entries(config, lock_filter_entries("PLLE2", mult))
+
+def arty_constants():
+    constants = {"clkin_freq": 100e6, "vco_min": 800e6, "vco_max": 1600e6, "mult_min": 2,
+        "mult_max": 64, "div_max": 56, "pfd_min": 19e6, "sys_clkout": 0, "primitive": 1}
+    for n, freq in enumerate([100e6, 25e6, 400e6, 400e6, 200e6]):
+        constants[f"clkout{n}_freq"]  = freq
+        constants[f"clkout{n}_fixed"] = int(n in [1, 4])
+    return constants
+
+def phase_degrees(config, n):
+    reg1, reg2 = config[DRP_CLKOUT[n][0]], config[DRP_CLKOUT[n][1]]
+    return drp_phase(reg1, reg2)/8/drp_divide(reg1, reg2)*360
+
+class TestClkSweep(unittest.TestCase):
+    def test_counters(self):
+        for divide in [1, 2, 5, 16, 64, 128]:
+            config = apply_entries({}, counter_entries(DRP_CLKOUT[1], divide, 0, 0, divide))
+            self.assertEqual(drp_divide(*[config[a] for a in DRP_CLKOUT[1]]), divide)
+            config = apply_entries({}, divclk_entries(divide))
+            self.assertEqual(drp_divclk_divide(config[DRP_DIVCLK]), divide)
+        self.assertEqual(drp_counter(7), (3, 4, 1, 0))
+
+    def test_phase_rescaled(self):
+        # 90° at divide 4 (8 ticks) stays 90° at divide 6 (12 ticks: DELAY_TIME 1, PHASE_MUX 4).
+        entries = counter_entries(DRP_CLKOUT[3], 6, 0x0000, 0x0001, 4)
+        config  = apply_entries({}, entries)
+        self.assertEqual(drp_phase(config[DRP_CLKOUT[3][0]], config[DRP_CLKOUT[3][1]]), 12)
+        self.assertEqual(phase_degrees(config, 3), 90)
+
+    def test_lock_filter(self):
+        # LOCK (XAPP888): LockRefDly/LockFBDly 31, LockCnt 625, LockSatHigh 1001, UnlockCnt 1 at mult 16.
+        config = apply_entries({}, lock_filter_entries("PLLE2", 16))
+        self.assertEqual(config[0x18], 625)
+        self.assertEqual(config[0x19], (31 << 10) | 1)
+        self.assertEqual(config[0x1a], (31 << 10) | 1001)
+        # Reserved bits of the FILTER registers are kept.
+        for adr, mask, data in lock_filter_entries("MMCME2", 40):
+            self.assertEqual(data & mask, 0)
+
+    def test_compute(self):
+        bus = FakeDRPBus(arty_drp(), arty_constants())
+        clk = ClockReconfig(bus)
+        self.assertTrue(clk.tables)
+        self.assertEqual(clk.vco_freq(), 1600e6)
+        entries, vco = clk.compute(125e6)
+        config = apply_entries(clk.nominal, entries)
+        mult   = int(clk.clkfbout_mult(config))
+        self.assertEqual(vco/clk.clkout_divide(0, config), 125e6)
+        # Scaled outputs keep their ratio and phase (in degrees), fixed outputs stay close.
+        self.assertEqual(clk.clkout_divide(0, config), 4*clk.clkout_divide(2, config))
+        self.assertEqual(phase_degrees(config, 3), 90)
+        self.assertAlmostEqual(vco/clk.clkout_divide(4, config)/200e6, 1, delta=0.1)
+        # LOCK/FILTER of the new multiplier.
+        self.assertEqual(config, apply_entries(config, lock_filter_entries("PLLE2", mult)))
+
+    def test_tables_mismatch(self):
+        drp = arty_drp()
+        drp[0x4e] ^= 0x0100
+        clk = ClockReconfig(FakeDRPBus(drp, arty_constants()))
+        self.assertFalse(clk.tables)
+        entries, _ = clk.compute(125e6)
+        self.assertNotIn(0x4e, [adr for adr, _, _ in entries])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import json
+import time
+import tempfile
+import unittest
+
+from litex_boards.tools.cpu_bench import parse_results, save_results, format_table
+from litex_boards.tools.cpu_bench import coremark_iterations, read_clk_freq
+from litex_boards.tools.cpu_bench import stream_readline, read_output
+
+OUTPUT = [
+    "BENCH start",
+    "BENCH cpu=VexRiscv",
+    "BENCH clk_freq=100000000",
+    "BENCH main_ram=DDR x16",
+    "BENCH main_ram_write_bps=200000000",
+    "BENCH main_ram_latency_ns=120",
+    "2K performance run parameters for coremark.",
+    "BENCH coremark_iterations=5000",
+    "BENCH coremark_cycles=1000000000",
+    "BENCH coremark_per_mhz_x1000=2150",
+    "BENCH done",
+]
+
+class TestCPUBench(unittest.TestCase):
+    def test_parse_results(self):
+        results = parse_results(OUTPUT)
+        self.assertEqual(results["cpu"], "VexRiscv")
+        self.assertEqual(results["main_ram"], "DDR x16")
+        self.assertEqual(results["main_ram_write_bps"], 200000000)
+        self.assertEqual(results["coremark_valid"], 1)
+        self.assertNotIn("errors", results)
+        # Any CoreMark error invalidates the result.
+        for error in [
+            "ERROR! list crc 0x1234 - should be 0xe714",
+            "ERROR! Must execute for at least 10 secs for a valid result!",
+            "ERROR! ee_u32 must be 32-bit!"]:
+            results = parse_results(OUTPUT[:-1] + [error, OUTPUT[-1]])
+            self.assertEqual(results["coremark_valid"], 0)
+            self.assertEqual(results["errors"], 1)
+        # Without CoreMark.
+        self.assertNotIn("coremark_valid", parse_results(OUTPUT[:6]))
+        # Simulation: too short runs accepted, other errors still invalidate the result.
+        short = "ERROR! Must execute for at least 10 secs for a valid result!"
+        results = parse_results(OUTPUT[:-1] + [short, OUTPUT[-1]], sim=True)
+        self.assertEqual(results["sim"], 1)
+        self.assertEqual(results["coremark_valid"], 1)
+        self.assertNotIn("errors", results)
+        results = parse_results(OUTPUT[:-1] + [short, "ERROR! list crc", OUTPUT[-1]], sim=True)
+        self.assertEqual(results["coremark_valid"], 0)
+        self.assertEqual(results["errors"], 1)
+
+    def test_format_table(self):
+        entries = [
+            {"target": "digilent_arty", "label": "full", "results": parse_results(OUTPUT)},
+            {"target": "digilent_arty", "label": "lite", "results": parse_results(OUTPUT + ["ERROR! list crc"])},
+            {"target": "digilent_arty", "label": "sim",  "results": parse_results(OUTPUT, sim=True)},
+        ]
+        lines = format_table(entries).split("\n")
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(len(set(len(line) for line in lines)), 1)
+        cells = [cell.strip() for cell in lines[2].split("|")[1:-1]]
+        self.assertEqual(cells[:8], ["digilent_arty", "full", "VexRiscv", "100.00", "-", "DDR x16", "200.00", "-"])
+        self.assertEqual(cells[-1], "2.15")
+        self.assertTrue(lines[3].rstrip(" |").endswith("2.15 (invalid)"))
+        self.assertTrue(lines[4].rstrip(" |").endswith("2.15 (sim)"))
+
+    def test_save_results(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "bench.json")
+            save_results(filename, "digilent_arty", "full", {"cpu": "VexRiscv"})
+            save_results(filename, "digilent_arty", "lite", {"cpu": "VexRiscv"})
+            # Same target/configuration: replaced.
+            save_results(filename, "digilent_arty", "full", {"cpu": "NaxRiscv"})
+            with open(filename) as f:
+                entries = json.load(f)
+            self.assertEqual([(e["label"], e["results"]["cpu"]) for e in entries],
+                [("lite", "VexRiscv"), ("full", "NaxRiscv")])
+
+    def test_coremark_iterations(self):
+        # At least 10s at the maximum CoreMark/MHz.
+        for clk_freq in [12e6, 50e6, 100e6, 125e6]:
+            iterations = coremark_iterations(clk_freq)
+            self.assertGreaterEqual(iterations/(5.0*clk_freq/1e6), 10)
+        self.assertEqual(coremark_iterations(100e6), 5000)
+        with tempfile.TemporaryDirectory() as tmp:
+            generated = os.path.join(tmp, "software", "include", "generated")
+            os.makedirs(generated)
+            with open(os.path.join(generated, "soc.h"), "w") as f:
+                f.write("#define CONFIG_CLOCK_FREQUENCY 60000000\n#define CONFIG_CPU_RESET_ADDR 0\n")
+            self.assertEqual(read_clk_freq(tmp), 60000000)
+
+    def test_read_output(self):
+        r, w = os.pipe()
+        with os.fdopen(r, "r") as stream, os.fdopen(w, "w") as output:
+            readline = stream_readline(stream, poll=0.01)
+            self.assertIsNone(readline())
+            # Timeout enforced while nothing is received.
+            start = time.time()
+            with self.assertRaises(TimeoutError):
+                read_output(readline, timeout=0.2)
+            self.assertLess(time.time() - start, 5)
+            output.write("\n".join(OUTPUT[:3]) + "\r\n")
+            output.flush()
+            output.write("\n".join(OUTPUT[3:]) + "\n")
+            output.flush()
+            self.assertEqual(read_output(readline, timeout=5), OUTPUT)
+            output.close()
+            with self.assertRaises(EOFError):
+                while True:
+                    readline()
+
+if __name__ == "__main__":
+    unittest.main()
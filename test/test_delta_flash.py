@@ -0,0 +1,148 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import re
+import tempfile
+import unittest
+
+from litex.build.openocd import OpenOCD
+
+from litex_boards.tools.delta_flash import FileFlash, DeltaFlasher, DeltaFlashError, get_changed_runs
+
+kB = 1024
+
+class NoReadbackFlash:
+    """Programmer without readback support."""
+    def __init__(self, flash):
+        self.flash_file = flash
+
+    def flash(self, address, data_file):
+        self.flash_file.flash(address, data_file)
+
+class FakeOpenOCD(OpenOCD):
+    """OpenOCD programmer running the JTAGSPI scripts on a FileFlash."""
+    def __init__(self, flash):
+        OpenOCD.__init__(self, "board.cfg", flash_proxy_basename="bscan_spi.bit")
+        self.flash_file = flash
+        self.scripts    = []
+
+    def find_config(self):
+        return "board.cfg"
+
+    def find_flash_proxy(self):
+        return "bscan_spi.bit"
+
+    def call(self, command):
+        script = command[command.index("-c") + 1]
+        self.scripts.append(script)
+        for cmd in script.split("; "):
+            m = re.match(r"jtagspi_program {(.*)} (0x[0-9a-f]+)", cmd)
+            if m:
+                self.flash_file.flash(int(m.group(2), 0), m.group(1))
+            m = re.match(r"flash read_bank 0 {(.*)} (0x[0-9a-f]+) (0x[0-9a-f]+)", cmd)
+            if m:
+                with open(m.group(1), "wb") as f:
+                    f.write(self.flash_file.read(int(m.group(2), 0), int(m.group(3), 0)))
+
+class TestDeltaFlash(unittest.TestCase):
+    sector_size = 4*kB
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.flash  = FileFlash(self.path("flash.img"), size=256*kB, sector_size=self.sector_size)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def write_image(self, data):
+        filename = self.path("image.bin")
+        with open(filename, "wb") as f:
+            f.write(data)
+        return filename
+
+    def flasher(self):
+        return DeltaFlasher(self.flash, "test", manifest_dir=self.path("manifests"), sector_size=self.sector_size)
+
+    def test_changed_runs(self):
+        self.assertEqual(get_changed_runs([1, 2, 3, 4], [1, 0, 0, 4, 5]), [(1, 2), (4, 1)])
+        self.assertEqual(get_changed_runs([1, 2, 3, 4], [0, 2, 0, 4], merge_gap=1), [(0, 3)])
+
+    def test_full_then_delta(self):
+        data = bytearray(os.urandom(40*kB))
+        regions = self.flasher().flash(0, self.write_image(data))
+        self.assertEqual(regions, [(0, len(data))])
+
+        # Unchanged image: nothing to program.
+        self.assertEqual(self.flasher().flash(0, self.write_image(data)), [])
+
+        # Change a single byte: only its sector is reprogrammed.
+        data[5*self.sector_size + 10] ^= 0xff
+        regions = self.flasher().flash(0, self.write_image(data))
+        self.assertEqual(regions, [(5*self.sector_size, self.sector_size)])
+        self.assertEqual(self.flash.read(0, len(data)), bytes(data))
+
+    def test_force(self):
+        data = os.urandom(8*kB)
+        self.flasher().flash(0, self.write_image(data))
+        regions = self.flasher().flash(0, self.write_image(data), force=True)
+        self.assertEqual(regions, [(0, len(data))])
+
+    def test_verify_whole_image(self):
+        data = bytearray(os.urandom(16*kB))
+        self.flasher().flash(0, self.write_image(data))
+
+        # Flash modified behind the manifest: the delta programming skips the sector, the whole image
+        # verification catches it and the manifest is invalidated.
+        with open(self.flash.filename, "r+b") as f:
+            f.seek(2*self.sector_size)
+            f.write(b"\x00")
+        data[10] ^= 0xff
+        with self.assertRaises(DeltaFlashError):
+            self.flasher().flash(0, self.write_image(data))
+        self.assertFalse(os.path.exists(self.flasher().manifest_filename))
+
+        # Next programming is a full one.
+        regions = self.flasher().flash(0, self.write_image(data))
+        self.assertEqual(regions, [(0, len(data))])
+        self.assertEqual(self.flash.read(0, len(data)), bytes(data))
+
+    def test_no_readback(self):
+        data    = os.urandom(8*kB)
+        flasher = DeltaFlasher(NoReadbackFlash(self.flash), "test",
+            manifest_dir = self.path("manifests"),
+            sector_size  = self.sector_size)
+        with self.assertRaises(DeltaFlashError):
+            flasher.flash(0, self.write_image(data))
+        self.assertEqual(self.flash.writes, [])
+        self.assertFalse(os.path.exists(flasher.manifest_filename))
+
+        # Explicitly unverified.
+        flasher.verify = False
+        self.assertEqual(flasher.flash(0, self.write_image(data)), [(0, len(data))])
+
+    def test_openocd(self):
+        prog    = FakeOpenOCD(self.flash)
+        flasher = DeltaFlasher(prog, "test", manifest_dir=self.path("manifests"), sector_size=self.sector_size)
+        data    = bytearray(os.urandom(40*kB))
+        flasher.flash(0, self.write_image(data))
+
+        # Two changed runs: programmed in a single session, FPGA reloaded once at the end.
+        data[1*self.sector_size] ^= 0xff
+        data[7*self.sector_size] ^= 0xff
+        prog.scripts = []
+        regions = flasher.flash(0, self.write_image(data))
+        self.assertEqual(regions, [(1*self.sector_size, self.sector_size), (7*self.sector_size, self.sector_size)])
+        self.assertEqual(len(prog.scripts), 2)
+        program, readback = [script.split("; ") for script in prog.scripts]
+        self.assertEqual(len([cmd for cmd in program if cmd.startswith("jtagspi_program")]), 2)
+        self.assertEqual(program[-2:], ["fpga_program", "exit"])
+        self.assertEqual(program.count("fpga_program"), 1)
+        # Readback also reloads the user design.
+        self.assertEqual(readback[-2:], ["fpga_program", "exit"])
+        self.assertEqual(self.flash.read(0, len(data)), bytes(data))
@@ -0,0 +1,124 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+
+from litex_boards.tools.etherbone_map import encode_packet, encode_record, decode_packet
+from litex_boards.tools.etherbone_map import EtherboneUDP, RemoteMemory, LoopbackServer
+
+CSR_CSV = """#--------------------------------------------------------------------------------
+# Auto-generated by LiteX
+#--------------------------------------------------------------------------------
+csr_base,ctrl,0xf0000000,,
+csr_register,ctrl_scratch,0xf0000004,1,rw
+csr_register,timer0_value,0xf0000800,2,ro
+constant,config_csr_data_width,32,,
+memory_region,sram,0x10000000,8192,cached
+"""
+
+class TestEtherboneMap(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csr_csv = os.path.join(self.tmp.name, "csr.csv")
+        with open(self.csr_csv, "w") as f:
+            f.write(CSR_CSV)
+        self.server = LoopbackServer()
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def memory(self, **kwargs):
+        transport = EtherboneUDP(*self.server.address, local_port=0, **kwargs)
+        memory    = RemoteMemory(transport, self.csr_csv)
+        memory.open()
+        self.addCleanup(memory.close)
+        return memory
+
+    def test_encoding(self):
+        # Same encoding than LiteX's litex.tools.remote.etherbone.
+        packet = encode_packet([
+            encode_record(reads=(7, [0x10, 0x14])),
+            encode_record(writes=(0x20, [1, 2])),
+        ])
+        self.assertEqual(packet.hex(), "4e6f104400000000000f0002000000070000001000000014"
+                                       "000f0200000000200000000100000002")
+        _, _, records = decode_packet(packet)
+        self.assertEqual(records, [(None, (7, [0x10, 0x14])), ((0x20, [1, 2]), None)])
+
+    def test_read_write(self):
+        memory = self.memory()
+        memory.regs.ctrl_scratch.write(0x12345678)
+        self.assertEqual(memory.regs.ctrl_scratch.read(), 0x12345678)
+        self.server.memory[0xf0000800] = 0x1
+        self.server.memory[0xf0000804] = 0x2
+        self.assertEqual(memory.read_registers(["timer0_value"]), {"timer0_value": 0x100000002})
+        sram = memory.region("sram")
+        sram[4:8] = [1, 2, 3, 4]
+        self.assertEqual(sram[3:9], [0, 1, 2, 3, 4, 0])
+
+    def test_batch(self):
+        memory = self.memory(max_burst=16)
+        with memory.batch() as batch:
+            batch.write(0x10000000, list(range(40))) # Coalesced in 3 burst records.
+            batch.write(0x10001000, 0xcafe)
+            results = [batch.read(0x10000000 + 4*i) for i in range(40)]
+            self.assertEqual(len(batch.records), 4 + 3)
+        self.assertEqual([r.value for r in results], list(range(40)))
+
+    def test_pipelining_retries(self):
+        # Lost read requests are re-sent, replies stay matched to their reads (writes have no
+        # reply: not dropped here).
+        memory = self.memory(window=8, max_burst=4, timeout=0.05)
+        values = list(range(1000, 1256))
+        memory.write(0x10000000, values)
+        memory.read(0x10000000) # Writes done.
+        self.server.drop_every = 5
+        self.assertEqual(memory.read(0x10000000, 256), values)
+        self.assertGreater(memory.transport.stats["retries"], 0)
+
+    def lossy_server(self, drop):
+        # Drops the request packets for which drop(records) is True (not executed by the target).
+        handle   = self.server.handle
+        requests = []
+        def lossy_handle(data):
+            records = decode_packet(data)[2]
+            requests.append(records)
+            return [] if drop(records) else handle(data)
+        self.server.handle = lossy_handle
+        return requests
+
+    def test_ordering(self):
+        # A lost read is re-sent before the following write is sent: it still returns the value
+        # preceding the write.
+        memory = self.memory(timeout=0.05)
+        memory.write(0x10000000, 1)
+        dropped = []
+        def drop(records):
+            if not dropped and any(reads is not None for _, reads in records):
+                dropped.append(records)
+                return True
+            return False
+        self.lossy_server(drop)
+        with memory.batch() as batch:
+            before = batch.read(0x10000000)
+            batch.write(0x10000000, 2)
+            after  = batch.read(0x10000000)
+        self.assertEqual((before.value, after.value), (1, 2))
+        self.assertEqual(len(dropped), 1)
+
+    def test_write_fences(self):
+        # Writes are throttled by a read-back fence every window write records and after the last.
+        memory   = self.memory(window=4)
+        requests = self.lossy_server(lambda records: False)
+        with memory.batch() as batch:
+            for i in range(10):
+                batch.write(0x10000000 + 8*i, i) # Not adjacent: a record per write.
+        fences = [reads for records in requests for _, reads in records if reads is not None]
+        self.assertEqual([addrs for _, addrs in fences], [[0x10000018], [0x10000038], [0x10000048]])
+        self.assertEqual([self.server.memory[0x10000000 + 8*i] for i in range(10)], list(range(10)))
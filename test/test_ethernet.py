@@ -0,0 +1,232 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+from types import SimpleNamespace
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect import stream
+
+from liteeth.common import eth_phy_description
+
+from litex_boards.cores.ethernet import EthernetCutThroughFIFO, EthernetForwarder
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def frame(n, length):
+    return [(7*n + k) & 0xff for k in range(length)]
+
+def send(endpoint, frames, gap=4, backpressure=False):
+    """Send frames on endpoint (PHY sources have no backpressure)."""
+    for data in frames:
+        for i, byte in enumerate(data):
+            yield endpoint.valid.eq(1)
+            yield endpoint.data.eq(byte)
+            yield endpoint.last.eq(i == len(data) - 1)
+            yield
+            while backpressure and not (yield endpoint.ready):
+                yield
+        yield endpoint.valid.eq(0)
+        for _ in range(gap):
+            yield
+
+@passive
+def receive(endpoint, frames, ready=lambda cycle: True):
+    """Receive frames from endpoint as (data, error) tuples, endpoint ready at cycle if ready(cycle)."""
+    data  = []
+    cycle = 0
+    while True:
+        yield endpoint.ready.eq(ready(cycle))
+        yield
+        if (yield endpoint.valid) and (yield endpoint.ready):
+            data.append((yield endpoint.data))
+            if (yield endpoint.last):
+                frames.append((data, (yield endpoint.error)))
+                data = []
+        cycle += 1
+
+# Ethernet Cut-Through FIFO ------------------------------------------------------------------------
+
+class FIFODUT(LiteXModule):
+    def __init__(self, depth=16, threshold=4):
+        self.cd_eth_rx  = ClockDomain()
+        self.cd_eth1_tx = ClockDomain()
+        self.fifo = EthernetCutThroughFIFO("eth_rx", "eth1_tx", depth=depth, threshold=threshold)
+
+class TestEthernetCutThroughFIFO(unittest.TestCase):
+    def run_fifo(self, frames, ready=lambda cycle: True, cycles=600):
+        dut      = FIFODUT()
+        received = []
+        status   = {"drops": 0, "first": None, "last": None}
+
+        def sink():
+            cycle = 0
+            for data in frames:
+                for i, byte in enumerate(data):
+                    yield dut.fifo.sink.valid.eq(1)
+                    yield dut.fifo.sink.data.eq(byte)
+                    yield dut.fifo.sink.last.eq(i == len(data) - 1)
+                    yield
+                    cycle += 1
+                    status["last"] = cycle
+                    status["drops"] += (yield dut.fifo.drop)
+                yield dut.fifo.sink.valid.eq(0)
+                for _ in range(4):
+                    yield
+                    cycle += 1
+            for _ in range(cycles):
+                yield
+
+        @passive
+        def source():
+            cycle = 0
+            while True:
+                if (yield dut.fifo.source.valid) and status["first"] is None:
+                    status["first"] = cycle
+                yield
+                cycle += 1
+
+        run_simulation(dut, {
+                "eth_rx":  [sink()],
+                "eth1_tx": [receive(dut.fifo.source, received, ready), source()],
+            },
+            clocks={"eth_rx": 8, "eth1_tx": 8})
+        return received, status
+
+    def test_forward(self):
+        # Frames forwarded intact (shorter than threshold included), in order.
+        frames = [frame(0, 12), frame(1, 3), frame(2, 8)]
+        received, status = self.run_fifo(frames)
+        self.assertEqual(received, [(data, 0) for data in frames])
+        self.assertEqual(status["drops"], 0)
+
+    def test_cut_through(self):
+        # Long frame: forwarding starts before its end is received.
+        frames = [frame(0, 12)]
+        received, status = self.run_fifo(frames)
+        self.assertEqual(received, [(frames[0], 0)])
+        self.assertLess(status["first"], status["last"])
+
+    def test_backpressure(self):
+        # TX port busy: frames fitting in the FIFO are buffered, then forwarded intact.
+        frames = [frame(0, 6), frame(1, 5)]
+        received, status = self.run_fifo(frames, ready=lambda cycle: cycle >= 100 and cycle % 3 != 0)
+        self.assertEqual(received, [(data, 0) for data in frames])
+        self.assertEqual(status["drops"], 0)
+
+    def test_drop(self):
+        # TX port busy: the second frame overflows the FIFO and is truncated (terminated with error),
+        # the third frame arrives on a full FIFO and is dropped. The fourth frame (sent once the
+        # TX port is ready again) is forwarded.
+        frames = [frame(0, 6), frame(1, 20), frame(2, 6)]
+        dut      = FIFODUT()
+        received = []
+        status   = {"drops": 0}
+
+        def sink():
+            for data in frames:
+                yield from send(dut.fifo.sink, [data])
+            for _ in range(200):
+                yield
+            yield from send(dut.fifo.sink, [frame(3, 6)])
+            for _ in range(100):
+                yield
+
+        @passive
+        def drops():
+            while True:
+                status["drops"] += (yield dut.fifo.drop)
+                yield
+
+        run_simulation(dut, {
+                "eth_rx":  [sink(), drops()],
+                "eth1_tx": [receive(dut.fifo.source, received, lambda cycle: cycle >= 150)],
+            },
+            clocks={"eth_rx": 8, "eth1_tx": 8})
+
+        self.assertEqual(received[0], (frames[0], 0))
+        self.assertEqual(received[1][1], 1)
+        self.assertEqual(received[1][0][:-1], frames[1][:len(received[1][0]) - 1])
+        self.assertEqual(received[-1], (frame(3, 6), 0))
+        self.assertEqual(len(received), 3)
+        self.assertEqual(status["drops"], 2)
+
+# Ethernet Forwarder -------------------------------------------------------------------------------
+
+def phy_model(cd_rx, cd_tx):
+    return SimpleNamespace(
+        crg         = SimpleNamespace(cd_eth_rx=cd_rx, cd_eth_tx=cd_tx),
+        rx_clk_freq = 125e6,
+        tx_clk_freq = 125e6,
+        source      = stream.Endpoint(eth_phy_description(8)),
+        sink        = stream.Endpoint(eth_phy_description(8)),
+    )
+
+class ForwarderDUT(LiteXModule):
+    def __init__(self, depth=2048):
+        self.cd_eth_rx  = ClockDomain()
+        self.cd_eth_tx  = ClockDomain()
+        self.cd_eth1_rx = ClockDomain()
+        self.cd_eth1_tx = ClockDomain()
+        self.phy0 = phy_model(self.cd_eth_rx,  self.cd_eth_tx)
+        self.phy1 = phy_model(self.cd_eth1_rx, self.cd_eth1_tx)
+        self.forwarder = EthernetForwarder(self.phy0, self.phy1, depth=depth, threshold=8)
+
+class TestEthernetForwarder(unittest.TestCase):
+    def run_forwarder(self, dut, phy0_frames, phy1_frames, local_frames, phy1_ready=lambda cycle: True):
+        received = {"local": [], "phy0": [], "phy1": []}
+        status   = {}
+
+        def counters():
+            for _ in range(1000):
+                yield
+            for name in ["downstream_frames", "downstream_drops", "upstream_frames", "upstream_drops"]:
+                status[name] = (yield getattr(dut.forwarder, name).status)
+
+        run_simulation(dut, {
+                "sys":     [counters()],
+                "eth_rx":  [send(dut.phy0.source, phy0_frames), receive(dut.forwarder.source, received["local"])],
+                "eth_tx":  [send(dut.forwarder.sink, local_frames, backpressure=True), receive(dut.phy0.sink, received["phy0"])],
+                "eth1_rx": [send(dut.phy1.source, phy1_frames)],
+                "eth1_tx": [receive(dut.phy1.sink, received["phy1"], phy1_ready)],
+            },
+            clocks={"sys": 10, "eth_rx": 8, "eth_tx": 8, "eth1_rx": 8, "eth1_tx": 8})
+        return received, status
+
+    def test_forward(self):
+        # phy0 RX -> local + phy1 TX, phy1 RX + local TX -> phy0 TX (merged at frame boundaries).
+        dut = ForwarderDUT()
+        phy0_frames  = [frame(0, 64), frame(1, 20)]
+        phy1_frames  = [frame(2, 40), frame(3, 10)]
+        local_frames = [frame(4, 30)]
+        received, status = self.run_forwarder(dut, phy0_frames, phy1_frames, local_frames,
+            phy1_ready = lambda cycle: cycle % 4 != 0)
+        self.assertEqual(received["local"], [(data, 0) for data in phy0_frames])
+        self.assertEqual(received["phy1"],  [(data, 0) for data in phy0_frames])
+        self.assertEqual(sorted(received["phy0"]), sorted((data, 0) for data in phy1_frames + local_frames))
+        self.assertEqual([data for data, _ in received["phy0"] if data in phy1_frames], phy1_frames)
+        self.assertEqual(status, {
+            "downstream_frames": 2,
+            "downstream_drops":  0,
+            "upstream_frames":   2, # Local frames not counted.
+            "upstream_drops":    0,
+        })
+
+    def test_drop(self):
+        # phy1 TX stalled: downstream overflow, frames still received by the local port.
+        dut = ForwarderDUT(depth=32)
+        phy0_frames = [frame(n, 24) for n in range(4)]
+        received, status = self.run_forwarder(dut, phy0_frames, [], [],
+            phy1_ready = lambda cycle: cycle >= 300)
+        self.assertEqual(received["local"], [(data, 0) for data in phy0_frames])
+        self.assertEqual(received["phy1"][0], (phy0_frames[0], 0))
+        self.assertGreater(status["downstream_drops"], 0)
+        self.assertEqual(status["downstream_frames"], len(received["phy1"]))
+
+if __name__ == "__main__":
+    unittest.main()
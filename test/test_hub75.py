@@ -0,0 +1,111 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex_boards.cores.hub75 import hub75_bcm_base, HUB75Scanner
+
+def bcm_base_search(sys_clk_freq, refresh_rate, rows, width, depth, clk_div=1, blank=4):
+    # Row cycles grow with bcm_base: bisect the largest bcm_base reaching refresh_rate.
+    row_cycles = sys_clk_freq/(refresh_rate*rows)
+    shift      = 2*clk_div*width + blank + clk_div + 2
+    lo, hi     = 1, 2**16 - 1
+    while lo < hi:
+        bcm_base = (lo + hi + 1)//2
+        if sum(max(shift, bcm_base << b) for b in range(depth)) <= row_cycles:
+            lo = bcm_base
+        else:
+            hi = bcm_base - 1
+    return lo
+
+class TestHUB75(unittest.TestCase):
+    def test_bcm_base(self):
+        for sys_clk_freq in [25e6, 60e6, 100e6]:
+            for refresh_rate in [50, 400, 2000, 10000]:
+                for rows, width, depth in [(8, 64, 4), (16, 128, 8), (32, 256, 10), (16, 32, 12)]:
+                    for clk_div in [1, 2]:
+                        args = (sys_clk_freq, refresh_rate, rows, width, depth, clk_div)
+                        self.assertEqual(hub75_bcm_base(*args), bcm_base_search(*args), args)
+
+    def test_scanner(self):
+        # 1 chain, 4 columns, 2 rows, 3 bit-planes: checks the data shifted for each bit-plane and
+        # the bank/BCM display time of each bit-plane.
+        width, rows, depth, bcm_base = 4, 2, 3, 20
+        control_pads = Record([("bank", 2), ("oe", 1), ("stb", 1), ("clk", 1)])
+        chain_pads   = Record([("r", 2), ("g", 2), ("b", 2)])
+        dut = HUB75Scanner(control_pads, [chain_pads], max_width=width, depth=depth, gamma=1.0,
+            width    = width,
+            rows     = rows,
+            bcm_base = bcm_base,
+        )
+
+        def level(x, row):
+            return (x + row) % 2**depth
+
+        def pixel(n):
+            # Gamma 1.0: 8-bit value displayed as n on depth bits.
+            return round(n*255/(2**depth - 1))
+
+        @passive
+        def feeder():
+            yield dut.request.ready.eq(1)
+            while True:
+                if (yield dut.request.valid):
+                    row = (yield dut.request.row)
+                    yield
+                    for x in range(width):
+                        upper = level(x, row)
+                        lower = 2**depth - 1 - upper
+                        for n in [upper, lower]:
+                            yield dut.sink.valid.eq(1)
+                            yield dut.sink.data.eq(pixel(n) | (pixel(n ^ 1) << 8))
+                            yield
+                            while not (yield dut.sink.ready):
+                                yield
+                    yield dut.sink.valid.eq(0)
+                yield
+
+        latches = []
+        def monitor():
+            clk   = 0
+            oe    = 1
+            shift = []
+            for _ in range(2000):
+                if (yield control_pads.clk) and not clk:
+                    shift.append(((yield chain_pads.r), (yield chain_pads.g), (yield chain_pads.b)))
+                if (yield control_pads.stb):
+                    if shift:
+                        latches.append({"shift": shift, "oe": 0})
+                    shift = []
+                if not (yield control_pads.oe) and latches: # Pads reset low.
+                    if oe:
+                        latches[-1]["bank"] = (yield control_pads.bank)
+                    latches[-1]["oe"] += 1
+                clk = (yield control_pads.clk)
+                oe  = (yield control_pads.oe)
+                yield
+            self.assertEqual((yield dut.underruns.status), 0)
+            self.assertGreater((yield dut.refreshes.status), 0)
+
+        run_simulation(dut, [feeder(), monitor()])
+
+        self.assertGreater(len(latches), 2*rows*depth)
+        for i, latch in enumerate(latches[:-1]):
+            plane = i % depth
+            row   = (i//depth) % rows
+            shift = []
+            for x in range(width):
+                upper = level(x, row)
+                lower = 2**depth - 1 - upper
+                bits  = lambda a, b: ((a >> plane) & 1) | (((b >> plane) & 1) << 1)
+                shift.append((bits(upper, lower), bits(upper ^ 1, lower ^ 1), 0))
+            self.assertEqual(latch["shift"], shift)
+            self.assertEqual(latch["bank"], row)
+            self.assertEqual(latch["oe"], bcm_base << plane)
+
+if __name__ == "__main__":
+    unittest.main()
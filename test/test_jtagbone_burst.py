@@ -0,0 +1,67 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litex_boards.tools.jtagbone_burst import encode_write, encode_read, split_reads
+from litex_boards.tools.jtagbone_burst import JTAGBone, JTAGBoneError, LoopbackServer, tune_speed
+from litex_boards.tools.etherbone_map import RemoteMemory
+
+class TestJTAGBoneBurst(unittest.TestCase):
+    def server(self, **kwargs):
+        server = LoopbackServer(**kwargs)
+        server.start()
+        self.addCleanup(server.stop)
+        return server
+
+    def transport(self, server, **kwargs):
+        transport = JTAGBone(*server.address, resync_delay=0.15, **kwargs)
+        transport.open()
+        self.addCleanup(transport.close)
+        return transport
+
+    def test_encoding(self):
+        # Same encoding than LiteX's litex.tools.remote.comm_uart.
+        self.assertEqual(encode_write(0x40000010, [0x12345678]).hex(), "01011000000412345678")
+        self.assertEqual(encode_read(0x40000010, 4).hex(), "020410000004")
+        self.assertEqual(split_reads([0, 4, 8, 16, 20], max_burst=2), [(0, 2), (8, 1), (16, 2)])
+
+    def test_bursts(self):
+        server    = self.server()
+        transport = self.transport(server)
+        memory    = RemoteMemory(transport)
+        datas     = list(range(1000))
+        memory.write(0x40000000, datas)
+        self.assertEqual(memory.read(0x40000000, 1000), datas)
+        with memory.batch() as batch:
+            batch.write(0xf0000004, 0x5a5a5a5a)
+            scratch = batch.read(0xf0000004)
+            first   = batch.read(0x40000000, 4)
+        self.assertEqual(scratch.value, 0x5a5a5a5a)
+        self.assertEqual(first.value, [0, 1, 2, 3])
+        # Several commands per scan.
+        self.assertLess(transport.stats["scans"], transport.stats["commands"])
+        self.assertEqual(transport.stats["retries"], 0)
+
+    def test_overflow(self):
+        # Without reply slots, the next commands are dropped while the target is sending.
+        server    = self.server()
+        transport = self.transport(server, gap=-32, retries=1)
+        with self.assertRaises(JTAGBoneError):
+            transport.execute([("r", [4*i for i in range(8)]), ("w", 0x100, list(range(8)))])
+        self.assertEqual(transport.stats["retries"], 1)
+        # Link usable once UARTBone timed out.
+        transport.gap = 8
+        transport.execute([("w", 0x100, [1, 2])])
+        self.assertEqual(transport.execute([("r", [0x100, 0x104])]), [[1, 2]])
+
+    def test_tune(self):
+        server    = self.server(max_speed=15000)
+        transport = self.transport(server)
+        self.assertEqual(tune_speed(transport, 0xf0000004, verbose=False), 15000)
+        self.assertEqual(server.speed, 15000)
+
+if __name__ == "__main__":
+    unittest.main()
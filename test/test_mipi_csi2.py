@@ -0,0 +1,326 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.mipi_csi2 import SOT_SYNC, CSI2_DT_FS, CSI2_DT_RAW8, CSI2_DT_RAW10, CSI2_DT_RAW12
+from litex_boards.cores.mipi_csi2 import CSI2RX, CSI2Unpacker, CSI2FrameDMA
+
+# CSI-2 Helpers ------------------------------------------------------------------------------------
+
+# Header bits covered by each ECC parity bit (CSI-2 specification).
+ECC_PARITY = [
+    [0, 1, 2, 4, 5, 7, 10, 11, 13, 16, 20, 21, 22, 23],
+    [0, 1, 3, 4, 6, 8, 10, 12, 14, 17, 20, 21, 22, 23],
+    [0, 2, 3, 5, 6, 9, 11, 12, 15, 18, 20, 21, 22],
+    [1, 2, 3, 7, 8, 9, 13, 14, 15, 19, 20, 21, 23],
+    [4, 5, 6, 7, 8, 9, 16, 17, 18, 19, 20, 22, 23],
+    [10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 21, 22, 23],
+]
+
+def ecc(header):
+    return sum((sum((header >> d) & 1 for d in bits) & 1) << p for p, bits in enumerate(ECC_PARITY))
+
+def crc16(data, crc=0xffff):
+    for byte in data:
+        for i in range(8):
+            bit  = ((byte >> i) & 1) ^ (crc & 1)
+            crc  = (crc >> 1) ^ (0x8408 if bit else 0)
+    return crc
+
+def packet(dt, wc, payload=None, header_errors=0, crc_error=False):
+    header = dt | (wc << 8)
+    data   = list((header ^ header_errors).to_bytes(3, "little")) + [ecc(header)]
+    if payload is not None:
+        crc   = crc16(payload) ^ (1 if crc_error else 0)
+        data += list(payload) + list(crc.to_bytes(2, "little"))
+    return data
+
+def lanes_bursts(packets, nlanes):
+    """Lanes (stop, raw byte) cycles: LP-11, LP-00, HS-zero, sync, packet, HS-trail, per packet."""
+    lanes = [[] for _ in range(nlanes)]
+    for data in packets:
+        bursts = []
+        for n in range(nlanes):
+            # LP-11 (Garbage with sync bytes on the HS receiver, must be ignored).
+            burst = [(1, SOT_SYNC)]*4
+            # HS burst (deskewed lanes, not byte aligned), HS-trail with sync bytes.
+            hs    = [0x00]*(2 + n) + [SOT_SYNC] + data[n::nlanes] + [SOT_SYNC, 0x5c, SOT_SYNC, 0xff]
+            bits  = [0]*(n + 3) + [(b >> i) & 1 for b in hs for i in range(8)]
+            bits += [1]*(-len(bits) % 8)
+            burst += [(0, sum(bits[8*k + i] << i for i in range(8))) for k in range(len(bits)//8)]
+            bursts.append(burst)
+        # Lanes with less bytes return to LP-11 earlier, next burst starts on all lanes together.
+        length = max(len(burst) for burst in bursts)
+        for lane, burst in zip(lanes, bursts):
+            lane += burst + [(1, 0xff)]*(length - len(burst))
+    return [lane + [(1, 0xff)]*16 for lane in lanes]
+
+# CSI-2 RX -----------------------------------------------------------------------------------------
+
+class RXDUT(LiteXModule):
+    def __init__(self, nlanes, data_type):
+        self.cd_mipi_byte = ClockDomain()
+        self.lanes = [Signal(8) for _ in range(nlanes)]
+        self.stop  = [Signal() for _ in range(nlanes)]
+        self.rx    = CSI2RX(self.lanes, data_type, stop=self.stop)
+
+class TestCSI2RX(unittest.TestCase):
+    def test_ecc_crc_reference(self):
+        # CSI-2 specification CRC examples.
+        self.assertEqual(crc16(bytes.fromhex("ff000002b9dcf372bbd4b85ac875c27c81f805dfff000001")), 0x00f0)
+        self.assertEqual(crc16(bytes.fromhex("ff0000001ef01ec74f8278c582e08c70d23c78e9ff000001")), 0xe569)
+        self.assertEqual(ecc(0x000001), 0x07)
+
+    def run_rx(self, nlanes):
+        payloads = [bytes((17*n + k) & 0xff for k in range(16)) for n in range(4)]
+        packets = [
+            packet(CSI2_DT_FS, 0),
+            packet(CSI2_DT_RAW8, 16, payloads[0]),
+            packet(0x12, 16, bytes(16)),                             # Other data type: skipped.
+            packet(CSI2_DT_RAW8, 16, payloads[1], header_errors=1 << 9),  # Corrected.
+            packet(CSI2_DT_RAW8, 16, payloads[2], header_errors=0x000300), # Dropped.
+            packet(CSI2_DT_RAW8, 16, payloads[3], crc_error=True),   # Forwarded, CRC error.
+        ]
+        dut   = RXDUT(nlanes, CSI2_DT_RAW8)
+        lanes = lanes_bursts(packets, nlanes)
+        words = []
+        status = {}
+
+        def lanes_gen():
+            for cycle in range(len(lanes[0])):
+                for n in range(nlanes):
+                    yield dut.stop[n].eq(lanes[n][cycle][0])
+                    yield dut.lanes[n].eq(lanes[n][cycle][1])
+                yield
+
+        @passive
+        def sink():
+            source = dut.rx.source
+            yield source.ready.eq(1)
+            while True:
+                if (yield source.valid):
+                    words.append(((yield source.data), (yield source.sof), (yield source.first), (yield source.last)))
+                yield
+
+        def errors():
+            for _ in range(len(lanes[0]) + 16):
+                yield
+            status["ecc"] = (yield dut.rx.ecc_errors.status)
+            status["crc"] = (yield dut.rx.crc_errors.status)
+
+        run_simulation(dut, {"sys": [errors()], "mipi_byte": [lanes_gen(), sink()]},
+            clocks={"sys": 10, "mipi_byte": 10})
+
+        expected = []
+        for n, payload in enumerate([payloads[0], payloads[1], payloads[3]]):
+            for i in range(4):
+                data = int.from_bytes(payload[4*i:4*i+4], "little")
+                expected.append((data, int(n == 0 and i == 0), int(i == 0), int(i == 3)))
+        self.assertEqual(words, expected)
+        self.assertEqual(status, {"ecc": 1, "crc": 1})
+
+    def test_rx_overflow(self):
+        # Source stalled during the first packet: lane merger overflow, lanes resynchronized on the
+        # next burst and second packet received.
+        nlanes   = 2
+        payloads = [bytes((3*n + k) & 0xff for k in range(64)) for n in range(2)]
+        packets  = [packet(CSI2_DT_RAW8, 64, payload) for payload in payloads]
+        dut      = RXDUT(nlanes, CSI2_DT_RAW8)
+        lanes    = lanes_bursts(packets, nlanes)
+        stall    = len(lanes_bursts(packets[:1], nlanes)[0]) - 16
+        words    = []
+        status   = {}
+
+        def lanes_gen():
+            for cycle in range(len(lanes[0])):
+                for n in range(nlanes):
+                    yield dut.stop[n].eq(lanes[n][cycle][0])
+                    yield dut.lanes[n].eq(lanes[n][cycle][1])
+                yield dut.rx.source.ready.eq(cycle >= stall)
+                if (yield dut.rx.source.valid) and (yield dut.rx.source.ready):
+                    words.append((yield dut.rx.source.data))
+                yield
+
+        def errors():
+            for _ in range(len(lanes[0]) + 16):
+                yield
+            status["overflows"] = (yield dut.rx.overflows.status)
+            status["crc"]       = (yield dut.rx.crc_errors.status)
+
+        run_simulation(dut, {"sys": [errors()], "mipi_byte": [lanes_gen()]},
+            clocks={"sys": 10, "mipi_byte": 10})
+
+        expected = [int.from_bytes(payloads[1][4*i:4*i+4], "little") for i in range(16)]
+        self.assertEqual(words[-16:], expected)
+        self.assertGreater(status["overflows"], 0)
+        self.assertEqual(status["crc"], 0)
+
+    def test_rx_1lane(self):
+        self.run_rx(1)
+
+    def test_rx_2lanes(self):
+        self.run_rx(2)
+
+    def test_rx_4lanes(self):
+        self.run_rx(4)
+
+# CSI-2 Unpacker -----------------------------------------------------------------------------------
+
+class TestCSI2Unpacker(unittest.TestCase):
+    def run_unpacker(self, data_type, pixel_bits, npixels, nlines=2):
+        dut    = CSI2Unpacker(data_type)
+        lines  = [[(997*(l*npixels + p) + 3) % 2**pixel_bits for p in range(npixels)] for l in range(nlines)]
+        output = []
+
+        def pack(pixels):
+            # RAW10: 4 MSBs bytes + 1 byte of 2-bit LSBs, RAW12: 2 MSBs bytes + 1 byte of 4-bit LSBs.
+            lsb_bits = pixel_bits - 8
+            group    = 8//lsb_bits
+            data     = []
+            for g in range(0, len(pixels), group):
+                data += [p >> lsb_bits for p in pixels[g:g + group]]
+                data += [sum((p & (2**lsb_bits - 1)) << (lsb_bits*i) for i, p in enumerate(pixels[g:g + group]))]
+            return data
+
+        def source():
+            for l, pixels in enumerate(lines):
+                data  = pack(pixels)
+                words = [int.from_bytes(bytes(data[i:i+4]), "little") for i in range(0, len(data), 4)]
+                for i, word in enumerate(words):
+                    yield dut.sink.valid.eq(1)
+                    yield dut.sink.data.eq(word)
+                    yield dut.sink.sof.eq(l == 0 and i == 0)
+                    yield dut.sink.first.eq(i == 0)
+                    yield dut.sink.last.eq(i == len(words) - 1)
+                    yield
+                    while not (yield dut.sink.ready):
+                        yield
+            yield dut.sink.valid.eq(0)
+            for _ in range(32):
+                yield
+
+        @passive
+        def sink():
+            yield dut.source.ready.eq(1)
+            while True:
+                if (yield dut.source.valid):
+                    output.append(((yield dut.source.data), (yield dut.source.sof),
+                        (yield dut.source.first), (yield dut.source.last)))
+                yield
+
+        run_simulation(dut, [source(), sink()])
+
+        expected = []
+        nwords   = npixels//2
+        for l, pixels in enumerate(lines):
+            for i in range(nwords):
+                data = pixels[2*i] | (pixels[2*i + 1] << 16)
+                expected.append((data, int(l == 0 and i == 0), int(i == 0), int(i == nwords - 1)))
+        self.assertEqual(output, expected)
+
+    def test_raw10(self):
+        self.run_unpacker(CSI2_DT_RAW10, 10, 32)
+
+    def test_raw12(self):
+        self.run_unpacker(CSI2_DT_RAW12, 12, 16)
+
+# CSI-2 Frame DMA ----------------------------------------------------------------------------------
+
+class DMADUT(LiteXModule):
+    def __init__(self, nbuffers):
+        bus       = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+        self.dma  = CSI2FrameDMA(bus, nbuffers=nbuffers)
+        self.sram = wishbone.SRAM(1024, bus=bus)
+
+class TestCSI2FrameDMA(unittest.TestCase):
+    def test_frame_dma(self):
+        dut         = DMADUT(nbuffers=2)
+        dma         = dut.dma
+        descriptors = []
+        memory      = {}
+        status      = {}
+
+        def csr_pulse(csr, value=None):
+            if value is not None:
+                yield csr.storage.eq(value)
+            yield csr.re.eq(1)
+            yield
+            yield csr.re.eq(0)
+
+        def send_frame(lines, width, seed, gap=8):
+            for l in range(lines):
+                for i in range(width):
+                    yield dma.sink.valid.eq(1)
+                    yield dma.sink.data.eq((seed << 16) | (l << 8) | i)
+                    yield dma.sink.sof.eq(l == 0 and i == 0)
+                    yield dma.sink.first.eq(i == 0)
+                    yield dma.sink.last.eq(i == width - 1)
+                    yield
+                    while not (yield dma.sink.ready):
+                        yield
+            yield dma.sink.valid.eq(0)
+            for _ in range(gap):
+                yield
+
+        def pop_descriptors():
+            while (yield dma.done_valid.status):
+                descriptors.append(((yield dma.done_base.status), (yield dma.done_length.status),
+                    (yield dma.done_truncated.status)))
+                yield from csr_pulse(dma.done_ack)
+                yield
+
+        def generator():
+            yield dma.enable.storage.eq(1)
+            yield dma.height.storage.eq(2)
+            yield dma.buffer_size.storage.eq(32)
+            # No free buffer: dropped.
+            yield from send_frame(2, 4, 0)
+            # Free buffers: 2 lines of 4 words, then a truncated frame (2 lines of 6 words).
+            yield from csr_pulse(dma.buffer_base, 0x000)
+            yield from csr_pulse(dma.buffer_base, 0x100)
+            for _ in range(4):
+                yield
+            status["level"] = (yield dma.buffer_level.status)
+            yield from send_frame(2, 4, 1)
+            yield from send_frame(2, 6, 2)
+            # Free ring empty: dropped.
+            yield from send_frame(2, 4, 3)
+            yield from pop_descriptors()
+            # Early SOF: 1 line then a new frame, closed on the new frame's SOF.
+            yield from csr_pulse(dma.buffer_base, 0x200)
+            yield from csr_pulse(dma.buffer_base, 0x300)
+            yield from send_frame(1, 4, 4, gap=0)
+            yield from send_frame(2, 4, 5)
+            # Invalid height: dropped.
+            yield dma.height.storage.eq(0)
+            yield from send_frame(2, 4, 6)
+            yield from pop_descriptors()
+            status["frames"]      = (yield dma.frames.status)
+            status["drops"]       = (yield dma.drops.status)
+            status["truncations"] = (yield dma.truncations.status)
+            for addr in range(256):
+                memory[4*addr] = (yield dut.sram.mem[addr])
+
+        run_simulation(dut, generator())
+
+        self.assertEqual(status, {"level": 2, "frames": 4, "drops": 3, "truncations": 1})
+        self.assertEqual(descriptors, [(0x000, 32, 0), (0x100, 32, 1), (0x200, 16, 0), (0x300, 32, 0)])
+        def words(base, n):
+            return [memory[base + 4*i] for i in range(n)]
+        self.assertEqual(words(0x000, 8), [(1 << 16) | (l << 8) | i for l in range(2) for i in range(4)])
+        # Truncated: the first 8 words, nothing written past the buffer.
+        self.assertEqual(words(0x100, 9), [(2 << 16) | (l << 8) | i for l in range(2) for i in range(6)][:8] + [0])
+        self.assertEqual(words(0x200, 5), [(4 << 16) | i for i in range(4)] + [0])
+        self.assertEqual(words(0x300, 8), [(5 << 16) | (l << 8) | i for l in range(2) for i in range(4)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import time
+import tempfile
+import threading
+import unittest
+
+from litex.build.openocd import OpenOCD
+
+from litex_boards.tools.multi_prog import Board, MultiProgrammer, select_adapter
+
+class StubProgrammer:
+    lock    = threading.Lock()
+    active  = {}
+    maximum = 0
+    log     = []
+
+    def __init__(self, board):
+        self.board = board
+
+    def _run(self, bitstream):
+        cls = StubProgrammer
+        with cls.lock:
+            adapter = self.board.adapter
+            assert cls.active.get(adapter, 0) == 0, "Adapter used concurrently."
+            cls.active[adapter] = 1
+            cls.maximum = max(cls.maximum, sum(cls.active.values()))
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active[adapter] = 0
+            cls.log.append(bitstream)
+        if bitstream == "bad.bit":
+            raise OSError("Programming failed.")
+
+    def load_bitstream(self, bitstream):
+        self._run(bitstream)
+
+    def flash(self, address, bitstream):
+        self._run(bitstream)
+
+class TestMultiProg(unittest.TestCase):
+    def setUp(self):
+        StubProgrammer.active  = {}
+        StubProgrammer.maximum = 0
+        StubProgrammer.log     = []
+
+    def test_parallel(self):
+        boards = [Board(f"board{i}", "ok.bit", platform="digilent_arty", serial=f"S{i}") for i in range(8)]
+        results = MultiProgrammer(boards, jobs=3, programmer_factory=StubProgrammer).run()
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual([r.board.name for r in results], [b.name for b in boards])
+        self.assertLessEqual(StubProgrammer.maximum, 3)
+        self.assertGreater(StubProgrammer.maximum, 1)
+
+    def test_same_adapter_serialized(self):
+        boards = [Board(f"board{i}", "ok.bit", platform="digilent_arty", serial="S0", mode="flash") for i in range(3)]
+        results = MultiProgrammer(boards, jobs=3, programmer_factory=StubProgrammer).run()
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(StubProgrammer.maximum, 1)
+
+    def test_failures(self):
+        boards = [
+            Board("good", "ok.bit",  platform="digilent_arty", serial="S0"),
+            Board("bad",  "bad.bit", platform="digilent_arty", serial="S1"),
+        ]
+        results = MultiProgrammer(boards, jobs=2, programmer_factory=StubProgrammer).run()
+        self.assertEqual([r.success for r in results], [True, False])
+        self.assertIsInstance(results[1].error, OSError)
+
+    def test_duplicate_names(self):
+        boards = [Board("arty", bitstream, platform="digilent_arty", serial=f"S{i}")
+            for i, bitstream in enumerate(["ok.bit", "bad.bit", "ok.bit"])]
+        results = MultiProgrammer(boards, jobs=3, programmer_factory=StubProgrammer).run()
+        self.assertEqual([r.board for r in results], boards)
+        self.assertEqual([r.success for r in results], [True, False, True])
+
+    def test_platform_args(self):
+        boards = [Board(f"board{i}", "ok.bit", platform="digilent_arty") for i in range(2)]
+        boards[0].platform_args["variant"] = "a7-100"
+        self.assertEqual(boards[1].platform_args, {})
+
+    def test_openocd_adapter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = os.path.join(tmp, "board.cfg")
+            with open(config, "w") as f:
+                f.write("adapter driver ftdi\n")
+            prog = OpenOCD(config)
+            prog.prog_local = tmp
+            select_adapter(prog, serial="210319A8D2E4")
+            # Adapter selected through the programmer's configuration.
+            self.assertEqual(prog.find_config(), os.path.join(tmp, "openocd_210319A8D2E4.cfg"))
+            with open(prog.config) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[0], f"source {{{config}}}")
+            self.assertEqual(lines[-1], "adapter serial 210319A8D2E4")
@@ -0,0 +1,191 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.soc.cores.icap import ICAP_SYNC, ICAP_NOOP, ICAP_WRITE, ICAP_READ
+from litex.soc.cores.icap import ICAPRegisters, ICAPCMDs
+
+from litex_boards.cores.reconfig import ICAPStreamer, QSPIFlashPHY, QSPIFlashProgrammer
+
+DESYNC = [ICAP_WRITE | (ICAPRegisters.CMD << 13) | 1, ICAPCMDs.DESYNC, ICAP_NOOP, ICAP_NOOP]
+SYNC   = [ICAP_NOOP, ICAP_SYNC, ICAP_NOOP, ICAP_NOOP]
+
+class TestICAPStreamer(unittest.TestCase):
+    def run_icap(self, access, words, o=0):
+        # Register access (write/read) issued while words are streamed, returns the words written to
+        # the ICAP (CSIB low, RDWRB low) and the read data.
+        dut     = ICAPStreamer(with_csr=False, simulation=True)
+        written = []
+        result  = {}
+
+        def register():
+            yield dut.addr.eq(ICAPRegisters.WBSTAR)
+            yield dut.write_data.eq(0x00800000)
+            yield getattr(dut, access).eq(1)
+            while not (yield dut.done):
+                yield
+            result["read_data"] = (yield dut.read_data)
+            yield getattr(dut, access).eq(0)
+            for _ in range(64):
+                yield
+
+        def streamer():
+            for _ in range(8):
+                yield
+            for word in words:
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.data.eq(word)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+
+        @passive
+        def monitor():
+            yield dut.o.eq(o)
+            while True:
+                if not (yield dut.csib) and not (yield dut.rdwrb):
+                    written.append((yield dut.i))
+                yield
+
+        run_simulation(dut, {"sys": [register(), streamer()], "icap": [monitor()]},
+            clocks={"sys": 10, "icap": 20})
+        return written, result["read_data"]
+
+    def test_write_then_stream(self):
+        words      = [0x1000 + n for n in range(8)]
+        written, _ = self.run_icap("write", words)
+        write      = [ICAP_WRITE | (ICAPRegisters.WBSTAR << 13) | 1, 0x00800000, ICAP_NOOP, ICAP_NOOP]
+        # Words streamed during the register access are held until it completes.
+        self.assertEqual(written, SYNC + write + DESYNC + words)
+
+    def test_read(self):
+        written, read_data = self.run_icap("read", [], o=0x12345678)
+        read = [ICAP_READ | (ICAPRegisters.WBSTAR << 13) | 1, ICAP_NOOP, ICAP_NOOP]
+        self.assertEqual(read_data, 0x12345678)
+        self.assertEqual(written, SYNC + read + DESYNC)
+
+# QSPI Flash Programmer ----------------------------------------------------------------------------
+
+class SPIFlashModel:
+    """S25FL-like QSPI Flash (WREN/RDSR/RDCR/WRR/4SE/4QPP/4QOR), Quad commands ignored while CR1.QUAD=0."""
+    def __init__(self, size, sector_size, sr1=0x00, cr1=0x00):
+        self.memory      = bytearray(b"\xff"*size)
+        self.sector_size = sector_size
+        self.sr1         = sr1
+        self.cr1         = cr1
+        self.wel         = 0
+
+    @passive
+    def run(self, phy, cs_n):
+        clk    = 0
+        clocks = []
+        while True:
+            if (yield cs_n):
+                if clocks:
+                    self.end(clocks)
+                clocks = []
+            elif (yield phy.clk) and not clk:
+                clocks.append((yield phy.dq_o))
+                yield phy.dq_i.eq(self.output(clocks))
+            clk = (yield phy.clk)
+            yield
+
+    def serial(self, clocks, start, nbytes):
+        # 1-bit mode bytes (DQ0, MSB first).
+        return [sum((clocks[start + 8*n + i] & 1) << (7 - i) for i in range(8)) for n in range(nbytes)]
+
+    def quad(self, clocks, start):
+        # 4-bit mode bytes (high nibble first).
+        return [(clocks[start + 2*n] << 4) | clocks[start + 2*n + 1] for n in range((len(clocks) - start)//2)]
+
+    def output(self, clocks):
+        n = len(clocks) - 1
+        if n < 8:
+            return 0
+        cmd = self.serial(clocks, 0, 1)[0]
+        if cmd in [0x05, 0x35]:
+            value = self.sr1 if cmd == 0x05 else self.cr1
+            return ((value >> (7 - (n - 8) % 8)) & 1) << 1
+        if cmd == 0x6c and (self.cr1 & 0x02) and n >= 48:
+            address = int.from_bytes(bytes(self.serial(clocks, 8, 4)), "big") + (n - 48)//2
+            return (self.memory[address] >> (4 if (n - 48) % 2 == 0 else 0)) & 0xf
+        return 0xf
+
+    def end(self, clocks):
+        cmd = self.serial(clocks, 0, 1)[0]
+        if cmd == 0x06:
+            self.wel = 1
+            return
+        if cmd in [0x01, 0xdc, 0x34] and self.wel:
+            if cmd == 0x01:
+                self.sr1, self.cr1 = self.serial(clocks, 8, 2)
+            else:
+                address = int.from_bytes(bytes(self.serial(clocks, 8, 4)), "big")
+            if cmd == 0xdc:
+                self.memory[address:address + self.sector_size] = b"\xff"*self.sector_size
+            if cmd == 0x34 and (self.cr1 & 0x02):
+                for i, byte in enumerate(self.quad(clocks, 40)):
+                    self.memory[address + i] &= byte
+        if cmd in [0x01, 0xdc, 0x34]:
+            self.wel = 0
+
+class QSPIDUT(LiteXModule):
+    def __init__(self):
+        self.phy        = QSPIFlashPHY(div=2)
+        self.programmer = QSPIFlashProgrammer(self.phy, page_size=16, sector_size=64)
+
+class TestQSPIFlashProgrammer(unittest.TestCase):
+    def run_programmer(self, flash, image, quad_enable=1):
+        dut    = QSPIDUT()
+        prog   = dut.programmer
+        status = {}
+
+        def generator():
+            yield prog.quad_enable.storage.eq(quad_enable)
+            yield prog.enable.storage.eq(1)
+            yield prog.enable.re.eq(1)
+            yield
+            yield prog.enable.re.eq(0)
+            for i in range(0, len(image), 4):
+                yield prog.sink.valid.eq(1)
+                yield prog.sink.data.eq(int.from_bytes(image[i:i+4], "little"))
+                yield
+                while not (yield prog.sink.ready):
+                    yield
+            yield prog.sink.valid.eq(0)
+            yield
+            while (yield prog.busy.status):
+                yield
+            status["pages"]  = (yield prog.pages.status)
+            status["errors"] = (yield prog.errors.status)
+
+        run_simulation(dut, [generator(), flash.run(dut.phy, prog.cs_n)])
+        return status
+
+    def test_quad_enable(self):
+        # Stock part (CR1.QUAD cleared): QUAD set with WRR (SR1 preserved), pages programmed/verified.
+        image  = bytes(range(1, 65))
+        flash  = SPIFlashModel(256, 64, sr1=0x1c, cr1=0x00)
+        status = self.run_programmer(flash, image)
+        self.assertEqual(status, {"pages": 4, "errors": 0})
+        self.assertEqual(bytes(flash.memory[:64]), image)
+        self.assertEqual((flash.sr1, flash.cr1), (0x1c, 0x02))
+
+    def test_no_quad_enable(self):
+        # Without Quad Enable, Quad Page Program/Output Read are ignored: every page fails verify.
+        flash  = SPIFlashModel(256, 64)
+        status = self.run_programmer(flash, bytes(range(1, 33)), quad_enable=0)
+        self.assertEqual(status["pages"], 2)
+        self.assertEqual(status["errors"], 32)
+        self.assertEqual(flash.cr1, 0x00)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import LiteXModule
+
+from litex.soc.interconnect import stream
+
+from litedram.frontend.axi import LiteDRAMAXIPort
+
+from litex_boards.cores.scope import _DMAStorage
+
+class DUT(LiteXModule):
+    def __init__(self, dma):
+        self.cd_scope = ClockDomain()
+        self.storage  = _DMAStorage(16, dma)
+
+class TestDMAStorage(unittest.TestCase):
+    def capture(self, dma, length, offset, trigger, base=0):
+        # Captures 16-bit samples (incrementing values, trigger on sample trigger), returns the DMA
+        # words and the storage status.
+        dut     = DUT(dma)
+        storage = dut.storage
+        status  = {}
+
+        def control():
+            yield storage.base.storage.eq(base)
+            yield storage.length.storage.eq(length)
+            yield storage.offset.storage.eq(offset)
+            yield
+            yield storage.enable.storage.eq(1)
+            for _ in range(8):
+                yield
+            while not (yield storage.done.status):
+                yield
+            for name in ["count", "trigger", "end", "overflow"]:
+                status[name] = (yield getattr(storage, name).status)
+            yield storage.enable.storage.eq(0)
+
+        @passive
+        def samples():
+            n = 0
+            while True:
+                yield storage.sink.valid.eq(1)
+                yield storage.sink.data.eq(n)
+                yield storage.sink.hit.eq(n == trigger)
+                yield
+                n += 1
+
+        run_simulation(dut, {"sys": [control()] + self.generators(dma), "scope": [samples()]},
+            clocks={"sys": 10, "scope": 10})
+        return status
+
+    def generators(self, dma):
+        return []
+
+class TestDMAStorageAXI(TestDMAStorage):
+    def generators(self, dma):
+        self.aws = []
+        self.ws  = []
+        @passive
+        def slave():
+            yield dma.aw.ready.eq(1)
+            yield dma.w.ready.eq(1)
+            while True:
+                if (yield dma.aw.valid):
+                    self.aws.append(((yield dma.aw.addr), (yield dma.aw.burst), (yield dma.aw.len)))
+                if (yield dma.w.valid):
+                    self.ws.append(((yield dma.w.data), (yield dma.w.last)))
+                yield
+        return [slave()]
+
+    def test_ring_buffer(self):
+        dma    = LiteDRAMAXIPort(data_width=64, address_width=32, id_width=1)
+        status = self.capture(dma, length=64, offset=16, trigger=200, base=0x1000)
+        self.assertEqual(status["overflow"], 0)
+        self.assertEqual(len(self.aws), len(self.ws))
+        # Single beat INCR bursts, with last set on each write beat.
+        for addr, burst, _len in self.aws:
+            self.assertEqual((burst, _len), (0b01, 0))
+            self.assertTrue(0x1000 <= addr < 0x1000 + 64*2)
+        for _, last in self.ws:
+            self.assertEqual(last, 1)
+        # Rebuild ring buffer (4 samples per word), oldest sample at end.
+        memory = {}
+        for (addr, _, _), (data, _) in zip(self.aws, self.ws):
+            for n in range(4):
+                memory[(addr - 0x1000)//2 + n] = (data >> 16*n) & 0xffff
+        ring = [memory[(status["end"] + n) % 64] for n in range(64)]
+        self.assertEqual(ring, list(range(ring[0], ring[0] + 64)))
+        self.assertEqual(memory[status["trigger"]], 200)
+        self.assertGreaterEqual(200 - ring[0], 16)
+
+class TestDMAStorageStream(TestDMAStorage):
+    def generators(self, dma):
+        self.words = []
+        @passive
+        def sink():
+            yield dma.ready.eq(1)
+            while True:
+                if (yield dma.valid):
+                    self.words.append((yield dma.data))
+                yield
+        return [sink()]
+
+    def test_stream(self):
+        dma    = stream.Endpoint([("data", 64)])
+        status = self.capture(dma, length=64, offset=16, trigger=100)
+        samples = [(word >> 16*n) & 0xffff for word in self.words for n in range(4)]
+        # Samples since enable until length - offset samples after trigger, padded to 8KB.
+        self.assertEqual(len(self.words)*8 % 8192, 0)
+        self.assertEqual(samples[:status["end"]], list(range(samples[0], samples[0] + status["end"])))
+        self.assertEqual(samples[status["trigger"]], 100)
+        self.assertGreaterEqual(status["end"] - status["trigger"], 64 - 16)
+
+if __name__ == "__main__":
+    unittest.main()
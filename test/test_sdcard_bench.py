@@ -0,0 +1,49 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litex_boards.tools.sdcard_bench import SDCardDriver, SDCardError
+
+class FakeCSR:
+    def __init__(self, read=lambda: 0):
+        self.read  = read
+        self.write = lambda value: None
+
+class FakeRegs:
+    def __init__(self, regs):
+        self.regs = regs
+
+    def __getattr__(self, name):
+        return self.regs.setdefault(name, FakeCSR())
+
+class FakeBus:
+    def __init__(self, regs):
+        self.regs = FakeRegs(regs)
+
+class TestSDCardBench(unittest.TestCase):
+    def test_dma_timeout(self):
+        # DMA stuck: timeout.
+        bus    = FakeBus({"sdcard_block2mem_dma_offset": FakeCSR(lambda: 16)})
+        driver = SDCardDriver(bus, timeout=0.01)
+        with self.assertRaises(SDCardError):
+            driver.wait_dma_done("block2mem_dma")
+
+        # DMA progressing (offset increments on each deadline): no timeout until done.
+        offsets = iter(range(16))
+        offset  = [0]
+        def read_offset():
+            offset[0] = next(offsets)
+            return offset[0]
+        bus    = FakeBus({
+            "sdcard_block2mem_dma_offset": FakeCSR(read_offset),
+            "sdcard_block2mem_dma_done"  : FakeCSR(lambda: int(offset[0] >= 8)),
+        })
+        driver = SDCardDriver(bus, timeout=1e-3)
+        driver.wait_dma_done("block2mem_dma")
+        self.assertEqual(offset[0], 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+import subprocess
+
+from litex_boards.tools.test_select import DependencyGraph, OutputsCache
+from litex_boards.tools.test_select import changed_files, package_version
+
+class TestSelect(unittest.TestCase):
+    graph = DependencyGraph(".")
+
+    def test_target_deps(self):
+        deps = self.graph.target_deps("colorlight_5a_75x")
+        self.assertIn("litex_boards/platforms/colorlight_5a_75b.py", deps)
+        self.assertIn("litex_boards/platforms/colorlight_5a_75e.py", deps)
+        self.assertIn("litex_boards/prog/openocd_colorlight_5a_75b.cfg", deps)
+
+    def test_platform_deps(self):
+        deps = self.graph.platform_deps("qmtech_xc7a35t")
+        self.assertIn("litex_boards/platforms/qmtech_daughterboard.py", deps)
+        self.assertIn("litex_boards/targets/simple.py", deps)
+
+    def test_affected(self):
+        targets, platforms = self.graph.affected(["litex_boards/platforms/qmtech_daughterboard.py"])
+        self.assertIn("qmtech_xc7a35t", targets)
+        self.assertIn("qmtech_5cefa2", platforms)
+        self.assertNotIn("digilent_arty", targets)
+        targets, platforms = self.graph.affected(["litex_boards/targets/simple.py"])
+        self.assertEqual(targets, ["simple"])
+        self.assertEqual(platforms, self.graph.platforms())
+        targets, platforms = self.graph.affected(["README.md"])
+        self.assertEqual((targets, platforms), ([], []))
+        targets, platforms = self.graph.affected(["setup.py"])
+        self.assertEqual(targets, self.graph.targets())
+
+    def test_outputs_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "cache.json")
+            cache    = OutputsCache(filename, self.graph)
+            self.assertFalse(cache.valid("target", "digilent_arty", ["--build"]))
+            cache.update("target", "digilent_arty", ["--build"])
+            cache.save()
+            cache = OutputsCache(filename, self.graph)
+            self.assertTrue(cache.valid("target", "digilent_arty", ["--build"]))
+            self.assertFalse(cache.valid("target", "digilent_arty", ["--build", "--with-ethernet"]))
+            # Installed packages changes invalidate the cache.
+            packages = dict(cache.packages, litex="0.0+0123456789abcdef")
+            cache    = OutputsCache(filename, self.graph, packages=packages)
+            self.assertFalse(cache.valid("target", "digilent_arty", ["--build"]))
+
+    def test_package_version(self):
+        self.assertIsNone(package_version("not_a_litex_package"))
+        # Development install: git commit of the package.
+        commit = subprocess.check_output(["git", "log", "-1", "--format=%H", "--", "litex_boards"],
+            text=True).strip()
+        self.assertIn(commit, package_version("litex_boards"))
+
+    def test_changed_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            git = ["git", "-C", tmp, "-c", "user.name=test", "-c", "user.email=test@test"]
+            for name in ["a.py", "b.py", ".gitignore"]:
+                with open(os.path.join(tmp, name), "w") as f:
+                    f.write("ignored.py\n" if name == ".gitignore" else "")
+            subprocess.check_call(git + ["init", "-q"])
+            subprocess.check_call(git + ["add", "."])
+            subprocess.check_call(git + ["commit", "-q", "-m", "init"])
+            for name in ["b.py", "c.py", "ignored.py"]:
+                with open(os.path.join(tmp, name), "w") as f:
+                    f.write("x = 1\n")
+            # Modified and untracked (not ignored) files.
+            self.assertEqual(changed_files("HEAD", tmp), ["b.py", "c.py"])
+
+if __name__ == "__main__":
+    unittest.main()
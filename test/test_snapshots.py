@@ -0,0 +1,73 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+
+from litex_boards.tools.snapshots import fingerprint, compare, SnapshotStore
+
+VERILOG = """// Date       : {date}
+/*
+# Hierarchy
+{hierarchy}
+*/
+module top(input clk);
+reg [7:0] counter = 8'd0;
+always @(posedge clk) counter <= counter + 1'd1;
+endmodule
+"""
+
+XDC = """# clk:0
+set_property LOC {loc} [get_ports {{clk}}]
+set_property IOSTANDARD LVCMOS33 [get_ports {{clk}}]
+"""
+
+CSR_CSV = """# Auto-generated by LiteX on {date}
+csr_base,ctrl,0x00000000,,
+csr_register,ctrl_reset,0x00000000,1,rw
+constant,config_identifier,litex soc {date},,
+memory_region,rom,0x00000000,{rom_size},cached
+memory_region,sram,0x10000000,8192,cached
+"""
+
+def write_outputs(output_dir, date="2024-01-01 00:00:00", hierarchy="a\nb", loc="E3", rom_size=131072):
+    os.makedirs(os.path.join(output_dir, "gateware"), exist_ok=True)
+    with open(os.path.join(output_dir, "gateware", "top.v"), "w") as f:
+        f.write(VERILOG.format(date=date, hierarchy=hierarchy))
+    with open(os.path.join(output_dir, "gateware", "top.xdc"), "w") as f:
+        f.write(XDC.format(loc=loc))
+    with open(os.path.join(output_dir, "csr.csv"), "w") as f:
+        f.write(CSR_CSV.format(date=date, rom_size=rom_size))
+
+class TestSnapshots(unittest.TestCase):
+    def test_normalization(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            write_outputs(os.path.join(tmp, "a"))
+            write_outputs(os.path.join(tmp, "b"), date="2025-06-07 08:09:10", hierarchy="b\na")
+            self.assertEqual(compare(fingerprint(os.path.join(tmp, "a")), fingerprint(os.path.join(tmp, "b"))), [])
+
+    def test_differences(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            write_outputs(os.path.join(tmp, "a"))
+            write_outputs(os.path.join(tmp, "b"), loc="E4", rom_size=65536)
+            summary = compare(fingerprint(os.path.join(tmp, "a")), fingerprint(os.path.join(tmp, "b")))
+            self.assertEqual(summary, [
+                "Constraints: gateware/top.xdc: +1/-1 lines.",
+                "Memory map: 1 changed (rom).",
+            ])
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "build")
+            write_outputs(output_dir)
+            store = SnapshotStore(os.path.join(tmp, "snapshots"))
+            self.assertEqual(store.check("targets/top", output_dir), []) # No snapshot.
+            SnapshotStore(store.directory, update=True).check("targets/top", output_dir)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "snapshots", "targets", "top.json")))
+            self.assertEqual(store.check("targets/top", output_dir), [])
+            with open(os.path.join(output_dir, "gateware", "top.v"), "a") as f:
+                f.write("module other();\nendmodule\n")
+            self.assertEqual(store.check("targets/top", output_dir), ["Verilog: 1 changed (gateware/top.v)."])
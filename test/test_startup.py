@@ -0,0 +1,63 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import re
+import sys
+import json
+import time
+import unittest
+import subprocess
+
+# Optional cores that targets must only import when the matching option is selected.
+LAZY_MODULES = re.compile(r"^(liteeth|litepcie|litescope|litesata|litesdcard)(\.|$)")
+
+help_py = """
+import sys, json, runpy
+sys.argv = ["{target}", "--help"]
+try:
+    runpy.run_module("litex_boards.targets.{target}", run_name="__main__")
+except SystemExit:
+    pass
+sys.stderr.write("\\n" + json.dumps(sorted(sys.modules)) + "\\n")
+"""
+
+class TestStartup(unittest.TestCase):
+    excluded_targets = [
+        "efinix_xyloni_dev_kit", # Reason: Require Efinity toolchain.
+    ]
+    required_modules = {
+        "lambdaconcept_pcie_screamer" : ["litepcie"], # Reason: PCIe always used.
+    }
+
+    # Run --help for all targets: no optional core imported, report the slowest targets.
+    def test_targets_help(self):
+        targets = []
+        for file in sorted(os.listdir("./litex_boards/targets/")):
+            if file.endswith(".py"):
+                file = file.replace(".py", "")
+                if file not in ["__init__"] + self.excluded_targets:
+                    targets.append(file)
+
+        durations = {}
+        for name in targets:
+            with self.subTest(target=name):
+                start = time.time()
+                p = subprocess.run([sys.executable, "-c", help_py.format(target=name)],
+                    stdout = subprocess.DEVNULL,
+                    stderr = subprocess.PIPE,
+                    text   = True)
+                durations[name] = time.time() - start
+                self.assertEqual(p.returncode, 0, msg=p.stderr)
+                modules = json.loads(p.stderr.strip().split("\n")[-1])
+                required = self.required_modules.get(name, [])
+                modules  = [m for m in modules if LAZY_MODULES.match(m) and m.split(".")[0] not in required]
+                self.assertEqual(modules, [])
+
+        for name, duration in sorted(durations.items(), key=lambda d: -d[1])[:5]:
+            print(f"{name}: {duration:.2f}s")
+
+if __name__ == "__main__":
+    unittest.main()
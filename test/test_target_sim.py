@@ -0,0 +1,49 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import sys
+import unittest
+
+from litex.soc.integration.soc      import LiteXSoC
+from litex.soc.integration.soc_core import SoCCore
+
+from litex_boards.tools.target_sim import _call_kwargs, capture_target, TargetSimSoC
+
+class TestTargetSim(unittest.TestCase):
+    def test_call_kwargs(self):
+        def method(self, a, b=2, **kwargs):
+            pass
+        self.assertEqual(_call_kwargs(method, None, 1, c=3), {"a": 1, "c": 3})
+
+    def test_capture_replay(self):
+        init      = SoCCore.__init__
+        add_sdram = LiteXSoC.add_sdram
+        argv      = list(sys.argv)
+        config    = capture_target("digilent_arty", ["--cpu-type=None", "--with-etherbone", "--with-spi-flash", "--no-compile"])
+
+        # Capture: BaseSoC/Builder configuration, patches/sys.argv restored.
+        self.assertEqual(config.sys_clk_freq, int(100e6))
+        self.assertEqual(config.uart_name, "sim")
+        self.assertEqual(config.sdram["module"].__class__.__name__, "MT41K128M16")
+        self.assertEqual([method for method, _ in config.ethernet], ["add_etherbone"])
+        self.assertEqual(config.spi_flash["module"].__class__.__name__, "S25FL128L")
+        self.assertFalse(config.builder_kwargs["compile_gateware"])
+        self.assertEqual(config.dropped, [])
+        self.assertIs(SoCCore.__init__, init)
+        self.assertIs(LiteXSoC.add_sdram, add_sdram)
+        self.assertEqual(sys.argv, argv)
+
+        # Replay on the simulation SoC: same memory map, board PHYs replaced with models.
+        soc = TargetSimSoC(config)
+        soc.finalize()
+        self.assertEqual(soc.mem_map, config.soc.mem_map)
+        self.assertEqual(soc.sdrphy.__class__.__name__, "SDRAMPHYModel")
+        self.assertEqual(soc.ethphy.__class__.__name__, "LiteEthPHYModel")
+        for region in ["sram", "main_ram", "spiflash"]:
+            self.assertEqual(soc.bus.regions[region].origin, config.soc.bus.regions[region].origin)
+        self.assertIn("sdram", soc.csr.locs)
+
+if __name__ == "__main__":
+    unittest.main()
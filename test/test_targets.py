@@ -5,7 +5,6 @@
 # This file is Copyright (c) 2019 Tim 'mithro' Ansell <me@mith.ro>
 # SPDX-License-Identifier: BSD-2-Clause
 
-import subprocess
 import unittest
 import os
 
@@ -13,6 +12,10 @@ from migen import *
 
 from litex.soc.integration.builder import *
 
+from litex_boards.tools.build_server import BuildJob, BuildServer
+from litex_boards.tools.test_select import TargetSelection
+from litex_boards.tools.snapshots import SnapshotStore
+
 class TestTargets(unittest.TestCase):
     excluded_platforms = [
         "qmtech_daughterboard",              # Reason: Not a real platform.
@@ -51,17 +54,27 @@ class TestTargets(unittest.TestCase):
                 if file not in ["__init__"] + self.excluded_platforms:
                     platforms.append(file)
 
-        # Test platforms with simple design.
-        for name in platforms:
+        # Only test platforms affected by the changes (see tools/test_select.py).
+        args      = ["--build", "--no-compile", "--uart-name=stub"]
+        selection = TargetSelection.from_env()
+        platforms = selection.filter_platforms(platforms, args)
+        snapshots = SnapshotStore.from_env() # Golden-output snapshots (see tools/snapshots.py).
+
+        # Test platforms with simple design (Elaborated in forked children of a warm worker).
+        server = BuildServer()
+        jobs   = [BuildJob("simple", [f"litex_boards.platforms.{name}"] + args,
+            name       = name,
+            output_dir = os.path.join("build", "platforms", name),
+        ) for name in platforms]
+        for job in jobs:
+            os.system(f"rm -rf {job.output_dir}")
+        for name, result in zip(platforms, server.run_jobs(jobs)):
             with self.subTest(platform=name):
-                os.system("rm -rf build")
-                cmd = """\
-python3 -m litex_boards.targets.simple litex_boards.platforms.{} \
-    --build            \
-    --no-compile       \
-    --uart-name="stub" \
-""".format(name)
-                subprocess.check_call(cmd, shell=True)
+                self.assertTrue(result.success, msg=result.log)
+                if snapshots is not None:
+                    differences = snapshots.check(f"platforms/{name}", result.job.output_dir)
+                    self.assertEqual(differences, [], msg="\n".join(differences))
+                selection.passed("platform", name, args)
 
     # Build default configuration for all targets.
     def test_targets(self):
@@ -73,15 +86,21 @@ python3 -m litex_boards.targets.simple litex_boards.platforms.{} \
                 if file not in ["__init__"] + self.excluded_targets:
                     targets.append(file)
 
-        # Test targets.
-        for name in targets:
+        # Only test targets affected by the changes (see tools/test_select.py).
+        args      = ["--cpu-type=vexriscv", "--cpu-variant=minimal", "--build", "--no-compile"]
+        selection = TargetSelection.from_env()
+        targets   = selection.filter_targets(targets, args)
+        snapshots = SnapshotStore.from_env() # Golden-output snapshots (see tools/snapshots.py).
+
+        # Test targets (Elaborated in forked children of a warm worker).
+        server = BuildServer()
+        jobs   = [BuildJob(name, args) for name in targets]
+        for job in jobs:
+            os.system(f"rm -rf {job.output_dir}")
+        for name, result in zip(targets, server.run_jobs(jobs)):
             with self.subTest(target=name):
-                os.system("rm -rf build")
-                cmd = """\
-python3 -m litex_boards.targets.{} \
-    --cpu-type=vexriscv     \
-    --cpu-variant=minimal   \
-    --build                 \
-    --no-compile            \
-""".format(name)
-                subprocess.check_call(cmd, shell=True)
+                self.assertTrue(result.success, msg=result.log)
+                if snapshots is not None:
+                    differences = snapshots.check(f"targets/{name}", result.job.output_dir)
+                    self.assertEqual(differences, [], msg="\n".join(differences))
+                selection.passed("target", name, args)
@@ -0,0 +1,121 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+
+from litex_boards.tools.usb_acm_reader import CMD_WRITE_BURST_INCR, CMD_READ_BURST_INCR
+from litex_boards.tools.usb_acm_reader import USB_ACM_MODE_DMA
+from litex_boards.tools.usb_acm_reader import USBACMReader, dma_capture
+
+CSRS = {
+    "uart_streamer_mode"              : (0x0000, 1),
+    "uart_streamer_dma_reader_base"   : (0x0004, 2),
+    "uart_streamer_dma_reader_length" : (0x000c, 1),
+    "uart_streamer_dma_reader_enable" : (0x0010, 1),
+    "uart_streamer_dma_reader_loop"   : (0x0014, 1),
+}
+
+class FakeUARTBone:
+    """USB-ACM port of a streamer in Bridge mode (UARTBone protocol), memory in a dict of words."""
+    def __init__(self, memory):
+        self.memory       = memory
+        self.rx           = bytearray()
+        self.tx           = bytearray()
+        self.inflight     = 0
+        self.max_inflight = 0
+
+    def write(self, data):
+        self.rx += data
+        while len(self.rx) >= 6:
+            cmd, length = self.rx[0], self.rx[1]
+            addr = int.from_bytes(self.rx[2:6], "big")
+            if cmd == CMD_READ_BURST_INCR:
+                del self.rx[:6]
+                for n in range(length):
+                    self.tx += self.memory.get(addr + n, 0).to_bytes(4, "big")
+                self.inflight     += 1
+                self.max_inflight  = max(self.max_inflight, self.inflight)
+            elif cmd == CMD_WRITE_BURST_INCR:
+                if len(self.rx) < 6 + 4*length:
+                    break
+                for n in range(length):
+                    self.memory[addr + n] = int.from_bytes(self.rx[6 + 4*n:10 + 4*n], "big")
+                del self.rx[:6 + 4*length]
+                self.written(addr)
+            else:
+                raise ValueError(cmd)
+
+    def written(self, addr):
+        # DMA mode: stream the DMA reader's memory (little-endian words).
+        if 4*addr == CSRS["uart_streamer_mode"][0] and self.memory[addr] == USB_ACM_MODE_DMA:
+            base   = self.csr("uart_streamer_dma_reader_base")
+            length = self.csr("uart_streamer_dma_reader_length")
+            for n in range(length//4):
+                self.tx += self.memory.get(base//4 + n, 0).to_bytes(4, "little")
+
+    def csr(self, name):
+        addr, nwords = CSRS[name]
+        value = 0
+        for n in range(nwords):
+            value = (value << 32) | self.memory.get(addr//4 + n, 0)
+        return value
+
+    def read(self, length):
+        data = bytes(self.tx[:length])
+        del self.tx[:length]
+        if data:
+            self.inflight -= 1
+        return data
+
+class TestUSBACMReader(unittest.TestCase):
+    def memory(self, base, nwords):
+        return {base//4 + n: (0x01020304*n) & 0xffffffff for n in range(nwords)}
+
+    def test_read(self):
+        memory = self.memory(0x40000000, 2048)
+        port   = FakeUARTBone(dict(memory))
+        reader = USBACMReader(port, pipeline=4)
+        data   = reader.read(0x40000001, 8000)
+        ref    = b"".join(memory[0x40000000//4 + n].to_bytes(4, "little") for n in range(2048))
+        self.assertEqual(data, ref[1:8001])
+        # 255-word bursts pipelined, up to pipeline in flight.
+        self.assertEqual(port.max_inflight, 4)
+        self.assertEqual(port.rx, b"")
+
+    def test_write_csr(self):
+        port   = FakeUARTBone({})
+        reader = USBACMReader(port)
+        reader.write_csr(0x0004, 0x123456789, nbits=64)
+        # CSRs wider than the CSR data width are split MSB first.
+        self.assertEqual(port.memory, {1: 0x00000001, 2: 0x23456789})
+        reader.write_csr(0x0100, 0x1234, nbits=16, csr_data_width=8)
+        self.assertEqual((port.memory[0x40], port.memory[0x41]), (0x12, 0x34))
+
+    def test_timeout(self):
+        reader = USBACMReader(FakeUARTBone({}))
+        with self.assertRaises(TimeoutError):
+            reader.capture(16)
+
+    def test_dma_capture(self):
+        memory = self.memory(0x40001000, 256)
+        port   = FakeUARTBone(dict(memory))
+        reader = USBACMReader(port)
+        with tempfile.TemporaryDirectory() as tmp:
+            csr_csv = os.path.join(tmp, "csr.csv")
+            with open(csr_csv, "w") as f:
+                f.write("#--------------------------------------------------------------------------------\n")
+                f.write("constant,config_csr_data_width,32,,\n")
+                for name, (addr, nwords) in CSRS.items():
+                    f.write(f"csr_register,{name},0x{addr:08x},{nwords},rw\n")
+            data = dma_capture(reader, csr_csv, "uart", 0x40001000, 1024)
+        ref = b"".join(memory[0x40001000//4 + n].to_bytes(4, "little") for n in range(256))
+        self.assertEqual(data, ref)
+        self.assertEqual(port.csr("uart_streamer_dma_reader_enable"), 1)
+        self.assertEqual(port.csr("uart_streamer_dma_reader_loop"), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import random
+import unittest
+
+from migen import *
+
+from litex_boards.cores.usb_bridge import USBBridge
+from litex_boards.tools.usb_bridge import FrameParser, LoopbackDevice, build_frame, benchmark
+
+class TestUSBBridge(unittest.TestCase):
+    def check_frames(self, device, chunk_sizes):
+        parser = FrameParser()
+        frames = []
+        for size in chunk_sizes:
+            frames += parser.feed(device.read(size))
+        self.assertGreater(len(frames), 0)
+        for frame, sent in zip(frames, device.sent):
+            self.assertEqual(frame.channel,   sent.channel)
+            self.assertEqual(frame.timestamp, sent.timestamp)
+            self.assertEqual(frame.payload,   sent.payload)
+            self.assertEqual(frame.dropped,   sent.dropped)
+        return parser, frames
+
+    def test_loopback(self):
+        device = LoopbackDevice(drop_every=7)
+        parser, frames = self.check_frames(device, [65536]*4)
+        self.assertEqual(parser.resyncs, 0)
+        self.assertTrue(any(frame.dropped for frame in frames))
+
+    def test_chunk_boundaries(self):
+        # Frames split at any byte boundary between transfers.
+        rng    = random.Random(1)
+        device = LoopbackDevice(max_words=16)
+        self.check_frames(device, [rng.randint(1, 100) for _ in range(2000)])
+
+    def test_resync(self):
+        device = LoopbackDevice(garbage=True)
+        parser, frames = self.check_frames(device, [4096]*16)
+        self.assertGreater(parser.resyncs, 0)
+
+    def test_build_frame(self):
+        frame  = build_frame(2, bytes(range(8)), timestamp=1234, dropped=True)
+        frames = FrameParser().feed(frame)
+        self.assertEqual(len(frames), 1)
+        self.assertEqual((frames[0].channel, frames[0].timestamp, frames[0].dropped), (2, 1234, True))
+        self.assertEqual(frames[0].payload, bytes(range(8)))
+
+    def test_benchmark(self):
+        total, elapsed, stats, parser = benchmark(LoopbackDevice(), 0.2, verbose=False)
+        self.assertGreater(total, 0)
+        self.assertEqual(sorted(stats.keys()), [0, 1, 2])
+
+    def test_gateware_framer(self):
+        # USBBridge frames parsed by the host FrameParser: 64-bit back-pressured channel with packets
+        # split in max_words segments, 32-bit droppable channel overflowing while USB is stalled.
+        dut = USBBridge(fifo_depth=256, batch=16, timeout=32)
+        ch0 = dut.add_channel(64, max_words=16, depth=64)
+        ch1 = dut.add_channel(32, max_words=8,  depth=16, droppable=True)
+        rng = random.Random(2)
+
+        ch0_packets = [[rng.getrandbits(64) for _ in range(n)] for n in [3, 8, 20, 1, 9]]
+        ch1_packets = [[rng.getrandbits(32) for _ in range(8)] for _ in range(12)]
+        timestamps  = {0: [], 1: []}
+        output      = bytearray()
+        status      = {}
+
+        def sender(sink, packets, gap):
+            for packet in packets:
+                for i, data in enumerate(packet):
+                    yield sink.valid.eq(1)
+                    yield sink.data.eq(data)
+                    yield sink.last.eq(i == len(packet) - 1)
+                    yield
+                    while not (yield sink.ready):
+                        yield
+                yield sink.valid.eq(0)
+                for _ in range(gap):
+                    yield
+
+        @passive
+        def monitor(n, sink, max_beats):
+            beat = 0
+            while True:
+                if (yield sink.valid) and (yield sink.ready):
+                    if beat % max_beats == 0:
+                        timestamps[n].append((yield dut.timestamp))
+                    beat = 0 if (yield sink.last) else beat + 1
+                yield
+
+        def usb():
+            # Stalled while channel 1 overflows, then random back-pressure.
+            for _ in range(200):
+                yield
+            for _ in range(3000):
+                ready = rng.randint(0, 3) != 0
+                yield dut.source.ready.eq(ready)
+                yield
+                if ready and (yield dut.source.valid):
+                    output.extend((yield dut.source.data).to_bytes(4, "little"))
+            self.assertEqual((yield dut.ch0.drops.status), 0)
+            self.assertEqual((yield dut.ch0.packets.status), 8)
+            status["ch1_packets"] = (yield dut.ch1.packets.status)
+            status["ch1_drops"]   = (yield dut.ch1.drops.status)
+
+        run_simulation(dut, [
+            sender(ch0, ch0_packets, 4), monitor(0, ch0, 8),
+            sender(ch1, ch1_packets, 2), monitor(1, ch1, 8),
+            usb()])
+
+        parser = FrameParser()
+        frames = parser.feed(bytes(output))
+        self.assertEqual(parser.resyncs, 0)
+        self.assertEqual(parser.buffer, b"")
+
+        # Channel 0: all packets, split in 8-beat (16 words) segments.
+        segments = []
+        for packet in ch0_packets:
+            for i in range(0, len(packet), 8):
+                segments.append(b"".join(data.to_bytes(8, "little") for data in packet[i:i+8]))
+        ch0_frames = [frame for frame in frames if frame.channel == 0]
+        self.assertEqual([frame.payload for frame in ch0_frames], segments)
+        self.assertEqual([frame.timestamp for frame in ch0_frames], timestamps[0])
+        self.assertFalse(any(frame.dropped for frame in ch0_frames))
+
+        # Channel 1: whole packets forwarded in order, drops flagged on the next forwarded packet.
+        ch1_frames = [frame for frame in frames if frame.channel == 1]
+        payloads   = [b"".join(data.to_bytes(4, "little") for data in packet) for packet in ch1_packets]
+        forwarded  = [payloads.index(frame.payload) for frame in ch1_frames]
+        self.assertEqual(forwarded, sorted(forwarded))
+        self.assertEqual(status["ch1_packets"], len(ch1_frames))
+        self.assertEqual(status["ch1_drops"], len(ch1_packets) - len(ch1_frames))
+        self.assertGreater(status["ch1_drops"], 0)
+        for i, frame in enumerate(ch1_frames):
+            previous = forwarded[i - 1] if i else -1
+            self.assertEqual(frame.dropped, forwarded[i] != previous + 1)
+            self.assertEqual(frame.timestamp, timestamps[1][forwarded[i]])
+
+if __name__ == "__main__":
+    unittest.main()
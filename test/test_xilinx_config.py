@@ -0,0 +1,38 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litex_boards.build.xilinx_config import XilinxConfigProfile
+
+class TestXilinxConfig(unittest.TestCase):
+    def test_fast_boot(self):
+        profile = XilinxConfigProfile(flash_size=16, configrate=33, max_spi_buswidth=4, max_configrate=50)
+        fast    = profile.fast_boot()
+        self.assertEqual((fast.spi_buswidth, fast.configrate, fast.compress), (4, 50, True))
+        self.assertEqual((profile.spi_buswidth, profile.configrate), (1, 33))
+        self.assertIn("set_property BITSTREAM.CONFIG.CONFIGRATE 50 [current_design]", fast.get_bitstream_commands())
+        self.assertIn("-interface spix4", fast.get_additional_commands()[0])
+
+    def test_cfgmem(self):
+        profile = XilinxConfigProfile(flash_size=16, multiboot=True)
+        self.assertEqual(len([c for c in profile.get_additional_commands() if c.startswith("write_cfgmem")]), 3)
+        profile = XilinxConfigProfile(flash_size=128, family="ultrascale+", with_cfgmem=False)
+        self.assertEqual(profile.get_additional_commands(), [])
+
+    def test_alveo_u280(self):
+        from litex_boards.platforms import xilinx_alveo_u280
+        platform = xilinx_alveo_u280.Platform()
+        profile  = platform.config_profile
+        self.assertEqual(platform.toolchain.additional_commands, [])
+        self.assertEqual(profile.family, "ultrascale+")
+        self.assertGreater(profile.fast_boot().configrate, profile.configrate)
+
+    def test_configrate(self):
+        with self.assertRaises(AssertionError):
+            XilinxConfigProfile(flash_size=16, configrate=85.0)
+
+if __name__ == "__main__":
+    unittest.main()